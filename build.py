@@ -51,6 +51,16 @@ if os.path.exists(icon_path):
     py_args.append(f"--icon={icon_path}")
 
 py_args.extend(add_data_args)
+
+# launcher.pyw imports these on first use (components/lazyimport.py), which
+# PyInstaller cannot see, so list them explicitly.
+hidden_imports = [
+    'psutil', 'pyqtgraph', 'PyQt6.QtMultimedia', 'requests',
+    'components.net.https', 'components.net.downloader', 'components.net.java',
+    'components.net.artifacts', 'components.net.pipeline', 'components.net.modrinth', 'components.net.queue',
+    'zstandard', 'lz4.block', 'yaml', 'tomllib',
+]
+py_args.extend(f"--hidden-import={m}" for m in hidden_imports)
 py_args.extend(['--log-level=WARN', '--clean', '--name=YaliLauncher'])
 
 print('Running PyInstaller with the following args:')
@@ -0,0 +1,484 @@
+"""Plugin and mod metadata for the Addons tab.
+
+`read_addon(jar_path)` opens a jar's zip central directory and decodes the
+first descriptor it carries, in this order:
+- `paper-plugin.yml`, `plugin.yml` (Paper / Bukkit / Spigot)
+- `bungee.yml`, `velocity-plugin.json` (proxies)
+- `fabric.mod.json`, `quilt.mod.json`
+- `META-INF/neoforge.mods.toml`, `META-INF/mods.toml` (NeoForge / Forge)
+
+Every descriptor is reduced to the same dict: kind, id, name, version,
+api_version, depends (required ids), soft_depends, load_before, load
+(Bukkit STARTUP / POSTWORLD), provides and error (set when the jar or its
+descriptor could not be read; the other fields are then empty).
+
+`AddonIndex.scan(folder)` reads every jar of an addons folder on a thread
+pool, reusing results cached in `addon_index.json` in app data for jars
+whose size and mtime have not changed, and `check(addons)` adds the
+missing dependencies and duplicate ids of each addon. YAML descriptors
+go through PyYAML when it is installed and a small block-YAML reader
+otherwise.
+"""
+import os
+import re
+import json
+import time
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Dict, Any, List, Tuple
+from ..appdata import get_app_data_dir
+from ..lazyimport import lazy_module, available
+
+yaml = lazy_module('yaml')
+tomllib = lazy_module('tomllib')
+
+DEFAULT_WORKERS = 8
+
+DESCRIPTORS = (
+	('paper-plugin.yml', 'paper'),
+	('plugin.yml', 'bukkit'),
+	('bungee.yml', 'bungee'),
+	('velocity-plugin.json', 'velocity'),
+	('fabric.mod.json', 'fabric'),
+	('quilt.mod.json', 'quilt'),
+	('META-INF/neoforge.mods.toml', 'neoforge'),
+	('META-INF/mods.toml', 'forge'),
+)
+
+# dependency ids supplied by the server or loader itself, never by another jar
+PLATFORM_IDS = frozenset((
+	'minecraft', 'java', 'fabricloader', 'fabric-loader', 'quilt_loader', 'forge', 'neoforge',
+	'velocity', 'bungeecord', 'paper', 'spigot', 'bukkit',
+))
+
+
+class AddonError(Exception):
+	pass
+
+
+def _empty(kind: Optional[str]) -> Dict[str, Any]:
+	return {'kind': kind, 'id': None, 'name': None, 'version': None, 'api_version': None,
+			'depends': [], 'soft_depends': [], 'load_before': [], 'load': None, 'provides': [], 'error': None}
+
+
+# --- descriptor text ----------------------------------------------------------
+
+def _scalar(text: str) -> Any:
+	text = text.strip()
+	if len(text) >= 2 and text[0] == text[-1] and text[0] in '"\'':
+		return text[1:-1]
+	if text.startswith('[') and text.endswith(']'):
+		return [_scalar(part) for part in text[1:-1].split(',') if part.strip()]
+	lowered = text.lower()
+	if lowered in ('true', 'yes'):
+		return True
+	if lowered in ('false', 'no'):
+		return False
+	if lowered in ('null', '~', ''):
+		return None
+	return text
+
+
+def _strip_comment(line: str) -> str:
+	quote = None
+	for i, ch in enumerate(line):
+		if quote:
+			if ch == quote:
+				quote = None
+		elif ch in '"\'':
+			quote = ch
+		elif ch == '#' and (i == 0 or line[i - 1] in ' \t'):
+			return line[:i].rstrip()
+	return line.rstrip()
+
+
+def _mini_yaml(text: str) -> Any:
+	"""Block mappings, block and flow lists and plain/quoted scalars; enough for plugin descriptors."""
+	lines = []
+	for raw in text.splitlines():
+		line = _strip_comment(raw.replace('\t', '  '))
+		if line.strip() and line.strip() not in ('---', '...'):
+			lines.append((len(line) - len(line.lstrip(' ')), line.strip()))
+
+	def _block(i: int, indent: int) -> Tuple[Any, int]:
+		if i < len(lines) and (lines[i][1].startswith('- ') or lines[i][1] == '-'):
+			out = []
+			while i < len(lines) and lines[i][0] == indent and (lines[i][1].startswith('- ') or lines[i][1] == '-'):
+				item = lines[i][1][2:].strip()
+				i += 1
+				if not item:
+					value, i = _child(i, indent)
+					out.append(value)
+				elif re.match(r'^[^\'"\[{][^:]*:(\s|$)', item):
+					# "- key: value" starts a mapping item; re-read it with the item's indent
+					lines[i - 1] = (indent + 2, item)
+					value, i = _block(i - 1, indent + 2)
+					out.append(value)
+				else:
+					out.append(_scalar(item))
+			return out, i
+		out = {}
+		while i < len(lines) and lines[i][0] == indent:
+			key, sep, rest = lines[i][1].partition(':')
+			i += 1
+			if not sep:
+				continue
+			key = _scalar(key)
+			rest = rest.strip()
+			if rest[:1] in ('|', '>'):
+				parts = []
+				while i < len(lines) and lines[i][0] > indent:
+					parts.append(lines[i][1])
+					i += 1
+				out[key] = ('\n' if rest[0] == '|' else ' ').join(parts)
+			elif rest:
+				out[key] = _scalar(rest)
+			else:
+				out[key], i = _child(i, indent)
+		return out, i
+
+	def _child(i: int, indent: int) -> Tuple[Any, int]:
+		if i < len(lines) and (lines[i][0] > indent or (lines[i][0] == indent and lines[i][1].startswith('-'))):
+			return _block(i, lines[i][0])
+		return None, i
+
+	if not lines:
+		return {}
+	value, _ = _block(0, lines[0][0])
+	return value
+
+
+def _load_yaml(text: str) -> Dict[str, Any]:
+	if available('yaml'):
+		loader = getattr(yaml, 'CSafeLoader', None) or yaml.SafeLoader
+		data = yaml.load(text, Loader=loader)
+	else:
+		data = _mini_yaml(text)
+	if not isinstance(data, dict):
+		raise AddonError('descriptor is not a mapping')
+	return data
+
+
+def _load_toml(text: str) -> Dict[str, Any]:
+	if available('tomllib'):
+		return tomllib.loads(text)
+	# no tomllib (Python < 3.11): the first [[mods]] table's plain keys are enough for the list
+	mod = {}
+	section = None
+	for line in text.splitlines():
+		line = line.strip()
+		if line.startswith('['):
+			section = line.strip('[] ')
+			if section == 'mods' and mod:
+				break
+			continue
+		m = re.match(r'^(\w+)\s*=\s*"(.*)"', line)
+		if m and section == 'mods':
+			mod.setdefault(m.group(1), m.group(2))
+	return {'mods': [mod]} if mod else {}
+
+
+def _names(value: Any) -> List[str]:
+	"""Dependency lists come as a list, a single string or a mapping keyed by id."""
+	if not value:
+		return []
+	if isinstance(value, str):
+		return [value]
+	if isinstance(value, dict):
+		return [str(k) for k in value]
+	return [str(v) for v in value if v is not None and not isinstance(v, (dict, list))]
+
+
+# --- descriptors --------------------------------------------------------------
+
+def _bukkit(data: Dict[str, Any], info: Dict[str, Any]):
+	info['id'] = info['name'] = str(data.get('name') or '') or None
+	info['version'] = str(data['version']) if data.get('version') is not None else None
+	info['api_version'] = str(data['api-version']) if data.get('api-version') is not None else None
+	info['depends'] = _names(data.get('depend'))
+	info['soft_depends'] = _names(data.get('softdepend'))
+	info['load_before'] = _names(data.get('loadbefore'))
+	info['load'] = str(data.get('load') or 'POSTWORLD').upper()
+	info['provides'] = _names(data.get('provides'))
+
+
+def _paper(data: Dict[str, Any], info: Dict[str, Any]):
+	_bukkit(data, info)
+	deps = data.get('dependencies') or {}
+	# dependencies: {server: {Name: {load, required}}, bootstrap: ...}
+	server = deps.get('server') if isinstance(deps, dict) else None
+	if isinstance(server, dict):
+		for name, spec in server.items():
+			spec = spec if isinstance(spec, dict) else {}
+			(info['depends'] if spec.get('required', True) else info['soft_depends']).append(str(name))
+			if str(spec.get('load', '')).upper() == 'AFTER':
+				info['load_before'].append(str(name))
+	elif isinstance(deps, list):
+		for spec in deps:
+			if isinstance(spec, dict) and spec.get('name'):
+				(info['depends'] if spec.get('required', True) else info['soft_depends']).append(str(spec['name']))
+
+
+def _bungee(data: Dict[str, Any], info: Dict[str, Any]):
+	info['id'] = info['name'] = str(data.get('name') or '') or None
+	info['version'] = str(data['version']) if data.get('version') is not None else None
+	info['depends'] = _names(data.get('depends'))
+	info['soft_depends'] = _names(data.get('softDepends'))
+
+
+def _velocity(data: Dict[str, Any], info: Dict[str, Any]):
+	info['id'] = data.get('id')
+	info['name'] = data.get('name') or data.get('id')
+	info['version'] = data.get('version')
+	for dep in data.get('dependencies') or []:
+		if isinstance(dep, dict) and dep.get('id'):
+			(info['soft_depends'] if dep.get('optional') else info['depends']).append(dep['id'])
+
+
+def _fabric(data: Dict[str, Any], info: Dict[str, Any]):
+	if info['kind'] == 'quilt':
+		loader = data.get('quilt_loader') or {}
+		meta = loader.get('metadata') or {}
+		info['id'] = loader.get('id')
+		info['name'] = meta.get('name') or loader.get('id')
+		info['version'] = loader.get('version')
+		for dep in loader.get('depends') or []:
+			dep_id = dep.get('id') if isinstance(dep, dict) else dep
+			optional = isinstance(dep, dict) and dep.get('optional')
+			if dep_id:
+				(info['soft_depends'] if optional else info['depends']).append(str(dep_id))
+		info['provides'] = [p.get('id') if isinstance(p, dict) else str(p) for p in loader.get('provides') or []]
+		return
+	info['id'] = data.get('id')
+	info['name'] = data.get('name') or data.get('id')
+	info['version'] = data.get('version')
+	info['depends'] = _names(data.get('depends'))
+	info['soft_depends'] = _names(data.get('recommends')) + _names(data.get('suggests'))
+	info['provides'] = _names(data.get('provides'))
+	mc = (data.get('depends') or {}).get('minecraft') if isinstance(data.get('depends'), dict) else None
+	if mc:
+		info['api_version'] = mc if isinstance(mc, str) else ', '.join(map(str, mc))
+
+
+def _forge(data: Dict[str, Any], info: Dict[str, Any], manifest: Dict[str, str]):
+	mods = data.get('mods') or []
+	mod = mods[0] if mods and isinstance(mods[0], dict) else {}
+	info['id'] = mod.get('modId')
+	info['name'] = mod.get('displayName') or mod.get('modId')
+	version = mod.get('version')
+	if version and '${' in str(version):
+		version = manifest.get('Implementation-Version') or None
+	info['version'] = version
+	info['provides'] = [m.get('modId') for m in mods[1:] if isinstance(m, dict) and m.get('modId')]
+	deps = data.get('dependencies') or {}
+	for dep in deps.get(info['id'], []) if isinstance(deps, dict) and info['id'] else []:
+		dep_id = dep.get('modId')
+		if not dep_id:
+			continue
+		kind = str(dep.get('type', '')).lower()
+		required = kind == 'required' if kind else bool(dep.get('mandatory', False))
+		if kind in ('incompatible', 'discouraged'):
+			continue
+		(info['depends'] if required else info['soft_depends']).append(dep_id)
+		if str(dep.get('ordering', '')).upper() == 'BEFORE':
+			info['load_before'].append(dep_id)
+		if dep_id == 'minecraft':
+			info['api_version'] = dep.get('versionRange')
+
+
+def _manifest(zf: zipfile.ZipFile, names) -> Dict[str, str]:
+	if 'META-INF/MANIFEST.MF' not in names:
+		return {}
+	out = {}
+	for line in zf.read('META-INF/MANIFEST.MF').decode('utf-8', 'replace').splitlines():
+		key, sep, value = line.partition(':')
+		if sep:
+			out[key.strip()] = value.strip()
+	return out
+
+
+def read_addon(jar_path: str) -> Dict[str, Any]:
+	"""Metadata of one plugin or mod jar (see the module docstring for the fields)."""
+	info = _empty(None)
+	try:
+		with zipfile.ZipFile(jar_path) as zf:
+			names = set(zf.namelist())
+			for entry, kind in DESCRIPTORS:
+				if entry not in names:
+					continue
+				info['kind'] = kind
+				text = zf.read(entry).decode('utf-8-sig', 'replace')
+				if kind in ('paper', 'bukkit', 'bungee'):
+					data = _load_yaml(text)
+					{'paper': _paper, 'bukkit': _bukkit, 'bungee': _bungee}[kind](data, info)
+				elif kind in ('velocity', 'fabric', 'quilt'):
+					data = json.loads(text, strict=False)
+					(_velocity if kind == 'velocity' else _fabric)(data, info)
+				else:
+					_forge(_load_toml(text), info, _manifest(zf, names))
+				break
+	except Exception as e:
+		info = _empty(info['kind'])
+		info['error'] = str(e) or type(e).__name__
+	for field in ('id', 'name', 'version', 'api_version'):
+		if info[field] is not None:
+			info[field] = str(info[field])
+	for field in ('depends', 'soft_depends', 'load_before', 'provides'):
+		info[field] = [str(v) for v in info[field] if v]
+	return info
+
+
+def check(addons: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+	"""Set 'missing' (required ids no jar provides) and 'duplicates' (other files with the same id) on each addon."""
+	provided: Dict[str, List[str]] = {}
+	for addon in addons:
+		ids = {i.lower() for i in [addon.get('id')] + list(addon.get('provides') or []) if i}
+		for addon_id in ids:
+			provided.setdefault(addon_id, []).append(addon['file'])
+	for addon in addons:
+		addon['missing'] = [d for d in addon.get('depends') or []
+							if d.lower() not in PLATFORM_IDS and d.lower() not in provided]
+		own = (addon.get('id') or '').lower()
+		addon['duplicates'] = [f for f in provided.get(own, []) if f != addon['file']] if own else []
+	return addons
+
+
+def _key(path: str) -> str:
+	return os.path.normcase(os.path.abspath(path))
+
+
+class AddonIndex:
+	"""Read addon descriptors concurrently, reusing cached results for unchanged jars."""
+
+	def __init__(self, cache_path: Optional[str] = None, max_workers: int = DEFAULT_WORKERS):
+		self.cache_path = cache_path
+		self.max_workers = max(1, int(max_workers))
+		self._lock = threading.Lock()
+		self._jars: Dict[str, Dict[str, Any]] = self._load()
+		self._dirty = False
+
+	def _load(self) -> Dict[str, Dict[str, Any]]:
+		if not self.cache_path:
+			return {}
+		try:
+			with open(self.cache_path, 'r', encoding='utf-8') as f:
+				data = json.load(f)
+			return dict(data.get('jars') or {})
+		except Exception:
+			return {}
+
+	def save(self):
+		"""Write the jar cache if it changed."""
+		if not self.cache_path:
+			return
+		with self._lock:
+			if not self._dirty:
+				return
+			payload = {'version': 1, 'jars': self._jars}
+			self._dirty = False
+		tmp = self.cache_path + '.tmp'
+		try:
+			with open(tmp, 'w', encoding='utf-8') as f:
+				json.dump(payload, f)
+			os.replace(tmp, self.cache_path)
+		except Exception:
+			pass
+
+	def _read(self, path: str, size: int, mtime_ns: int) -> Tuple[Dict[str, Any], bool]:
+		key = _key(path)
+		stamp = [size, mtime_ns]
+		with self._lock:
+			cached = self._jars.get(key)
+		if cached and cached.get('stamp') == stamp:
+			return dict(cached['addon']), True
+		addon = read_addon(path)
+		with self._lock:
+			self._jars[key] = {'stamp': stamp, 'addon': addon}
+			self._dirty = True
+		return dict(addon), False
+
+	def scan(self, folder: str, on_addon: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+		"""Read every `*.jar` in `folder`; returns checked addon dicts sorted by file name.
+
+		Each dict has the `read_addon` fields plus file, path, size, cached,
+		missing and duplicates. `on_addon` is called from the pool threads as
+		each jar is read (before `check`).
+		"""
+		jars = []
+		with os.scandir(folder) as it:
+			for entry in it:
+				try:
+					if entry.name.lower().endswith('.jar') and entry.is_file():
+						st = entry.stat()
+						jars.append((entry.name, entry.path, st.st_size, st.st_mtime_ns))
+				except OSError:
+					continue
+
+		def _one(job):
+			name, path, size, mtime_ns = job
+			addon, cached = self._read(path, size, mtime_ns)
+			addon.update({'file': name, 'path': path, 'size': size, 'cached': cached})
+			if on_addon:
+				try:
+					on_addon(dict(addon))
+				except Exception:
+					pass
+			return addon
+
+		with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='yali-addon-index') as pool:
+			addons = list(pool.map(_one, jars))
+
+		prefix = _key(folder) + os.sep
+		present = {_key(path) for _, path, _, _ in jars}
+		with self._lock:
+			for key in [k for k in self._jars if k.startswith(prefix) and os.sep not in k[len(prefix):] and k not in present]:
+				del self._jars[key]
+				self._dirty = True
+		self.save()
+		addons.sort(key=lambda a: a['file'].lower())
+		return check(addons)
+
+
+_index: Optional[AddonIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> AddonIndex:
+	"""Return the shared index whose cache lives in the launcher's app data folder."""
+	global _index
+	with _index_lock:
+		if _index is None:
+			_index = AddonIndex(os.path.join(get_app_data_dir(), 'addon_index.json'))
+		return _index
+
+
+def problems(addon: Dict[str, Any]) -> List[str]:
+	"""Human readable issues of a checked addon, for the Addons tab."""
+	out = []
+	if addon.get('error'):
+		out.append(f"unreadable: {addon['error']}")
+	elif not addon.get('kind'):
+		out.append('no plugin or mod descriptor')
+	if addon.get('missing'):
+		out.append(f"missing: {', '.join(addon['missing'])}")
+	if addon.get('duplicates'):
+		out.append(f"duplicate of {', '.join(addon['duplicates'])}")
+	return out
+
+
+if __name__ == '__main__':
+	import argparse
+
+	parser = argparse.ArgumentParser(description='List plugin / mod metadata of an addons folder')
+	parser.add_argument('folder')
+	args = parser.parse_args()
+
+	started = time.monotonic()
+	addons = get_index().scan(args.folder)
+	for addon in addons:
+		issues = '; '.join(problems(addon))
+		print(f"{addon['file']:<40} {addon['kind'] or '-':<9} {addon['name'] or '-'} {addon['version'] or ''}"
+			  f"{'  [' + issues + ']' if issues else ''}")
+	cached = sum(1 for a in addons if a['cached'])
+	print(f"{len(addons)} jars ({cached} cached) in {(time.monotonic() - started) * 1000.0:.0f} ms")
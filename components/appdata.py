@@ -0,0 +1,18 @@
+"""Per-user data locations for YaliLauncher.
+
+Settings, caches and indexes all live under one folder: `%LOCALAPPDATA%`
+(or `%APPDATA%`) on Windows, `~/.config` elsewhere.
+"""
+import os
+
+
+def get_app_data_dir(*parts: str) -> str:
+	"""Return (and create) a folder inside the launcher's data directory."""
+	local = os.getenv('LOCALAPPDATA') or os.getenv('APPDATA')
+	if local:
+		folder = os.path.join(local, 'KaiakK', 'YaliLauncher')
+	else:
+		folder = os.path.join(os.path.expanduser('~'), '.config', 'YaliLauncher')
+	path = os.path.join(folder, *parts)
+	os.makedirs(path, exist_ok=True)
+	return path
@@ -0,0 +1,218 @@
+"""Filesystem helpers shared by the launcher's caches and copy jobs.
+
+`fast_copy` copies one file with the cheapest mechanism that works:
+reflink clone, then `os.copy_file_range` (in-kernel, may use server-side
+copy on NFS/SMB), then `os.sendfile`, then a buffered read/write loop.
+A mechanism that fails with "not supported" on a device is not tried
+again on that device; any other error (permissions, a full disk, I/O
+errors) is not taken as a verdict on the device.
+"""
+import os
+import sys
+import errno
+import shutil
+import threading
+from typing import Optional, Callable
+
+FICLONE = 0x40049409
+COPY_BLOCK = 8 * 1024 * 1024
+
+# errors meaning "this mechanism does not work here", not "the copy failed"
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF, errno.EPERM}
+
+# errors from the clone call itself that mean the filesystem pair cannot reflink
+_NO_REFLINK = {errno.EOPNOTSUPP, errno.ENOTSUP, errno.EXDEV, errno.EINVAL}
+
+_unsupported = {'reflink': set(), 'copy_file_range': set(), 'sendfile': set()}
+_unsupported_lock = threading.Lock()
+
+
+class CopyCancelled(Exception):
+	pass
+
+
+def _clone(src: str, dst: str) -> bool:
+	"""Reflink `src` to `dst`; False if the platform has no clone call, OSError if the clone fails.
+
+	`dst` is not left behind on failure.
+	"""
+	if sys.platform.startswith('linux'):
+		try:
+			import fcntl
+		except Exception:
+			return False
+		try:
+			with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+				fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+			return True
+		except BaseException:
+			try:
+				os.remove(dst)
+			except Exception:
+				pass
+			raise
+
+	if sys.platform == 'darwin':
+		try:
+			import ctypes
+			libc = ctypes.CDLL('libc.dylib', use_errno=True)
+		except Exception:
+			return False
+		if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+			err = ctypes.get_errno()
+			raise OSError(err, os.strerror(err), dst)
+		return True
+
+	return False
+
+
+def reflink(src: str, dst: str) -> bool:
+	"""Clone `src` to `dst` sharing data blocks (copy-on-write).
+
+	Supported on Linux filesystems with FICLONE (btrfs, XFS, bcachefs)
+	and on macOS APFS via clonefile(2). Returns False when the platform or
+	filesystem cannot clone; `dst` is not left behind in that case.
+	"""
+	try:
+		return _clone(src, dst)
+	except Exception:
+		return False
+
+
+def link_or_copy(src: str, dst: str, allow_hardlink: bool = True) -> str:
+	"""Place a copy of `src` at `dst` as cheaply as the filesystem allows.
+
+	Tries a hardlink (when `allow_hardlink`), then a reflink clone, then a
+	regular copy. `dst` is replaced atomically. Returns the method used:
+	'hardlink', 'reflink' or 'copy'.
+	"""
+	tmp = dst + '.yali-tmp'
+	try:
+		if os.path.exists(tmp):
+			os.remove(tmp)
+	except Exception:
+		pass
+
+	method = 'copy'
+	try:
+		if allow_hardlink:
+			try:
+				os.link(src, tmp)
+				method = 'hardlink'
+			except Exception:
+				method = 'copy'
+		if method == 'copy' and reflink(src, tmp):
+			method = 'reflink'
+		if method == 'copy':
+			shutil.copy2(src, tmp)
+		os.replace(tmp, dst)
+	except Exception:
+		try:
+			if os.path.exists(tmp):
+				os.remove(tmp)
+		except Exception:
+			pass
+		raise
+	return method
+
+
+def _mark_unsupported(method: str, dev):
+	with _unsupported_lock:
+		_unsupported[method].add(dev)
+
+
+def _is_unsupported(method: str, dev) -> bool:
+	with _unsupported_lock:
+		return dev in _unsupported[method]
+
+
+def _kernel_copy(method: str, fsrc, fdst, size: int, progress: Optional[Callable[[int], None]],
+				 cancel: Optional[threading.Event]) -> bool:
+	"""Copy with copy_file_range or sendfile; False if the first call is not supported."""
+	call = getattr(os, method, None)
+	if call is None:
+		return False
+	src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+	offset = 0
+	while offset < size:
+		if cancel is not None and cancel.is_set():
+			raise CopyCancelled()
+		count = min(COPY_BLOCK, size - offset)
+		try:
+			if method == 'copy_file_range':
+				sent = call(src_fd, dst_fd, count)
+			else:
+				sent = call(dst_fd, src_fd, offset, count)
+		except OSError as e:
+			if offset == 0 and e.errno in _UNSUPPORTED:
+				return False
+			raise
+		if sent == 0:
+			if offset == 0:
+				# some filesystems report success without copying anything
+				return False
+			raise OSError(errno.EIO, f'{method} stopped after {offset} of {size} bytes (source changed while copying?)')
+		offset += sent
+		if progress:
+			progress(sent)
+	return True
+
+
+def fast_copy(src: str, dst: str, progress: Optional[Callable[[int], None]] = None,
+			  cancel: Optional[threading.Event] = None, allow_reflink: bool = True) -> str:
+	"""Copy file `src` to `dst` (contents, then mode and times like `shutil.copy2`).
+
+	`progress(nbytes)` is called as data is copied; a reflink reports the
+	whole size at once. Setting `cancel` raises CopyCancelled between
+	blocks; the partial `dst` is removed on any failure. Returns the method
+	used: 'reflink', 'copy_file_range', 'sendfile' or 'copy'.
+	"""
+	st = os.stat(src)
+	# support depends on both ends (reflinks never cross filesystems)
+	dev = (st.st_dev, os.stat(os.path.dirname(os.path.abspath(dst))).st_dev)
+	method = None
+	try:
+		if allow_reflink and st.st_size and not _is_unsupported('reflink', dev):
+			try:
+				cloned = _clone(src, dst)
+			except OSError as e:
+				# anything else (EACCES, ENOSPC, EIO) may be specific to this file; fall back for it only
+				cloned = None
+				if e.errno in _NO_REFLINK:
+					_mark_unsupported('reflink', dev)
+			if cloned:
+				method = 'reflink'
+				if progress:
+					progress(st.st_size)
+			elif cloned is False:
+				_mark_unsupported('reflink', dev)
+		if method is None:
+			with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+				for name in ('copy_file_range', 'sendfile'):
+					if st.st_size and sys.platform != 'win32' and not _is_unsupported(name, dev):
+						if _kernel_copy(name, fsrc, fdst, st.st_size, progress, cancel):
+							method = name
+							break
+						_mark_unsupported(name, dev)
+						fsrc.seek(0)
+						fdst.seek(0)
+						fdst.truncate()
+				if method is None:
+					method = 'copy'
+					while True:
+						if cancel is not None and cancel.is_set():
+							raise CopyCancelled()
+						block = fsrc.read(COPY_BLOCK)
+						if not block:
+							break
+						fdst.write(block)
+						if progress:
+							progress(len(block))
+		shutil.copystat(src, dst)
+	except BaseException:
+		try:
+			os.remove(dst)
+		except OSError:
+			pass
+		raise
+	return method
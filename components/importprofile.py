@@ -0,0 +1,151 @@
+"""Per-module import timing for `launcher.pyw --profile-imports`.
+
+`install()` puts a finder at the front of `sys.meta_path` that wraps each
+module's loader and times its `create_module` (where extension modules
+such as PyQt6.QtCore do their work) and `exec_module`. Nested imports are
+subtracted,
+so every module gets both a self time and a cumulative time, like
+`python -X importtime` but usable from the frozen build too.
+
+`report()` returns (and `write_report()` prints and saves) a table sorted
+by self time, plus the total against `DEFAULT_BUDGET_MS`.
+
+Only meant for diagnosis: while installed, `module.__loader__` is a wrapper
+that forwards everything to the real loader.
+"""
+import sys
+import time
+import threading
+from typing import Optional, List, Tuple
+
+DEFAULT_BUDGET_MS = 800.0
+
+_timings = {}
+_order: List[str] = []
+_local = threading.local()
+_started: Optional[float] = None
+
+
+class _TimedLoader:
+	"""Forward to `loader`, timing create_module and exec_module."""
+
+	def __init__(self, loader, name: str):
+		self._loader = loader
+		self._name = name
+
+	def __getattr__(self, attr):
+		return getattr(self._loader, attr)
+
+	def _timed(self, call, arg):
+		"""Run call(arg), adding its time to this module and to the importing module's nested time."""
+		stack = getattr(_local, 'stack', None)
+		if stack is None:
+			stack = _local.stack = []
+		frame = [0.0]
+		stack.append(frame)
+		started = time.perf_counter()
+		try:
+			return call(arg)
+		finally:
+			total = time.perf_counter() - started
+			stack.pop()
+			if stack:
+				stack[-1][0] += total
+			if self._name not in _timings:
+				_order.append(self._name)
+			self_s, cumulative = _timings.get(self._name, (0.0, 0.0))
+			_timings[self._name] = (self_s + total - frame[0], cumulative + total)
+
+	def create_module(self, spec):
+		create = getattr(self._loader, 'create_module', None)
+		return self._timed(create, spec) if create else None
+
+	def exec_module(self, module):
+		self._timed(self._loader.exec_module, module)
+
+
+class _TimingFinder:
+	"""Meta path finder that defers to the others and wraps the loader they return."""
+
+	@classmethod
+	def find_spec(cls, name, path=None, target=None):
+		for finder in sys.meta_path:
+			if finder is cls:
+				continue
+			find = getattr(finder, 'find_spec', None)
+			if find is None:
+				continue
+			spec = find(name, path, target)
+			if spec is None:
+				continue
+			if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+				spec.loader = _TimedLoader(spec.loader, name)
+			return spec
+		return None
+
+	@classmethod
+	def invalidate_caches(cls):
+		pass
+
+
+def install():
+	"""Start timing imports; modules imported before this call are not counted."""
+	global _started
+	if _TimingFinder not in sys.meta_path:
+		sys.meta_path.insert(0, _TimingFinder)
+		_started = time.perf_counter()
+
+
+def uninstall():
+	try:
+		sys.meta_path.remove(_TimingFinder)
+	except ValueError:
+		pass
+
+
+def is_installed() -> bool:
+	return _TimingFinder in sys.meta_path
+
+
+def timings() -> List[Tuple[str, float, float]]:
+	"""Return (module, self_ms, cumulative_ms) rows, most expensive first."""
+	rows = [(name, s * 1000.0, c * 1000.0) for name, (s, c) in _timings.items()]
+	rows.sort(key=lambda r: r[1], reverse=True)
+	return rows
+
+
+def report(limit: int = 40, budget_ms: float = DEFAULT_BUDGET_MS) -> str:
+	"""Format the `limit` most expensive imports and the overall total."""
+	rows = timings()
+	total = sum(r[1] for r in rows)
+	width = max([len('module')] + [len(r[0]) for r in rows[:limit]])
+	lines = [f"{'module':<{width}}  {'self ms':>9}  {'cumul ms':>9}"]
+	lines.append('-' * len(lines[0]))
+	for name, self_ms, cumulative_ms in rows[:limit]:
+		lines.append(f"{name:<{width}}  {self_ms:9.1f}  {cumulative_ms:9.1f}")
+	if len(rows) > limit:
+		rest = sum(r[1] for r in rows[limit:])
+		lines.append(f"{f'({len(rows) - limit} more)':<{width}}  {rest:9.1f}")
+	lines.append('-' * len(lines[0]))
+	verdict = 'OK' if total <= budget_ms else f'OVER BUDGET by {total - budget_ms:.1f} ms'
+	lines.append(f"{len(rows)} modules, {total:.1f} ms importing (budget {budget_ms:.0f} ms: {verdict})")
+	if _started is not None:
+		lines.append(f"{(time.perf_counter() - _started) * 1000.0:.1f} ms since profiling started")
+	return '\n'.join(lines)
+
+
+def write_report(path: Optional[str] = None, limit: int = 40, budget_ms: float = DEFAULT_BUDGET_MS) -> str:
+	"""Print the report (when there is a console) and save it to `path` if given."""
+	text = report(limit=limit, budget_ms=budget_ms)
+	if sys.stdout is not None:
+		try:
+			print(text, flush=True)
+		except Exception:
+			pass
+	if path:
+		try:
+			with open(path, 'w', encoding='utf-8') as f:
+				f.write(text + '\n')
+		except Exception:
+			pass
+	return text
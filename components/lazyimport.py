@@ -0,0 +1,86 @@
+"""Deferred imports for heavy or optional modules.
+
+`lazy_module('pyqtgraph')` returns a stand-in that imports the real module
+the first time one of its attributes is used, so code can keep writing
+`pg.mkPen(...)` while the import cost moves to the first call site.
+
+- `available(name)` checks whether a module could be imported without
+  importing it (a `find_spec` lookup).
+- `load(proxy_or_name)` imports now and returns the module, or None if the
+  import fails; use it where a missing dependency has a fallback.
+
+Lazy imports are invisible to PyInstaller's analysis, so every module used
+through here must also be listed as a hidden import in `build.py`.
+"""
+import sys
+import importlib
+import importlib.util
+import threading
+from typing import Optional, Union
+from types import ModuleType
+
+_lock = threading.RLock()
+
+
+class LazyModule:
+	"""Placeholder for module `name`; the first attribute access imports it."""
+
+	def __init__(self, name: str):
+		self.__dict__['_name'] = name
+		self.__dict__['_module'] = None
+
+	def _load(self) -> ModuleType:
+		module = self.__dict__['_module']
+		if module is None:
+			with _lock:
+				module = self.__dict__['_module']
+				if module is None:
+					module = importlib.import_module(self.__dict__['_name'])
+					self.__dict__['_module'] = module
+		return module
+
+	@property
+	def is_loaded(self) -> bool:
+		return self.__dict__['_module'] is not None
+
+	def __getattr__(self, attr):
+		return getattr(self._load(), attr)
+
+	def __setattr__(self, attr, value):
+		setattr(self._load(), attr, value)
+
+	def __dir__(self):
+		return dir(self._load())
+
+	def __repr__(self):
+		state = 'loaded' if self.is_loaded else 'not loaded'
+		return f"<lazy module {self.__dict__['_name']!r} ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+	"""Return a LazyModule for `name`, or the module itself if it is already imported."""
+	module = sys.modules.get(name)
+	proxy = LazyModule(name)
+	if module is not None:
+		proxy.__dict__['_module'] = module
+	return proxy
+
+
+def available(name: str) -> bool:
+	"""True if `name` can be found on the import path (it is not imported)."""
+	if name in sys.modules:
+		return sys.modules[name] is not None
+	try:
+		return importlib.util.find_spec(name) is not None
+	except (ImportError, ValueError):
+		return False
+
+
+def load(target: Union[LazyModule, str]) -> Optional[ModuleType]:
+	"""Import `target` now; returns None instead of raising if that fails."""
+	try:
+		if isinstance(target, LazyModule):
+			return target._load()
+		return importlib.import_module(target)
+	except Exception:
+		return None
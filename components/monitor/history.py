@@ -0,0 +1,294 @@
+"""Tiered, persistent metrics history for one server directory.
+
+Samples are rolled up into three tiers, each holding min/avg/max per metric:
+- `1s`: one record per second, last hour
+- `1m`: one record per minute, last two days
+- `1h`: one record per hour, last 90 days
+
+Every tier is an append-only binary file (`<tier>.bin`) of fixed-size
+records plus an in-memory copy in `array` columns. When a file grows past
+twice its retention it is rewritten with only the retained tail, so memory
+and disk stay bounded regardless of uptime.
+
+`query(start, end)` picks the finest tier that still covers `start`; if
+none reaches back that far (the server has not been watched that long), the
+finest tier holding data in the range whose retention spans it, else the
+finest tier holding any data in the range.
+"""
+import os
+import math
+import time
+import json
+import struct
+import hashlib
+import threading
+from array import array
+from typing import Optional, Dict, List, Sequence, Tuple, Any
+from ..appdata import get_app_data_dir
+
+METRICS = ('cpu', 'rss_mb', 'disk_kbs', 'net_recv_kbs', 'net_sent_kbs')
+
+# (name, bucket seconds, records kept)
+TIERS = (
+	('1s', 1, 3600),
+	('1m', 60, 2 * 24 * 60),
+	('1h', 3600, 90 * 24),
+)
+
+FLUSH_SECONDS = 10.0
+
+_RECORD = struct.Struct('<d' + 'fff' * len(METRICS))
+
+
+class _Bucket:
+	"""Running min/sum/max/count per metric for one time bucket."""
+	def __init__(self, start: float):
+		self.start = start
+		self.mins = [math.inf] * len(METRICS)
+		self.maxs = [-math.inf] * len(METRICS)
+		self.sums = [0.0] * len(METRICS)
+		self.counts = [0] * len(METRICS)
+
+	def add(self, lo: Sequence[float], avg: Sequence[float], hi: Sequence[float], weight: int = 1):
+		for i in range(len(METRICS)):
+			if math.isnan(avg[i]):
+				continue
+			self.mins[i] = min(self.mins[i], lo[i])
+			self.maxs[i] = max(self.maxs[i], hi[i])
+			self.sums[i] += avg[i] * weight
+			self.counts[i] += weight
+
+	def record(self) -> Tuple[float, List[float], List[float], List[float], List[int]]:
+		lo, avg, hi = [], [], []
+		for i in range(len(METRICS)):
+			if self.counts[i]:
+				lo.append(self.mins[i])
+				avg.append(self.sums[i] / self.counts[i])
+				hi.append(self.maxs[i])
+			else:
+				lo.append(math.nan)
+				avg.append(math.nan)
+				hi.append(math.nan)
+		return self.start, lo, avg, hi, list(self.counts)
+
+
+class _Tier:
+	"""Columns for one resolution plus its on-disk file."""
+	def __init__(self, name: str, step: int, retention: int, path: str):
+		self.name = name
+		self.step = step
+		self.retention = retention
+		self.path = path
+		self.ts = array('d')
+		self.cols = {(m, k): array('f') for m in METRICS for k in ('min', 'avg', 'max')}
+		self.on_disk = 0
+		self._unflushed = bytearray()
+		self._load()
+
+	def _load(self):
+		try:
+			size = os.path.getsize(self.path)
+		except OSError:
+			return
+		count = size // _RECORD.size
+		keep = min(count, self.retention)
+		try:
+			with open(self.path, 'rb') as f:
+				f.seek((count - keep) * _RECORD.size)
+				data = f.read(keep * _RECORD.size)
+		except Exception:
+			return
+		for off in range(0, len(data) - _RECORD.size + 1, _RECORD.size):
+			self._append_columns(_RECORD.unpack_from(data, off))
+		self.on_disk = count
+		if size % _RECORD.size:
+			self._rewrite()
+
+	def _append_columns(self, values: Sequence[float]):
+		self.ts.append(values[0])
+		for i, m in enumerate(METRICS):
+			self.cols[(m, 'min')].append(values[1 + 3 * i])
+			self.cols[(m, 'avg')].append(values[2 + 3 * i])
+			self.cols[(m, 'max')].append(values[3 + 3 * i])
+
+	def append(self, ts: float, lo: Sequence[float], avg: Sequence[float], hi: Sequence[float]):
+		values = [ts]
+		for i in range(len(METRICS)):
+			values += [lo[i], avg[i], hi[i]]
+		self._append_columns(values)
+		self._unflushed += _RECORD.pack(*values)
+		excess = len(self.ts) - self.retention
+		if excess > self.retention // 4:
+			del self.ts[:excess]
+			for col in self.cols.values():
+				del col[:excess]
+
+	def flush(self):
+		if not self._unflushed:
+			return
+		try:
+			with open(self.path, 'ab') as f:
+				f.write(self._unflushed)
+			self.on_disk += len(self._unflushed) // _RECORD.size
+			self._unflushed = bytearray()
+		except Exception:
+			return
+		if self.on_disk > 2 * self.retention:
+			self._rewrite()
+
+	def _rewrite(self):
+		"""Compact the file down to the retained in-memory records."""
+		start = max(0, len(self.ts) - self.retention)
+		tmp = self.path + '.tmp'
+		try:
+			with open(tmp, 'wb') as f:
+				for idx in range(start, len(self.ts)):
+					values = [self.ts[idx]]
+					for m in METRICS:
+						values += [self.cols[(m, 'min')][idx], self.cols[(m, 'avg')][idx], self.cols[(m, 'max')][idx]]
+					f.write(_RECORD.pack(*values))
+			os.replace(tmp, self.path)
+			self.on_disk = len(self.ts) - start
+		except Exception:
+			try:
+				os.remove(tmp)
+			except Exception:
+				pass
+
+	def oldest(self) -> Optional[float]:
+		return self.ts[0] if self.ts else None
+
+
+class MetricsHistory:
+	"""Persistent min/avg/max history of sampler metrics at 1s / 1m / 1h resolution."""
+
+	def __init__(self, folder: str):
+		self.folder = folder
+		os.makedirs(folder, exist_ok=True)
+		self._lock = threading.Lock()
+		self._tiers = [_Tier(name, step, keep, os.path.join(folder, f'{name}.bin')) for name, step, keep in TIERS]
+		self._buckets: List[Optional[_Bucket]] = [None] * len(self._tiers)
+		self._last_flush = time.monotonic()
+
+	@classmethod
+	def for_directory(cls, server_dir: str) -> 'MetricsHistory':
+		"""Return the history stored in app data for `server_dir`."""
+		norm = os.path.normcase(os.path.abspath(server_dir))
+		key = hashlib.sha1(norm.encode('utf-8')).hexdigest()[:16]
+		folder = get_app_data_dir('metrics', key)
+		try:
+			meta = os.path.join(folder, 'meta.json')
+			if not os.path.exists(meta):
+				with open(meta, 'w', encoding='utf-8') as f:
+					json.dump({'server_directory': norm}, f)
+		except Exception:
+			pass
+		return cls(folder)
+
+	def _feed(self, level: int, ts: float, lo, avg, hi, weight: int = 1):
+		tier = self._tiers[level]
+		start = ts - (ts % tier.step)
+		bucket = self._buckets[level]
+		if bucket is not None and start != bucket.start:
+			self._close_bucket(level)
+			bucket = None
+		if bucket is None:
+			bucket = self._buckets[level] = _Bucket(start)
+		bucket.add(lo, avg, hi, weight)
+
+	def _close_bucket(self, level: int):
+		bucket = self._buckets[level]
+		self._buckets[level] = None
+		if bucket is None:
+			return
+		start, lo, avg, hi, counts = bucket.record()
+		self._tiers[level].append(start, lo, avg, hi)
+		if level + 1 < len(self._tiers):
+			self._feed(level + 1, start, lo, avg, hi, max(counts) or 1)
+
+	def add(self, sample: Dict[str, Any]):
+		"""Record one sampler dict (see `ProcessSampler.sample`)."""
+		vals = []
+		for m in METRICS:
+			v = sample.get(m)
+			vals.append(math.nan if v is None else float(v))
+		ts = float(sample.get('ts') or time.time())
+		with self._lock:
+			self._feed(0, ts, vals, vals, vals)
+			if time.monotonic() - self._last_flush >= FLUSH_SECONDS:
+				self._flush_locked()
+
+	def _flush_locked(self):
+		for tier in self._tiers:
+			tier.flush()
+		self._last_flush = time.monotonic()
+
+	def flush(self):
+		with self._lock:
+			self._flush_locked()
+
+	def close(self):
+		"""Write completed and in-progress buckets to disk."""
+		with self._lock:
+			for level in range(len(self._tiers)):
+				self._close_bucket(level)
+			self._flush_locked()
+
+	def query(self, start: float, end: Optional[float] = None, metric: str = 'cpu', max_points: Optional[int] = None) -> Dict[str, List[float]]:
+		"""Return `{'ts', 'min', 'avg', 'max', 'tier'}` for `metric` between `start` and `end`.
+
+		Uses the finest tier whose retained data reaches back to `start`,
+		else the finest with data in the range (preferring one whose
+		retention spans the range). `max_points` thins the result by merging
+		neighbouring records.
+		"""
+		end = time.time() if end is None else end
+		with self._lock:
+			chosen = None
+			for tier in self._tiers:
+				oldest = tier.oldest()
+				if oldest is not None and oldest <= start + tier.step:
+					chosen = tier
+					break
+			if chosen is None:
+				with_data = [t for t in self._tiers if _bisect(t.ts, start) < _bisect(t.ts, end + 1e-9)]
+				spanning = [t for t in with_data if t.step * t.retention >= end - start]
+				chosen = (spanning or with_data or self._tiers)[0]
+			ts = chosen.ts
+			lo_i, hi_i = _bisect(ts, start), _bisect(ts, end + 1e-9)
+			out = {
+				'tier': chosen.name,
+				'ts': list(ts[lo_i:hi_i]),
+				'min': list(chosen.cols[(metric, 'min')][lo_i:hi_i]),
+				'avg': list(chosen.cols[(metric, 'avg')][lo_i:hi_i]),
+				'max': list(chosen.cols[(metric, 'max')][lo_i:hi_i]),
+			}
+		if max_points and len(out['ts']) > max_points:
+			out = _thin(out, max_points)
+		return out
+
+
+def _bisect(arr: array, value: float) -> int:
+	lo, hi = 0, len(arr)
+	while lo < hi:
+		mid = (lo + hi) // 2
+		if arr[mid] < value:
+			lo = mid + 1
+		else:
+			hi = mid
+	return lo
+
+
+def _thin(series: Dict[str, Any], max_points: int) -> Dict[str, Any]:
+	n = len(series['ts'])
+	group = math.ceil(n / max_points)
+	out = {'tier': series['tier'], 'ts': [], 'min': [], 'avg': [], 'max': []}
+	for i in range(0, n, group):
+		avgs = [v for v in series['avg'][i:i + group] if not math.isnan(v)]
+		mins = [v for v in series['min'][i:i + group] if not math.isnan(v)]
+		maxs = [v for v in series['max'][i:i + group] if not math.isnan(v)]
+		out['ts'].append(series['ts'][i])
+		out['avg'].append(sum(avgs) / len(avgs) if avgs else math.nan)
+		out['min'].append(min(mins) if mins else math.nan)
+		out['max'].append(max(maxs) if maxs else math.nan)
+	return out
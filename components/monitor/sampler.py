@@ -0,0 +1,175 @@
+"""Per-process resource sampling for the Monitoring tab.
+
+`ProcessSampler.sample()` reads psutil counters for the server process and
+its children and returns a compact dict. It keeps the previous I/O counters
+so read/write figures are rates of the server's own disk traffic rather than
+whole-machine totals.
+
+psutil has no portable per-process network counters, so `net_recv_kbs` /
+`net_sent_kbs` remain host-wide and are reported as such.
+
+Every sample records `cost_ms`, the wall time spent collecting it.
+"""
+import os
+import time
+from typing import Optional, Dict, Any
+
+from ..lazyimport import lazy_module, available
+
+psutil = lazy_module('psutil')
+HAS_PSUTIL = available('psutil')
+
+MIN_INTERVAL_MS = 100
+DEFAULT_INTERVAL_MS = 1000
+USS_EVERY_SECONDS = 5.0
+
+
+class ProcessSampler:
+	"""Collect CPU, memory, I/O, thread, handle and child counts for one process tree.
+
+	USS needs a full memory map walk, which is far more expensive than the
+	other counters, so it is refreshed at most every `uss_every` seconds and
+	carried forward in between.
+	"""
+	def __init__(self, pid: Optional[int] = None, uss_every: float = USS_EVERY_SECONDS):
+		self.uss_every = uss_every
+		self._proc = None
+		self._pid = None
+		self._children = {}
+		self._last_io = None
+		self._last_net = None
+		self._last_ts = None
+		self._last_uss = None
+		self._last_uss_ts = 0.0
+		self.set_pid(pid)
+
+	@property
+	def pid(self) -> Optional[int]:
+		return self._pid
+
+	def set_pid(self, pid: Optional[int]):
+		"""Switch to a different process; counters restart from the next sample."""
+		if pid == self._pid:
+			return
+		self._pid = pid
+		self._proc = None
+		self._children = {}
+		self._last_io = None
+		self._last_ts = None
+		self._last_uss = None
+		self._last_uss_ts = 0.0
+		if pid and HAS_PSUTIL:
+			try:
+				self._proc = psutil.Process(pid)
+				self._proc.cpu_percent(interval=None)
+			except Exception:
+				self._proc = None
+
+	def _tree(self):
+		"""Return [proc] + live children, priming cpu_percent for new children."""
+		procs = [self._proc]
+		try:
+			kids = self._proc.children(recursive=True)
+		except Exception:
+			kids = []
+		current = {}
+		for child in kids:
+			known = self._children.get(child.pid)
+			if known is None:
+				try:
+					child.cpu_percent(interval=None)
+				except Exception:
+					continue
+				known = child
+			current[child.pid] = known
+		self._children = current
+		return procs + list(current.values())
+
+	def _host_net(self):
+		try:
+			nio = psutil.net_io_counters()
+			return (nio.bytes_recv, nio.bytes_sent) if nio is not None else None
+		except Exception:
+			return None
+
+	def sample(self) -> Dict[str, Any]:
+		"""Take one sample. Metrics that cannot be read are None."""
+		started = time.perf_counter()
+		now = time.time()
+		out: Dict[str, Any] = {
+			'ts': now, 'pid': self._pid, 'alive': False,
+			'cpu': None, 'rss_mb': None, 'uss_mb': None,
+			'read_kbs': None, 'write_kbs': None, 'disk_kbs': None,
+			'threads': None, 'fds': None, 'children': None,
+			'net_recv_kbs': None, 'net_sent_kbs': None,
+		}
+		if not HAS_PSUTIL:
+			out['cost_ms'] = (time.perf_counter() - started) * 1000.0
+			return out
+
+		dt = (now - self._last_ts) if self._last_ts else None
+
+		net = self._host_net()
+		if net is not None:
+			if self._last_net is not None and dt:
+				out['net_recv_kbs'] = max(0.0, (net[0] - self._last_net[0]) / 1024.0 / dt)
+				out['net_sent_kbs'] = max(0.0, (net[1] - self._last_net[1]) / 1024.0 / dt)
+			self._last_net = net
+
+		proc = self._proc
+		if proc is not None:
+			try:
+				procs = self._tree()
+				cpu = 0.0
+				rss = 0
+				threads = 0
+				fds = 0
+				read_bytes = 0
+				write_bytes = 0
+				have_io = False
+				for p in procs:
+					try:
+						with p.oneshot():
+							cpu += p.cpu_percent(interval=None) or 0.0
+							rss += p.memory_info().rss
+							threads += p.num_threads()
+							try:
+								fds += p.num_handles() if os.name == 'nt' else p.num_fds()
+							except Exception:
+								pass
+							try:
+								io = p.io_counters()
+								read_bytes += io.read_bytes
+								write_bytes += io.write_bytes
+								have_io = True
+							except Exception:
+								pass
+					except Exception:
+						if p is proc:
+							raise
+				out['alive'] = True
+				out['cpu'] = cpu
+				out['rss_mb'] = rss / (1024.0 * 1024.0)
+				out['threads'] = threads
+				out['fds'] = fds
+				out['children'] = len(procs) - 1
+				if have_io:
+					if self._last_io is not None and dt:
+						out['read_kbs'] = max(0.0, (read_bytes - self._last_io[0]) / 1024.0 / dt)
+						out['write_kbs'] = max(0.0, (write_bytes - self._last_io[1]) / 1024.0 / dt)
+						out['disk_kbs'] = out['read_kbs'] + out['write_kbs']
+					self._last_io = (read_bytes, write_bytes)
+
+				if self._last_uss is None or (now - self._last_uss_ts) >= self.uss_every:
+					try:
+						self._last_uss = proc.memory_full_info().uss / (1024.0 * 1024.0)
+					except Exception:
+						self._last_uss = None
+					self._last_uss_ts = now
+				out['uss_mb'] = self._last_uss
+			except Exception:
+				self._proc = None
+
+		self._last_ts = now
+		out['cost_ms'] = (time.perf_counter() - started) * 1000.0
+		return out
@@ -0,0 +1,141 @@
+"""Streaming TPS / MSPT extraction from server console output.
+
+`TickMetricsExtractor.feed(line)` is called once per console line and keeps
+the most recent tick rate and tick time together with when they were seen,
+so the monitor only pays for new lines instead of re-scanning a buffer.
+
+Recognised output:
+- Paper / Purpur / Spigot `/tps`: `TPS from last 1m, 5m, 15m: 20.0, 19.9, 19.9`
+- Paper / Purpur `/mspt`: a `Server tick times ...` header followed by a
+  `avg/min/max, ...` line
+- Vanilla `/tick query` (1.20.3+): `Average time per tick: 3.4ms`
+- Vanilla `/debug stop`: `... ticks (20.00 ticks per second)`
+- Forge / NeoForge `/forge tps`: `Overall: Mean tick time: 1.2 ms. Mean TPS: 20.0`
+- Generic `TPS: 19.8` style lines from plugins
+"""
+import re
+import time
+from typing import Optional, Dict, Any
+
+MAX_TPS = 20.0
+
+_ANSI_RE = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]|§[0-9a-fk-or]', re.IGNORECASE)
+_PAPER_TPS_RE = re.compile(r'TPS from last [^:]*:\s*\*?([0-9]+(?:\.[0-9]+)?)', re.IGNORECASE)
+_MSPT_HEADER_RE = re.compile(r'Server tick times', re.IGNORECASE)
+_MSPT_VALUES_RE = re.compile(r'([0-9]+(?:\.[0-9]+)?)/([0-9]+(?:\.[0-9]+)?)/([0-9]+(?:\.[0-9]+)?)')
+_VANILLA_QUERY_RE = re.compile(r'Average time per tick:\s*([0-9]+(?:\.[0-9]+)?)\s*ms', re.IGNORECASE)
+_VANILLA_DEBUG_RE = re.compile(r'\(([0-9]+(?:\.[0-9]+)?)\s*ticks per second\)', re.IGNORECASE)
+_FORGE_RE = re.compile(r'Mean tick time:\s*([0-9]+(?:\.[0-9]+)?)\s*ms\.?\s*Mean TPS:\s*([0-9]+(?:\.[0-9]+)?)', re.IGNORECASE)
+_MEAN_TICK_RE = re.compile(r'mean\s*tick\s*time[:=\s]*([0-9]+(?:\.[0-9]+)?)\s*ms', re.IGNORECASE)
+_GENERIC_TPS_RE = re.compile(r'\bTPS[:=\s]+([0-9]+(?:\.[0-9]+)?)|([0-9]+(?:\.[0-9]+)?)\s*TPS\b', re.IGNORECASE)
+
+
+class TickMetricsExtractor:
+	"""Keep the latest TPS / MSPT parsed from console lines.
+
+	Timestamps are `time.time()` values so callers can show how old a
+	reading is; `tps()` falls back to 1000 / mspt when only tick time is known
+	or is newer.
+	"""
+	def __init__(self):
+		self.reset()
+
+	def reset(self):
+		self.last_tps: Optional[float] = None
+		self.last_tps_at: Optional[float] = None
+		self.last_mspt: Optional[float] = None
+		self.last_mspt_at: Optional[float] = None
+		self.source: Optional[str] = None
+		self._await_mspt = False
+
+	def _set_tps(self, value: float, source: str, now: float):
+		self.last_tps = min(MAX_TPS, max(0.0, value))
+		self.last_tps_at = now
+		self.source = source
+
+	def _set_mspt(self, value: float, source: str, now: float):
+		self.last_mspt = max(0.0, value)
+		self.last_mspt_at = now
+		self.source = source
+
+	def feed(self, line: str, now: Optional[float] = None) -> bool:
+		"""Parse one console line; returns True when a metric was updated."""
+		if not line:
+			return False
+		low = line.lower()
+		if not self._await_mspt and 'tps' not in low and 'tick' not in low:
+			return False
+		if '\x1b' in line or '§' in line:
+			line = _ANSI_RE.sub('', line)
+		now = time.time() if now is None else now
+
+		if self._await_mspt:
+			self._await_mspt = False
+			m = _MSPT_VALUES_RE.search(line)
+			if m:
+				self._set_mspt(float(m.group(1)), 'mspt', now)
+				return True
+
+		m = _PAPER_TPS_RE.search(line)
+		if m:
+			self._set_tps(float(m.group(1)), 'tps', now)
+			return True
+		if _MSPT_HEADER_RE.search(line):
+			m = _MSPT_VALUES_RE.search(line.split(':', 1)[-1])
+			if m:
+				self._set_mspt(float(m.group(1)), 'mspt', now)
+				return True
+			self._await_mspt = True
+			return False
+		m = _FORGE_RE.search(line)
+		if m:
+			self._set_mspt(float(m.group(1)), 'forge', now)
+			self._set_tps(float(m.group(2)), 'forge', now)
+			return True
+		m = _VANILLA_QUERY_RE.search(line)
+		if m:
+			self._set_mspt(float(m.group(1)), 'tick query', now)
+			return True
+		m = _VANILLA_DEBUG_RE.search(line)
+		if m:
+			self._set_tps(float(m.group(1)), 'debug', now)
+			return True
+		m = _MEAN_TICK_RE.search(line)
+		if m:
+			self._set_mspt(float(m.group(1)), 'tick time', now)
+			return True
+		m = _GENERIC_TPS_RE.search(line)
+		if m:
+			try:
+				self._set_tps(float(m.group(1) or m.group(2)), 'generic', now)
+				return True
+			except ValueError:
+				return False
+		return False
+
+	def feed_text(self, text: str) -> bool:
+		"""Feed a chunk of output line by line; True if any metric changed."""
+		updated = False
+		for line in text.splitlines():
+			updated = self.feed(line) or updated
+		return updated
+
+	def tps(self) -> Optional[float]:
+		"""Most recent tick rate, derived from MSPT when that reading is newer."""
+		if self.last_mspt is not None and (self.last_tps_at is None or (self.last_mspt_at or 0) > self.last_tps_at):
+			if self.last_mspt <= 0:
+				return MAX_TPS
+			return min(MAX_TPS, 1000.0 / self.last_mspt)
+		return self.last_tps
+
+	def snapshot(self) -> Dict[str, Any]:
+		"""Return the latest readings and when they were taken."""
+		times = [t for t in (self.last_tps_at, self.last_mspt_at) if t is not None]
+		return {
+			'tps': self.tps(),
+			'mspt': self.last_mspt,
+			'tps_at': self.last_tps_at,
+			'mspt_at': self.last_mspt_at,
+			'updated_at': max(times) if times else None,
+			'source': self.source,
+		}
@@ -0,0 +1,258 @@
+"""Content-addressed artifact store for YaliLauncher.
+
+Server jars and plugins downloaded by the launcher are kept once per
+machine and materialized into each server directory with a reflink clone
+or plain copy, so stamping out another server with the same software does
+not touch the network. Blobs are never hardlinked to a server's file: an
+in-place write to one server's jar would otherwise change the stored blob
+and every other server's copy with it.
+
+Layout under the store root:
+- `blobs/<sha256[:2]>/<sha256>` holds file contents.
+- `index.json` maps blobs to `{size, last_used, filename}` and source
+  coordinates (e.g. `('paper', '1.21.1', '130', 'server.jar')`) to a blob.
+
+The store is bounded by size (`YALI_ARTIFACT_CACHE_MB`, default 2 GiB);
+least recently used blobs are evicted after each `put`. A limit of 0 turns
+the store off: `put` keeps nothing and drops what is already stored. Run `python -m components.net.artifacts list|prune` to inspect
+or trim it by hand.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Optional, Dict, Any, List, Sequence
+from ..appdata import get_app_data_dir
+from ..fsutil import link_or_copy
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+Coords = Sequence[Any]
+
+
+def coords_key(coords: Coords) -> str:
+	"""Return the index key for a coordinate tuple."""
+	return '/'.join(str(c).strip().replace('/', '_') for c in coords)
+
+
+def _sha256_of_file(path: str, chunk_size: int = 65536) -> str:
+	h = hashlib.sha256()
+	with open(path, 'rb') as f:
+		for chunk in iter(lambda: f.read(chunk_size), b''):
+			h.update(chunk)
+	return h.hexdigest()
+
+
+class ArtifactStore:
+	"""Launcher-wide cache of downloaded files keyed by hash and coordinates."""
+
+	def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+		self.root = root
+		self.max_bytes = max_bytes
+		self._index_path = os.path.join(root, 'index.json')
+		self._lock = threading.RLock()
+		os.makedirs(os.path.join(root, 'blobs'), exist_ok=True)
+		self._index = self._load_index()
+
+	def _load_index(self) -> Dict[str, Dict[str, Any]]:
+		try:
+			with open(self._index_path, 'r', encoding='utf-8') as f:
+				data = json.load(f)
+			return {'blobs': dict(data.get('blobs') or {}), 'coords': dict(data.get('coords') or {})}
+		except Exception:
+			return {'blobs': {}, 'coords': {}}
+
+	def _save_index(self):
+		tmp = self._index_path + '.tmp'
+		try:
+			with open(tmp, 'w', encoding='utf-8') as f:
+				json.dump(self._index, f, indent=1)
+			os.replace(tmp, self._index_path)
+		except Exception:
+			pass
+
+	def blob_path(self, sha256: str) -> str:
+		sha256 = sha256.lower()
+		return os.path.join(self.root, 'blobs', sha256[:2], sha256)
+
+	def has(self, sha256: str) -> bool:
+		with self._lock:
+			meta = self._index['blobs'].get(sha256.lower())
+			if not meta:
+				return False
+			try:
+				return os.path.getsize(self.blob_path(sha256)) == meta.get('size')
+			except OSError:
+				return False
+
+	def lookup(self, coords: Coords) -> Optional[str]:
+		"""Return the sha256 stored for `coords`, or None if it is not cached."""
+		with self._lock:
+			sha = self._index['coords'].get(coords_key(coords))
+			if sha and self.has(sha):
+				return sha
+			return None
+
+	def materialize(self, sha256: str, dest_path: str) -> str:
+		"""Place blob `sha256` at `dest_path`; returns 'reflink' or 'copy'.
+
+		Only the lookup and the LRU touch hold the store lock; the copy runs
+		outside it so other downloads are not queued behind a large jar.
+		"""
+		with self._lock:
+			if not self.has(sha256):
+				raise KeyError(sha256)
+			blob = self.blob_path(sha256)
+			linked = os.stat(blob).st_nlink > 1
+			self._index['blobs'][sha256.lower()]['last_used'] = time.time()
+			self._save_index()
+		# stores written before blobs stopped being hardlinked may share an inode with a server's jar
+		if linked and _sha256_of_file(blob) != sha256.lower():
+			self.remove(sha256)
+			raise KeyError(sha256)
+		os.makedirs(os.path.dirname(dest_path) or '.', exist_ok=True)
+		return link_or_copy(blob, dest_path, allow_hardlink=False)
+
+	def fetch(self, coords: Coords, dest_path: str) -> Optional[str]:
+		"""Materialize the blob for `coords` at `dest_path` if cached.
+
+		Returns the method used, or None on a cache miss.
+		"""
+		sha = self.lookup(coords)
+		if not sha:
+			return None
+		try:
+			return self.materialize(sha, dest_path)
+		except Exception:
+			return None
+
+	def put(self, path: str, coords: Optional[Coords] = None, sha256: Optional[str] = None) -> str:
+		"""Add the file at `path` to the store and return its sha256.
+
+		- `coords` (optional) records where the file came from so later
+		  lookups can skip the network entirely.
+		- `sha256` may be passed when the caller already knows the digest.
+		- With `max_bytes` 0 nothing is stored.
+		"""
+		sha = (sha256 or _sha256_of_file(path)).lower()
+		size = os.path.getsize(path)
+		with self._lock:
+			if self.max_bytes <= 0:
+				self.prune(0)
+				return sha
+			blob = self.blob_path(sha)
+			if not self.has(sha):
+				os.makedirs(os.path.dirname(blob), exist_ok=True)
+				link_or_copy(path, blob, allow_hardlink=False)
+			self._index['blobs'][sha] = {
+				'size': size,
+				'last_used': time.time(),
+				'filename': os.path.basename(path),
+			}
+			if coords:
+				self._index['coords'][coords_key(coords)] = sha
+			self._save_index()
+			self.prune(self.max_bytes)
+		return sha
+
+	def entries(self) -> List[Dict[str, Any]]:
+		"""Return one dict per blob (sha256, size, last_used, filename, coords), newest first."""
+		with self._lock:
+			by_sha: Dict[str, List[str]] = {}
+			for key, sha in self._index['coords'].items():
+				by_sha.setdefault(sha, []).append(key)
+			out = []
+			for sha, meta in self._index['blobs'].items():
+				out.append({
+					'sha256': sha,
+					'size': int(meta.get('size') or 0),
+					'last_used': float(meta.get('last_used') or 0),
+					'filename': meta.get('filename'),
+					'coords': sorted(by_sha.get(sha, [])),
+				})
+			out.sort(key=lambda e: e['last_used'], reverse=True)
+			return out
+
+	def total_size(self) -> int:
+		with self._lock:
+			return sum(int(m.get('size') or 0) for m in self._index['blobs'].values())
+
+	def remove(self, sha256: str):
+		"""Drop a blob and every coordinate pointing at it."""
+		sha256 = sha256.lower()
+		with self._lock:
+			self._index['blobs'].pop(sha256, None)
+			self._index['coords'] = {k: v for k, v in self._index['coords'].items() if v != sha256}
+			try:
+				os.remove(self.blob_path(sha256))
+			except FileNotFoundError:
+				pass
+			except Exception:
+				pass
+			self._save_index()
+
+	def prune(self, max_bytes: Optional[int] = None) -> List[str]:
+		"""Evict least recently used blobs until the store fits in `max_bytes`.
+
+		Passing `0` empties the store. Returns the evicted sha256 values.
+		"""
+		limit = self.max_bytes if max_bytes is None else max_bytes
+		evicted = []
+		with self._lock:
+			for sha in list(self._index['blobs']):
+				if not os.path.exists(self.blob_path(sha)):
+					self.remove(sha)
+			total = self.total_size()
+			for entry in sorted(self.entries(), key=lambda e: e['last_used']):
+				if total <= limit:
+					break
+				self.remove(entry['sha256'])
+				total -= entry['size']
+				evicted.append(entry['sha256'])
+		return evicted
+
+
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> ArtifactStore:
+	"""Return the shared store under the launcher's app data folder.
+
+	`YALI_ARTIFACT_CACHE_MB` sets its size limit; 0 disables caching.
+	"""
+	global _store
+	with _store_lock:
+		if _store is None:
+			max_bytes = DEFAULT_MAX_BYTES
+			try:
+				max_bytes = int(os.environ.get('YALI_ARTIFACT_CACHE_MB', '')) * 1024 * 1024
+			except ValueError:
+				pass
+			_store = ArtifactStore(get_app_data_dir('artifacts'), max_bytes=max_bytes)
+		return _store
+
+
+if __name__ == '__main__':
+	import argparse
+
+	parser = argparse.ArgumentParser(description='Inspect or prune the YaliLauncher artifact store')
+	sub = parser.add_subparsers(dest='cmd', required=True)
+	sub.add_parser('list', help='list cached artifacts')
+	p_prune = sub.add_parser('prune', help='evict least recently used artifacts')
+	p_prune.add_argument('--max-mb', type=int, default=None, help='target size in MiB (0 empties the store)')
+	args = parser.parse_args()
+
+	store = get_store()
+	if args.cmd == 'list':
+		for e in store.entries():
+			used = time.strftime('%Y-%m-%d %H:%M', time.localtime(e['last_used']))
+			print(f"{e['sha256'][:12]}  {e['size'] / (1024 * 1024):8.1f} MB  {used}  {e['filename']}")
+			for key in e['coords']:
+				print(f"{'':14}{key}")
+		print(f"total: {store.total_size() / (1024 * 1024):.1f} MB in {store.root}")
+	elif args.cmd == 'prune':
+		limit = None if args.max_mb is None else args.max_mb * 1024 * 1024
+		evicted = store.prune(limit)
+		print(f"evicted {len(evicted)} artifact(s); {store.total_size() / (1024 * 1024):.1f} MB remain")
@@ -3,60 +3,458 @@
 This module exposes `download_file` which downloads a URL to a path
 and reports progress via an optional callback. It uses `components.net.http`
 for the underlying requests session so retry behaviour is shared.
+
+When the origin advertises `Accept-Ranges: bytes` and a content-length the
+file is split into byte ranges that are fetched on a small worker pool and
+written at their offsets into a preallocated `.part` file.
+
+Range-capable downloads keep a `.part.json` sidecar next to the `.part`
+file recording the URL, the validator (ETag / Last-Modified) and how many
+bytes of each range are on disk. A later call for the same URL resumes
+with `Range` + `If-Range`; if the validator no longer matches the server
+sends the full body and the download restarts from scratch.
+
+Digests are computed while the body is written (`_Hasher`), and the `.part`
+file is only promoted to `dest_path` once every expected hash matches, so a
+corrupt download never appears at its final name.
 """
 import os
+import json
 import hashlib
-from typing import Optional, Callable
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, List, Tuple, Dict, Iterable
 from . import https
 
 ProgressCallback = Optional[Callable[[int, int], None]]
 
+DEFAULT_SEGMENTS = 4
+MIN_SEGMENT_SIZE = 2 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+STATE_SAVE_BYTES = 1024 * 1024
+HASH_ALGORITHMS = ('md5', 'sha1', 'sha256', 'sha512')
 
-def _sha256_of_file(path: str, chunk_size: int = 65536) -> str:
-	h = hashlib.sha256()
-	with open(path, 'rb') as f:
-		for chunk in iter(lambda: f.read(chunk_size), b''):
-			h.update(chunk)
-	return h.hexdigest()
 
+class ChecksumMismatch(ValueError):
+	"""Raised when a downloaded file does not match an expected digest."""
 
-def download_file(url: str, dest_path: str, progress_cb: ProgressCallback = None, expected_sha256: Optional[str] = None, timeout: int = 30) -> str:
-	"""Download `url` to `dest_path`.
 
-	- `progress_cb(downloaded_bytes, total_bytes)` will be called intermittently if provided.
-	- If `expected_sha256` is provided the file will be validated and removed on mismatch.
-	- Returns the final path on success, raises on errors.
+class DownloadCancelled(IOError):
+	"""Raise from a `progress_cb` to abort a download; the `.part` file is kept for resuming."""
+
+
+class _Hasher:
+	"""Incremental digests over a file that may be written out of order.
+
+	Bytes arriving at the current hash offset are hashed straight from
+	memory. Bytes written further ahead (other range segments, or data kept
+	from an interrupted run) are remembered as extents and read back from
+	the `.part` file once the hash offset reaches them, which is usually
+	while the download is still in flight and the data is in the page cache.
 	"""
-	tmp = dest_path + '.part'
-	os.makedirs(os.path.dirname(dest_path) or '.', exist_ok=True)
+	def __init__(self, path: str, algorithms: Iterable[str]):
+		self.path = path
+		self.algorithms = tuple(sorted(set(algorithms)))
+		self._lock = threading.Lock()
+		self.reset()
 
-	resp = https.get(url, stream=True, timeout=timeout)
-	resp.raise_for_status()
+	def reset(self):
+		with self._lock:
+			self._hashes = {a: hashlib.new(a) for a in self.algorithms}
+			self._offset = 0
+			self._extents: List[List[int]] = []
 
-	total = int(resp.headers.get('content-length') or 0)
-	downloaded = 0
+	def _update(self, data):
+		for h in self._hashes.values():
+			h.update(data)
 
-	with open(tmp, 'wb') as fh:
-		for chunk in resp.iter_content(chunk_size=8192):
-			if not chunk:
+	def _add_extent(self, start: int, end: int):
+		ext = self._extents
+		ext.append([start, end])
+		ext.sort()
+		merged = [ext[0]]
+		for s, e in ext[1:]:
+			if s <= merged[-1][1]:
+				merged[-1][1] = max(merged[-1][1], e)
+			else:
+				merged.append([s, e])
+		self._extents = merged
+
+	def _catch_up(self):
+		while self._extents and self._extents[0][0] <= self._offset:
+			start, end = self._extents.pop(0)
+			if end <= self._offset:
 				continue
-			fh.write(chunk)
-			downloaded += len(chunk)
-			if progress_cb:
+			with open(self.path, 'rb') as fh:
+				fh.seek(self._offset)
+				remaining = end - self._offset
+				while remaining > 0:
+					chunk = fh.read(min(CHUNK_SIZE * 4, remaining))
+					if not chunk:
+						raise IOError(f"{self.path} is shorter than the bytes written to it")
+					self._update(chunk)
+					remaining -= len(chunk)
+					self._offset += len(chunk)
+
+	def feed(self, offset: int, data: bytes):
+		"""Account for `data` that has just been written to disk at `offset`."""
+		with self._lock:
+			if offset == self._offset:
+				self._update(data)
+				self._offset += len(data)
+			else:
+				self._add_extent(offset, offset + len(data))
+			self._catch_up()
+
+	def mark(self, start: int, end: int):
+		"""Account for bytes `[start, end)` already on disk (e.g. from an earlier run)."""
+		if end > start:
+			with self._lock:
+				self._add_extent(start, end)
+				self._catch_up()
+
+	def hexdigests(self, size: int) -> Dict[str, str]:
+		"""Return the digests once all `size` bytes have been accounted for."""
+		with self._lock:
+			self._catch_up()
+			if self._offset != size:
+				raise IOError(f"hashed {self._offset} of {size} bytes for {self.path}")
+			return {a: h.hexdigest() for a, h in self._hashes.items()}
+
+
+class _Progress:
+	"""Thread-safe byte counter that forwards to a `progress_cb`.
+
+	Segment workers report from several threads; the callback is invoked
+	under a lock so callers keep seeing a monotonic `downloaded` value.
+	"""
+	def __init__(self, progress_cb: ProgressCallback, total: int, start: int = 0):
+		self._cb = progress_cb
+		self._lock = threading.Lock()
+		self.total = total
+		self.downloaded = start
+
+	def add(self, n: int):
+		with self._lock:
+			self.downloaded += n
+			if self._cb:
 				try:
-					progress_cb(downloaded, total)
+					self._cb(self.downloaded, self.total)
+				except DownloadCancelled:
+					raise
 				except Exception:
 					pass
 
-	os.replace(tmp, dest_path)
 
-	if expected_sha256:
-		actual = _sha256_of_file(dest_path)
-		if actual.lower() != expected_sha256.lower():
+class _PartialState:
+	"""Sidecar describing a resumable `.part` file.
+
+	`ranges` is a list of `[start, end, committed]` entries where `committed`
+	counts bytes from `start` that have been flushed to the `.part` file.
+	"""
+	def __init__(self, path: str, url: str, validator: str, total: int, ranges: List[List[int]]):
+		self.path = path
+		self.url = url
+		self.validator = validator
+		self.total = total
+		self.ranges = ranges
+		self._lock = threading.Lock()
+
+	@classmethod
+	def load(cls, tmp: str, url: str) -> Optional['_PartialState']:
+		path = tmp + '.json'
+		try:
+			if not os.path.exists(tmp):
+				return None
+			with open(path, 'r', encoding='utf-8') as f:
+				data = json.load(f)
+			if data.get('url') != url or not data.get('validator'):
+				return None
+			total = int(data.get('total') or 0)
+			ranges = [[int(s), int(e), int(c)] for s, e, c in data.get('ranges') or []]
+			if total <= 0 or not ranges or os.path.getsize(tmp) != total:
+				return None
+			return cls(path, url, data['validator'], total, ranges)
+		except Exception:
+			return None
+
+	@staticmethod
+	def discard(tmp: str):
+		for p in (tmp, tmp + '.json'):
 			try:
-				os.remove(dest_path)
+				if os.path.exists(p):
+					os.remove(p)
 			except Exception:
 				pass
-			raise ValueError(f"checksum mismatch for {dest_path}: expected {expected_sha256}, got {actual}")
 
+	def committed(self) -> int:
+		with self._lock:
+			return sum(c for _, _, c in self.ranges)
+
+	def pending(self) -> List[List[int]]:
+		with self._lock:
+			return [r for r in self.ranges if r[0] + r[2] <= r[1]]
+
+	def commit(self, rng: List[int], n: int):
+		with self._lock:
+			rng[2] += n
+			self._save_locked()
+
+	def save(self):
+		with self._lock:
+			self._save_locked()
+
+	def _save_locked(self):
+		data = {'url': self.url, 'validator': self.validator, 'total': self.total, 'ranges': self.ranges}
+		tmp = self.path + '.tmp'
+		try:
+			with open(tmp, 'w', encoding='utf-8') as f:
+				json.dump(data, f)
+			os.replace(tmp, self.path)
+		except Exception:
+			pass
+
+
+def partial_bytes(dest_path: str, url: str) -> int:
+	"""Return how many bytes of `url` are already on disk for `dest_path`."""
+	state = _PartialState.load(dest_path + '.part', url)
+	return state.committed() if state else 0
+
+
+def _split_ranges(total: int, segments: int) -> List[Tuple[int, int]]:
+	"""Split `total` bytes into at most `segments` inclusive (start, end) ranges."""
+	count = max(1, min(segments, total // MIN_SEGMENT_SIZE))
+	size = total // count
+	ranges = []
+	start = 0
+	for i in range(count):
+		end = total - 1 if i == count - 1 else start + size - 1
+		ranges.append((start, end))
+		start = end + 1
+	return ranges
+
+
+def _supports_ranges(resp) -> bool:
+	accept = (resp.headers.get('accept-ranges') or '').lower()
+	encoding = (resp.headers.get('content-encoding') or 'identity').lower()
+	return 'bytes' in accept and encoding == 'identity'
+
+
+def _validator(resp) -> Optional[str]:
+	"""Return a strong validator usable in `If-Range`, or None."""
+	etag = resp.headers.get('etag')
+	if etag and not etag.startswith('W/'):
+		return etag
+	return resp.headers.get('last-modified') or None
+
+
+class RangeNotSupported(IOError):
+	"""Raised when a server answers a range request with the full body."""
+
+
+def _write_all(fh, data):
+	view = memoryview(data)
+	while view:
+		n = fh.write(view)
+		view = view[n:]
+
+
+def _write_range(resp, tmp: str, rng: List[int], progress: _Progress, state: Optional[_PartialState], hasher: Optional[_Hasher] = None):
+	"""Copy `resp` into `tmp` at the first uncommitted byte of `rng`.
+
+	The file is opened unbuffered so bytes handed to `hasher` are already
+	visible to its read-back of other segments.
+	"""
+	start, end, committed = rng
+	expected = end - start + 1 - committed
+	written = 0
+	unsaved = 0
+	with open(tmp, 'r+b', buffering=0) as fh:
+		fh.seek(start + committed)
+		try:
+			for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+				if not chunk:
+					continue
+				chunk = chunk[:expected - written]
+				_write_all(fh, chunk)
+				if hasher:
+					hasher.feed(start + committed + written, chunk)
+				written += len(chunk)
+				unsaved += len(chunk)
+				progress.add(len(chunk))
+				if state and unsaved >= STATE_SAVE_BYTES:
+					state.commit(rng, unsaved)
+					unsaved = 0
+				if written >= expected:
+					break
+		finally:
+			if state and unsaved:
+				state.commit(rng, unsaved)
+	if written != expected:
+		raise IOError(f"short read for bytes {start}-{end}: got {written} of {expected}")
+
+
+def _fetch_range(url: str, tmp: str, rng: List[int], progress: _Progress, timeout: int, state: Optional[_PartialState] = None, hasher: Optional[_Hasher] = None):
+	headers = {'Range': f'bytes={rng[0] + rng[2]}-{rng[1]}'}
+	if state:
+		headers['If-Range'] = state.validator
+	resp = https.get(url, stream=True, timeout=timeout, headers=headers)
+	try:
+		resp.raise_for_status()
+		if resp.status_code != 206:
+			raise RangeNotSupported(f"server ignored range request for bytes {rng[0]}-{rng[1]} (HTTP {resp.status_code})")
+		_write_range(resp, tmp, rng, progress, state, hasher)
+	finally:
+		resp.close()
+
+
+def _download_ranges(url: str, tmp: str, ranges: List[List[int]], progress: _Progress, timeout: int, state: Optional[_PartialState] = None, hasher: Optional[_Hasher] = None):
+	"""Fetch each pending range of `url` on a worker pool into `tmp`."""
+	if not ranges:
+		return
+	with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix='yali-dl') as pool:
+		futures = [pool.submit(_fetch_range, url, tmp, rng, progress, timeout, state, hasher) for rng in ranges]
+		for fut in futures:
+			fut.result()
+
+
+def _download_stream(resp, tmp: str, progress: _Progress, hasher: Optional[_Hasher] = None):
+	offset = 0
+	with open(tmp, 'wb') as fh:
+		for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+			if not chunk:
+				continue
+			fh.write(chunk)
+			if hasher:
+				hasher.feed(offset, chunk)
+			offset += len(chunk)
+			progress.add(len(chunk))
+
+
+def _resume(url: str, tmp: str, state: _PartialState, progress_cb: ProgressCallback, timeout: int, hasher: Optional[_Hasher] = None) -> bool:
+	"""Continue an interrupted download described by `state`.
+
+	Returns False when the server no longer serves the same representation,
+	in which case the caller should start over.
+	"""
+	pending = state.pending()
+	progress = _Progress(progress_cb, state.total, state.committed())
+	if not pending:
+		if hasher:
+			hasher.mark(0, state.total)
+		progress.add(0)
+		return True
+	first = pending[0]
+	resp = https.get(url, stream=True, timeout=timeout, headers={
+		'Range': f'bytes={first[0] + first[2]}-{first[1]}',
+		'If-Range': state.validator,
+	})
+	try:
+		resp.raise_for_status()
+		if resp.status_code != 206:
+			return False
+		progress.add(0)
+		if hasher:
+			for start, _, committed in state.ranges:
+				hasher.mark(start, start + committed)
+		final_url = resp.url or url
+		with ThreadPoolExecutor(max_workers=1, thread_name_prefix='yali-dl') as pool:
+			others = pool.submit(_download_ranges, final_url, tmp, pending[1:], progress, timeout, state, hasher)
+			_write_range(resp, tmp, first, progress, state, hasher)
+			others.result()
+	except RangeNotSupported:
+		return False
+	finally:
+		resp.close()
+	return True
+
+
+def _download_fresh(url: str, tmp: str, progress_cb: ProgressCallback, timeout: int, segments: int, hasher: Optional[_Hasher] = None):
+	resp = https.get(url, stream=True, timeout=timeout)
+	resp.raise_for_status()
+
+	total = int(resp.headers.get('content-length') or 0)
+	progress = _Progress(progress_cb, total)
+
+	try:
+		validator = _validator(resp)
+		if total > 0 and _supports_ranges(resp) and validator:
+			final_url = resp.url or url
+			ranges = [[s, e, 0] for s, e in _split_ranges(total, segments if segments > 1 else 1)]
+			with open(tmp, 'wb') as fh:
+				fh.truncate(total)
+			state = _PartialState(tmp + '.json', url, validator, total, ranges)
+			state.save()
+			if len(ranges) == 1:
+				_write_range(resp, tmp, ranges[0], progress, state, hasher)
+				return
+			resp.close()
+			try:
+				_download_ranges(final_url, tmp, ranges, progress, timeout, state, hasher)
+				return
+			except RangeNotSupported:
+				_PartialState.discard(tmp)
+				if hasher:
+					hasher.reset()
+				progress = _Progress(progress_cb, total)
+				resp = https.get(url, stream=True, timeout=timeout)
+				resp.raise_for_status()
+		_download_stream(resp, tmp, progress, hasher)
+	finally:
+		resp.close()
+
+
+def _normalize_hashes(expected_sha256: Optional[str], expected_hashes: Optional[Dict[str, str]]) -> Dict[str, str]:
+	expected = {}
+	for algo, value in (expected_hashes or {}).items():
+		algo = (algo or '').lower().replace('-', '')
+		if algo in HASH_ALGORITHMS and value:
+			expected[algo] = str(value).strip().lower()
+	if expected_sha256:
+		expected['sha256'] = expected_sha256.strip().lower()
+	return expected
+
+
+def download_file(url: str, dest_path: str, progress_cb: ProgressCallback = None, expected_sha256: Optional[str] = None, timeout: int = 30, segments: int = DEFAULT_SEGMENTS, resume: bool = True, expected_hashes: Optional[Dict[str, str]] = None, digests: Optional[Dict[str, str]] = None) -> str:
+	"""Download `url` to `dest_path`.
+
+	- `progress_cb(downloaded_bytes, total_bytes)` will be called intermittently if provided.
+	  When resuming, the first call reports the bytes already on disk.
+	  Raising `DownloadCancelled` from it stops the download and keeps the `.part` file.
+	- `expected_hashes` maps algorithm ('md5', 'sha1', 'sha256', 'sha512') to a hex digest;
+	  `expected_sha256` is shorthand for `{'sha256': ...}`. Digests are computed while
+	  downloading and the file only reaches `dest_path` if they all match; on mismatch
+	  the partial file is removed and `ChecksumMismatch` is raised.
+	- `digests`, if given, is filled with the computed digests (always including sha256).
+	- `segments` caps the number of parallel range requests; `1` forces a single stream.
+	  Servers without byte-range support always use a single stream.
+	- `resume=False` discards any interrupted `.part` file instead of continuing it.
+	- Returns the final path on success, raises on errors.
+	"""
+	tmp = dest_path + '.part'
+	os.makedirs(os.path.dirname(dest_path) or '.', exist_ok=True)
+
+	expected = _normalize_hashes(expected_sha256, expected_hashes)
+	hasher = _Hasher(tmp, set(expected) | {'sha256'})
+
+	state = _PartialState.load(tmp, url) if resume else None
+	if state is None or not _resume(url, tmp, state, progress_cb, timeout, hasher):
+		_PartialState.discard(tmp)
+		hasher.reset()
+		_download_fresh(url, tmp, progress_cb, timeout, segments, hasher)
+
+	actual = hasher.hexdigests(os.path.getsize(tmp))
+	for algo, value in expected.items():
+		if actual[algo] != value:
+			_PartialState.discard(tmp)
+			raise ChecksumMismatch(f"{algo} mismatch for {os.path.basename(dest_path)}: expected {value}, got {actual[algo]}")
+
+	os.replace(tmp, dest_path)
+	try:
+		os.remove(tmp + '.json')
+	except FileNotFoundError:
+		pass
+
+	if digests is not None:
+		digests.update(actual)
 	return dest_path
@@ -2,14 +2,64 @@
 
 Move all network request logic into this module so the UI code
 doesn't directly call requests. Provides a session with retries
-and convenience helpers like `get_json` and `get`.
+and convenience helpers like `get_json`, `get` and `post_json`.
+
+`get_json` keeps an on-disk response cache:
+- Responses are fresh for a per-endpoint TTL (`CACHE_RULES`) and served
+  without touching the network.
+- Stale entries are revalidated with `If-None-Match` / `If-Modified-Since`;
+  a 304 just refreshes the entry.
+- With `stale_ok=True` a stale entry is returned immediately and refreshed
+  on a background thread (stale-while-revalidate), for UI paths.
+- The cache is bounded: at most `MEMORY_ENTRIES` responses stay in memory
+  (least recently used go first), and files on disk older than
+  `MAX_CACHE_AGE` or beyond `MAX_CACHE_BYTES` (oldest first) are removed.
+  URLs matching `MEMORY_ONLY` (search results) are never written to disk.
+- Every call returns its own copy of the body, so callers may modify it
+  without changing what later calls get.
+- `cache_stats()` reports hit/miss counters.
 """
-from typing import Optional, Dict, Any
+import os
+import re
+import copy
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 import requests
 from requests.adapters import HTTPAdapter, Retry
+from ..appdata import get_app_data_dir
 
 DEFAULT_TIMEOUT = 10
 
+# (url pattern, ttl seconds). First match wins; unmatched URLs fall back to
+# the server's `Cache-Control: max-age` or are always revalidated.
+CACHE_RULES: List[Tuple[re.Pattern, int]] = [
+	(re.compile(r'^https://piston-meta\.mojang\.com/v1/packages/'), 7 * 24 * 3600),
+	(re.compile(r'^https://launchermeta\.mojang\.com/v1/packages/'), 7 * 24 * 3600),
+	(re.compile(r'^https://(launchermeta|piston-meta)\.mojang\.com/mc/game/version_manifest'), 10 * 60),
+	(re.compile(r'^https://api\.papermc\.io/v2/projects/[^/]+/versions/[^/]+/builds/\d+'), 7 * 24 * 3600),
+	(re.compile(r'^https://api\.papermc\.io/'), 5 * 60),
+	(re.compile(r'^https://api\.purpurmc\.org/'), 5 * 60),
+	(re.compile(r'^https://meta\.fabricmc\.net/'), 10 * 60),
+	(re.compile(r'^https://maven\.neoforged\.net/'), 30 * 60),
+	(re.compile(r'^https://api\.modrinth\.com/v2/search'), 2 * 60),
+	(re.compile(r'^https://api\.modrinth\.com/'), 5 * 60),
+	(re.compile(r'^https://api\.adoptium\.net/'), 30 * 60),
+]
+
+# one file per query would pile up while the user types
+MEMORY_ONLY: List[re.Pattern] = [
+	re.compile(r'^https://api\.modrinth\.com/v2/search'),
+]
+
+MEMORY_ENTRIES = 256
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+MAX_CACHE_AGE = 14 * 24 * 3600
+PRUNE_EVERY = 50
+
 _session: Optional[requests.Session] = None
 
 
@@ -37,13 +87,266 @@ def get(url: str, *, stream: bool = False, timeout: int = DEFAULT_TIMEOUT, param
 	return resp
 
 
-def get_json(url: str, *, timeout: int = DEFAULT_TIMEOUT, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Any:
-	"""GET a URL and parse JSON. Raises on HTTP or JSON errors."""
-	resp = get(url, stream=False, timeout=timeout, params=params, headers=headers)
+_stats = {'hits': 0, 'stale': 0, 'revalidated': 0, 'misses': 0, 'errors': 0}
+_memory: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+_cache_lock = threading.Lock()
+_refreshing = set()
+_cache_dir: Optional[str] = None
+_stores_since_prune = PRUNE_EVERY
+
+
+def _count(name: str):
+	with _cache_lock:
+		_stats[name] += 1
+
+
+def cache_stats() -> Dict[str, int]:
+	"""Return a copy of the `get_json` cache counters."""
+	with _cache_lock:
+		return dict(_stats)
+
+
+def _get_cache_dir() -> Optional[str]:
+	global _cache_dir
+	if _cache_dir is None:
+		try:
+			_cache_dir = get_app_data_dir('http-cache')
+		except Exception:
+			_cache_dir = ''
+	return _cache_dir or None
+
+
+def _cache_key(url: str, params: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]]) -> str:
+	parts = [url]
+	parts += [f"{k}={params[k]}" for k in sorted(params or {})]
+	parts += [f"{k.lower()}:{headers[k]}" for k in sorted(headers or {})]
+	return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _rule_ttl(url: str) -> Optional[int]:
+	for pattern, ttl in CACHE_RULES:
+		if pattern.match(url):
+			return ttl
+	return None
+
+
+def _remember(key: str, entry: Dict[str, Any]):
+	"""Put `entry` in the in-memory LRU (caller holds the lock)."""
+	_memory[key] = entry
+	_memory.move_to_end(key)
+	while len(_memory) > MEMORY_ENTRIES:
+		_memory.popitem(last=False)
+
+
+def _load_entry(key: str) -> Optional[Dict[str, Any]]:
+	with _cache_lock:
+		entry = _memory.get(key)
+		if entry is not None:
+			_memory.move_to_end(key)
+			return entry
+	folder = _get_cache_dir()
+	if not folder:
+		return None
+	try:
+		with open(os.path.join(folder, key + '.json'), 'r', encoding='utf-8') as f:
+			entry = json.load(f)
+	except Exception:
+		return None
+	with _cache_lock:
+		_remember(key, entry)
+	return entry
+
+
+def prune_cache(max_bytes: int = MAX_CACHE_BYTES, max_age: float = MAX_CACHE_AGE) -> int:
+	"""Remove cache files older than `max_age`, then the oldest until the rest fit in `max_bytes`.
+
+	Returns the number of files removed.
+	"""
+	folder = _get_cache_dir()
+	if not folder:
+		return 0
+	files = []
+	try:
+		with os.scandir(folder) as it:
+			for e in it:
+				if e.name.endswith(('.json', '.tmp')) and e.is_file():
+					st = e.stat()
+					files.append((st.st_mtime, st.st_size, e.path))
+	except OSError:
+		return 0
+	files.sort()
+	now = time.time()
+	total = sum(size for _, size, _ in files)
+	removed = 0
+	for mtime, size, path in files:
+		if now - mtime <= max_age and total <= max_bytes:
+			break
+		try:
+			os.remove(path)
+			removed += 1
+		except OSError:
+			pass
+		total -= size
+	return removed
+
+
+def _store_entry(key: str, entry: Dict[str, Any]):
+	global _stores_since_prune
+	with _cache_lock:
+		_remember(key, entry)
+	url = entry.get('url') or ''
+	if any(pattern.match(url) for pattern in MEMORY_ONLY):
+		return
+	folder = _get_cache_dir()
+	if not folder:
+		return
+	with _cache_lock:
+		_stores_since_prune += 1
+		prune = _stores_since_prune >= PRUNE_EVERY
+		if prune:
+			_stores_since_prune = 0
+	if prune:
+		prune_cache()
+	path = os.path.join(folder, key + '.json')
+	tmp = f"{path}.{threading.get_ident()}.tmp"
+	try:
+		with open(tmp, 'w', encoding='utf-8') as f:
+			json.dump(entry, f)
+		os.replace(tmp, path)
+	except Exception:
+		try:
+			os.remove(tmp)
+		except Exception:
+			pass
+
+
+def clear_cache():
+	"""Drop every cached `get_json` response."""
+	with _cache_lock:
+		_memory.clear()
+	folder = _get_cache_dir()
+	if not folder:
+		return
+	for name in os.listdir(folder):
+		if name.endswith('.json'):
+			try:
+				os.remove(os.path.join(folder, name))
+			except Exception:
+				pass
+
+
+def _response_ttl(url: str, resp: requests.Response, ttl: Optional[int]) -> Optional[int]:
+	"""Return how long `resp` may be served without revalidating, or None to skip caching."""
+	cc = (resp.headers.get('cache-control') or '').lower()
+	if 'no-store' in cc:
+		return None
+	if ttl is not None:
+		return ttl
+	rule = _rule_ttl(url)
+	if rule is not None:
+		return rule
+	m = re.search(r'max-age=(\d+)', cc)
+	if m and 'no-cache' not in cc:
+		return int(m.group(1))
+	return 0
+
+
+def _fetch_json(url: str, key: str, entry: Optional[Dict[str, Any]], timeout: int, params, headers, ttl: Optional[int]) -> Any:
+	"""Fetch `url`, revalidating `entry` when it has validators."""
+	req_headers = dict(headers or {})
+	if entry:
+		if entry.get('etag'):
+			req_headers['If-None-Match'] = entry['etag']
+		if entry.get('last_modified'):
+			req_headers['If-Modified-Since'] = entry['last_modified']
+	resp = get(url, stream=False, timeout=timeout, params=params, headers=req_headers)
+	if resp.status_code == 304 and entry:
+		entry = dict(entry)
+		entry['stored_at'] = time.time()
+		new_ttl = _response_ttl(url, resp, ttl)
+		if new_ttl is not None:
+			entry['ttl'] = new_ttl
+		_store_entry(key, entry)
+		_count('revalidated')
+		return copy.deepcopy(entry['body'])
 	resp.raise_for_status()
-	return resp.json()
+	body = resp.json()
+	entry_ttl = _response_ttl(url, resp, ttl)
+	if entry_ttl is not None:
+		_store_entry(key, {
+			'url': url,
+			'stored_at': time.time(),
+			'ttl': entry_ttl,
+			'etag': resp.headers.get('etag'),
+			'last_modified': resp.headers.get('last-modified'),
+			'body': body,
+		})
+	_count('misses')
+	return copy.deepcopy(body) if entry_ttl is not None else body
+
+
+def _refresh_in_background(url: str, key: str, entry: Dict[str, Any], timeout: int, params, headers, ttl: Optional[int]):
+	with _cache_lock:
+		if key in _refreshing:
+			return
+		_refreshing.add(key)
+
+	def _run():
+		try:
+			_fetch_json(url, key, entry, timeout, params, headers, ttl)
+		except Exception:
+			_count('errors')
+		finally:
+			with _cache_lock:
+				_refreshing.discard(key)
+
+	threading.Thread(target=_run, name='yali-http-revalidate', daemon=True).start()
+
+
+def get_json(url: str, *, timeout: int = DEFAULT_TIMEOUT, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, ttl: Optional[int] = None, stale_ok: bool = False, cache: bool = True) -> Any:
+	"""GET a URL and parse JSON. Raises on HTTP or JSON errors.
+
+	- `ttl` overrides the per-endpoint freshness from `CACHE_RULES`.
+	- `stale_ok=True` returns an expired entry at once and revalidates it in
+	  the background; also used as a fallback when the network fails.
+	- `cache=False` bypasses the cache entirely.
+	"""
+	if not cache:
+		resp = get(url, stream=False, timeout=timeout, params=params, headers=headers)
+		resp.raise_for_status()
+		return resp.json()
+
+	key = _cache_key(url, params, headers)
+	entry = _load_entry(key)
+	if entry is not None:
+		age = time.time() - float(entry.get('stored_at') or 0)
+		fresh_for = ttl if ttl is not None else entry.get('ttl') or 0
+		if age < fresh_for:
+			_count('hits')
+			return copy.deepcopy(entry['body'])
+		if stale_ok:
+			_count('stale')
+			_refresh_in_background(url, key, entry, timeout, params, headers, ttl)
+			return copy.deepcopy(entry['body'])
+	try:
+		return _fetch_json(url, key, entry, timeout, params, headers, ttl)
+	except Exception:
+		_count('errors')
+		if stale_ok and entry is not None:
+			return copy.deepcopy(entry['body'])
+		raise
 
 
 def head(url: str, *, timeout: int = DEFAULT_TIMEOUT, headers: Optional[Dict[str, str]] = None) -> requests.Response:
 	sess = _get_session()
 	return sess.head(url, timeout=timeout, headers=headers)
+
+
+def post_json(url: str, payload: Any, *, timeout: int = DEFAULT_TIMEOUT, headers: Optional[Dict[str, str]] = None) -> Any:
+	"""POST `payload` as JSON and return the decoded response; never cached.
+
+	Raises `requests.HTTPError` for error statuses.
+	"""
+	resp = _get_session().post(url, json=payload, timeout=timeout, headers=headers)
+	resp.raise_for_status()
+	return resp.json()
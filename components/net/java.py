@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import os
+import hashlib
 import sys
 import time
 from typing import Callable, Dict, Optional, Tuple
@@ -89,8 +90,11 @@ def _http_get_json(url: str, params: Optional[Dict] = None, timeout: int = 30) -
 		raise TemurinError(f"URL error: {e.reason}")
 
 
-def _select_asset_for_major(major: int, os_name: str = "windows", arch: str = "x64") -> Tuple[str, str]:
-	"""Query the Adoptium assets API and return (download_url, filename).
+def _select_asset_for_major(major: int, os_name: str = "windows", arch: str = "x64") -> Tuple[str, str, Optional[str]]:
+	"""Query the Adoptium assets API and return (download_url, filename, sha256).
+
+	The sha256 comes from the package's published `checksum` and is None
+	when the asset was found through the binary redirect fallback.
 
 	Raises TemurinError on failure.
 	"""
@@ -145,8 +149,8 @@ def _select_asset_for_major(major: int, os_name: str = "windows", arch: str = "x
 					loc = headers.get('Location') or headers.get('location')
 					if loc:
 						filename = os.path.basename(loc.split('?')[0])
-						return loc, filename
-					return cand_url, os.path.basename(cand_url)
+						return loc, filename, None
+					return cand_url, os.path.basename(cand_url), None
 			except Exception:
 				continue
 
@@ -176,7 +180,7 @@ def _select_asset_for_major(major: int, os_name: str = "windows", arch: str = "x
 	if not binaries:
 		pkg = best.get("package")
 		if pkg and isinstance(pkg, dict) and pkg.get("link"):
-			return pkg.get("link"), pkg.get("name") or os.path.basename(pkg.get("link"))
+			return pkg.get("link"), pkg.get("name") or os.path.basename(pkg.get("link")), pkg.get("checksum") or None
 		raise TemurinError(f"No binary packages available for Java {major}")
 
 	for b in binaries:
@@ -186,39 +190,74 @@ def _select_asset_for_major(major: int, os_name: str = "windows", arch: str = "x
 			if isinstance(b, dict):
 				pkg = b.get("binary", {}).get("package") or b.get("package")
 		if pkg and isinstance(pkg, dict) and pkg.get("link"):
-			return pkg.get("link"), pkg.get("name") or os.path.basename(pkg.get("link"))
+			return pkg.get("link"), pkg.get("name") or os.path.basename(pkg.get("link")), pkg.get("checksum") or None
 
 	raise TemurinError(f"Unable to select a binary package for Java {major}")
 
 
-def _stream_download(url: str, dest_path: str, progress_cb: Optional[Callable[[int, Optional[int]], None]] = None, chunk_size: int = 64 * 1024):
+def _finish_download(part_path: str, dest_path: str, hasher=None, expected_sha256: Optional[str] = None):
+	"""Move a completed `.part` file into place, verifying `expected_sha256` first."""
+	if expected_sha256 and hasher is not None:
+		actual = hasher.hexdigest()
+		if actual.lower() != expected_sha256.lower():
+			try:
+				os.remove(part_path)
+			except Exception:
+				pass
+			raise TemurinError(f"checksum mismatch for {os.path.basename(dest_path)}: expected {expected_sha256}, got {actual}")
+	os.replace(part_path, dest_path)
+
+
+def _copy_stream(fh, part_path: str, total: Optional[int], progress_cb, chunk_size: int, hasher=None):
+	"""Write a response body to `part_path`, feeding `hasher` (a hashlib object) if given."""
+	read = 0
+	with open(part_path, 'wb') as out:
+		while True:
+			chunk = fh.read(chunk_size)
+			if not chunk:
+				break
+			out.write(chunk)
+			if hasher is not None:
+				hasher.update(chunk)
+			read += len(chunk)
+			if progress_cb:
+				try:
+					progress_cb(read, total)
+				except Exception:
+					pass
+
+
+def _stream_download(url: str, dest_path: str, progress_cb: Optional[Callable[[int, Optional[int]], None]] = None, chunk_size: int = 64 * 1024, expected_sha256: Optional[str] = None, timeout: int = 60):
 	"""Stream-download URL to dest_path. progress_cb(bytes_read, total_bytes).
 
-	Uses requests when available; otherwise urllib streaming.
+	With requests installed this goes through `components.net.downloader` on
+	the launcher's download queue, which resumes interrupted downloads and
+	only moves the file into place once `expected_sha256` matches. Without
+	requests it falls back to urllib (or http.client) streaming into
+	`dest_path + '.part'`, checked the same way but not resumable.
 	"""
 	try:
-		import requests as _requests
+		from . import downloader as _downloader
+		from . import queue as _queue
 	except Exception:
-		_requests = None
+		_downloader = None
 
-	if _requests:
-		with _requests.get(url, stream=True) as r:
-			r.raise_for_status()
-			total = int(r.headers.get("Content-Length") or 0) or None
-			read = 0
-			with open(dest_path, "wb") as fh:
-				for chunk in r.iter_content(chunk_size=chunk_size):
-					if not chunk:
-						continue
-					fh.write(chunk)
-					read += len(chunk)
-					if progress_cb:
-						try:
-							progress_cb(read, total)
-						except Exception:
-							pass
+	if _downloader is not None:
+		def _cb(read, total):
+			if progress_cb:
+				progress_cb(read, total or None)
+		try:
+			hashes = {'sha256': expected_sha256} if expected_sha256 else None
+			item = _queue.get_queue().submit(url, dest_path, priority=_queue.PRIORITY_RUNTIME,
+											 expected_hashes=hashes, progress_cb=_cb)
+			item.result()
+		except _downloader.ChecksumMismatch as e:
+			raise TemurinError(str(e))
 		return
 
+	part_path = dest_path + '.part'
+	hasher = hashlib.sha256() if expected_sha256 else None
+
 	try:
 		from urllib.request import urlopen as _urlopen, Request as _Request
 		from urllib.error import URLError as _URLError, HTTPError as _HTTPError
@@ -231,7 +270,7 @@ def _stream_download(url: str, dest_path: str, progress_cb: Optional[Callable[[i
 
 		parsed = _urlparse(url)
 		conn_cls = _httpclient.HTTPSConnection if parsed.scheme == 'https' else _httpclient.HTTPConnection
-		conn = conn_cls(parsed.netloc, timeout=30)
+		conn = conn_cls(parsed.netloc, timeout=timeout)
 		path = parsed.path or '/'
 		if parsed.query:
 			path += '?' + parsed.query
@@ -245,45 +284,25 @@ def _stream_download(url: str, dest_path: str, progress_cb: Optional[Callable[[i
 				total = int(resp.getheader('Content-Length'))
 			except Exception:
 				total = None
-			read = 0
-			with open(dest_path, 'wb') as out:
-				while True:
-					chunk = resp.read(chunk_size)
-					if not chunk:
-						break
-					out.write(chunk)
-					read += len(chunk)
-					if progress_cb:
-						try:
-							progress_cb(read, total)
-						except Exception:
-							pass
+			_copy_stream(resp, part_path, total, progress_cb, chunk_size, hasher)
+			_finish_download(part_path, dest_path, hasher, expected_sha256)
 			return
+		except TemurinError:
+			raise
 		except Exception as e:
 			raise TemurinError(f"http.client download failed: {e}")
 
 	req = _Request(url)
 	try:
-		with _urlopen(req) as fh:
+		with _urlopen(req, timeout=timeout) as fh:
 			meta = fh.info()
 			total = None
 			try:
 				total = int(meta.get("Content-Length"))
 			except Exception:
 				total = None
-			read = 0
-			with open(dest_path, "wb") as out:
-				while True:
-					chunk = fh.read(chunk_size)
-					if not chunk:
-						break
-					out.write(chunk)
-					read += len(chunk)
-					if progress_cb:
-						try:
-							progress_cb(read, total)
-						except Exception:
-							pass
+			_copy_stream(fh, part_path, total, progress_cb, chunk_size, hasher)
+		_finish_download(part_path, dest_path, hasher, expected_sha256)
 	except _HTTPError as e:
 		raise TemurinError(f"HTTP error while downloading: {e.code} {e.reason}")
 	except _URLError as e:
@@ -344,7 +363,7 @@ def download_temurin(major: int, dest_dir: str, os_name: Optional[str] = None, a
 	os_name = os_name or ("windows" if sys.platform.startswith("win") else "linux" if sys.platform.startswith("linux") else "mac")
 	os_name = "mac" if os_name == "darwin" else os_name
 
-	download_url, filename = _select_asset_for_major(major, os_name=os_name, arch=arch)
+	download_url, filename, checksum = _select_asset_for_major(major, os_name=os_name, arch=arch)
 
 	os.makedirs(dest_dir, exist_ok=True)
 	dest_path = os.path.join(dest_dir, filename)
@@ -352,7 +371,7 @@ def download_temurin(major: int, dest_dir: str, os_name: Optional[str] = None, a
 	if os.path.exists(dest_path):
 		return dest_path
 
-	_stream_download(download_url, dest_path, progress_cb=progress_cb)
+	_stream_download(download_url, dest_path, progress_cb=progress_cb, expected_sha256=checksum)
 
 	if install:
 		installed = install_temurin(major, dest_path, install_dir=install_dir, set_java_home=set_java_home)
@@ -0,0 +1,383 @@
+"""Modrinth API helpers: bulk update check by file hash, and paged search.
+
+`check_updates(folder, loaders, game_versions)` works from file hashes, so
+it needs three requests however many jars there are:
+- every jar is hashed (sha1 + sha512) on a thread pool; digests are cached
+  in `addon_hashes.json` in app data per path, size and mtime;
+- `POST /version_files` identifies the installed version of each jar;
+- `POST /version_files/update` returns the newest version of the same
+  project for the given loaders and game versions;
+- `GET /projects?ids=[...]` adds project titles.
+
+The result lists updates (old file, new file, URL, hashes), jars that are
+up to date and jars Modrinth does not know. `apply_updates(updates)`
+downloads the new files through the shared download queue (hash-checked
+by the downloader) and removes each replaced jar only after its
+replacement is in place. `latest_version(project_id, ...)` picks the file
+to install for a search result.
+
+`search(query, facets, offset)` wraps `/search` with encoded parameters
+and keeps the last `SEARCH_CACHE_SIZE` pages in memory, keyed by (query,
+facets, offset, limit), so paging back and forth or retyping a query is
+served without a request; `cached_search` only looks at that cache.
+
+The API base defaults to https://api.modrinth.com/v2 and can be pointed
+elsewhere with `YALI_MODRINTH_API` (e.g. a local test server).
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Callable, Dict, Any, List, Sequence, Tuple
+from . import https, downloader
+from . import queue as download_queue
+from ..appdata import get_app_data_dir
+
+API_BASE = os.environ.get('YALI_MODRINTH_API', 'https://api.modrinth.com/v2').rstrip('/')
+
+DEFAULT_WORKERS = 4
+HASH_CHUNK = 1024 * 1024
+SEARCH_PAGE_SIZE = 20
+SEARCH_CACHE_SIZE = 64
+
+# detect_server_info() software type -> Modrinth loaders
+LOADERS = {
+	'fabric': ['fabric'],
+	'forge': ['forge', 'neoforge'],
+	'bukkit': ['bukkit', 'spigot', 'paper', 'purpur', 'folia'],
+}
+
+ProgressCallback = Optional[Callable[[int, int, str], None]]
+
+
+class ModrinthError(Exception):
+	pass
+
+
+# --- search -------------------------------------------------------------------
+
+_search_cache: 'OrderedDict[Tuple, Dict[str, Any]]' = OrderedDict()
+_search_lock = threading.Lock()
+
+
+def search_facets(addon_type: Optional[str], software_type: Optional[str], mc_version: Optional[str]) -> List[List[str]]:
+	"""Facets (AND of ORs) restricting a search to what the current server can load."""
+	facets = []
+	if addon_type == 'plugins':
+		facets.append(['project_type:plugin'])
+	elif addon_type == 'mods':
+		facets.append(['project_type:mod'])
+	if mc_version:
+		facets.append([f'versions:{mc_version}'])
+	if software_type in LOADERS:
+		facets.append([f'categories:{loader}' for loader in LOADERS[software_type]])
+	return facets
+
+
+def _search_key(query: str, facets: Sequence[Sequence[str]], offset: int, limit: int) -> Tuple:
+	return (query.strip().lower(), tuple(tuple(group) for group in facets or ()), int(offset), int(limit))
+
+
+def cached_search(query: str, facets: Sequence[Sequence[str]] = (), offset: int = 0,
+				  limit: int = SEARCH_PAGE_SIZE) -> Optional[Dict[str, Any]]:
+	"""The cached `search` result for these arguments, or None without a request."""
+	key = _search_key(query, facets, offset, limit)
+	with _search_lock:
+		result = _search_cache.get(key)
+		if result is not None:
+			_search_cache.move_to_end(key)
+		return result
+
+
+def search(query: str, facets: Sequence[Sequence[str]] = (), offset: int = 0, limit: int = SEARCH_PAGE_SIZE,
+		   api_base: Optional[str] = None) -> Dict[str, Any]:
+	"""One page of /search: {'hits': [...], 'offset': int, 'total_hits': int}."""
+	result = cached_search(query, facets, offset, limit)
+	if result is not None:
+		return result
+	params = {'query': query.strip(), 'offset': int(offset), 'limit': int(limit)}
+	if facets:
+		params['facets'] = json.dumps([list(group) for group in facets])
+	data = https.get_json(f"{(api_base or API_BASE).rstrip('/')}/search", params=params, timeout=10, stale_ok=True) or {}
+	result = {'hits': list(data.get('hits') or []), 'offset': int(data.get('offset', offset) or 0),
+			  'total_hits': int(data.get('total_hits', 0) or 0)}
+	key = _search_key(query, facets, offset, limit)
+	with _search_lock:
+		_search_cache[key] = result
+		_search_cache.move_to_end(key)
+		while len(_search_cache) > SEARCH_CACHE_SIZE:
+			_search_cache.popitem(last=False)
+	return result
+
+
+# --- hashing ------------------------------------------------------------------
+
+_hash_cache: Optional[Dict[str, Any]] = None
+_hash_lock = threading.Lock()
+_hash_dirty = False
+
+
+def _hash_cache_path() -> str:
+	return os.path.join(get_app_data_dir(), 'addon_hashes.json')
+
+
+def _hash_file(path: str) -> Dict[str, str]:
+	sha1 = hashlib.sha1()
+	sha512 = hashlib.sha512()
+	with open(path, 'rb') as f:
+		for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+			sha1.update(chunk)
+			sha512.update(chunk)
+	return {'sha1': sha1.hexdigest(), 'sha512': sha512.hexdigest()}
+
+
+def file_hashes(path: str) -> Dict[str, str]:
+	"""{'sha1': ..., 'sha512': ...} of a file, from the cache when size and mtime match."""
+	global _hash_cache, _hash_dirty
+	st = os.stat(path)
+	key = os.path.normcase(os.path.abspath(path))
+	stamp = [st.st_size, st.st_mtime_ns]
+	with _hash_lock:
+		if _hash_cache is None:
+			try:
+				with open(_hash_cache_path(), 'r', encoding='utf-8') as f:
+					_hash_cache = dict(json.load(f))
+			except Exception:
+				_hash_cache = {}
+		cached = _hash_cache.get(key)
+	if cached and cached.get('stamp') == stamp:
+		return dict(cached['hashes'])
+	hashes = _hash_file(path)
+	with _hash_lock:
+		_hash_cache[key] = {'stamp': stamp, 'hashes': hashes}
+		_hash_dirty = True
+	return hashes
+
+
+def _save_hash_cache():
+	global _hash_dirty
+	with _hash_lock:
+		if not _hash_dirty or _hash_cache is None:
+			return
+		# drop entries for files that are gone
+		for key in [k for k in _hash_cache if not os.path.exists(k)]:
+			del _hash_cache[key]
+		payload = dict(_hash_cache)
+		_hash_dirty = False
+	tmp = _hash_cache_path() + '.tmp'
+	try:
+		with open(tmp, 'w', encoding='utf-8') as f:
+			json.dump(payload, f)
+		os.replace(tmp, _hash_cache_path())
+	except Exception:
+		pass
+
+
+def hash_folder(folder: str, max_workers: int = DEFAULT_WORKERS) -> Dict[str, Dict[str, str]]:
+	"""{jar file name: hashes} for every `*.jar` in `folder`; unreadable jars are left out."""
+	names = sorted(n for n in os.listdir(folder) if n.lower().endswith('.jar') and os.path.isfile(os.path.join(folder, n)))
+	out = {}
+	with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='yali-addon-hash') as pool:
+		futures = {pool.submit(file_hashes, os.path.join(folder, n)): n for n in names}
+		for fut in as_completed(futures):
+			try:
+				out[futures[fut]] = fut.result()
+			except OSError:
+				continue
+	_save_hash_cache()
+	return out
+
+
+# --- API ----------------------------------------------------------------------
+
+def _primary_file(version: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+	files = version.get('files') or []
+	if not files:
+		return None
+	return next((f for f in files if f.get('primary')), files[0])
+
+
+def check_updates(folder: str, loaders: Optional[Sequence[str]] = None, game_versions: Optional[Sequence[str]] = None,
+				  max_workers: int = DEFAULT_WORKERS, api_base: Optional[str] = None) -> Dict[str, Any]:
+	"""Compare the jars in `folder` with their newest Modrinth versions.
+
+	Returns {'updates': [...], 'current': [file names], 'unknown': [file
+	names], 'checked': int}. Each update has file, project_id, title,
+	current_version, new_version, version_id, filename, url, hashes and
+	size. Identical jars under different names are each reported. Raises
+	ModrinthError if the API cannot be reached.
+	"""
+	base = (api_base or API_BASE).rstrip('/')
+	hashes = hash_folder(folder, max_workers=max_workers)
+	by_hash: Dict[str, List[str]] = {}
+	for name, h in hashes.items():
+		by_hash.setdefault(h['sha512'], []).append(name)
+	result = {'updates': [], 'current': [], 'unknown': [], 'checked': len(hashes)}
+	if not by_hash:
+		return result
+
+	body = {'hashes': list(by_hash), 'algorithm': 'sha512'}
+	try:
+		installed = https.post_json(f"{base}/version_files", body, timeout=30) or {}
+		update_body = dict(body)
+		if loaders:
+			update_body['loaders'] = list(loaders)
+		if game_versions:
+			update_body['game_versions'] = list(game_versions)
+		latest = https.post_json(f"{base}/version_files/update", update_body, timeout=30) or {}
+	except Exception as e:
+		raise ModrinthError(f"Modrinth lookup failed: {e}")
+
+	titles = {}
+	project_ids = sorted({v.get('project_id') for v in installed.values() if v.get('project_id')})
+	if project_ids:
+		try:
+			projects = https.get_json(f"{base}/projects", params={'ids': json.dumps(project_ids)}, timeout=30, stale_ok=True)
+			titles = {p.get('id'): p.get('title') for p in projects or []}
+		except Exception:
+			pass
+
+	for name, sha512 in sorted(((n, h['sha512']) for n, h in hashes.items()), key=lambda kv: kv[0].lower()):
+		current = installed.get(sha512)
+		if not current:
+			result['unknown'].append(name)
+			continue
+		newest = latest.get(sha512)
+		new_file = _primary_file(newest) if newest else None
+		if not newest or newest.get('id') == current.get('id') or not new_file or not new_file.get('url'):
+			result['current'].append(name)
+			continue
+		result['updates'].append({
+			'file': name,
+			'project_id': current.get('project_id'),
+			'title': titles.get(current.get('project_id')) or name,
+			'current_version': current.get('version_number'),
+			'new_version': newest.get('version_number'),
+			'version_id': newest.get('id'),
+			'filename': os.path.basename(new_file.get('filename') or name),
+			'url': new_file['url'],
+			'hashes': {k: v for k, v in (new_file.get('hashes') or {}).items() if k in ('sha1', 'sha512')},
+			'size': new_file.get('size') or 0,
+		})
+	return result
+
+
+def latest_version(project_id: str, loaders: Optional[Sequence[str]] = None,
+				   game_versions: Optional[Sequence[str]] = None, api_base: Optional[str] = None) -> Dict[str, Any]:
+	"""Newest version of a project for the given loaders and game versions, for installing it.
+
+	Returns project_id, title, version_number, game_versions, loaders,
+	filename, url and hashes of its primary file. Raises ModrinthError if
+	there is no compatible version.
+	"""
+	base = (api_base or API_BASE).rstrip('/')
+	project = https.get_json(f"{base}/project/{project_id}", timeout=10, stale_ok=True) or {}
+	title = project.get('title') or project_id
+	params = {}
+	if game_versions:
+		params['game_versions'] = json.dumps(list(game_versions))
+	if loaders:
+		params['loaders'] = json.dumps(list(loaders))
+	versions = https.get_json(f"{base}/project/{project_id}/version", params=params, timeout=10) or []
+	if not versions:
+		detail = [f"MC {', '.join(game_versions)}"] if game_versions else []
+		detail += [', '.join(loaders)] if loaders else []
+		raise ModrinthError(f"No compatible versions found for {title}" + (f" ({'; '.join(detail)})" if detail else ''))
+	newest = versions[0]
+	primary = _primary_file(newest)
+	if not primary or not primary.get('url') or not primary.get('filename'):
+		raise ModrinthError(f"No files available for {title}")
+	return {
+		'project_id': project_id,
+		'title': title,
+		'version_number': newest.get('version_number') or 'unknown',
+		'game_versions': list(newest.get('game_versions') or []),
+		'loaders': list(newest.get('loaders') or []),
+		'filename': os.path.basename(primary['filename']),
+		'url': primary['url'],
+		'hashes': {k: v for k, v in (primary.get('hashes') or {}).items() if k in ('sha1', 'sha512')},
+	}
+
+
+def apply_updates(folder: str, updates: List[Dict[str, Any]], progress_cb: ProgressCallback = None,
+				  cancel: Optional[threading.Event] = None,
+				  priority: int = download_queue.PRIORITY_ADDON) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+	"""Download the new files of `updates` into `folder` and remove the jars they replace.
+
+	The downloads go through the shared download queue. Returns (update,
+	error) pairs; error is None on success. A failed download leaves the
+	old jar untouched. `progress_cb(done, total, name)` is called as each
+	update finishes.
+	"""
+	queue = download_queue.get_queue()
+	pending = []
+	downloads = {}
+	for update in updates:
+		dest = os.path.join(folder, update['filename'])
+		old = os.path.join(folder, update['file'])
+		# identical old jars under two names share one download of the new file
+		key = os.path.normcase(dest)
+		if key not in downloads:
+			# the new jar may share the old name; download beside it and swap
+			staging = dest + '.update' if key == os.path.normcase(old) else dest
+			item = queue.submit(update['url'], staging, priority=priority, label=update['filename'],
+								expected_hashes=update.get('hashes') or None)
+			downloads[key] = (item, staging)
+		item, staging = downloads[key]
+		pending.append((update, item, staging, dest, old))
+
+	results = []
+	for done, (update, item, staging, dest, old) in enumerate(pending, 1):
+		while not item.wait(0.2):
+			if cancel is not None and cancel.is_set():
+				item.cancel()
+		try:
+			item.result()
+			if staging != dest and os.path.exists(staging):
+				os.replace(staging, dest)
+			if os.path.normcase(old) != os.path.normcase(dest) and os.path.exists(old):
+				os.remove(old)
+			error = None
+		except downloader.DownloadCancelled:
+			error = 'cancelled'
+		except Exception as e:
+			error = str(e) or type(e).__name__
+		results.append((update, error))
+		if progress_cb:
+			try:
+				progress_cb(done, len(pending), update['file'])
+			except Exception:
+				pass
+	return results
+
+
+def describe(update: Dict[str, Any]) -> str:
+	"""'Title: 1.2 -> 1.3 (old.jar -> new.jar)' line for the update list."""
+	line = f"{update['title']}: {update.get('current_version') or '?'} -> {update.get('new_version') or '?'}"
+	if update['filename'] != update['file']:
+		line += f" ({update['file']} -> {update['filename']})"
+	return line
+
+
+if __name__ == '__main__':
+	import argparse
+
+	parser = argparse.ArgumentParser(description='Check a plugins / mods folder for Modrinth updates')
+	parser.add_argument('folder')
+	parser.add_argument('--loader', action='append', default=[], help='Modrinth loader, repeatable (e.g. paper)')
+	parser.add_argument('--game-version', action='append', default=[], help='Minecraft version, repeatable')
+	parser.add_argument('--apply', action='store_true', help='download the updates')
+	args = parser.parse_args()
+
+	started = time.monotonic()
+	report = check_updates(args.folder, args.loader, args.game_version)
+	for update in report['updates']:
+		print(describe(update))
+	print(f"{len(report['updates'])} update(s), {len(report['current'])} up to date, "
+		  f"{len(report['unknown'])} not on Modrinth ({(time.monotonic() - started) * 1000.0:.0f} ms)")
+	if args.apply and report['updates']:
+		for update, error in apply_updates(args.folder, report['updates']):
+			print(f"{update['filename']}: {error or 'ok'}")
@@ -0,0 +1,113 @@
+"""Small dependency-aware task runner for provisioning jobs.
+
+`TaskGraph` runs named callables on a bounded thread pool, starting each
+one as soon as the tasks it depends on have finished. It is used by the
+launcher to overlap Modrinth lookups and plugin downloads with the server
+jar download.
+
+- A failing optional task only skips the tasks that depend on it.
+- A failing required task stops scheduling; running tasks are allowed to
+  finish and the original exception is re-raised from `run()`.
+- `on_event(kind, name, info)` is called for 'start', 'done', 'failed' and
+  'skipped'; `info` is the elapsed seconds, or the exception for 'failed'.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Callable, Dict, Any, Sequence
+
+EventCallback = Optional[Callable[[str, str, Any], None]]
+
+
+class _Task:
+	def __init__(self, name: str, fn: Callable[[], Any], deps: Sequence[str], optional: bool):
+		self.name = name
+		self.fn = fn
+		self.deps = tuple(deps)
+		self.optional = optional
+
+
+class TaskGraph:
+	"""Run callables concurrently while respecting their dependencies."""
+
+	def __init__(self, max_workers: int = 4, on_event: EventCallback = None):
+		self.max_workers = max(1, int(max_workers))
+		self.on_event = on_event
+		self.results: Dict[str, Any] = {}
+		self.errors: Dict[str, BaseException] = {}
+		self.skipped = set()
+		self._tasks: Dict[str, _Task] = {}
+
+	def add(self, name: str, fn: Callable[[], Any], deps: Sequence[str] = (), optional: bool = False):
+		"""Register task `name`; it runs after every task named in `deps` succeeded."""
+		if name in self._tasks:
+			raise ValueError(f"duplicate task {name!r}")
+		self._tasks[name] = _Task(name, fn, deps, optional)
+		return self
+
+	def _emit(self, kind: str, name: str, info: Any = None):
+		if self.on_event:
+			try:
+				self.on_event(kind, name, info)
+			except Exception:
+				pass
+
+	def _call(self, task: _Task):
+		started = time.monotonic()
+		self._emit('start', task.name, 0.0)
+		result = task.fn()
+		return result, time.monotonic() - started
+
+	def run(self) -> Dict[str, Any]:
+		"""Execute the graph and return `{name: result}` for tasks that succeeded."""
+		for task in self._tasks.values():
+			missing = [d for d in task.deps if d not in self._tasks]
+			if missing:
+				raise ValueError(f"task {task.name!r} depends on unknown task(s): {', '.join(missing)}")
+
+		pending = dict(self._tasks)
+		running = {}
+		fatal: Optional[BaseException] = None
+
+		with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='yali-task') as pool:
+			while pending or running:
+				if fatal is None:
+					for name, task in list(pending.items()):
+						if any(d in self.errors or d in self.skipped for d in task.deps):
+							del pending[name]
+							self._mark_skipped(name)
+							continue
+						if all(d in self.results for d in task.deps):
+							del pending[name]
+							running[pool.submit(self._call, task)] = task
+				if not running:
+					if fatal is not None or not pending:
+						break
+					# every remaining task waits on something that will never finish
+					for name in list(pending):
+						del pending[name]
+						self._mark_skipped(name)
+					break
+
+				done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+				for fut in done:
+					task = running.pop(fut)
+					try:
+						result, elapsed = fut.result()
+					except BaseException as e:
+						self.errors[task.name] = e
+						self._emit('failed', task.name, e)
+						if not task.optional and fatal is None:
+							fatal = e
+						continue
+					self.results[task.name] = result
+					self._emit('done', task.name, elapsed)
+
+		if fatal is not None:
+			for name in pending:
+				self._mark_skipped(name)
+			raise fatal
+		return dict(self.results)
+
+	def _mark_skipped(self, name: str):
+		self.skipped.add(name)
+		self._emit('skipped', name, None)
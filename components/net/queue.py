@@ -0,0 +1,380 @@
+"""Launcher-wide download queue.
+
+Every download the launcher starts (server jars, plugins and mods from
+Modrinth, Temurin JDKs) goes through the shared `get_queue()`, so they
+compete for one bounded set of workers instead of each caller opening its
+own connections:
+- items run in priority order (`PRIORITY_SERVER` before `PRIORITY_RUNTIME`
+  before `PRIORITY_ADDON` before `PRIORITY_OPTIONAL`), FIFO within one
+  priority;
+- at most `per_host` items per host run at once;
+- a failed item is retried with exponential backoff (not for HTTP 4xx,
+  checksum mismatches or cancellation); `downloader.download_file` resumes
+  from the `.part` file it left behind;
+- `pause()` holds running transfers at their next chunk and keeps queued
+  items waiting; `cancel()` on an item or `cancel_all()` aborts them;
+- `stats()` reports queue depth, states and the throughput of the last
+  few seconds.
+
+`submit(url, dest, ...)` returns a `DownloadItem`; callers that need the
+file block on `item.result()`. `submit_job(fn, host=...)` queues any
+callable taking a progress callback, for downloads done by other code.
+"""
+import os
+import time
+import heapq
+import itertools
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+from typing import Optional, Callable, Dict, Any, List
+from . import downloader
+
+PRIORITY_SERVER = 0
+PRIORITY_RUNTIME = 10
+PRIORITY_ADDON = 20
+PRIORITY_OPTIONAL = 30
+
+DEFAULT_WORKERS = 4
+DEFAULT_PER_HOST = 2
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+RATE_WINDOW = 5.0
+HISTORY = 50
+
+ProgressCallback = Optional[Callable[[int, int], None]]
+
+QUEUED = 'queued'
+RUNNING = 'running'
+RETRYING = 'retrying'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class DownloadItem:
+	"""One queued download; thread-safe to read, `cancel()` and `wait()` on."""
+
+	def __init__(self, seq: int, label: str, host: str, priority: int, job: Callable[[ProgressCallback], Any],
+				 progress_cb: ProgressCallback, retries: int):
+		self.seq = seq
+		self.label = label
+		self.host = host
+		self.priority = priority
+		self.retries = retries
+		self.state = QUEUED
+		self.attempts = 0
+		self.downloaded = 0
+		self.total = 0
+		self.error: Optional[BaseException] = None
+		self.value: Any = None
+		self.not_before = 0.0
+		self.started: Optional[float] = None
+		self.finished: Optional[float] = None
+		self._job = job
+		self._progress_cb = progress_cb
+		self._counting = False
+		self._on_cancel: Optional[Callable[['DownloadItem'], None]] = None
+		self._cancel = threading.Event()
+		self._done = threading.Event()
+
+	def __lt__(self, other: 'DownloadItem') -> bool:
+		return (self.priority, self.seq) < (other.priority, other.seq)
+
+	@property
+	def cancelled(self) -> bool:
+		return self._cancel.is_set()
+
+	@property
+	def percent(self) -> int:
+		"""0-100, or -1 while the size is unknown."""
+		if self.state == DONE:
+			return 100
+		return int(self.downloaded * 100 / self.total) if self.total else -1
+
+	def cancel(self):
+		self._cancel.set()
+		if self._on_cancel:
+			self._on_cancel(self)
+
+	def wait(self, timeout: Optional[float] = None) -> bool:
+		return self._done.wait(timeout)
+
+	def result(self, timeout: Optional[float] = None) -> Any:
+		"""Block until the item finishes; return the job's value or raise its error."""
+		if not self._done.wait(timeout):
+			raise TimeoutError(f"{self.label} is still downloading")
+		if self.state == CANCELLED:
+			raise downloader.DownloadCancelled(f"{self.label} was cancelled")
+		if self.error is not None:
+			raise self.error
+		return self.value
+
+	def __repr__(self):
+		return f"<DownloadItem {self.label!r} {self.state} {self.percent}%>"
+
+
+def _retryable(error: BaseException) -> bool:
+	if isinstance(error, (downloader.DownloadCancelled, downloader.ChecksumMismatch)):
+		return False
+	status = getattr(getattr(error, 'response', None), 'status_code', None)
+	if status is not None and 400 <= status < 500 and status not in (408, 429):
+		return False
+	return True
+
+
+class DownloadQueue:
+	"""Priority download queue with a bounded worker pool and per-host limits."""
+
+	def __init__(self, max_workers: int = DEFAULT_WORKERS, per_host: int = DEFAULT_PER_HOST,
+				 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF):
+		self.max_workers = max(1, int(max_workers))
+		self.per_host = max(1, int(per_host))
+		self.retries = max(0, int(retries))
+		self.backoff = max(0.0, float(backoff))
+		self._cond = threading.Condition()
+		self._heap: List[DownloadItem] = []
+		self._running: Dict[str, int] = {}
+		self._active: List[DownloadItem] = []
+		self._history: deque = deque(maxlen=HISTORY)
+		self._workers: List[threading.Thread] = []
+		self._idle = 0
+		self._seq = itertools.count()
+		self._resume = threading.Event()
+		self._resume.set()
+		self._samples: deque = deque()
+		self._counts = {DONE: 0, FAILED: 0, CANCELLED: 0, 'retries': 0, 'bytes': 0}
+
+	# --- submitting ---------------------------------------------------------------
+
+	def submit(self, url: str, dest_path: str, priority: int = PRIORITY_ADDON, label: Optional[str] = None,
+			   expected_hashes: Optional[Dict[str, str]] = None, progress_cb: ProgressCallback = None,
+			   digests: Optional[Dict[str, str]] = None, retries: Optional[int] = None) -> DownloadItem:
+		"""Queue `url` -> `dest_path` (see `downloader.download_file` for hashes and digests)."""
+		def _job(cb):
+			return downloader.download_file(url, dest_path, progress_cb=cb, expected_hashes=expected_hashes, digests=digests)
+		return self.submit_job(_job, host=urlsplit(url).netloc.lower(), label=label or os.path.basename(dest_path),
+							   priority=priority, progress_cb=progress_cb, retries=retries)
+
+	def submit_job(self, fn: Callable[[ProgressCallback], Any], host: str, label: str, priority: int = PRIORITY_ADDON,
+				   progress_cb: ProgressCallback = None, retries: Optional[int] = None) -> DownloadItem:
+		"""Queue `fn(progress_cb)`; it counts against `host`'s limit and is retried like a download."""
+		item = DownloadItem(next(self._seq), label, host or '', priority, fn, progress_cb,
+							self.retries if retries is None else max(0, int(retries)))
+		item._on_cancel = self._drop
+		with self._cond:
+			heapq.heappush(self._heap, item)
+			self._active.append(item)
+			if self._idle == 0 and len(self._workers) < self.max_workers:
+				worker = threading.Thread(target=self._work, name=f'yali-download-{len(self._workers)}', daemon=True)
+				self._workers.append(worker)
+				worker.start()
+			self._cond.notify()
+		return item
+
+	# --- control ------------------------------------------------------------------
+
+	@property
+	def paused(self) -> bool:
+		return not self._resume.is_set()
+
+	def pause(self):
+		"""Hold running downloads at their next chunk and start no new ones."""
+		self._resume.clear()
+
+	def resume(self):
+		with self._cond:
+			self._resume.set()
+			self._cond.notify_all()
+
+	def cancel_all(self):
+		"""Cancel every queued and running item."""
+		with self._cond:
+			items = list(self._active)
+		for item in items:
+			item.cancel()
+
+	def _drop(self, item: DownloadItem):
+		"""Finish a cancelled item right away if it has not started; running ones stop at their next chunk."""
+		with self._cond:
+			if item in self._heap:
+				self._heap.remove(item)
+				heapq.heapify(self._heap)
+				self._finish(item, CANCELLED)
+			self._cond.notify_all()
+
+	def items(self) -> List[DownloadItem]:
+		"""Queued and running items, then recently finished ones (newest first)."""
+		with self._cond:
+			return sorted(self._active) + list(reversed(self._history))
+
+	def stats(self) -> Dict[str, Any]:
+		"""Queue depth, per-state counts, bytes moved and current throughput (bytes/s)."""
+		with self._cond:
+			now = time.monotonic()
+			self._trim(now)
+			window = now - self._samples[0][0] if len(self._samples) > 1 else 0.0
+			rate = sum(n for _, n in self._samples) / window if window > 0 else 0.0
+			queued = sum(1 for i in self._active if i.state in (QUEUED, RETRYING))
+			running = sum(1 for i in self._active if i.state == RUNNING)
+			return {
+				'queued': queued, 'running': running, 'done': self._counts[DONE],
+				'failed': self._counts[FAILED], 'cancelled': self._counts[CANCELLED],
+				'retries': self._counts['retries'], 'bytes': self._counts['bytes'],
+				'rate_bps': rate, 'paused': self.paused, 'per_host': dict(self._running),
+			}
+
+	# --- workers ------------------------------------------------------------------
+
+	def _trim(self, now: float):
+		while self._samples and now - self._samples[0][0] > RATE_WINDOW:
+			self._samples.popleft()
+
+	def _next(self) -> Optional[DownloadItem]:
+		"""Pop the first runnable item (caller holds the lock); None if nothing can start yet."""
+		now = time.monotonic()
+		for item in sorted(self._heap):
+			if item.cancelled:
+				self._heap.remove(item)
+				heapq.heapify(self._heap)
+				self._finish(item, CANCELLED)
+				continue
+			if item.not_before > now or self._running.get(item.host, 0) >= self.per_host:
+				continue
+			self._heap.remove(item)
+			heapq.heapify(self._heap)
+			return item
+		return None
+
+	def _wait_time(self) -> Optional[float]:
+		now = time.monotonic()
+		delays = [item.not_before - now for item in self._heap if item.not_before > now]
+		return max(0.05, min(delays)) if delays else None
+
+	def _finish(self, item: DownloadItem, state: str):
+		item.state = state
+		item.finished = time.monotonic()
+		item._job = None
+		self._counts[state] += 1
+		if item in self._active:
+			self._active.remove(item)
+		self._history.append(item)
+		item._done.set()
+
+	def _work(self):
+		while True:
+			with self._cond:
+				item = None
+				while item is None:
+					if self._resume.is_set():
+						item = self._next()
+					if item is None:
+						self._idle += 1
+						self._cond.wait(self._wait_time())
+						self._idle -= 1
+				item.state = RUNNING
+				item.attempts += 1
+				item.started = item.started or time.monotonic()
+				item._counting = False
+				self._running[item.host] = self._running.get(item.host, 0) + 1
+			error = None
+			try:
+				item.value = item._job(lambda done, total, _item=item: self._progress(_item, done, total))
+			except BaseException as e:
+				error = e
+			with self._cond:
+				self._running[item.host] -= 1
+				if not self._running[item.host]:
+					del self._running[item.host]
+				if error is None:
+					item.error = None
+					self._finish(item, DONE)
+				elif item.cancelled:
+					self._finish(item, CANCELLED)
+				elif item.attempts <= item.retries and _retryable(error):
+					self._counts['retries'] += 1
+					item.state = RETRYING
+					item.error = error
+					item.not_before = time.monotonic() + self.backoff * (2 ** (item.attempts - 1))
+					heapq.heappush(self._heap, item)
+				else:
+					item.error = error
+					self._finish(item, FAILED)
+				self._cond.notify_all()
+
+	def _progress(self, item: DownloadItem, done: int, total: int):
+		"""Progress hook handed to the job: counts bytes, honours pause and cancel."""
+		while not self._resume.is_set() and not item.cancelled:
+			self._resume.wait(0.2)
+		if item.cancelled:
+			raise downloader.DownloadCancelled(f"{item.label} was cancelled")
+		with self._cond:
+			now = time.monotonic()
+			# the first report of an attempt may include bytes resumed from disk
+			delta = max(0, done - item.downloaded) if item._counting else 0
+			item._counting = True
+			self._samples.append((now, delta))
+			self._trim(now)
+			self._counts['bytes'] += delta
+			item.downloaded = done
+			item.total = total or 0
+		if item._progress_cb:
+			try:
+				item._progress_cb(done, total)
+			except downloader.DownloadCancelled:
+				raise
+			except Exception:
+				pass
+
+
+_queue: Optional[DownloadQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> DownloadQueue:
+	"""Return the launcher's shared queue (`YALI_DOWNLOAD_WORKERS` overrides the worker count)."""
+	global _queue
+	with _queue_lock:
+		if _queue is None:
+			workers = DEFAULT_WORKERS
+			try:
+				workers = int(os.environ.get('YALI_DOWNLOAD_WORKERS', '')) or DEFAULT_WORKERS
+			except ValueError:
+				pass
+			_queue = DownloadQueue(max_workers=workers)
+		return _queue
+
+
+def current_queue() -> Optional[DownloadQueue]:
+	"""The shared queue if anything has used it yet, without creating it."""
+	return _queue
+
+
+def format_rate(bps: float) -> str:
+	"""'2.41 MB/s' / '812.0 KB/s' / '90 B/s'."""
+	if bps >= 1024 * 1024:
+		return f"{bps / (1024 * 1024):.2f} MB/s"
+	if bps >= 1024:
+		return f"{bps / 1024:.1f} KB/s"
+	return f"{bps:.0f} B/s"
+
+
+if __name__ == '__main__':
+	import argparse
+
+	parser = argparse.ArgumentParser(description='Download URLs through the launcher download queue')
+	parser.add_argument('dest_dir')
+	parser.add_argument('urls', nargs='+')
+	parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+	parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST)
+	args = parser.parse_args()
+
+	queue = DownloadQueue(max_workers=args.workers, per_host=args.per_host)
+	started = time.monotonic()
+	items = [queue.submit(url, os.path.join(args.dest_dir, os.path.basename(urlsplit(url).path) or 'download'))
+			 for url in args.urls]
+	for item in items:
+		item.wait()
+		print(f"{item.label:<40} {item.state:<9} {item.attempts} attempt(s)  {item.error or ''}")
+	stats = queue.stats()
+	print(f"{stats['bytes'] / (1024 * 1024):.1f} MB, {stats['retries']} retries, {(time.monotonic() - started):.1f} s")
@@ -0,0 +1,270 @@
+"""Java runtime discovery for YaliLauncher.
+
+Finds java executables in JAVA_HOME, PATH and the usual install folders and
+works out their major version without starting a JVM where possible:
+- A JDK/JRE `release` file (JAVA_VERSION, IMPLEMENTOR, OS_ARCH) is read first.
+- Only candidates without a readable `release` file are probed with
+  `java -version`, in parallel.
+- Results are cached in app data keyed by (path, size, mtime) of the
+  executable, so a warm start spawns no processes at all. Executables
+  whose probe failed (a broken or foreign `java`) are cached as failed
+  under the same key and skipped until the file changes.
+"""
+import os
+import re
+import sys
+import json
+import shutil
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple, Any
+from ..appdata import get_app_data_dir
+
+PROBE_TIMEOUT = 5
+PROBE_WORKERS = 8
+CACHE_VERSION = 1
+
+JAVA_EXE = 'java.exe' if sys.platform == 'win32' else 'java'
+
+_VERSION_RE = re.compile(r'version\s+"?(\d+)(?:\.(\d+))?(?:\.(\d+))?')
+_HOME_DIR_RE = re.compile(r'(?i)^(jdk|openjdk|temurin|adoptium|adoptopenjdk|java|zulu|corretto|graalvm)')
+
+_cache_lock = threading.Lock()
+
+
+def parse_major(version: str) -> Optional[int]:
+	"""Return the feature release of a Java version string ('1.8.0_392' -> 8, '21.0.2' -> 21)."""
+	m = re.match(r'\s*"?(\d+)(?:\.(\d+))?', version or '')
+	if not m:
+		return None
+	major = int(m.group(1))
+	if major == 1 and m.group(2):
+		major = int(m.group(2))
+	return major
+
+
+def read_release(home: str) -> Optional[Dict[str, str]]:
+	"""Parse `<home>/release` into a dict, or None if it is missing or unusable."""
+	path = os.path.join(home, 'release')
+	try:
+		with open(path, 'r', encoding='utf-8', errors='replace') as f:
+			text = f.read()
+	except OSError:
+		return None
+	data = {}
+	for line in text.splitlines():
+		if '=' not in line:
+			continue
+		key, _, value = line.partition('=')
+		data[key.strip()] = value.strip().strip('"')
+	return data if data.get('JAVA_VERSION') else None
+
+
+def _home_of(java_path: str) -> str:
+	return os.path.dirname(os.path.dirname(os.path.realpath(java_path)))
+
+
+def _children_with_java(root: str, pattern: Optional[re.Pattern] = None, suffix: Tuple[str, ...] = ()) -> List[str]:
+	found = []
+	try:
+		with os.scandir(root) as it:
+			for entry in it:
+				if not entry.is_dir() or (pattern and not pattern.search(entry.name)):
+					continue
+				jp = os.path.join(entry.path, *suffix, 'bin', JAVA_EXE)
+				if os.path.exists(jp):
+					found.append(jp)
+	except OSError:
+		pass
+	return found
+
+
+def candidate_paths() -> List[Tuple[str, str]]:
+	"""Return (java_path, source) pairs from JAVA_HOME, PATH and common install folders."""
+	out = []
+	jh = os.environ.get('JAVA_HOME')
+	if jh:
+		jp = os.path.join(jh, 'bin', JAVA_EXE)
+		if os.path.exists(jp):
+			out.append((jp, 'JAVA_HOME'))
+
+	for p in os.environ.get('PATH', '').split(os.pathsep):
+		if p:
+			jp = os.path.join(p, JAVA_EXE)
+			if os.path.exists(jp):
+				out.append((jp, 'PATH'))
+
+	home = os.path.expanduser('~')
+	user_roots = [
+		os.path.join(home, '.local', 'opt'),
+		os.path.join(home, '.jdks'),
+		os.path.join(home, 'jdk'),
+		os.path.join(home, 'java'),
+		os.path.join(home, '.sdkman', 'candidates', 'java'),
+	]
+	if sys.platform == 'win32':
+		for var, default in (('ProgramFiles', r'C:\Program Files'), ('ProgramFiles(x86)', r'C:\Program Files (x86)')):
+			root = os.environ.get(var, default)
+			if root:
+				out += [(jp, 'ProgramFiles') for jp in _children_with_java(root)]
+				for vendor in ('Java', 'Eclipse Adoptium', 'Eclipse Foundation', 'Microsoft', 'Zulu', 'Amazon Corretto', 'BellSoft'):
+					out += [(jp, 'ProgramFiles') for jp in _children_with_java(os.path.join(root, vendor))]
+	elif sys.platform == 'darwin':
+		for root in ('/Library/Java/JavaVirtualMachines', os.path.join(home, 'Library', 'Java', 'JavaVirtualMachines')):
+			out += [(jp, 'JavaVirtualMachines') for jp in _children_with_java(root, suffix=('Contents', 'Home'))]
+	else:
+		for root in ('/usr/lib/jvm', '/usr/java', '/opt/java', '/opt'):
+			pattern = _HOME_DIR_RE if root == '/opt' else None
+			out += [(jp, 'System') for jp in _children_with_java(root, pattern)]
+
+	for root in user_roots:
+		out += [(jp, 'UserLocal') for jp in _children_with_java(root)]
+	out += [(jp, 'UserHome') for jp in _children_with_java(home, _HOME_DIR_RE)]
+	return out
+
+
+def probe(java_path: str, timeout: int = PROBE_TIMEOUT) -> Optional[Dict[str, Any]]:
+	"""Run `java -version` and return {'major', 'version', 'vendor', 'arch'}, or None."""
+	try:
+		result = subprocess.run(
+			[java_path, '-version'],
+			capture_output=True,
+			text=True,
+			timeout=timeout,
+			creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+		)
+	except Exception:
+		return None
+	out = (result.stderr or result.stdout) or ''
+	m = _VERSION_RE.search(out)
+	if not m:
+		return None
+	first = out.splitlines()[0] if out else ''
+	version = first.split('"')[1] if first.count('"') >= 2 else m.group(0).split()[-1].strip('"')
+	vendor = None
+	for line in out.splitlines()[1:]:
+		if 'Runtime Environment' in line:
+			vendor = line.split('Runtime Environment')[0].strip() or None
+			break
+	return {
+		'major': parse_major(version),
+		'version': version,
+		'vendor': vendor,
+		'arch': 'x64' if '64-Bit' in out else None,
+	}
+
+
+def _from_release(java_path: str) -> Optional[Dict[str, Any]]:
+	data = read_release(_home_of(java_path))
+	if not data:
+		return None
+	major = parse_major(data.get('JAVA_VERSION', ''))
+	if major is None:
+		return None
+	return {
+		'major': major,
+		'version': data.get('JAVA_VERSION'),
+		'vendor': data.get('IMPLEMENTOR') or None,
+		'arch': data.get('OS_ARCH') or None,
+	}
+
+
+def _stat_key(java_path: str) -> Optional[List[float]]:
+	try:
+		st = os.stat(java_path)
+		return [st.st_size, st.st_mtime]
+	except OSError:
+		return None
+
+
+def _cache_path() -> str:
+	return os.path.join(get_app_data_dir(), 'java_runtimes.json')
+
+
+def _load_cache(path: str) -> Dict[str, Any]:
+	try:
+		with open(path, 'r', encoding='utf-8') as f:
+			data = json.load(f)
+		if data.get('version') == CACHE_VERSION:
+			return data.get('entries') or {}
+	except Exception:
+		pass
+	return {}
+
+
+def _save_cache(path: str, entries: Dict[str, Any]):
+	with _cache_lock:
+		tmp = path + '.tmp'
+		try:
+			with open(tmp, 'w', encoding='utf-8') as f:
+				json.dump({'version': CACHE_VERSION, 'entries': entries}, f, indent=1)
+			os.replace(tmp, path)
+		except Exception:
+			pass
+
+
+def default_java() -> Optional[str]:
+	"""Return the java executable PATH resolves to, if any."""
+	return shutil.which('java')
+
+
+def discover(use_cache: bool = True, cache_path: Optional[str] = None, max_workers: int = PROBE_WORKERS) -> List[Dict[str, Any]]:
+	"""Find installed Java runtimes.
+
+	Returns dicts with 'major', 'path', 'source', 'version', 'vendor', 'arch'
+	and 'how' ('cache', 'release' or 'probe'), de-duplicated by resolved path.
+	"""
+	try:
+		cache_path = cache_path or _cache_path()
+	except Exception:
+		cache_path = None
+	cache = _load_cache(cache_path) if (use_cache and cache_path) else {}
+	new_cache = {}
+
+	seen = set()
+	pending = []
+	resolved = []
+	for java_path, source in candidate_paths():
+		real = os.path.normcase(os.path.realpath(java_path))
+		if real in seen:
+			continue
+		seen.add(real)
+		key = _stat_key(real)
+		if key is None:
+			continue
+		hit = cache.get(real)
+		if hit and hit.get('stat') == key and hit.get('failed'):
+			new_cache[real] = hit
+			continue
+		if hit and hit.get('stat') == key and hit.get('info'):
+			info, how = hit['info'], 'cache'
+		else:
+			info, how = _from_release(java_path), 'release'
+		if info is None:
+			pending.append((java_path, source, real, key))
+			continue
+		new_cache[real] = {'stat': key, 'info': info}
+		resolved.append({**info, 'path': java_path, 'source': source, 'how': how})
+
+	if pending:
+		with ThreadPoolExecutor(max_workers=min(max_workers, len(pending)), thread_name_prefix='yali-java') as pool:
+			results = list(pool.map(lambda c: probe(c[0]), pending))
+		for (java_path, source, real, key), info in zip(pending, results):
+			if info is None or info.get('major') is None:
+				new_cache[real] = {'stat': key, 'failed': True}
+				continue
+			new_cache[real] = {'stat': key, 'info': info}
+			resolved.append({**info, 'path': java_path, 'source': source, 'how': 'probe'})
+
+	if cache_path and new_cache != cache:
+		_save_cache(cache_path, new_cache)
+	return resolved
+
+
+if __name__ == '__main__':
+	import time
+	started = time.perf_counter()
+	for rt in discover():
+		print(f"Java {rt['major']:>2}  {rt.get('vendor') or '?':<20} {rt['how']:<8} {rt['source']:<10} {rt['path']}")
+	print(f"discovery took {(time.perf_counter() - started) * 1000:.0f} ms")
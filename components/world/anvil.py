@@ -0,0 +1,100 @@
+"""Minimal reader/writer for Anvil region files (`.mca`).
+
+A region file starts with an 8 KiB header: 1024 big-endian location entries
+(3-byte sector offset, 1-byte sector count) followed by 1024 big-endian
+uint32 timestamps. Each chunk lives in whole 4096-byte sectors and starts
+with a 4-byte length and a 1-byte compression type.
+
+Chunks are handled here as their raw stored payload (length prefix,
+compression byte and data), so they can be copied between files without
+decompressing. `write_region` lays chunks out back to back; the result is
+equivalent to the original for the game, not byte-identical.
+"""
+import os
+import struct
+from typing import Dict, List, Optional, Tuple, BinaryIO
+
+SECTOR = 4096
+HEADER_SIZE = 2 * SECTOR
+CHUNKS = 1024
+
+_HEADER = struct.Struct('>1024I1024I')
+
+
+class RegionError(ValueError):
+	pass
+
+
+def chunk_index(x: int, z: int) -> int:
+	"""Header index of chunk (x, z) within its region."""
+	return (x & 31) + (z & 31) * 32
+
+
+def looks_like_region(path: str, size: Optional[int] = None) -> bool:
+	"""True for .mca files big enough to hold a header and sector aligned."""
+	if not path.lower().endswith('.mca'):
+		return False
+	if size is None:
+		try:
+			size = os.path.getsize(path)
+		except OSError:
+			return False
+	return size >= HEADER_SIZE and size % SECTOR == 0
+
+
+def read_header(f: BinaryIO) -> List[Tuple[int, int, int, int]]:
+	"""Return (index, sector_offset, sector_count, timestamp) for every present chunk."""
+	f.seek(0)
+	data = f.read(HEADER_SIZE)
+	if len(data) != HEADER_SIZE:
+		raise RegionError('truncated region header')
+	values = _HEADER.unpack(data)
+	out = []
+	for i in range(CHUNKS):
+		loc = values[i]
+		offset, count = loc >> 8, loc & 0xFF
+		if offset == 0 and count == 0:
+			continue
+		if offset < 2 or count == 0:
+			raise RegionError(f'chunk {i} has an invalid location ({offset}, {count})')
+		out.append((i, offset, count, values[CHUNKS + i]))
+	return out
+
+
+def read_payload(f: BinaryIO, offset: int, count: int) -> bytes:
+	"""Read the stored payload (length prefix included) of the chunk at `offset`."""
+	f.seek(offset * SECTOR)
+	head = f.read(5)
+	if len(head) != 5:
+		raise RegionError('chunk past end of file')
+	length = struct.unpack('>I', head[:4])[0]
+	if length == 0 or length + 4 > count * SECTOR:
+		raise RegionError(f'chunk length {length} does not fit in {count} sector(s)')
+	rest = f.read(length - 1)
+	if len(rest) != length - 1:
+		raise RegionError('chunk past end of file')
+	return head + rest
+
+
+def write_region(path: str, chunks: Dict[int, Tuple[int, bytes]]):
+	"""Write a region file from `{index: (timestamp, payload)}`."""
+	locations = [0] * CHUNKS
+	timestamps = [0] * CHUNKS
+	sector = 2
+	layout = []
+	for index in sorted(chunks):
+		timestamp, payload = chunks[index]
+		count = (len(payload) + SECTOR - 1) // SECTOR
+		if count > 255:
+			raise RegionError(f'chunk {index} is too large for an in-region entry')
+		locations[index] = (sector << 8) | count
+		timestamps[index] = timestamp & 0xFFFFFFFF
+		layout.append((payload, count))
+		sector += count
+	with open(path, 'wb') as f:
+		f.write(_HEADER.pack(*locations, *timestamps))
+		for payload, count in layout:
+			f.write(payload)
+			pad = count * SECTOR - len(payload)
+			if pad:
+				f.write(b'\0' * pad)
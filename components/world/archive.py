@@ -0,0 +1,489 @@
+"""Export a world to a single archive and import one back.
+
+Export (`export_world`) streams straight into the archive, without a
+temporary copy of the world:
+- `.zip`: files the game already compresses (region files, gzipped NBT)
+  are stored as-is; everything else is deflated on a thread pool while
+  the calling thread appends finished entries in order. `zipfile`
+  compresses in the thread that writes, so the writer here is our own;
+  it switches to ZIP64 records past 4 GiB or 65535 entries.
+- `.tar.zst`: needs the optional `zstandard` package, whose compressor
+  spreads the work over all cores itself.
+
+Import (`import_world`) accepts `.zip`, `.tar.zst` and plain or gzipped
+tars. The world inside is the folder holding `level.dat` and a region
+folder (the rules of `indexer.is_valid_world`). It is extracted into a
+hidden staging folder next to the destination (zip members in parallel)
+and renamed into place once complete.
+"""
+import os
+import time
+import zlib
+import shutil
+import struct
+import tarfile
+import zipfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+from .copier import plan_tree, CopyCancelled, ProgressCallback, DEFAULT_WORKERS
+from .indexer import REGION_DIRS, is_valid_world
+from ..lazyimport import lazy_module, available
+
+zstd = lazy_module('zstandard')
+
+COPY_CHUNK = 1024 * 1024
+DEFLATE_LEVEL = 6
+
+# region files hold zlib/LZ4 chunks and .dat/.nbt files are gzipped NBT
+STORE_SUFFIXES = ('.mca', '.mcc', '.dat', '.dat_old', '.nbt', '.gz', '.zip', '.zst', '.png', '.jar')
+
+ARCHIVE_SUFFIXES = ('.zip', '.tar.zst', '.tar.gz', '.tgz', '.tar')
+
+_ZIP64_LIMIT = 0xFFFFFFFF
+_MAX16 = 0xFFFF
+_LOCAL = struct.Struct('<IHHHHHIIIHH')
+_CENTRAL = struct.Struct('<IHHHHHHIIIHHHHHII')
+_END = struct.Struct('<IHHHHIIH')
+_END64 = struct.Struct('<IQHHIIQQQQ')
+_LOCATOR = struct.Struct('<IIQI')
+_UTF8 = 0x0800
+
+
+class ArchiveError(ValueError):
+	pass
+
+
+def archive_kind(path: str) -> Optional[str]:
+	"""'zip', 'tar.zst' or 'tar' for supported archive names, else None."""
+	lower = path.lower()
+	if lower.endswith('.zip'):
+		return 'zip'
+	if lower.endswith('.tar.zst'):
+		return 'tar.zst'
+	if lower.endswith(('.tar.gz', '.tgz', '.tar')):
+		return 'tar'
+	return None
+
+
+def is_archive(path: str) -> bool:
+	return archive_kind(path) is not None and os.path.isfile(path)
+
+
+def zstd_available() -> bool:
+	return available('zstandard')
+
+
+def archive_stem(path: str) -> str:
+	"""File name without its archive suffix ('survival.tar.zst' -> 'survival')."""
+	name = os.path.basename(path)
+	for suffix in ARCHIVE_SUFFIXES:
+		if name.lower().endswith(suffix):
+			return name[:-len(suffix)]
+	return os.path.splitext(name)[0]
+
+
+def find_world_root(names: Iterable[str]) -> Optional[str]:
+	"""Return the shallowest member prefix ('' or 'dir/') that holds a world, or None."""
+	files = set()
+	dirs = set()
+	for name in names:
+		name = name.replace('\\', '/').lstrip('/')
+		parts = name.split('/')
+		for i in range(1, len(parts)):
+			dirs.add('/'.join(parts[:i]))
+		if name.endswith('/'):
+			dirs.add(name.rstrip('/'))
+		else:
+			files.add(name)
+	candidates = sorted((f[:-len('level.dat')] for f in files if f == 'level.dat' or f.endswith('/level.dat')), key=len)
+	for prefix in candidates:
+		if any(prefix + rel in dirs for rel in REGION_DIRS):
+			return prefix
+	return None
+
+
+def _safe_rel(rel: str) -> Optional[str]:
+	"""Normalise an archive member path; None if it would escape the destination."""
+	rel = rel.replace('\\', '/')
+	if rel.startswith('/') or (len(rel) > 1 and rel[1] == ':'):
+		return None
+	parts = [p for p in rel.split('/') if p not in ('', '.')]
+	if any(p == '..' for p in parts):
+		return None
+	return os.path.join(*parts) if parts else ''
+
+
+def _stores(rel: str) -> bool:
+	return rel.lower().endswith(STORE_SUFFIXES)
+
+
+def _clamp32(value: int) -> int:
+	"""Value for a 32-bit zip field; 0xFFFFFFFF means 'see the ZIP64 extra field'."""
+	return value if value < _ZIP64_LIMIT else 0xFFFFFFFF
+
+
+def _dos_time(mtime: float) -> Tuple[int, int]:
+	t = time.localtime(mtime)
+	if t.tm_year < 1980:
+		return 0, (1 << 5) | 1
+	return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+
+class _ZipWriter:
+	"""Sequential zip writer for entries whose data is produced elsewhere."""
+
+	def __init__(self, f):
+		self.f = f
+		self.entries: List[Tuple[bytes, int, int, int, int, int, int, int, int]] = []
+
+	def _local_header(self, name: bytes, method: int, dostime: Tuple[int, int], crc: int, csize: int, usize: int) -> bytes:
+		if usize >= _ZIP64_LIMIT or csize >= _ZIP64_LIMIT:
+			extra = struct.pack('<HHQQ', 1, 16, usize, csize)
+			return _LOCAL.pack(0x04034b50, 45, _UTF8, method, dostime[0], dostime[1], crc,
+							   0xFFFFFFFF, 0xFFFFFFFF, len(name), len(extra)) + name + extra
+		return _LOCAL.pack(0x04034b50, 20, _UTF8, method, dostime[0], dostime[1], crc,
+						   csize, usize, len(name), 0) + name
+
+	def add_bytes(self, arcname: str, data: bytes, crc: int, usize: int, method: int, mtime: float, external: int = 0o100644 << 16):
+		name = arcname.encode('utf-8')
+		dostime = _dos_time(mtime)
+		offset = self.f.tell()
+		self.f.write(self._local_header(name, method, dostime, crc, len(data), usize))
+		self.f.write(data)
+		self.entries.append((name, method, dostime[0], dostime[1], crc, len(data), usize, offset, external))
+
+	def add_file(self, arcname: str, path: str, size: int, mtime: float) -> int:
+		"""Store `size` bytes of `path` uncompressed, patching the CRC in afterwards."""
+		name = arcname.encode('utf-8')
+		dostime = _dos_time(mtime)
+		offset = self.f.tell()
+		self.f.write(self._local_header(name, 0, dostime, 0, size, size))
+		crc = 0
+		written = 0
+		with open(path, 'rb') as src:
+			while written < size:
+				block = src.read(min(COPY_CHUNK, size - written))
+				if not block:
+					break
+				crc = zlib.crc32(block, crc)
+				self.f.write(block)
+				written += len(block)
+		if written != size:
+			raise ArchiveError(f'{arcname} changed size while it was archived')
+		end = self.f.tell()
+		self.f.seek(offset + 14)
+		self.f.write(struct.pack('<I', crc))
+		self.f.seek(end)
+		self.entries.append((name, 0, dostime[0], dostime[1], crc, size, size, offset, 0o100644 << 16))
+		return size
+
+	def add_dir(self, arcname: str, mtime: float):
+		self.add_bytes(arcname.rstrip('/') + '/', b'', 0, 0, 0, mtime, external=(0o40755 << 16) | 0x10)
+
+	def close(self):
+		cd_offset = self.f.tell()
+		for name, method, dtime, ddate, crc, csize, usize, offset, external in self.entries:
+			fields = [v for v in (usize, csize, offset) if v >= _ZIP64_LIMIT]
+			extra = struct.pack('<HH', 1, 8 * len(fields)) + struct.pack(f'<{len(fields)}Q', *fields) if fields else b''
+			self.f.write(_CENTRAL.pack(
+				0x02014b50, (3 << 8) | 45, 45 if fields else 20, _UTF8, method, dtime, ddate, crc,
+				_clamp32(csize), _clamp32(usize), len(name), len(extra), 0, 0, 0,
+				external, _clamp32(offset)) + name + extra)
+		cd_size = self.f.tell() - cd_offset
+		count = len(self.entries)
+		if count >= _MAX16 or cd_offset >= _ZIP64_LIMIT or cd_size >= _ZIP64_LIMIT:
+			end64 = self.f.tell()
+			self.f.write(_END64.pack(0x06064b50, 44, 45, 45, 0, 0, count, count, cd_size, cd_offset))
+			self.f.write(_LOCATOR.pack(0x07064b50, 0, end64, 1))
+		entries = count if count < _MAX16 else 0xFFFF
+		self.f.write(_END.pack(0x06054b50, 0, 0, entries, entries, _clamp32(cd_size), _clamp32(cd_offset), 0))
+
+
+def _deflate(path: str) -> Tuple[bytes, int, int]:
+	with open(path, 'rb') as f:
+		data = f.read()
+	comp = zlib.compressobj(DEFLATE_LEVEL, zlib.DEFLATED, -15)
+	return comp.compress(data) + comp.flush(), zlib.crc32(data), len(data)
+
+
+class _Progress:
+	def __init__(self, progress_cb: ProgressCallback, total_bytes: int, total_files: int):
+		self.cb = progress_cb
+		self.total_bytes = total_bytes
+		self.total_files = total_files
+		self.bytes = 0
+		self.files = 0
+
+	def add(self, size: int, files: int = 1):
+		self.bytes += size
+		self.files += files
+		if self.cb:
+			try:
+				self.cb(self.bytes, self.total_bytes, self.files, self.total_files)
+			except Exception:
+				pass
+
+
+def _export_zip(world_path: str, f, prefix: str, dirs, files, progress: _Progress, max_workers: int,
+				cancel: Optional[threading.Event]) -> Dict[str, int]:
+	writer = _ZipWriter(f)
+	writer.add_dir(prefix, os.path.getmtime(world_path))
+	for rel in sorted(dirs):
+		writer.add_dir(prefix + rel.replace(os.sep, '/'), os.path.getmtime(os.path.join(world_path, rel)))
+	stored = deflated = 0
+	window = max(1, int(max_workers)) * 2
+	with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix='yali-deflate') as pool:
+		pending = deque()
+		queue = iter(files)
+		while True:
+			while len(pending) < window:
+				try:
+					rel, size = next(queue)
+				except StopIteration:
+					break
+				path = os.path.join(world_path, rel)
+				pending.append((rel, size, path, None if _stores(rel) else pool.submit(_deflate, path)))
+			if not pending:
+				break
+			if cancel is not None and cancel.is_set():
+				for *_, fut in pending:
+					if fut is not None:
+						fut.cancel()
+				raise CopyCancelled()
+			rel, size, path, fut = pending.popleft()
+			arcname = prefix + rel.replace(os.sep, '/')
+			mtime = os.path.getmtime(path)
+			if fut is None:
+				writer.add_file(arcname, path, size, mtime)
+				stored += 1
+			else:
+				data, crc, usize = fut.result()
+				if len(data) < usize:
+					writer.add_bytes(arcname, data, crc, usize, zipfile.ZIP_DEFLATED, mtime)
+					deflated += 1
+				else:
+					# incompressible after all; store the original bytes instead
+					writer.add_file(arcname, path, usize, mtime)
+					stored += 1
+			progress.add(size)
+	writer.close()
+	return {'stored': stored, 'deflated': deflated}
+
+
+def _export_tar_zst(world_path: str, f, prefix: str, dirs, files, progress: _Progress,
+					cancel: Optional[threading.Event]) -> Dict[str, int]:
+	cctx = zstd.ZstdCompressor(level=3, threads=-1)
+	with cctx.stream_writer(f, closefd=False) as zf:
+		with tarfile.open(fileobj=zf, mode='w|', format=tarfile.PAX_FORMAT) as tar:
+			tar.add(world_path, arcname=prefix.rstrip('/'), recursive=False)
+			for rel in sorted(dirs):
+				tar.add(os.path.join(world_path, rel), arcname=prefix + rel.replace(os.sep, '/'), recursive=False)
+			for rel, size in files:
+				if cancel is not None and cancel.is_set():
+					raise CopyCancelled()
+				tar.add(os.path.join(world_path, rel), arcname=prefix + rel.replace(os.sep, '/'), recursive=False)
+				progress.add(size)
+	return {'stored': len(files), 'deflated': 0}
+
+
+def export_world(world_path: str, dest_path: str, max_workers: int = DEFAULT_WORKERS, progress_cb: ProgressCallback = None,
+				 cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+	"""Write `world_path` to the archive `dest_path` (.zip or .tar.zst).
+
+	Members are stored under the world's folder name. The archive is written
+	to `dest_path + '.part'` and renamed when complete. Returns
+	{'files', 'bytes', 'archive_bytes', 'stored', 'deflated', 'elapsed_ms'}.
+	"""
+	kind = archive_kind(dest_path)
+	if kind not in ('zip', 'tar.zst'):
+		raise ArchiveError('worlds can be exported as .zip or .tar.zst')
+	if kind == 'tar.zst' and not zstd_available():
+		raise ArchiveError('exporting .tar.zst needs the zstandard package')
+	started = time.monotonic()
+	dirs, files = plan_tree(world_path)
+	prefix = os.path.basename(os.path.normpath(world_path)) + '/'
+	progress = _Progress(progress_cb, sum(s for _, s in files), len(files))
+	progress.add(0, 0)
+	tmp = dest_path + '.part'
+	try:
+		with open(tmp, 'wb') as f:
+			if kind == 'zip':
+				counts = _export_zip(world_path, f, prefix, dirs, files, progress, max_workers, cancel)
+			else:
+				counts = _export_tar_zst(world_path, f, prefix, dirs, files, progress, cancel)
+		os.replace(tmp, dest_path)
+	except BaseException:
+		try:
+			os.remove(tmp)
+		except OSError:
+			pass
+		raise
+	return dict(counts, files=len(files), bytes=progress.total_bytes, archive_bytes=os.path.getsize(dest_path),
+				elapsed_ms=(time.monotonic() - started) * 1000.0)
+
+
+def _extract_zip(archive_path: str, staging: str, max_workers: int, progress_cb: ProgressCallback,
+				 cancel: Optional[threading.Event]) -> int:
+	with zipfile.ZipFile(archive_path) as zf:
+		infos = zf.infolist()
+		root = find_world_root(i.filename for i in infos)
+		if root is None:
+			raise ArchiveError('the archive does not contain a world (level.dat and a region folder)')
+		members = []
+		for info in infos:
+			name = info.filename.replace('\\', '/').lstrip('/')
+			if not name.startswith(root):
+				continue
+			rel = _safe_rel(name[len(root):])
+			if rel is None:
+				raise ArchiveError(f'unsafe path in archive: {info.filename}')
+			if not rel:
+				continue
+			if info.is_dir():
+				os.makedirs(os.path.join(staging, rel), exist_ok=True)
+			else:
+				members.append((info, rel))
+		members.sort(key=lambda m: m[0].file_size, reverse=True)
+		progress = _Progress(progress_cb, sum(i.file_size for i, _ in members), len(members))
+		progress.add(0, 0)
+		lock = threading.Lock()
+		failed = threading.Event()
+
+		def _one(info, rel):
+			if failed.is_set() or (cancel is not None and cancel.is_set()):
+				raise CopyCancelled()
+			path = os.path.join(staging, rel)
+			os.makedirs(os.path.dirname(path), exist_ok=True)
+			# ZipFile serialises reads of the shared handle; inflating happens here, in parallel
+			with zf.open(info) as src, open(path, 'wb') as out:
+				shutil.copyfileobj(src, out, COPY_CHUNK)
+			try:
+				mtime = time.mktime(info.date_time + (0, 0, -1))
+				os.utime(path, (mtime, mtime))
+			except Exception:
+				pass
+			with lock:
+				progress.add(info.file_size)
+
+		with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix='yali-unzip') as pool:
+			futures = [pool.submit(_one, info, rel) for info, rel in members]
+			error: Optional[BaseException] = None
+			for fut in futures:
+				try:
+					fut.result()
+				except BaseException as e:
+					if error is None or (isinstance(error, CopyCancelled) and not isinstance(e, CopyCancelled)):
+						error = e
+					failed.set()
+			if error is not None:
+				raise error
+	return len(members)
+
+
+def _extract_tar(archive_path: str, kind: str, staging: str, progress_cb: ProgressCallback,
+				 cancel: Optional[threading.Event]) -> int:
+	"""Extract a tar stream into `staging`; the world root is located afterwards."""
+	total = os.path.getsize(archive_path)
+	count = 0
+	data_filter = getattr(tarfile, 'data_filter', None)
+	with open(archive_path, 'rb') as raw:
+		if kind == 'tar.zst':
+			if not zstd_available():
+				raise ArchiveError('importing .tar.zst needs the zstandard package')
+			stream = zstd.ZstdDecompressor().stream_reader(raw)
+			tar = tarfile.open(fileobj=stream, mode='r|')
+		else:
+			tar = tarfile.open(fileobj=raw, mode='r|*')
+		with tar:
+			for member in tar:
+				if cancel is not None and cancel.is_set():
+					raise CopyCancelled()
+				if _safe_rel(member.name) is None or not (member.isfile() or member.isdir()):
+					raise ArchiveError(f'unsafe entry in archive: {member.name}')
+				if data_filter is not None:
+					tar.extract(member, staging, filter='data')
+				else:
+					tar.extract(member, staging)
+				if member.isfile():
+					count += 1
+					if progress_cb:
+						try:
+							# compressed bytes consumed is the only total known up front
+							progress_cb(min(raw.tell(), total), total, count, 0)
+						except Exception:
+							pass
+	return count
+
+
+def _locate_world(staging: str) -> Optional[str]:
+	"""Shallowest directory below `staging` (itself included) that is a valid world."""
+	level = [staging]
+	while level:
+		for path in level:
+			if is_valid_world(path):
+				return path
+		nxt = []
+		for path in level:
+			try:
+				with os.scandir(path) as it:
+					nxt.extend(e.path for e in it if e.is_dir(follow_symlinks=False))
+			except OSError:
+				continue
+		level = sorted(nxt)
+	return None
+
+
+def import_world(archive_path: str, dest_path: str, max_workers: int = DEFAULT_WORKERS, progress_cb: ProgressCallback = None,
+				 cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+	"""Extract the world in `archive_path` to `dest_path` (which must not exist).
+
+	Raises ArchiveError if the archive holds no valid world; nothing is left
+	behind on failure. Returns {'files', 'elapsed_ms'}.
+	"""
+	kind = archive_kind(archive_path)
+	if kind is None:
+		raise ArchiveError(f'unsupported archive: {os.path.basename(archive_path)}')
+	if os.path.exists(dest_path):
+		raise FileExistsError(dest_path)
+	started = time.monotonic()
+	parent, name = os.path.split(os.path.abspath(dest_path))
+	staging = os.path.join(parent, f".{name}.import-{time.strftime('%Y%m%d-%H%M%S')}")
+	os.makedirs(staging)
+	try:
+		if kind == 'zip':
+			count = _extract_zip(archive_path, staging, max_workers, progress_cb, cancel)
+			world = staging
+		else:
+			count = _extract_tar(archive_path, kind, staging, progress_cb, cancel)
+			world = _locate_world(staging)
+		if world is None or not is_valid_world(world):
+			raise ArchiveError('the archive does not contain a world (level.dat and a region folder)')
+		os.rename(world, dest_path)
+	finally:
+		shutil.rmtree(staging, ignore_errors=True)
+	return {'files': count, 'elapsed_ms': (time.monotonic() - started) * 1000.0}
+
+
+if __name__ == '__main__':
+	import argparse
+
+	parser = argparse.ArgumentParser(description='Export or import a world archive')
+	sub = parser.add_subparsers(dest='cmd', required=True)
+	p_export = sub.add_parser('export', help='write a world to a .zip or .tar.zst archive')
+	p_export.add_argument('world')
+	p_export.add_argument('archive')
+	p_import = sub.add_parser('import', help='extract the world in an archive to a new folder')
+	p_import.add_argument('archive')
+	p_import.add_argument('dest')
+	parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+	args = parser.parse_args()
+
+	if args.cmd == 'export':
+		r = export_world(args.world, args.archive, max_workers=args.workers)
+		print(f"{r['files']} files ({r['deflated']} deflated, {r['stored']} stored), "
+			  f"{r['bytes'] / (1024 * 1024):.1f} MB -> {r['archive_bytes'] / (1024 * 1024):.1f} MB in {r['elapsed_ms']:.0f} ms")
+	else:
+		r = import_world(args.archive, args.dest, max_workers=args.workers)
+		print(f"extracted {r['files']} files in {r['elapsed_ms']:.0f} ms")
@@ -0,0 +1,133 @@
+"""Consistent backups of a world that a running server may be writing.
+
+While the server is up, `SaveLock` brackets the copy with the vanilla save
+commands:
+
+- `save-off` stops autosave so region files stop changing;
+- `save-all flush` writes everything pending, and we wait for the
+  "Saved the game" console line;
+- the files are copied (for a snapshot, only the files changed since the
+  last one, into a staging folder);
+- `save-on` re-enables autosave, whatever happened during the copy.
+
+Commands go out through a `send(command)` callable and console lines come
+back through `feed(line)`, so the caller keeps ownership of the server
+process. The time autosave was off is kept in `unsafe_seconds`.
+
+`backup_world` makes a full copy; `snapshot_world` stores a chunk-level
+differential snapshot (see `diffbackup`).
+"""
+import os
+import re
+import time
+import shutil
+import threading
+from typing import Optional, Callable, Dict, Any
+from .copier import copy_tree, ProgressCallback, DEFAULT_WORKERS
+from .diffbackup import DiffRepository
+
+SAVE_TIMEOUT = 120.0
+
+SAVED_RE = re.compile(r'Saved the (game|world)', re.IGNORECASE)
+
+
+class SaveTimeout(Exception):
+	pass
+
+
+class SaveLock:
+	"""Context manager holding the server in save-off for the duration of a copy."""
+
+	def __init__(self, send: Callable[[str], None], timeout: float = SAVE_TIMEOUT):
+		self.send = send
+		self.timeout = timeout
+		self.unsafe_seconds: Optional[float] = None
+		self.flush_seconds: Optional[float] = None
+		self._saved = threading.Event()
+		self._off_at: Optional[float] = None
+
+	def feed(self, line: str):
+		"""Pass server console output here while the lock is active."""
+		if SAVED_RE.search(line or ''):
+			self._saved.set()
+
+	def server_stopped(self):
+		"""The server exited (and saved on the way out); stop waiting for the flush."""
+		self._saved.set()
+
+	def __enter__(self):
+		# a "Saved the game" from an earlier autosave or lock must not count as this flush
+		self._saved.clear()
+		self._off_at = time.monotonic()
+		self.send('save-off')
+		self.send('save-all flush')
+		if not self._saved.wait(self.timeout):
+			self._release()
+			raise SaveTimeout(f"server did not confirm the save within {self.timeout:.0f}s")
+		self.flush_seconds = time.monotonic() - self._off_at
+		return self
+
+	def _release(self):
+		if self._off_at is None:
+			return
+		try:
+			self.send('save-on')
+		finally:
+			self.unsafe_seconds = time.monotonic() - self._off_at
+			self._off_at = None
+
+	def __exit__(self, exc_type, exc, tb):
+		self._release()
+		return False
+
+
+def backup_world(world_path: str, dest_path: str, save_lock: Optional[SaveLock] = None,
+				 progress_cb: ProgressCallback = None, cancel: Optional[threading.Event] = None,
+				 max_workers: int = DEFAULT_WORKERS) -> Dict[str, Any]:
+	"""Copy `world_path` to `dest_path`, under `save_lock` when the server is running.
+
+	Returns the copier stats plus `unsafe_seconds` and `flush_seconds`
+	(None for offline backups). A failed or cancelled copy removes
+	`dest_path` and re-raises.
+	"""
+	if os.path.exists(dest_path):
+		raise FileExistsError(dest_path)
+	try:
+		if save_lock is not None:
+			with save_lock:
+				stats = copy_tree(world_path, dest_path, max_workers=max_workers, progress_cb=progress_cb, cancel=cancel)
+		else:
+			stats = copy_tree(world_path, dest_path, max_workers=max_workers, progress_cb=progress_cb, cancel=cancel)
+	except BaseException:
+		if os.path.isdir(dest_path):
+			shutil.rmtree(dest_path, ignore_errors=True)
+		raise
+	stats['unsafe_seconds'] = save_lock.unsafe_seconds if save_lock is not None else None
+	stats['flush_seconds'] = save_lock.flush_seconds if save_lock is not None else None
+	return stats
+
+
+def snapshot_world(world_path: str, repo: DiffRepository, save_lock: Optional[SaveLock] = None,
+				   progress_cb: Optional[Callable[[int, int], None]] = None,
+				   cancel: Optional[threading.Event] = None, tag: str = 'manual') -> Dict[str, Any]:
+	"""Take a chunk-level differential snapshot of `world_path` into `repo`.
+
+	With `save_lock`, autosave is off only while the changed files are
+	staged in a hidden folder next to the world (`DiffRepository.stage`);
+	the diff itself runs from that copy after save-on. Returns the snapshot
+	stats plus `unsafe_seconds` and `flush_seconds`.
+	"""
+	if save_lock is not None:
+		parent, name = os.path.split(os.path.abspath(world_path))
+		staging = os.path.join(parent, f".{name}.snapshot-{time.strftime('%Y%m%d-%H%M%S')}")
+		try:
+			with save_lock:
+				staged = repo.stage(world_path, staging, cancel=cancel)
+			stats = repo.create(world_path, progress_cb=progress_cb, cancel=cancel, tag=tag, staged=staged)
+		finally:
+			shutil.rmtree(staging, ignore_errors=True)
+	else:
+		stats = repo.create(world_path, progress_cb=progress_cb, cancel=cancel, tag=tag)
+	stats['unsafe_seconds'] = save_lock.unsafe_seconds if save_lock is not None else None
+	stats['flush_seconds'] = save_lock.flush_seconds if save_lock is not None else None
+	return stats
@@ -0,0 +1,142 @@
+"""Parallel directory copier used for world imports and backups.
+
+`copy_tree(src, dst)` lists the tree once with `os.scandir`, creates the
+directory skeleton, then copies files on a thread pool with
+`fsutil.fast_copy` (reflink clone, else in-kernel copy_file_range /
+sendfile, else a buffered copy). Region files are many and similarly
+sized, so a handful of workers keeps the disk busy where
+`shutil.copytree` would copy them one at a time.
+
+- `progress_cb(done_bytes, total_bytes, done_files, total_files)` is called
+  from worker threads as data is copied.
+- Setting `cancel` (a `threading.Event`) stops the copy between blocks.
+- The tree is built in a hidden staging folder next to `dst` and renamed
+  into place at the end, so a failed or cancelled copy leaves nothing at
+  `dst`.
+
+Hardlinks are never used: the server rewrites region files in place, so a
+linked world would change its source as well.
+"""
+import os
+import time
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Callable, Dict, Any, List, Tuple
+from ..fsutil import fast_copy, CopyCancelled
+
+DEFAULT_WORKERS = 8
+
+ProgressCallback = Optional[Callable[[int, int, int, int], None]]
+
+
+def plan_tree(src: str) -> Tuple[List[str], List[Tuple[str, int]]]:
+	"""Return (relative dirs, [(relative file, size)]) below `src`."""
+	dirs: List[str] = []
+	files: List[Tuple[str, int]] = []
+	stack = ['']
+	while stack:
+		rel = stack.pop()
+		with os.scandir(os.path.join(src, rel) if rel else src) as it:
+			for entry in it:
+				child = os.path.join(rel, entry.name) if rel else entry.name
+				try:
+					if entry.is_dir(follow_symlinks=False):
+						dirs.append(child)
+						stack.append(child)
+					elif entry.is_file(follow_symlinks=False):
+						files.append((child, entry.stat(follow_symlinks=False).st_size))
+				except OSError:
+					continue
+	return dirs, files
+
+
+def copy_tree(src: str, dst: str, max_workers: int = DEFAULT_WORKERS, progress_cb: ProgressCallback = None,
+			  cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+	"""Copy the tree at `src` to `dst` (which must not exist yet).
+
+	Returns `{'files', 'bytes', 'elapsed_ms', 'methods'}`, `methods` counting
+	files per copy mechanism. Raises CopyCancelled if `cancel` is set before
+	all files were copied.
+	"""
+	started = time.monotonic()
+	if os.path.exists(dst):
+		raise FileExistsError(dst)
+	dirs, files = plan_tree(src)
+	parent, name = os.path.split(os.path.abspath(dst))
+	staging = os.path.join(parent, f".{name}.copy-{time.strftime('%Y%m%d-%H%M%S')}")
+
+	total_bytes = sum(size for _, size in files)
+	total_files = len(files)
+	lock = threading.Lock()
+	failed = threading.Event()
+	done = {'bytes': 0, 'files': 0}
+	methods: Dict[str, int] = {}
+	# largest first so a few big region files do not trail at the end
+	files.sort(key=lambda f: f[1], reverse=True)
+
+	def _report(nbytes: int, nfiles: int):
+		with lock:
+			done['bytes'] += nbytes
+			done['files'] += nfiles
+			snapshot = (done['bytes'], total_bytes, done['files'], total_files)
+		if progress_cb:
+			try:
+				progress_cb(*snapshot)
+			except Exception:
+				pass
+
+	def _copy(rel: str, size: int):
+		if failed.is_set() or (cancel is not None and cancel.is_set()):
+			raise CopyCancelled()
+		copied = [0]
+
+		def _bytes(n):
+			copied[0] += n
+			_report(n, 0)
+
+		method = fast_copy(os.path.join(src, rel), os.path.join(staging, rel), progress=_bytes, cancel=cancel)
+		with lock:
+			methods[method] = methods.get(method, 0) + 1
+		# the file may have changed size since it was listed
+		_report(size - copied[0], 1)
+
+	_report(0, 0)
+	try:
+		os.makedirs(staging)
+		for rel in sorted(dirs):
+			os.makedirs(os.path.join(staging, rel), exist_ok=True)
+		with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix='yali-copy') as pool:
+			futures = [pool.submit(_copy, rel, size) for rel, size in files]
+			error: Optional[BaseException] = None
+			for fut in as_completed(futures):
+				try:
+					fut.result()
+				except BaseException as e:
+					if error is None or (isinstance(error, CopyCancelled) and not isinstance(e, CopyCancelled)):
+						error = e
+					failed.set()
+			if error is not None:
+				raise error
+		os.rename(staging, dst)
+	except BaseException:
+		shutil.rmtree(staging, ignore_errors=True)
+		raise
+
+	return {'files': total_files, 'bytes': total_bytes, 'elapsed_ms': (time.monotonic() - started) * 1000.0, 'methods': methods}
+
+
+if __name__ == '__main__':
+	import argparse
+
+	parser = argparse.ArgumentParser(description='Copy a directory tree with the world copier')
+	parser.add_argument('src')
+	parser.add_argument('dst')
+	parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+	args = parser.parse_args()
+
+	r = copy_tree(args.src, args.dst, max_workers=args.workers)
+	secs = r['elapsed_ms'] / 1000.0
+	rate = r['bytes'] / (1024 * 1024) / secs if secs else 0.0
+	print(f"{r['files']} files, {r['bytes'] / (1024 * 1024):.1f} MB in {r['elapsed_ms']:.0f} ms ({rate:.0f} MB/s) "
+		  f"{', '.join(f'{k}: {v}' for k, v in sorted(r['methods'].items()))}")
@@ -0,0 +1,787 @@
+"""Chunk-level differential snapshots of a Minecraft world.
+
+A repository holds any number of snapshots of one world:
+- `packs/<id>.pack`: the bytes snapshot `<id>` had to add (chunk payloads,
+  whole files and chunk tables), appended back to back.
+- `snapshots/<id>.json.gz`: the manifest, mapping every file of the world
+  to data in the packs. A snapshot exists once its manifest exists.
+
+Each snapshot is diffed against its parent (by default the newest one):
+- a file whose size and mtime are unchanged reuses the parent entry
+  without being read;
+- for region files (`.mca`) only the 8 KiB header is read, and a chunk is
+  stored only if its timestamp or location changed *and* its payload hash
+  differs from the parent's;
+- other files are stored whole when their content hash changed.
+
+Whole files are also content addressed: `objects.json` maps content hashes
+to pack data, so a file that moved or went back to older content is not
+stored again.
+
+Restoring rebuilds region files from their chunk tables with
+`anvil.write_region`. Every manifest describes the whole world, so any
+snapshot restores directly, but its data may live in older packs.
+
+Housekeeping:
+- `forget(policy)` drops snapshots outside a keep-last / hourly / daily /
+  weekly retention policy (stored in `policy.json`).
+- `prune()` deletes packs nothing references any more and rewrites packs
+  that are mostly garbage into a fresh `gc-*` pack, updating manifests.
+- `restore_into(id, world_path)` rebuilds a snapshot next to the world and
+  swaps it in with renames, so the world is never half restored.
+"""
+import os
+import gzip
+import json
+import time
+import zlib
+import hashlib
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Dict, Any, List, Set, Tuple
+from . import anvil
+from .copier import plan_tree, CopyCancelled
+from ..fsutil import fast_copy
+from ..appdata import get_app_data_dir
+
+DEFAULT_WORKERS = 4
+COPY_CHUNK = 1024 * 1024
+
+DEFAULT_POLICY = {'keep_last': 5, 'hourly': 24, 'daily': 7, 'weekly': 4}
+
+# packs with less than this fraction of live bytes are rewritten by prune()
+REPACK_BELOW = 0.5
+
+ProgressCallback = Optional[Callable[[int, int], None]]
+
+
+def _hash(data: bytes) -> str:
+	return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+_repo_locks: Dict[str, threading.RLock] = {}
+_repo_locks_guard = threading.Lock()
+
+
+def _repo_lock(root: str) -> threading.RLock:
+	"""One lock per repository folder, shared by every DiffRepository instance on it."""
+	key = os.path.normcase(os.path.abspath(root))
+	with _repo_locks_guard:
+		lock = _repo_locks.get(key)
+		if lock is None:
+			lock = _repo_locks[key] = threading.RLock()
+		return lock
+
+
+def select_retained(snapshots: List[Tuple[str, float]], policy: Dict[str, int]) -> Set[str]:
+	"""Return the ids kept by `policy` from (id, created) pairs.
+
+	Keeps the newest `keep_last`, then the newest snapshot in each of the
+	last `hourly` hours, `daily` days and `weekly` ISO weeks that have one.
+	The newest snapshot is always kept.
+	"""
+	ordered = sorted(snapshots, key=lambda s: s[1], reverse=True)
+	keep = {sid for sid, _ in ordered[:max(1, int(policy.get('keep_last', 0)))]}
+	for fmt, key in (('%Y-%m-%d %H', 'hourly'), ('%Y-%m-%d', 'daily'), ('%G-%V', 'weekly')):
+		limit = int(policy.get(key, 0))
+		buckets = set()
+		for sid, created in ordered:
+			if len(buckets) >= limit:
+				break
+			bucket = time.strftime(fmt, time.localtime(created))
+			if bucket not in buckets:
+				buckets.add(bucket)
+				keep.add(sid)
+	return keep
+
+
+def _id_order(snapshot_id: str):
+	# ids are '<YYYYmmdd-HHMMSS>' with a '-<n>' suffix for same-second snapshots
+	suffix = snapshot_id[16:]
+	return snapshot_id[:15], int(suffix) if suffix.isdigit() else 1
+
+
+class _PackWriter:
+	"""Append-only pack file shared by the snapshot workers."""
+
+	def __init__(self, pack_id: str, path: str):
+		self.pack_id = pack_id
+		self.path = path
+		self.tmp = path + '.tmp'
+		self._lock = threading.Lock()
+		self._f = open(self.tmp, 'wb')
+		self.size = 0
+
+	def append(self, data: bytes) -> List[Any]:
+		with self._lock:
+			offset = self.size
+			self._f.write(data)
+			self.size += len(data)
+		return [self.pack_id, offset, len(data)]
+
+	def append_file(self, path: str, size: int) -> List[Any]:
+		with self._lock:
+			offset = self.size
+			written = 0
+			with open(path, 'rb') as src:
+				while written < size:
+					block = src.read(min(COPY_CHUNK, size - written))
+					if not block:
+						break
+					self._f.write(block)
+					written += len(block)
+			self.size += written
+		return [self.pack_id, offset, written]
+
+	def commit(self) -> bool:
+		"""Close and publish the pack; an empty pack is discarded. Returns True if kept."""
+		self._f.close()
+		if self.size == 0:
+			os.remove(self.tmp)
+			return False
+		os.replace(self.tmp, self.path)
+		return True
+
+	def discard(self):
+		try:
+			self._f.close()
+		except Exception:
+			pass
+		try:
+			os.remove(self.tmp)
+		except OSError:
+			pass
+
+
+class _PackReader:
+	"""Read refs from pack files, keeping one handle per pack and thread."""
+
+	def __init__(self, packs_dir: str):
+		self.packs_dir = packs_dir
+		self._local = threading.local()
+		self._open = []
+		self._open_lock = threading.Lock()
+
+	def read(self, ref: List[Any]) -> bytes:
+		pack_id, offset, length = ref
+		handles = getattr(self._local, 'handles', None)
+		if handles is None:
+			handles = self._local.handles = {}
+		f = handles.get(pack_id)
+		if f is None:
+			f = handles[pack_id] = open(os.path.join(self.packs_dir, f'{pack_id}.pack'), 'rb')
+			with self._open_lock:
+				self._open.append(f)
+		f.seek(offset)
+		data = f.read(length)
+		if len(data) != length:
+			raise IOError(f'pack {pack_id} is truncated')
+		return data
+
+	def close(self):
+		"""Close every handle opened by any thread (packs cannot be deleted on Windows otherwise)."""
+		with self._open_lock:
+			for f in self._open:
+				try:
+					f.close()
+				except Exception:
+					pass
+			self._open = []
+		self._local = threading.local()
+
+	def copy_to(self, ref: List[Any], dest):
+		pack_id, offset, length = ref
+		with open(os.path.join(self.packs_dir, f'{pack_id}.pack'), 'rb') as f:
+			f.seek(offset)
+			remaining = length
+			while remaining > 0:
+				block = f.read(min(COPY_CHUNK, remaining))
+				if not block:
+					raise IOError(f'pack {pack_id} is truncated')
+				dest.write(block)
+				remaining -= len(block)
+
+
+class _LockedDict:
+	"""get/set on a dict shared by the snapshot workers."""
+
+	def __init__(self, data: Dict[str, Any], lock: threading.Lock):
+		self._data = data
+		self._lock = lock
+
+	def get(self, key, default=None):
+		with self._lock:
+			return self._data.get(key, default)
+
+	def __setitem__(self, key, value):
+		with self._lock:
+			self._data[key] = value
+
+
+class DiffRepository:
+	"""Snapshot store for one world; see the module docstring for the format."""
+
+	def __init__(self, root: str):
+		self.root = root
+		self.packs_dir = os.path.join(root, 'packs')
+		self.snapshots_dir = os.path.join(root, 'snapshots')
+		os.makedirs(self.packs_dir, exist_ok=True)
+		os.makedirs(self.snapshots_dir, exist_ok=True)
+		self._lock = _repo_lock(root)
+
+	@classmethod
+	def for_world(cls, world_path: str) -> 'DiffRepository':
+		"""Return the repository kept in app data for `world_path`."""
+		norm = os.path.normcase(os.path.abspath(world_path))
+		key = hashlib.sha1(norm.encode('utf-8')).hexdigest()[:16]
+		root = get_app_data_dir('snapshots', key)
+		try:
+			meta = os.path.join(root, 'meta.json')
+			if not os.path.exists(meta):
+				with open(meta, 'w', encoding='utf-8') as f:
+					json.dump({'world': norm}, f)
+		except Exception:
+			pass
+		return cls(root)
+
+	def _manifest_path(self, snapshot_id: str) -> str:
+		return os.path.join(self.snapshots_dir, f'{snapshot_id}.json.gz')
+
+	def snapshot_ids(self) -> List[str]:
+		"""Committed snapshot ids, oldest first."""
+		ids = [n[:-len('.json.gz')] for n in os.listdir(self.snapshots_dir) if n.endswith('.json.gz')]
+		return sorted(ids, key=_id_order)
+
+	def load(self, snapshot_id: str) -> Dict[str, Any]:
+		with gzip.open(self._manifest_path(snapshot_id), 'rt', encoding='utf-8') as f:
+			return json.load(f)
+
+	def _read_json(self, name: str, default):
+		try:
+			with open(os.path.join(self.root, name), 'r', encoding='utf-8') as f:
+				return json.load(f)
+		except Exception:
+			return default
+
+	def _write_json(self, name: str, data):
+		path = os.path.join(self.root, name)
+		tmp = path + '.tmp'
+		with open(tmp, 'w', encoding='utf-8') as f:
+			json.dump(data, f, separators=(',', ':'))
+		os.replace(tmp, path)
+
+	def policy(self) -> Dict[str, int]:
+		"""The retention policy of this repository (DEFAULT_POLICY until one is set)."""
+		stored = self._read_json('policy.json', {})
+		return {k: int(stored.get(k, v)) for k, v in DEFAULT_POLICY.items()}
+
+	def set_policy(self, policy: Dict[str, int]):
+		self._write_json('policy.json', {k: max(0, int(policy.get(k, v))) for k, v in DEFAULT_POLICY.items()})
+
+	def summaries(self) -> List[Dict[str, Any]]:
+		"""id, created, tag and stats of every snapshot, newest first.
+
+		Read from `index.json`; manifests are only opened for snapshots the
+		index does not know yet.
+		"""
+		with self._lock:
+			index = self._read_json('index.json', {})
+			ids = self.snapshot_ids()
+			changed = set(index) != set(ids)
+			for snapshot_id in ids:
+				if snapshot_id not in index:
+					try:
+						m = self.load(snapshot_id)
+						index[snapshot_id] = {'created': m.get('created', 0), 'tag': m.get('tag', ''), 'stats': m.get('stats', {})}
+					except Exception:
+						continue
+			index = {k: v for k, v in index.items() if k in ids}
+			if changed:
+				try:
+					self._write_json('index.json', index)
+				except Exception:
+					pass
+		out = [dict(v, id=k) for k, v in index.items()]
+		out.sort(key=lambda e: _id_order(e['id']), reverse=True)
+		return out
+
+	def total_size(self) -> int:
+		total = 0
+		for name in os.listdir(self.packs_dir):
+			if name.endswith('.pack'):
+				try:
+					total += os.path.getsize(os.path.join(self.packs_dir, name))
+				except OSError:
+					pass
+		return total
+
+	def latest(self) -> Optional[str]:
+		ids = self.snapshot_ids()
+		return ids[-1] if ids else None
+
+	def _new_id(self) -> str:
+		base = time.strftime('%Y%m%d-%H%M%S')
+		snapshot_id, n = base, 1
+		while os.path.exists(self._manifest_path(snapshot_id)) or os.path.exists(os.path.join(self.packs_dir, f'{snapshot_id}.pack.tmp')):
+			n += 1
+			snapshot_id = f'{base}-{n}'
+		return snapshot_id
+
+	def _read_table(self, reader: _PackReader, entry: Dict[str, Any]) -> Dict[int, List[Any]]:
+		rows = json.loads(zlib.decompress(reader.read(entry['table'])))
+		return {row[0]: row for row in rows}
+
+	def _snapshot_region(self, path, st, prev, pack, reader, stats):
+		prev_table = {}
+		if prev and prev.get('kind') == 'region':
+			try:
+				prev_table = self._read_table(reader, prev)
+			except Exception:
+				prev_table = {}
+		rows = []
+		with open(path, 'rb') as f:
+			for index, offset, count, timestamp in anvil.read_header(f):
+				location = (offset << 8) | count
+				old = prev_table.get(index)
+				if old is not None and old[1] == timestamp and old[2] == location:
+					rows.append(old)
+					continue
+				payload = anvil.read_payload(f, offset, count)
+				stats['bytes_read'] += len(payload)
+				digest = _hash(payload)
+				if old is not None and old[3] == digest:
+					rows.append([index, timestamp, location, digest] + list(old[4:]))
+					continue
+				rows.append([index, timestamp, location, digest] + pack.append(payload))
+				stats['chunks_written'] += 1
+				stats['bytes_written'] += len(payload)
+		stats['chunks'] += len(rows)
+		table = zlib.compress(json.dumps(rows, separators=(',', ':')).encode('utf-8'))
+		table_hash = _hash(table)
+		if prev and prev.get('kind') == 'region' and prev.get('table_hash') == table_hash:
+			table_ref = prev['table']
+		else:
+			table_ref = pack.append(table)
+			stats['bytes_written'] += len(table)
+		return {
+			'kind': 'region', 'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+			'chunks': len(rows), 'table': table_ref, 'table_hash': table_hash,
+		}
+
+	def _snapshot_plain(self, path, st, prev, pack, stats, objects):
+		h = hashlib.blake2b(digest_size=16)
+		with open(path, 'rb') as f:
+			for block in iter(lambda: f.read(COPY_CHUNK), b''):
+				h.update(block)
+		digest = h.hexdigest()
+		stats['bytes_read'] += st.st_size
+		if prev and prev.get('kind') == 'file' and prev.get('hash') == digest:
+			return dict(prev, mtime_ns=st.st_mtime_ns)
+		known = objects.get(digest)
+		if known is not None and known[2] == st.st_size and os.path.exists(os.path.join(self.packs_dir, f'{known[0]}.pack')):
+			ref = list(known)
+		else:
+			ref = pack.append_file(path, st.st_size)
+			objects[digest] = ref
+			stats['files_written'] += 1
+			stats['bytes_written'] += ref[2]
+		return {'kind': 'file', 'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'hash': digest, 'ref': ref}
+
+	def stage(self, world_path: str, staging: str, parent: Optional[str] = 'latest',
+			  cancel: Optional[threading.Event] = None, max_workers: int = DEFAULT_WORKERS) -> Dict[str, Any]:
+		"""Freeze `world_path` for a later `create(..., staged=...)`.
+
+		Lists the world and copies only the files whose size or mtime differ
+		from `parent` into `staging` (created here; the caller removes it).
+		This is the part of a snapshot that needs the world to hold still, so
+		a running server can go back to save-on as soon as it returns.
+		"""
+		with self._lock:
+			if parent == 'latest':
+				parent = self.latest()
+			parent_files = self.load(parent)['files'] if parent else {}
+			dirs, files = plan_tree(world_path)
+			stat = {}
+			changed = []
+			for rel, _ in files:
+				st = os.stat(os.path.join(world_path, rel))
+				stat[rel] = st
+				prev = parent_files.get(rel)
+				if not (prev and prev.get('size') == st.st_size and prev.get('mtime_ns') == st.st_mtime_ns):
+					changed.append(rel)
+			os.makedirs(staging)
+
+			def _copy(rel: str):
+				if cancel is not None and cancel.is_set():
+					raise CopyCancelled()
+				dest = os.path.join(staging, rel)
+				os.makedirs(os.path.dirname(dest), exist_ok=True)
+				fast_copy(os.path.join(world_path, rel), dest, cancel=cancel)
+
+			with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix='yali-stage') as pool:
+				list(pool.map(_copy, changed))
+			return {'parent': parent, 'root': staging, 'dirs': dirs, 'files': files, 'stat': stat, 'changed': set(changed)}
+
+	def create(self, world_path: str, parent: Optional[str] = 'latest', progress_cb: ProgressCallback = None,
+			   cancel: Optional[threading.Event] = None, max_workers: int = DEFAULT_WORKERS, tag: str = 'manual',
+			   staged: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+		"""Snapshot `world_path` and return the manifest's `stats` plus its `id`.
+
+		`parent='latest'` diffs against the newest snapshot; None stores
+		everything. `tag` is a free-form label shown in listings. With
+		`staged` (from `stage()`), the world as it was when staged is stored:
+		changed files are read from the staged copy and `parent` is ignored.
+		"""
+		with self._lock:
+			return self._create(world_path, parent, progress_cb, cancel, max_workers, tag, staged)
+
+	def _create(self, world_path, parent, progress_cb, cancel, max_workers, tag, staged=None):
+		started = time.monotonic()
+		if staged is not None:
+			parent, dirs, files = staged['parent'], staged['dirs'], staged['files']
+		else:
+			if parent == 'latest':
+				parent = self.latest()
+			dirs, files = plan_tree(world_path)
+		parent_files = self.load(parent)['files'] if parent else {}
+		reader = _PackReader(self.packs_dir)
+		stats_lock = threading.Lock()
+		stats = {'files': len(files), 'files_reused': 0, 'files_written': 0, 'chunks': 0, 'chunks_written': 0,
+				 'bytes_total': sum(s for _, s in files), 'bytes_read': 0, 'bytes_written': 0}
+		done = [0]
+		objects = self._read_json('objects.json', {})
+		objects_lock = threading.Lock()
+
+		snapshot_id = self._new_id()
+		pack = _PackWriter(snapshot_id, os.path.join(self.packs_dir, f'{snapshot_id}.pack'))
+
+		def _one(rel: str):
+			if cancel is not None and cancel.is_set():
+				raise CopyCancelled()
+			if staged is not None:
+				st = staged['stat'][rel]
+				path = os.path.join(staged['root'] if rel in staged['changed'] else world_path, rel)
+			else:
+				path = os.path.join(world_path, rel)
+				st = os.stat(path)
+			prev = parent_files.get(rel)
+			local = {k: 0 for k in ('files_reused', 'files_written', 'chunks', 'chunks_written', 'bytes_read', 'bytes_written')}
+			if prev and prev.get('size') == st.st_size and prev.get('mtime_ns') == st.st_mtime_ns:
+				entry = prev
+				local['files_reused'] += 1
+				local['chunks'] += prev.get('chunks', 0)
+			else:
+				entry = None
+				if anvil.looks_like_region(path, st.st_size):
+					try:
+						entry = self._snapshot_region(path, st, prev, pack, reader, local)
+					except anvil.RegionError:
+						entry = None
+				if entry is None:
+					entry = self._snapshot_plain(path, st, prev, pack, local, _LockedDict(objects, objects_lock))
+			with stats_lock:
+				for k, v in local.items():
+					stats[k] += v
+				done[0] += 1
+				count = done[0]
+			if progress_cb:
+				try:
+					progress_cb(count, len(files))
+				except Exception:
+					pass
+			return rel, entry
+
+		try:
+			with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix='yali-snapshot') as pool:
+				entries = dict(pool.map(_one, [rel for rel, _ in files]))
+			pack.commit()
+		except BaseException:
+			pack.discard()
+			raise
+		finally:
+			reader.close()
+
+		stats['elapsed_ms'] = (time.monotonic() - started) * 1000.0
+		manifest = {
+			'id': snapshot_id, 'created': time.time(), 'world': os.path.abspath(world_path), 'tag': tag,
+			'parent': parent, 'dirs': sorted(dirs), 'files': entries, 'stats': stats,
+		}
+		self._write_manifest(manifest)
+		try:
+			self._write_json('objects.json', objects)
+		except Exception:
+			pass
+		return dict(stats, id=snapshot_id, parent=parent)
+
+	def _write_manifest(self, manifest: Dict[str, Any]):
+		path = self._manifest_path(manifest['id'])
+		tmp = path + '.tmp'
+		with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+			json.dump(manifest, f, separators=(',', ':'))
+		os.replace(tmp, path)
+		index = self._read_json('index.json', {})
+		index[manifest['id']] = {'created': manifest.get('created', 0), 'tag': manifest.get('tag', ''), 'stats': manifest.get('stats', {})}
+		try:
+			self._write_json('index.json', index)
+		except Exception:
+			pass
+
+	def restore(self, snapshot_id: str, dest_path: str, progress_cb: ProgressCallback = None,
+				max_workers: int = DEFAULT_WORKERS) -> Dict[str, Any]:
+		"""Recreate snapshot `snapshot_id` as a new directory at `dest_path`.
+
+		A failed restore removes the partial directory.
+		"""
+		if os.path.exists(dest_path):
+			raise FileExistsError(dest_path)
+		with self._lock:
+			started = time.monotonic()
+			manifest = self.load(snapshot_id)
+			reader = _PackReader(self.packs_dir)
+			items = list(manifest['files'].items())
+			lock = threading.Lock()
+			done = [0]
+
+			def _one(item):
+				rel, entry = item
+				path = os.path.join(dest_path, rel)
+				os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+				if entry['kind'] == 'region':
+					chunks = {row[0]: (row[1], reader.read(row[4:7])) for row in self._read_table(reader, entry).values()}
+					anvil.write_region(path, chunks)
+				else:
+					with open(path, 'wb') as out:
+						reader.copy_to(entry['ref'], out)
+				try:
+					os.utime(path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+				except Exception:
+					pass
+				with lock:
+					done[0] += 1
+					count = done[0]
+				if progress_cb:
+					try:
+						progress_cb(count, len(items))
+					except Exception:
+						pass
+
+			try:
+				os.makedirs(dest_path)
+				for rel in manifest.get('dirs', []):
+					os.makedirs(os.path.join(dest_path, rel), exist_ok=True)
+				with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix='yali-restore') as pool:
+					list(pool.map(_one, items))
+			except BaseException:
+				shutil.rmtree(dest_path, ignore_errors=True)
+				raise
+			finally:
+				reader.close()
+			return {'id': snapshot_id, 'files': len(items), 'elapsed_ms': (time.monotonic() - started) * 1000.0}
+
+	def restore_into(self, snapshot_id: str, world_path: str, progress_cb: ProgressCallback = None) -> Dict[str, Any]:
+		"""Replace the world at `world_path` with snapshot `snapshot_id`.
+
+		The snapshot is rebuilt in a hidden sibling folder first; only when
+		that succeeded is the live world renamed away and the new one renamed
+		into place. The server must not be running.
+		"""
+		parent, name = os.path.split(os.path.abspath(world_path))
+		stamp = time.strftime('%Y%m%d-%H%M%S')
+		staging = os.path.join(parent, f'.{name}.restore-{stamp}')
+		replaced = os.path.join(parent, f'.{name}.replaced-{stamp}')
+		result = self.restore(snapshot_id, staging, progress_cb=progress_cb)
+		had_world = os.path.exists(world_path)
+		try:
+			if had_world:
+				os.rename(world_path, replaced)
+			try:
+				os.rename(staging, world_path)
+			except BaseException:
+				if had_world:
+					os.rename(replaced, world_path)
+				raise
+		except BaseException:
+			shutil.rmtree(staging, ignore_errors=True)
+			raise
+		if had_world:
+			shutil.rmtree(replaced, ignore_errors=True)
+		return result
+
+	def delete(self, snapshot_id: str):
+		"""Remove a snapshot's manifest; its data goes on the next `prune()`."""
+		with self._lock:
+			try:
+				os.remove(self._manifest_path(snapshot_id))
+			except FileNotFoundError:
+				pass
+			index = self._read_json('index.json', {})
+			if index.pop(snapshot_id, None) is not None:
+				try:
+					self._write_json('index.json', index)
+				except Exception:
+					pass
+
+	def forget(self, policy: Optional[Dict[str, int]] = None) -> List[str]:
+		"""Delete snapshots not retained by `policy` (default: the stored one). Returns their ids."""
+		policy = self.policy() if policy is None else policy
+		with self._lock:
+			snapshots = [(e['id'], float(e.get('created') or 0)) for e in self.summaries()]
+			keep = select_retained(snapshots, policy)
+			dropped = [sid for sid, _ in snapshots if sid not in keep]
+			for sid in dropped:
+				self.delete(sid)
+			return dropped
+
+	def _collect_refs(self, manifests: List[Dict[str, Any]], reader: _PackReader):
+		"""Return ({pack: {(offset, length)}}, {table_ref_tuple: rows}) for the given manifests."""
+		live: Dict[str, Set[Tuple[int, int]]] = {}
+		tables: Dict[Tuple[str, int, int], List[List[Any]]] = {}
+
+		def _add(ref):
+			live.setdefault(ref[0], set()).add((ref[1], ref[2]))
+
+		for manifest in manifests:
+			for entry in manifest['files'].values():
+				if entry['kind'] == 'region':
+					key = tuple(entry['table'])
+					_add(entry['table'])
+					if key not in tables:
+						tables[key] = list(self._read_table(reader, entry).values())
+						for row in tables[key]:
+							_add(row[4:7])
+				else:
+					_add(entry['ref'])
+		return live, tables
+
+	def prune(self, repack_below: float = REPACK_BELOW) -> Dict[str, Any]:
+		"""Reclaim space from deleted snapshots.
+
+		Unreferenced packs are removed. Packs whose live bytes are below
+		`repack_below` of their size are copied into one new pack and the
+		manifests are rewritten to point there; the old packs are deleted
+		only after every manifest has been updated.
+		"""
+		with self._lock:
+			started = time.monotonic()
+			manifests = [self.load(sid) for sid in self.snapshot_ids()]
+			reader = _PackReader(self.packs_dir)
+			try:
+				live, tables = self._collect_refs(manifests, reader)
+				sizes = {}
+				for name in os.listdir(self.packs_dir):
+					path = os.path.join(self.packs_dir, name)
+					if name.endswith('.pack.tmp'):
+						# left behind by an interrupted snapshot or prune
+						os.remove(path)
+					elif name.endswith('.pack'):
+						sizes[name[:-len('.pack')]] = os.path.getsize(path)
+
+				removed = [pid for pid in sizes if pid not in live]
+				freed = sum(sizes[pid] for pid in removed)
+				repack = set()
+				for pid, ranges in live.items():
+					if pid in sizes and sizes[pid] and sum(length for _, length in ranges) < repack_below * sizes[pid]:
+						repack.add(pid)
+
+				if repack:
+					freed += self._repack(repack, manifests, tables, reader, sizes)
+			finally:
+				reader.close()
+
+			for pid in removed + sorted(repack):
+				try:
+					os.remove(os.path.join(self.packs_dir, f'{pid}.pack'))
+				except OSError:
+					pass
+			objects = self._read_json('objects.json', {})
+			objects = {h: ref for h, ref in objects.items() if ref[0] in live and ref[0] not in repack}
+			for manifest in manifests:
+				for entry in manifest['files'].values():
+					if entry['kind'] == 'file':
+						objects[entry['hash']] = entry['ref']
+			try:
+				self._write_json('objects.json', objects)
+			except Exception:
+				pass
+			return {
+				'packs_removed': len(removed), 'packs_repacked': len(repack), 'bytes_freed': freed,
+				'elapsed_ms': (time.monotonic() - started) * 1000.0,
+			}
+
+	def _repack(self, packs: Set[str], manifests, tables, reader: _PackReader, sizes: Dict[str, int]) -> int:
+		"""Move live data out of `packs` into a new gc pack and rewrite manifests. Returns bytes saved."""
+		pack_id = 'gc-' + self._new_id()
+		writer = _PackWriter(pack_id, os.path.join(self.packs_dir, f'{pack_id}.pack'))
+		moved: Dict[Tuple[str, int, int], List[Any]] = {}
+
+		def _move(ref):
+			key = tuple(ref)
+			if key[0] not in packs:
+				return list(ref)
+			if key not in moved:
+				moved[key] = writer.append(reader.read(list(ref)))
+			return moved[key]
+
+		try:
+			new_tables = {}
+			for key, rows in tables.items():
+				if key[0] not in packs and not any(row[4] in packs for row in rows):
+					continue
+				new_rows = [row[:4] + _move(row[4:7]) for row in rows]
+				blob = zlib.compress(json.dumps(new_rows, separators=(',', ':')).encode('utf-8'))
+				new_tables[key] = (writer.append(blob), _hash(blob))
+			for manifest in manifests:
+				for entry in manifest['files'].values():
+					if entry['kind'] == 'region':
+						replacement = new_tables.get(tuple(entry['table']))
+						if replacement is not None:
+							entry['table'], entry['table_hash'] = replacement
+					else:
+						entry['ref'] = _move(entry['ref'])
+			writer.commit()
+		except BaseException:
+			writer.discard()
+			raise
+		for manifest in manifests:
+			self._write_manifest(manifest)
+		return sum(sizes.get(pid, 0) for pid in packs) - writer.size
+
+
+if __name__ == '__main__':
+	import argparse
+
+	parser = argparse.ArgumentParser(description='Chunk-level differential world snapshots')
+	sub = parser.add_subparsers(dest='cmd', required=True)
+	p_snap = sub.add_parser('snapshot', help='snapshot a world into its app data repository')
+	p_snap.add_argument('world')
+	p_snap.add_argument('--full', action='store_true', help='do not diff against the previous snapshot')
+	p_list = sub.add_parser('list', help='list the snapshots of a world')
+	p_list.add_argument('world')
+	p_prune = sub.add_parser('prune', help='apply the retention policy and reclaim space')
+	p_prune.add_argument('world')
+	p_restore = sub.add_parser('restore', help='restore a snapshot into a new directory')
+	p_restore.add_argument('world')
+	p_restore.add_argument('snapshot')
+	p_restore.add_argument('dest')
+	args = parser.parse_args()
+
+	repo = DiffRepository.for_world(args.world)
+	if args.cmd == 'snapshot':
+		s = repo.create(args.world, parent=None if args.full else 'latest')
+		print(f"{s['id']}: {s['files']} files ({s['files_reused']} unchanged), "
+			  f"{s['chunks_written']}/{s['chunks']} chunks stored, "
+			  f"{s['bytes_written'] / (1024 * 1024):.1f} MB written of {s['bytes_total'] / (1024 * 1024):.1f} MB, "
+			  f"{s['elapsed_ms']:.0f} ms")
+	elif args.cmd == 'list':
+		for snapshot_id in repo.snapshot_ids():
+			s = repo.load(snapshot_id)['stats']
+			print(f"{snapshot_id}  {s['bytes_written'] / (1024 * 1024):8.1f} MB new  {s['files']} files")
+	elif args.cmd == 'prune':
+		dropped = repo.forget()
+		r = repo.prune()
+		print(f"forgot {len(dropped)} snapshot(s); removed {r['packs_removed']} and repacked {r['packs_repacked']} pack(s), "
+			  f"{r['bytes_freed'] / (1024 * 1024):.1f} MB freed")
+	elif args.cmd == 'restore':
+		r = repo.restore(args.snapshot, args.dest)
+		print(f"restored {r['files']} files in {r['elapsed_ms']:.0f} ms")
@@ -0,0 +1,335 @@
+"""World detection and size indexing for the World Manager tab.
+
+`WorldIndexer.scan(server_dir)` finds the worlds in a server directory and
+totals their sizes on a thread pool, calling `on_world(info)` as each world
+finishes so the list can fill in progressively.
+
+Sizes come from `os.scandir` entries. Per-directory totals (own file bytes,
+file count, subdirectory names) are cached in `world_index.json` in app data,
+keyed by the directory's mtime. A directory whose mtime has not changed is
+not listed again, so after the first scan only changed subtrees are
+touched.
+
+A directory's mtime only moves when entries are added, removed or renamed,
+not when an existing file grows in place (region files do). Callers should
+`invalidate()` a server directory after its server has run, and the
+Refresh button passes `force=True`.
+
+Each world's level.dat metadata (`leveldat.read_level`: version, last
+played, game type, ...) is cached in the same file under 'levels', keyed
+by level.dat's mtime and size, so unchanged worlds are not decoded again.
+"""
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Callable, Dict, Any, List, Tuple
+from ..appdata import get_app_data_dir
+from . import leveldat
+
+DEFAULT_WORKERS = 8
+
+# a world has level.dat and at least one of these (relative, '/'-separated)
+REGION_DIRS = ('region', 'DIM-1/region', 'DIM1/region')
+
+
+def _has_region_dir(path: str) -> bool:
+	"""level.dat plus a region folder, with one listing of `path` instead of a probe per candidate."""
+	has_level = False
+	dirs = set()
+	with os.scandir(path) as it:
+		for entry in it:
+			try:
+				if entry.name == 'level.dat':
+					has_level = entry.is_file()
+				elif entry.is_dir():
+					dirs.add(entry.name)
+			except OSError:
+				continue
+	if not has_level:
+		return False
+	for rel in REGION_DIRS:
+		top, _, rest = rel.partition('/')
+		if top in dirs and (not rest or os.path.isdir(os.path.join(path, top, rest))):
+			return True
+	return False
+
+
+def is_valid_world(path: str) -> bool:
+	"""A world folder has level.dat and at least one dimension region folder."""
+	try:
+		return _has_region_dir(path)
+	except OSError:
+		return False
+
+
+_DIMENSION_LABELS = {'overworld': 'Overworld', 'the_nether': 'Nether', 'the_end': 'End'}
+
+
+def region_dirs(path: str) -> List[Tuple[str, str]]:
+	"""Return (dimension label, region folder) for every dimension stored in a world.
+
+	Covers the legacy layout (region/, DIM-1/region, DIM1/region) and the
+	per-dimension layout dimensions/<namespace>/<name>/region. Vanilla
+	dimensions are labelled 'Overworld', 'Nether' and 'End'; others
+	'<namespace>:<name>'.
+	"""
+	out = []
+	for rel, label in (('region', 'Overworld'), ('DIM-1/region', 'Nether'), ('DIM1/region', 'End')):
+		folder = os.path.join(path, *rel.split('/'))
+		if os.path.isdir(folder):
+			out.append((label, folder))
+	root = os.path.join(path, 'dimensions')
+	try:
+		namespaces = sorted(os.listdir(root))
+	except OSError:
+		namespaces = []
+	for namespace in namespaces:
+		try:
+			names = sorted(os.listdir(os.path.join(root, namespace)))
+		except OSError:
+			continue
+		for name in names:
+			folder = os.path.join(root, namespace, name, 'region')
+			if os.path.isdir(folder):
+				label = _DIMENSION_LABELS.get(name, f'{namespace}:{name}') if namespace == 'minecraft' else f'{namespace}:{name}'
+				out.append((label, folder))
+	return out
+
+
+def world_dimensions(path: str) -> List[str]:
+	"""Return the dimensions present in a world ('Overworld', 'Nether', 'End')."""
+	labels = {label for label, _ in region_dirs(path)}
+	dimensions = [d for d in ('Overworld', 'Nether', 'End') if d in labels]
+	if not dimensions:
+		dimensions.append('Overworld')
+	return dimensions
+
+
+def find_worlds(server_dir: str) -> List[str]:
+	"""Return the sorted names of valid worlds directly inside `server_dir`."""
+	worlds = []
+	with os.scandir(server_dir) as it:
+		for entry in it:
+			try:
+				# hidden folders are the copier's and snapshots' staging copies
+				if not entry.name.startswith('.') and entry.is_dir() and _has_region_dir(entry.path):
+					worlds.append(entry.name)
+			except OSError:
+				continue
+	return sorted(worlds)
+
+
+def _key(path: str) -> str:
+	return os.path.normcase(os.path.abspath(path))
+
+
+class WorldIndexer:
+	"""Scan worlds concurrently, reusing cached totals for unchanged directories."""
+
+	def __init__(self, cache_path: Optional[str] = None, max_workers: int = DEFAULT_WORKERS):
+		self.cache_path = cache_path
+		self.max_workers = max(1, int(max_workers))
+		self._lock = threading.Lock()
+		self._dirs: Dict[str, Dict[str, Any]] = {}
+		self._levels: Dict[str, Dict[str, Any]] = {}
+		self._load()
+		self._dirty = False
+
+	def _load(self):
+		if not self.cache_path:
+			return
+		try:
+			with open(self.cache_path, 'r', encoding='utf-8') as f:
+				data = json.load(f)
+			self._dirs = dict(data.get('dirs') or {})
+			self._levels = dict(data.get('levels') or {})
+		except Exception:
+			pass
+
+	def save(self):
+		"""Write the directory cache if it changed."""
+		if not self.cache_path:
+			return
+		with self._lock:
+			if not self._dirty:
+				return
+			payload = {'version': 2, 'dirs': self._dirs, 'levels': self._levels}
+			self._dirty = False
+		tmp = self.cache_path + '.tmp'
+		try:
+			with open(tmp, 'w', encoding='utf-8') as f:
+				json.dump(payload, f)
+			os.replace(tmp, self.cache_path)
+		except Exception:
+			pass
+
+	def invalidate(self, path: Optional[str] = None):
+		"""Forget cached totals under `path` (everything if None)."""
+		with self._lock:
+			if path is None:
+				self._dirs.clear()
+				self._levels.clear()
+			else:
+				prefix = _key(path)
+				for cache in (self._dirs, self._levels):
+					for key in [k for k in cache if k == prefix or k.startswith(prefix + os.sep)]:
+						del cache[key]
+			self._dirty = True
+
+	def level_info(self, world_path: str) -> Optional[Dict[str, Any]]:
+		"""level.dat metadata of a world (see `leveldat.read_level`), None if unreadable."""
+		level_path = os.path.join(world_path, 'level.dat')
+		try:
+			st = os.stat(level_path)
+		except OSError:
+			return None
+		key = _key(level_path)
+		stamp = [st.st_mtime_ns, st.st_size]
+		with self._lock:
+			cached = self._levels.get(key)
+		if cached and cached.get('stamp') == stamp:
+			return dict(cached['level'])
+		try:
+			level = leveldat.read_level(world_path)
+		except Exception:
+			return None
+		with self._lock:
+			self._levels[key] = {'stamp': stamp, 'level': level}
+			self._dirty = True
+		return dict(level)
+
+	def _scan_dir(self, path: str, force: bool):
+		"""Return (path, own_bytes, files, subdir_names, from_cache) for one directory."""
+		key = _key(path)
+		mtime = os.stat(path).st_mtime_ns
+		if not force:
+			with self._lock:
+				cached = self._dirs.get(key)
+			if cached and cached.get('mtime_ns') == mtime:
+				return path, cached['bytes'], cached['files'], cached['subdirs'], True
+
+		own = 0
+		files = 0
+		subdirs = []
+		with os.scandir(path) as it:
+			for entry in it:
+				try:
+					if entry.is_dir(follow_symlinks=False):
+						subdirs.append(entry.name)
+					elif entry.is_file(follow_symlinks=False):
+						own += entry.stat(follow_symlinks=False).st_size
+						files += 1
+				except OSError:
+					continue
+		with self._lock:
+			self._dirs[key] = {'mtime_ns': mtime, 'bytes': own, 'files': files, 'subdirs': subdirs}
+			self._dirty = True
+		return path, own, files, subdirs, False
+
+	def scan(self, server_dir: str, force: bool = False, on_world: Optional[Callable[[Dict[str, Any]], None]] = None,
+			 worlds: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+		"""Index every world in `server_dir` and return one dict per world.
+
+		Each dict has name, path, size, files, dimensions, level (level.dat
+		metadata or None), dirs_scanned, dirs_cached and elapsed_ms. `on_world` is called from this thread
+		as each world completes. Pass `worlds` to skip detection.
+		"""
+		names = find_worlds(server_dir) if worlds is None else list(worlds)
+		state = {}
+		for name in names:
+			path = os.path.join(server_dir, name)
+			state[path] = {
+				'name': name, 'path': path, 'size': 0, 'files': 0,
+				'dirs_scanned': 0, 'dirs_cached': 0, 'pending': 0,
+				'seen': set(), 'started': time.monotonic(),
+			}
+		results = []
+
+		def _finish(info):
+			seen = info.pop('seen')
+			prefix = _key(info['path'])
+			info['level'] = self.level_info(info['path'])
+			with self._lock:
+				for key in [k for k in self._dirs if (k == prefix or k.startswith(prefix + os.sep)) and k not in seen]:
+					del self._dirs[key]
+					self._dirty = True
+			info.pop('pending')
+			info['elapsed_ms'] = (time.monotonic() - info.pop('started')) * 1000.0
+			try:
+				info['dimensions'] = world_dimensions(info['path'])
+			except Exception:
+				info['dimensions'] = ['Overworld']
+			results.append(info)
+			if on_world:
+				try:
+					on_world(dict(info))
+				except Exception:
+					pass
+
+		with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='yali-world-index') as pool:
+			running = {}
+			for path, info in state.items():
+				running[pool.submit(self._scan_dir, path, force)] = info
+				info['pending'] += 1
+			while running:
+				done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+				for fut in done:
+					info = running.pop(fut)
+					info['pending'] -= 1
+					try:
+						path, own, files, subdirs, cached = fut.result()
+					except OSError:
+						subdirs = []
+					else:
+						info['seen'].add(_key(path))
+						info['size'] += own
+						info['files'] += files
+						info['dirs_cached' if cached else 'dirs_scanned'] += 1
+						for name in subdirs:
+							running[pool.submit(self._scan_dir, os.path.join(path, name), force)] = info
+							info['pending'] += 1
+					if info['pending'] == 0:
+						_finish(info)
+
+		self.save()
+		results.sort(key=lambda i: i['name'])
+		return results
+
+
+_indexer: Optional[WorldIndexer] = None
+_indexer_lock = threading.Lock()
+
+
+def get_indexer() -> WorldIndexer:
+	"""Return the shared indexer whose cache lives in the launcher's app data folder."""
+	global _indexer
+	with _indexer_lock:
+		if _indexer is None:
+			_indexer = WorldIndexer(os.path.join(get_app_data_dir(), 'world_index.json'))
+		return _indexer
+
+
+def format_size(size: int) -> str:
+	"""'512.0 MB' / '30.25 GB', as shown in the World Manager."""
+	size_mb = size / (1024 * 1024)
+	if size_mb < 1024:
+		return f"{size_mb:.1f} MB"
+	return f"{size_mb / 1024:.2f} GB"
+
+
+if __name__ == '__main__':
+	import argparse
+
+	parser = argparse.ArgumentParser(description='Index the worlds in a server directory')
+	parser.add_argument('server_dir')
+	parser.add_argument('--force', action='store_true', help='ignore cached directory totals')
+	args = parser.parse_args()
+
+	started = time.monotonic()
+	for info in get_indexer().scan(args.server_dir, force=args.force):
+		print(f"{info['name']:<24} {format_size(info['size']):>10}  {info['files']:>7} files  "
+			  f"{info['dirs_scanned']} scanned / {info['dirs_cached']} cached  [{', '.join(info['dimensions'])}]  "
+			  f"{leveldat.describe(info['level'] or {})}")
+	print(f"{(time.monotonic() - started) * 1000.0:.0f} ms")
@@ -0,0 +1,172 @@
+"""World metadata from level.dat, and the world version a server jar writes.
+
+`read_level(world_path)` decodes only the level.dat fields the World
+Manager shows (with `nbt.select`, so datapack and generator settings are
+skipped, not parsed):
+- name, data_version, version_name, snapshot
+- seed, game_type ('survival', ...), hardcore
+- last_played (epoch seconds), spawn (x, y, z)
+- border: {'size', 'center_x', 'center_z'} when stored in level.dat
+
+`jar_world_version(jar_path)` returns (DataVersion, version name) from a
+server jar's `version.json`. Paperclip jars keep the vanilla jar under
+`META-INF/versions/`, which is opened in place when the outer jar has no
+version.json. Both are cached by mtime and size, the jar result in app
+data since opening a nested jar costs a few hundred milliseconds.
+"""
+import io
+import os
+import json
+import time
+import zipfile
+import threading
+from typing import Optional, Dict, Any, Tuple
+from . import nbt
+from ..appdata import get_app_data_dir
+
+GAME_TYPES = {0: 'survival', 1: 'creative', 2: 'adventure', 3: 'spectator'}
+
+_FIELDS = {
+	('Data', 'LevelName'): 'name',
+	('Data', 'DataVersion'): 'data_version',
+	('Data', 'Version', 'Name'): 'version_name',
+	('Data', 'Version', 'Snapshot'): 'snapshot',
+	('Data', 'WorldGenSettings', 'seed'): 'seed',
+	('Data', 'RandomSeed'): 'legacy_seed',
+	('Data', 'LastPlayed'): 'last_played',
+	('Data', 'GameType'): 'game_type',
+	('Data', 'hardcore'): 'hardcore',
+	('Data', 'SpawnX'): 'spawn_x',
+	('Data', 'SpawnY'): 'spawn_y',
+	('Data', 'SpawnZ'): 'spawn_z',
+	('Data', 'spawn', 'pos'): 'spawn_pos',
+	('Data', 'BorderSize'): 'border_size',
+	('Data', 'BorderCenterX'): 'border_center_x',
+	('Data', 'BorderCenterZ'): 'border_center_z',
+}
+
+
+def parse_level(data: bytes) -> Dict[str, Any]:
+	"""Return the World Manager fields from uncompressed level.dat NBT."""
+	raw = {_FIELDS[path]: value for path, value in nbt.select(data, _FIELDS).items()}
+	info: Dict[str, Any] = {
+		'name': raw.get('name'),
+		'data_version': raw.get('data_version'),
+		'version_name': raw.get('version_name'),
+		'snapshot': bool(raw.get('snapshot', 0)),
+		'seed': raw.get('seed', raw.get('legacy_seed')),
+		'last_played': raw['last_played'] / 1000.0 if raw.get('last_played') else None,
+		'game_type': GAME_TYPES.get(raw.get('game_type'), None),
+		'hardcore': bool(raw.get('hardcore', 0)),
+		'spawn': None,
+		'border': None,
+	}
+	if 'spawn_x' in raw:
+		info['spawn'] = [raw['spawn_x'], raw.get('spawn_y', 0), raw.get('spawn_z', 0)]
+	elif raw.get('spawn_pos'):
+		info['spawn'] = list(raw['spawn_pos'][:3])
+	if 'border_size' in raw:
+		info['border'] = {'size': raw['border_size'], 'center_x': raw.get('border_center_x', 0.0),
+						  'center_z': raw.get('border_center_z', 0.0)}
+	return info
+
+
+def read_level(world_path: str) -> Dict[str, Any]:
+	"""Read level.dat of `world_path`; raises OSError / nbt.NBTError if unreadable."""
+	return parse_level(nbt.read_bytes(os.path.join(world_path, 'level.dat')))
+
+
+def _read_jar_version(jar_path: str) -> Optional[Tuple[int, str]]:
+	def _from(zf: zipfile.ZipFile):
+		if 'version.json' in zf.namelist():
+			with zf.open('version.json') as f:
+				data = json.load(f)
+			if data.get('world_version'):
+				return int(data['world_version']), str(data.get('name') or data.get('id') or '')
+		return None
+
+	with zipfile.ZipFile(jar_path) as zf:
+		found = _from(zf)
+		if found:
+			return found
+		nested = [n for n in zf.namelist() if n.startswith('META-INF/versions/') and n.endswith('.jar')]
+		for name in nested:
+			with zf.open(name) as f:
+				inner = io.BytesIO(f.read())
+			with zipfile.ZipFile(inner) as izf:
+				found = _from(izf)
+			if found:
+				return found
+	return None
+
+
+_jar_cache: Optional[Dict[str, Any]] = None
+_jar_lock = threading.Lock()
+
+
+def _jar_cache_path() -> str:
+	return os.path.join(get_app_data_dir(), 'jar_versions.json')
+
+
+def jar_world_version(jar_path: str) -> Optional[Tuple[int, str]]:
+	"""(DataVersion, version name) of the worlds `jar_path` writes, or None if unknown."""
+	global _jar_cache
+	try:
+		st = os.stat(jar_path)
+	except OSError:
+		return None
+	key = os.path.normcase(os.path.abspath(jar_path))
+	stamp = [st.st_mtime_ns, st.st_size]
+	with _jar_lock:
+		if _jar_cache is None:
+			try:
+				with open(_jar_cache_path(), 'r', encoding='utf-8') as f:
+					_jar_cache = dict(json.load(f))
+			except Exception:
+				_jar_cache = {}
+		cached = _jar_cache.get(key)
+	if cached and cached.get('stamp') == stamp:
+		value = cached.get('version')
+		return tuple(value) if value else None
+	try:
+		value = _read_jar_version(jar_path)
+	except Exception:
+		value = None
+	with _jar_lock:
+		_jar_cache[key] = {'stamp': stamp, 'version': list(value) if value else None}
+		try:
+			tmp = _jar_cache_path() + '.tmp'
+			with open(tmp, 'w', encoding='utf-8') as f:
+				json.dump(_jar_cache, f)
+			os.replace(tmp, _jar_cache_path())
+		except Exception:
+			pass
+	return value
+
+
+def describe(info: Dict[str, Any]) -> str:
+	"""'1.21.1, survival, last played 2024-08-01 18:20' style summary for the world list."""
+	parts = []
+	if info.get('version_name'):
+		parts.append(info['version_name'])
+	if info.get('game_type'):
+		parts.append('hardcore' if info.get('hardcore') else info['game_type'])
+	if info.get('last_played'):
+		parts.append('last played ' + time.strftime('%Y-%m-%d %H:%M', time.localtime(info['last_played'])))
+	return ', '.join(parts)
+
+
+if __name__ == '__main__':
+	import argparse
+
+	parser = argparse.ArgumentParser(description='Show level.dat metadata of a world or the world version of a server jar')
+	parser.add_argument('path', help='world folder or server jar')
+	args = parser.parse_args()
+
+	started = time.monotonic()
+	if os.path.isdir(args.path):
+		for key, value in read_level(args.path).items():
+			print(f"{key:<14} {value}")
+	else:
+		print(jar_world_version(args.path))
+	print(f"{(time.monotonic() - started) * 1000.0:.1f} ms")
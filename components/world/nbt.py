@@ -0,0 +1,286 @@
+"""Minimal NBT decoding for chunk and level.dat inspection.
+
+`parse(data)` decodes a whole uncompressed NBT document into Python values
+(compounds become dicts, lists lists, arrays `bytes`/tuples). `find(data,
+names)` is the fast path used for chunks: it walks the document without
+building values and returns only the named tags found in the root
+compound or one compound level below it (pre-1.18 chunks keep their data
+under `Level`), skipping block and entity data by length. `select(data,
+paths)` does the same for exact tag paths (used for level.dat).
+
+`decompress_chunk(payload)` turns a stored region payload (length prefix,
+compression byte, data) into NBT bytes; LZ4 chunks need the optional
+`lz4` package. Corrupt compressed data raises NBTError like any other
+unreadable chunk.
+"""
+import gzip
+import zlib
+import struct
+from typing import Any, Dict, Iterable, Optional, Tuple
+from ..lazyimport import lazy_module, available
+
+lz4_block = lazy_module('lz4.block')
+
+TAG_END = 0
+TAG_BYTE = 1
+TAG_SHORT = 2
+TAG_INT = 3
+TAG_LONG = 4
+TAG_FLOAT = 5
+TAG_DOUBLE = 6
+TAG_BYTE_ARRAY = 7
+TAG_STRING = 8
+TAG_LIST = 9
+TAG_COMPOUND = 10
+TAG_INT_ARRAY = 11
+TAG_LONG_ARRAY = 12
+
+_FIXED = {TAG_BYTE: struct.Struct('>b'), TAG_SHORT: struct.Struct('>h'), TAG_INT: struct.Struct('>i'),
+		  TAG_LONG: struct.Struct('>q'), TAG_FLOAT: struct.Struct('>f'), TAG_DOUBLE: struct.Struct('>d')}
+_ARRAY_ITEM = {TAG_BYTE_ARRAY: 1, TAG_INT_ARRAY: 4, TAG_LONG_ARRAY: 8}
+_U16 = struct.Struct('>H')
+_I32 = struct.Struct('>i')
+
+COMPRESSION_GZIP = 1
+COMPRESSION_ZLIB = 2
+COMPRESSION_NONE = 3
+COMPRESSION_LZ4 = 4
+EXTERNAL_FLAG = 0x80
+
+
+class NBTError(ValueError):
+	pass
+
+
+def _name(data: bytes, pos: int) -> Tuple[str, int]:
+	(length,) = _U16.unpack_from(data, pos)
+	pos += 2
+	return data[pos:pos + length].decode('utf-8', 'replace'), pos + length
+
+
+def _skip(data: bytes, pos: int, tag: int) -> int:
+	"""Return the position after a payload of type `tag` starting at `pos`."""
+	fixed = _FIXED.get(tag)
+	if fixed is not None:
+		return pos + fixed.size
+	if tag in _ARRAY_ITEM:
+		(count,) = _I32.unpack_from(data, pos)
+		return pos + 4 + count * _ARRAY_ITEM[tag]
+	if tag == TAG_STRING:
+		(length,) = _U16.unpack_from(data, pos)
+		return pos + 2 + length
+	if tag == TAG_LIST:
+		item = data[pos]
+		(count,) = _I32.unpack_from(data, pos + 1)
+		pos += 5
+		if item in _FIXED:
+			return pos + count * _FIXED[item].size
+		for _ in range(max(0, count)):
+			pos = _skip(data, pos, item)
+		return pos
+	if tag == TAG_COMPOUND:
+		while True:
+			child = data[pos]
+			pos += 1
+			if child == TAG_END:
+				return pos
+			(length,) = _U16.unpack_from(data, pos)
+			pos = _skip(data, pos + 2 + length, child)
+	raise NBTError(f'unknown tag type {tag}')
+
+
+def _value(data: bytes, pos: int, tag: int) -> Tuple[Any, int]:
+	fixed = _FIXED.get(tag)
+	if fixed is not None:
+		return fixed.unpack_from(data, pos)[0], pos + fixed.size
+	if tag == TAG_BYTE_ARRAY:
+		(count,) = _I32.unpack_from(data, pos)
+		return bytes(data[pos + 4:pos + 4 + count]), pos + 4 + count
+	if tag in (TAG_INT_ARRAY, TAG_LONG_ARRAY):
+		(count,) = _I32.unpack_from(data, pos)
+		fmt = f">{count}{'i' if tag == TAG_INT_ARRAY else 'q'}"
+		return struct.unpack_from(fmt, data, pos + 4), pos + 4 + count * _ARRAY_ITEM[tag]
+	if tag == TAG_STRING:
+		return _name(data, pos)
+	if tag == TAG_LIST:
+		item = data[pos]
+		(count,) = _I32.unpack_from(data, pos + 1)
+		pos += 5
+		out = []
+		for _ in range(max(0, count)):
+			value, pos = _value(data, pos, item)
+			out.append(value)
+		return out, pos
+	if tag == TAG_COMPOUND:
+		out = {}
+		while True:
+			child = data[pos]
+			pos += 1
+			if child == TAG_END:
+				return out, pos
+			key, pos = _name(data, pos)
+			out[key], pos = _value(data, pos, child)
+	raise NBTError(f'unknown tag type {tag}')
+
+
+def _root(data: bytes) -> int:
+	if not data or data[0] != TAG_COMPOUND:
+		raise NBTError('NBT data does not start with a compound')
+	_, pos = _name(data, 1)
+	return pos
+
+
+def parse(data: bytes) -> Dict[str, Any]:
+	"""Decode an uncompressed NBT document whose root is a compound."""
+	try:
+		value, _ = _value(data, _root(data), TAG_COMPOUND)
+	except (IndexError, struct.error) as e:
+		raise NBTError(f'truncated NBT data: {e}')
+	return value
+
+
+def find(data: bytes, names: Iterable[str]) -> Dict[str, Any]:
+	"""Return {name: value} for the wanted tags in the root compound or a compound directly below it.
+
+	Root-level tags win over nested ones of the same name.
+	"""
+	wanted = set(names)
+	found: Dict[str, Any] = {}
+	nested: Dict[str, Any] = {}
+	try:
+		pos = _root(data)
+		while True:
+			tag = data[pos]
+			pos += 1
+			if tag == TAG_END:
+				break
+			key, pos = _name(data, pos)
+			if key in wanted:
+				found[key], pos = _value(data, pos, tag)
+			elif tag == TAG_COMPOUND:
+				while True:
+					child = data[pos]
+					pos += 1
+					if child == TAG_END:
+						break
+					sub, pos = _name(data, pos)
+					if sub in wanted and sub not in nested:
+						nested[sub], pos = _value(data, pos, child)
+					else:
+						pos = _skip(data, pos, child)
+			else:
+				pos = _skip(data, pos, tag)
+	except (IndexError, struct.error) as e:
+		raise NBTError(f'truncated NBT data: {e}')
+	for key, value in nested.items():
+		found.setdefault(key, value)
+	return found
+
+
+def select(data: bytes, paths: Iterable[Tuple[str, ...]]) -> Dict[Tuple[str, ...], Any]:
+	"""Return {path: value} for tag paths below the root compound, e.g. ('Data', 'Version', 'Name').
+
+	Only compounds on the way to a wanted path are entered; everything else
+	is skipped by length. Missing paths are absent from the result.
+	"""
+	tree: Dict[str, Any] = {}
+	for path in paths:
+		node = tree
+		for part in path[:-1]:
+			if node.get(part, {}) is None:
+				break
+			node = node.setdefault(part, {})
+		else:
+			node[path[-1]] = None
+	found: Dict[Tuple[str, ...], Any] = {}
+
+	def _walk(pos: int, node: Dict[str, Any], prefix: Tuple[str, ...]) -> int:
+		while True:
+			tag = data[pos]
+			pos += 1
+			if tag == TAG_END:
+				return pos
+			key, pos = _name(data, pos)
+			if key not in node:
+				pos = _skip(data, pos, tag)
+			elif node[key] is None:
+				found[prefix + (key,)], pos = _value(data, pos, tag)
+			elif tag == TAG_COMPOUND:
+				pos = _walk(pos, node[key], prefix + (key,))
+			else:
+				pos = _skip(data, pos, tag)
+
+	try:
+		_walk(_root(data), tree, ())
+	except (IndexError, struct.error) as e:
+		raise NBTError(f'truncated NBT data: {e}')
+	return found
+
+
+def decompress_chunk(payload: bytes, external: Optional[bytes] = None) -> bytes:
+	"""NBT bytes of a stored chunk payload (4-byte length, compression byte, data).
+
+	For chunks stored in a `.mcc` file (compression byte has 0x80 set) pass
+	that file's contents as `external`.
+	"""
+	if len(payload) < 5:
+		raise NBTError('chunk payload too short')
+	kind = payload[4]
+	body = payload[5:]
+	if kind & EXTERNAL_FLAG:
+		if external is None:
+			raise NBTError('chunk is stored in an external .mcc file')
+		kind &= ~EXTERNAL_FLAG
+		body = external
+	try:
+		if kind == COMPRESSION_ZLIB:
+			return zlib.decompress(body)
+		if kind == COMPRESSION_GZIP:
+			return gzip.decompress(body)
+		if kind == COMPRESSION_NONE:
+			return bytes(body)
+		if kind == COMPRESSION_LZ4:
+			if not available('lz4'):
+				raise NBTError('LZ4 compressed chunks need the lz4 package')
+			return _lz4_java_block(body)
+	except NBTError:
+		raise
+	except Exception as e:
+		# zlib.error, gzip.BadGzipFile, EOFError and lz4's own errors do not share a base class
+		raise NBTError(f'corrupt chunk data: {e}')
+	raise NBTError(f'unknown chunk compression {kind}')
+
+
+def _lz4_java_block(body: bytes) -> bytes:
+	"""Decode the LZ4BlockOutputStream framing Minecraft uses for LZ4 chunks."""
+	out = []
+	pos = 0
+	while pos + 21 <= len(body):
+		if body[pos:pos + 8] != b'LZ4Block':
+			raise NBTError('bad LZ4 block magic')
+		token = body[pos + 8]
+		csize, dsize = struct.unpack_from('<ii', body, pos + 9)
+		pos += 21
+		if dsize == 0:
+			break
+		block = body[pos:pos + csize]
+		pos += csize
+		if token & 0xF0 == 0x10:
+			out.append(block)
+		else:
+			out.append(lz4_block.decompress(block, uncompressed_size=dsize))
+	return b''.join(out)
+
+
+def read_bytes(path: str) -> bytes:
+	"""Uncompressed NBT bytes of a file such as level.dat (gzip compressed or raw)."""
+	with open(path, 'rb') as f:
+		data = f.read()
+	if data[:2] == b'\x1f\x8b':
+		data = gzip.decompress(data)
+	return data
+
+
+def read_file(path: str) -> Dict[str, Any]:
+	"""Parse an NBT file such as level.dat (gzip compressed or raw)."""
+	return parse(read_bytes(path))
@@ -0,0 +1,333 @@
+"""Region statistics and chunk pruning for a world.
+
+`analyze_world(world_path)` reads the region files of every dimension
+(`indexer.region_dirs`) on a thread pool and decodes just enough of each
+chunk's NBT (`InhabitedTime`, `Status`) to report, per dimension:
+- region files, chunks and bytes on disk;
+- chunks by status ('full', 'features', ...) and by how long players spent
+  in them, including chunks no player ever stayed in (InhabitedTime 0).
+
+`prune_world(world_path, ...)` deletes chunks whose InhabitedTime is below
+a threshold and/or that lie outside a square radius around a centre chunk
+(the world spawn by default). The game regenerates deleted chunks from the
+seed when they are visited again. Each region file is rewritten to a
+temporary file and swapped in; files left empty are removed. The matching
+`entities/` and `poi/` region files (1.14+/1.17+) lose the same chunks so
+no orphaned entities or points of interest remain. Chunks whose NBT cannot
+be read are always kept, and region files with an unreadable header are
+counted and skipped by both the analyzer and the pruner.
+
+Run the pruner only while the server is stopped.
+"""
+import os
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Callable, Dict, Any, List, Tuple
+from . import anvil, nbt, leveldat
+from .indexer import region_dirs
+
+DEFAULT_WORKERS = 4
+TICKS_PER_SECOND = 20
+
+REGION_RE = re.compile(r'^r\.(-?\d+)\.(-?\d+)\.mca$')
+
+# (upper bound in ticks, label); InhabitedTime 0 is counted as 'never'
+INHABITED_BUCKETS = (
+	(TICKS_PER_SECOND * 60, '< 1 min'),
+	(TICKS_PER_SECOND * 600, '< 10 min'),
+	(TICKS_PER_SECOND * 3600, '< 1 h'),
+	(TICKS_PER_SECOND * 36000, '< 10 h'),
+	(None, '10 h+'),
+)
+
+SIBLING_DIRS = ('entities', 'poi')
+
+ProgressCallback = Optional[Callable[[int, int], None]]
+
+
+class PruneCancelled(Exception):
+	pass
+
+
+def inhabited_bucket(ticks: int) -> str:
+	if ticks <= 0:
+		return 'never'
+	for limit, label in INHABITED_BUCKETS:
+		if limit is None or ticks < limit:
+			return label
+	return INHABITED_BUCKETS[-1][1]
+
+
+def _region_files(folder: str) -> List[Tuple[str, int, int]]:
+	out = []
+	try:
+		with os.scandir(folder) as it:
+			for entry in it:
+				m = REGION_RE.match(entry.name)
+				if m and entry.is_file():
+					out.append((entry.path, int(m.group(1)), int(m.group(2))))
+	except OSError:
+		pass
+	return sorted(out)
+
+
+def _chunk_fields(folder: str, f, index: int, offset: int, count: int, cx: int, cz: int) -> Dict[str, Any]:
+	payload = anvil.read_payload(f, offset, count)
+	external = None
+	if len(payload) > 4 and payload[4] & nbt.EXTERNAL_FLAG:
+		with open(os.path.join(folder, f'c.{cx}.{cz}.mcc'), 'rb') as ext:
+			external = ext.read()
+	return nbt.find(nbt.decompress_chunk(payload, external), ('InhabitedTime', 'Status'))
+
+
+def _scan_region(path: str, rx: int, rz: int, decode: bool):
+	"""Return ([(index, cx, cz, inhabited_or_None, status_or_None)], unreadable_chunks)."""
+	folder = os.path.dirname(path)
+	chunks = []
+	errors = 0
+	with open(path, 'rb') as f:
+		for index, offset, count, _ in anvil.read_header(f):
+			cx, cz = rx * 32 + (index & 31), rz * 32 + (index >> 5)
+			inhabited = status = None
+			if decode:
+				try:
+					fields = _chunk_fields(folder, f, index, offset, count, cx, cz)
+					inhabited = int(fields.get('InhabitedTime', 0))
+					status = str(fields.get('Status', '')).replace('minecraft:', '') or None
+				except (anvil.RegionError, nbt.NBTError, OSError, ValueError, EOFError):
+					errors += 1
+			chunks.append((index, cx, cz, inhabited, status))
+	return chunks, errors
+
+
+def _run(tasks, func, max_workers: int, progress_cb: ProgressCallback, cancel: Optional[threading.Event]):
+	"""Run func(task) on a pool, yielding (task, result) as they finish."""
+	done = 0
+	with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix='yali-regions') as pool:
+		futures = {pool.submit(func, task): task for task in tasks}
+		try:
+			for fut in as_completed(futures):
+				if cancel is not None and cancel.is_set():
+					raise PruneCancelled()
+				done += 1
+				yield futures[fut], fut.result()
+				if progress_cb:
+					try:
+						progress_cb(done, len(futures))
+					except Exception:
+						pass
+		finally:
+			for fut in futures:
+				fut.cancel()
+
+
+def analyze_world(world_path: str, max_workers: int = DEFAULT_WORKERS, progress_cb: ProgressCallback = None,
+				  cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+	"""Return {'dimensions': {label: stats}, 'regions', 'chunks', 'elapsed_ms'} for a world.
+
+	Per dimension: regions, chunks, bytes, never_visited, unreadable
+	(chunks), unreadable_regions, inhabited ({bucket label: chunks}) and
+	status ({status: chunks}).
+	"""
+	started = time.monotonic()
+	tasks = []
+	dims: Dict[str, Dict[str, Any]] = {}
+	for label, folder in region_dirs(world_path):
+		files = _region_files(folder)
+		dims[label] = {
+			'regions': len(files), 'chunks': 0, 'bytes': 0, 'never_visited': 0, 'unreadable': 0, 'unreadable_regions': 0,
+			'inhabited': {'never': 0, **{name: 0 for _, name in INHABITED_BUCKETS}}, 'status': {},
+		}
+		tasks.extend((label, path, rx, rz) for path, rx, rz in files)
+
+	def _one(task):
+		label, path, rx, rz = task
+		try:
+			size = os.path.getsize(path)
+			if size < anvil.HEADER_SIZE:
+				return size, [], 0, False
+			chunks, errors = _scan_region(path, rx, rz, decode=True)
+		except (anvil.RegionError, OSError):
+			return 0, [], 0, True
+		return size, chunks, errors, False
+
+	for (label, *_), (size, chunks, errors, broken) in _run(tasks, _one, max_workers, progress_cb, cancel):
+		d = dims[label]
+		d['bytes'] += size
+		d['chunks'] += len(chunks)
+		d['unreadable'] += errors
+		d['unreadable_regions'] += 1 if broken else 0
+		for _, _, _, inhabited, status in chunks:
+			if inhabited is None:
+				continue
+			bucket = inhabited_bucket(inhabited)
+			d['inhabited'][bucket] += 1
+			if bucket == 'never':
+				d['never_visited'] += 1
+			if status:
+				d['status'][status] = d['status'].get(status, 0) + 1
+	return {
+		'dimensions': dims,
+		'regions': sum(d['regions'] for d in dims.values()),
+		'chunks': sum(d['chunks'] for d in dims.values()),
+		'elapsed_ms': (time.monotonic() - started) * 1000.0,
+	}
+
+
+def world_spawn_chunk(world_path: str) -> Tuple[int, int]:
+	"""Chunk coordinates of the world spawn from level.dat, (0, 0) if unreadable."""
+	try:
+		spawn = leveldat.read_level(world_path).get('spawn')
+		if spawn:
+			return int(spawn[0]) >> 4, int(spawn[2]) >> 4
+	except Exception:
+		pass
+	return 0, 0
+
+
+def _rewrite(path: str, drop: set, dry_run: bool) -> Tuple[int, int, int]:
+	"""Remove chunk indices `drop` from region file `path`. Returns (removed, bytes_before, bytes_after)."""
+	before = os.path.getsize(path)
+	folder = os.path.dirname(path)
+	m = REGION_RE.match(os.path.basename(path))
+	rx, rz = int(m.group(1)), int(m.group(2))
+	with open(path, 'rb') as f:
+		header = anvil.read_header(f)
+		present = {entry[0] for entry in header}
+		removed = present & drop
+		if not removed:
+			return 0, before, before
+		kept = {}
+		if not dry_run or len(removed) < len(present):
+			for index, offset, count, timestamp in header:
+				if index not in removed:
+					kept[index] = (timestamp, anvil.read_payload(f, offset, count))
+	after = 0
+	if kept:
+		after = anvil.HEADER_SIZE + sum((len(p) + anvil.SECTOR - 1) // anvil.SECTOR * anvil.SECTOR for _, p in kept.values())
+	if dry_run:
+		return len(removed), before, after
+	if kept:
+		tmp = path + '.prune-tmp'
+		try:
+			anvil.write_region(tmp, kept)
+			os.replace(tmp, path)
+		except BaseException:
+			try:
+				os.remove(tmp)
+			except OSError:
+				pass
+			raise
+	else:
+		os.remove(path)
+	for index in removed:
+		external = os.path.join(folder, f'c.{rx * 32 + (index & 31)}.{rz * 32 + (index >> 5)}.mcc')
+		if os.path.exists(external):
+			try:
+				os.remove(external)
+			except OSError:
+				pass
+	return len(removed), before, after
+
+
+def prune_world(world_path: str, min_inhabited_ticks: int = 0, radius: Optional[int] = None,
+				center: Optional[Tuple[int, int]] = None, dimensions: Optional[List[str]] = None, dry_run: bool = False,
+				max_workers: int = DEFAULT_WORKERS, progress_cb: ProgressCallback = None,
+				cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+	"""Delete chunks with InhabitedTime below `min_inhabited_ticks` or outside `radius`.
+
+	`radius` is in chunks around `center` (chunk coordinates, default the
+	world spawn) and applies to every dimension. `dimensions` limits the job
+	to those labels. With `dry_run` nothing is written and the stats show
+	what would be removed. Region files that cannot be read are left as
+	they are. Returns regions, regions_changed, regions_deleted,
+	regions_unreadable, chunks, chunks_removed, bytes_before, bytes_after
+	and elapsed_ms.
+	"""
+	if min_inhabited_ticks <= 0 and radius is None:
+		raise ValueError('nothing to prune: set an InhabitedTime threshold or a radius')
+	started = time.monotonic()
+	if center is None:
+		center = world_spawn_chunk(world_path)
+	tasks = []
+	for label, folder in region_dirs(world_path):
+		if dimensions is not None and label not in dimensions:
+			continue
+		tasks.extend(_region_files(folder))
+
+	def _one(task):
+		path, rx, rz = task
+		try:
+			if os.path.getsize(path) < anvil.HEADER_SIZE:
+				return 0, 0, False, 0, 0, False
+			chunks, _ = _scan_region(path, rx, rz, decode=min_inhabited_ticks > 0)
+			drop = set()
+			for index, cx, cz, inhabited, _ in chunks:
+				if radius is not None and max(abs(cx - center[0]), abs(cz - center[1])) > radius:
+					drop.add(index)
+				elif min_inhabited_ticks > 0 and inhabited is not None and inhabited < min_inhabited_ticks:
+					drop.add(index)
+			if not drop:
+				return len(chunks), 0, False, 0, 0, False
+			# _rewrite only swaps the file in once it is complete, so a failure leaves it untouched
+			removed, before, after = _rewrite(path, drop, dry_run)
+		except (anvil.RegionError, OSError):
+			return 0, 0, False, 0, 0, True
+		emptied = after == 0
+		dimension_root = os.path.dirname(os.path.dirname(path))
+		for sub in SIBLING_DIRS:
+			sibling = os.path.join(dimension_root, sub, os.path.basename(path))
+			if os.path.exists(sibling):
+				try:
+					_, b, a = _rewrite(sibling, drop, dry_run)
+					before += b
+					after += a
+				except (anvil.RegionError, OSError):
+					pass
+		return len(chunks), removed, emptied, before, after, False
+
+	stats = {'regions': len(tasks), 'regions_changed': 0, 'regions_deleted': 0, 'regions_unreadable': 0, 'chunks': 0,
+			 'chunks_removed': 0, 'bytes_before': 0, 'bytes_after': 0, 'center': list(center), 'dry_run': dry_run}
+	for _, (chunks, removed, emptied, before, after, broken) in _run(tasks, _one, max_workers, progress_cb, cancel):
+		stats['regions_unreadable'] += 1 if broken else 0
+		stats['chunks'] += chunks
+		stats['chunks_removed'] += removed
+		if removed:
+			stats['regions_changed'] += 1
+			stats['regions_deleted'] += 1 if emptied else 0
+			stats['bytes_before'] += before
+			stats['bytes_after'] += after
+	stats['elapsed_ms'] = (time.monotonic() - started) * 1000.0
+	return stats
+
+
+if __name__ == '__main__':
+	import argparse
+	from .indexer import format_size
+
+	parser = argparse.ArgumentParser(description='Analyze region files or prune chunks of a world')
+	parser.add_argument('world')
+	parser.add_argument('--prune', action='store_true', help='delete chunks (see --min-minutes / --radius)')
+	parser.add_argument('--min-minutes', type=float, default=0, help='delete chunks players spent less than this in')
+	parser.add_argument('--radius', type=int, default=None, help='delete chunks further than this from spawn')
+	parser.add_argument('--dry-run', action='store_true')
+	args = parser.parse_args()
+
+	if args.prune:
+		r = prune_world(args.world, min_inhabited_ticks=int(args.min_minutes * 60 * TICKS_PER_SECOND),
+						radius=args.radius, dry_run=args.dry_run)
+		verb = 'would remove' if r['dry_run'] else 'removed'
+		print(f"{verb} {r['chunks_removed']}/{r['chunks']} chunks in {r['regions_changed']} regions "
+			  f"({r['regions_deleted']} emptied), {format_size(r['bytes_before'])} -> {format_size(r['bytes_after'])}, "
+			  f"{r['regions_unreadable']} unreadable regions skipped, {r['elapsed_ms']:.0f} ms")
+	else:
+		r = analyze_world(args.world)
+		for label, d in r['dimensions'].items():
+			print(f"{label}: {d['regions']} regions, {d['chunks']} chunks, {format_size(d['bytes'])}, "
+				  f"{d['never_visited']} never visited, {d['unreadable']} unreadable chunks, "
+				  f"{d['unreadable_regions']} unreadable regions")
+			print('  inhabited: ' + ', '.join(f'{k}: {v}' for k, v in d['inhabited'].items()))
+			print('  status:    ' + ', '.join(f'{k}: {v}' for k, v in sorted(d['status'].items())))
+		print(f"{r['elapsed_ms']:.0f} ms")
@@ -21,7 +21,7 @@ if not os.path.exists(script_to_run):
 
 try:
     subprocess.run(
-        [sys.executable, script_to_run],
+        [sys.executable, script_to_run, *sys.argv[1:]],  # e.g. --profile-imports
         check=True,
     )
     
@@ -1,43 +1,54 @@
 import sys
 import os
+
+# Must run before any other import so the table covers everything below.
+PROFILE_IMPORTS = '--profile-imports' in sys.argv
+if PROFILE_IMPORTS:
+    from components import importprofile
+    importprofile.install()
+
 import shutil
-import psutil
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                               QHBoxLayout, QLabel, QComboBox, QPushButton, 
-                              QTextEdit, QLineEdit, QFileDialog, QProgressBar,
+                              QTextEdit, QPlainTextEdit, QLineEdit, QFileDialog, QProgressBar,
                               QGroupBox, QMessageBox, QSpinBox, QTabWidget,
                               QCheckBox, QScrollArea, QFormLayout, QListWidget,
                               QListWidgetItem, QSlider, QTabBar)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QProcess, QTimer, QEvent, QUrl
-from PyQt6.QtGui import QFont, QTextCursor, QKeyEvent, QFontDatabase, QIcon
-from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput, QSoundEffect
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QProcess, QTimer, QEvent, QUrl, QMutex
+from PyQt6.QtGui import QFont, QTextCursor, QKeyEvent, QFontDatabase, QIcon, QTextCharFormat
 from PyQt6.QtGui import QPainter, QColor, QPen
 from collections import deque
 import re
-try:
-    import psutil
-    HAS_PSUTIL = True
-except Exception:
-    psutil = None
-    HAS_PSUTIL = False
-try:
-    import pyqtgraph as pg
-    from pyqtgraph import PlotWidget
-    HAS_PG = True
-except Exception:
-    pg = None
-    PlotWidget = None
-    HAS_PG = False
-import requests
 import subprocess
-import re
+import threading
 import time
 import json
 import zipfile
 from datetime import datetime
-import time
 import html
-from components.net import https as http, downloader, java as temurin
+from components.lazyimport import lazy_module, available, load as load_module
+from components.appdata import get_app_data_dir
+from components.monitor.tps import TickMetricsExtractor
+from components.monitor.sampler import ProcessSampler, MIN_INTERVAL_MS, DEFAULT_INTERVAL_MS
+from components.monitor.history import MetricsHistory
+from components.runtime import java_discovery
+from components.world import indexer as world_indexer, backup as world_backup, diffbackup, archive as world_archive, copier as world_copier, regions as world_regions, leveldat
+from components.addons import index as addon_index
+
+# Heavy or rarely needed modules are imported on first use (plots, audio,
+# Temurin, downloads). Keep build.py's hidden imports in sync with this list.
+psutil = lazy_module('psutil')
+HAS_PSUTIL = available('psutil')
+pg = lazy_module('pyqtgraph')
+HAS_PG = available('pyqtgraph')
+QtMultimedia = lazy_module('PyQt6.QtMultimedia')
+http = lazy_module('components.net.https')
+downloader = lazy_module('components.net.downloader')
+temurin = lazy_module('components.net.java')
+artifacts = lazy_module('components.net.artifacts')
+pipeline = lazy_module('components.net.pipeline')
+modrinth = lazy_module('components.net.modrinth')
+dl_queue = lazy_module('components.net.queue')
 
 class ScrollableComboBox(QComboBox):
     """QComboBox that limits popup height to maxVisibleItems so it scrolls reliably.
@@ -127,8 +138,9 @@ def get_base_dir():
     return os.path.dirname(os.path.abspath(sys.argv[0])) if sys.argv and sys.argv[0] else os.getcwd()
 
 class WorldListWidget(QListWidget):
-    """QListWidget that accepts world folders via drag & drop and imports them
-    into the current server directory.
+    """QListWidget that accepts world folders and world archives (.zip,
+    .tar.zst, .tar.gz) via drag & drop and imports them into the current
+    server directory.
     """
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -140,7 +152,7 @@ class WorldListWidget(QListWidget):
             urls = md.urls()
             for u in urls:
                 path = u.toLocalFile()
-                if os.path.isdir(path):
+                if os.path.isdir(path) or world_archive.is_archive(path):
                     event.acceptProposedAction()
                     return
         event.ignore()
@@ -167,6 +179,9 @@ class WorldListWidget(QListWidget):
 
         for url in md.urls():
             src = url.toLocalFile()
+            if src and world_archive.is_archive(src) and hasattr(window, 'import_world_archive'):
+                window.import_world_archive(src, interactive=False)
+                continue
             if not src or not os.path.isdir(src):
                 continue
 
@@ -181,24 +196,14 @@ class WorldListWidget(QListWidget):
             world_name = os.path.basename(src)
             dest = os.path.join(window.server_directory, world_name)
             
-            try:
-                if os.path.exists(dest):
-                    if hasattr(window, 'log'):
-                        window.log(f"[WARNING] World '{world_name}' already exists in server directory")
-                    continue
-                    
-                shutil.copytree(src, dest)
-                if hasattr(window, 'log'):
-                    window.log(f"[SUCCESS] Imported world: {world_name}")
-            except Exception as e:
+            if os.path.exists(dest):
                 if hasattr(window, 'log'):
-                    window.log(f"[WARNING] Failed to import {world_name}: {e}")
+                    window.log(f"[WARNING] World '{world_name}' already exists in server directory")
+                continue
 
-        try:
-            if hasattr(window, 'refresh_worlds_list'):
-                window.refresh_worlds_list()
-        except Exception:
-            pass
+            # copied on the window's import thread; the list refreshes when the queue drains
+            if hasattr(window, 'queue_world_import'):
+                window.queue_world_import(src, dest, interactive=False)
 
 class AddonListWidget(QListWidget):
     """QListWidget that accepts .jar files via drag & drop and copies them
@@ -272,6 +277,117 @@ class AddonListWidget(QListWidget):
             pass
 
 
+class ConsoleView(QPlainTextEdit):
+    """Read-only console that batches appended lines into one edit per frame.
+
+    Lines passed to append()/append_lines() are queued and written by a
+    single-shot timer (~60 Hz) inside one edit block, colored with cached
+    QTextCharFormats instead of per-line HTML. The document keeps at most
+    `max_blocks` lines; older lines are dropped by Qt as new ones arrive.
+    The view only follows new output while scrolled to the bottom.
+    """
+    DEFAULT_COLOR = "#d4d4d4"
+    ERROR_RE = re.compile(r'ERROR|EXCEPTION|SEVERE|CRITICAL', re.IGNORECASE)
+    WARN_RE = re.compile(r'WARN', re.IGNORECASE)
+
+    def __init__(self, parent=None, max_blocks: int = 5000, flush_interval_ms: int = 16):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(max_blocks)
+        self.max_blocks = max_blocks
+        try:
+            font = QFont("Consolas")
+            font.setStyleHint(QFont.StyleHint.Monospace)
+            self.setFont(font)
+        except Exception:
+            pass
+        self._pending = deque()
+        self._dropped = 0
+        self._formats = {}
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_interval_ms)
+        self._flush_timer.timeout.connect(self.flush)
+
+    @classmethod
+    def severity_color(cls, text):
+        if cls.ERROR_RE.search(text):
+            return "#ff5555"
+        if cls.WARN_RE.search(text):
+            return "#ffd700"
+        return cls.DEFAULT_COLOR
+
+    def _format_for(self, color):
+        fmt = self._formats.get(color)
+        if fmt is None:
+            fmt = QTextCharFormat()
+            if color:
+                fmt.setForeground(QColor(color))
+            self._formats[color] = fmt
+        return fmt
+
+    def append(self, text):
+        """Queue `text` (one or more lines) using the default color"""
+        self.append_lines(str(text).splitlines() or [""], colorize=False)
+
+    def append_lines(self, lines, colorize=True):
+        """Queue lines for the next flush, colored by severity when `colorize`"""
+        for line in lines:
+            self._pending.append((line, self.severity_color(line) if colorize else None))
+        overflow = len(self._pending) - self.max_blocks
+        if overflow > 0:
+            for _ in range(overflow):
+                self._pending.popleft()
+            self._dropped += overflow
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """Write every queued line to the document in a single edit"""
+        if not self._pending and not self._dropped:
+            return
+        bar = self.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum() - 4
+
+        pending = self._pending
+        self._pending = deque()
+        if self._dropped:
+            pending.appendleft((f"[... {self._dropped} lines skipped ...]", "#808080"))
+            self._dropped = 0
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        try:
+            first = self.document().isEmpty()
+            run_color = None
+            run = []
+            for line, color in pending:
+                if run and color != run_color:
+                    cursor.insertText('\n'.join(run), self._format_for(run_color))
+                    run = []
+                if not run:
+                    if not first:
+                        cursor.insertBlock()
+                    first = False
+                    run_color = color
+                run.append(line)
+            if run:
+                cursor.insertText('\n'.join(run), self._format_for(run_color))
+        finally:
+            cursor.endEditBlock()
+
+        if at_bottom:
+            bar.setValue(bar.maximum())
+
+    def clear(self):
+        self._pending.clear()
+        self._dropped = 0
+        self._flush_timer.stop()
+        super().clear()
+
+
 class SimplePlot(QWidget):
     """Very small rolling line plot widget backed by a deque of numeric samples."""
     def __init__(self, parent=None, max_samples=60, color=(63,163,77)):
@@ -349,10 +465,18 @@ class SimplePlot(QWidget):
 
 
 class DownloadThread(QThread):
-    """Background thread for downloading server files"""
+    """Background thread for downloading server files.
+
+    The server jar, the generated server files and the bundled plugins are
+    provisioned as a task graph so plugin lookups and downloads overlap with
+    the jar download. Per-task progress is reported via
+    task_progress_signal(task, percent, text).
+    """
     log_signal = pyqtSignal(str)
     progress_signal = pyqtSignal(int, str)
+    task_progress_signal = pyqtSignal(str, int, str)
     finished_signal = pyqtSignal(bool, str)
+    MAX_PARALLEL_TASKS = 4
     
     def __init__(self, version, software, directory, ram, java_exe: str | None = None):
         super().__init__()
@@ -373,46 +497,42 @@ class DownloadThread(QThread):
             self.log(f"[INFO] Target directory: {self.directory}")
             self.log(f"[INFO] RAM allocation: {self.ram}")
             
-            jar_path = None
-            if self.software == "Vanilla":
-                jar_path = self.download_vanilla()
-            elif self.software == "Paper":
-                jar_path = self.download_paper()
-            elif self.software == "Purpur":
-                jar_path = self.download_purpur()
-            elif self.software == "Fabric":
-                jar_path = self.download_fabric()
-            elif self.software == "Folia":
-                jar_path = self.download_folia()
-            elif self.software == "BungeeCord":
-                jar_path = self.download_bungeecord()
-            elif self.software == "Waterfall":
-                jar_path = self.download_waterfall()
-            elif self.software == "Velocity":
-                jar_path = self.download_velocity()
-            elif self.software == "NeoForge":
-                jar_path = self.download_neoforge()
-            elif self.software in ["Forge", "Spigot", "Bukkit"]:
+            downloaders = {
+                "Vanilla": self.download_vanilla,
+                "Paper": self.download_paper,
+                "Purpur": self.download_purpur,
+                "Fabric": self.download_fabric,
+                "Folia": self.download_folia,
+                "BungeeCord": self.download_bungeecord,
+                "Waterfall": self.download_waterfall,
+                "Velocity": self.download_velocity,
+                "NeoForge": self.download_neoforge,
+            }
+            if self.software in ["Forge", "Spigot", "Bukkit"]:
                 self.finished_signal.emit(False, f"{self.software} requires manual installation")
                 return
-                
+            download_server = downloaders.get(self.software)
+            if download_server is None:
+                self.finished_signal.emit(False, "Download failed")
+                return
+
+            started = time.monotonic()
+            graph = pipeline.TaskGraph(max_workers=self.MAX_PARALLEL_TASKS, on_event=self._on_task_event)
+            graph.add('server', download_server)
+            graph.add('eula.txt', lambda: self.create_eula_file(graph.results['server']), deps=['server'])
+            graph.add('start.bat', lambda: self.create_start_batch(graph.results['server'], getattr(self, 'java_exe', None)), deps=['server'])
+            graph.add('folder', lambda: self.create_plugin_mods_folder(graph.results['server']), deps=['server'])
+            graph.add('axior', self.install_axior_plugin, optional=True)
+            graph.add('foliaperms', self.install_foliaperms_plugin, optional=True)
+            graph.add('eventron', self.install_eventron_plugin, optional=True)
+            graph.add('multimedia', self.install_multimedia_plugin, optional=True)
+            if self.software == 'Fabric':
+                graph.add('fabric-api', self.install_fabric_api, optional=True)
+
+            results = graph.run()
+            jar_path = results.get('server')
             if jar_path:
-                self.log("\n[INFO] Creating server files...")
-                self.create_eula_file(jar_path)
-                self.create_start_batch(jar_path, getattr(self, 'java_exe', None) or getattr(self, 'java_exe', None))
-                self.create_plugin_mods_folder(jar_path)
-                self.install_axior_plugin(jar_path)
-                self.install_foliaperms_plugin(jar_path)
-                self.install_eventron_plugin(jar_path)
-                try:
-                    self.install_multimedia_plugin(jar_path)
-                except Exception:
-                    pass
-                try:
-                    if self.software == 'Fabric':
-                        self.install_fabric_api(jar_path)
-                except Exception:
-                    pass
+                self.log(f"\n[INFO] Provisioning finished in {time.monotonic() - started:.1f}s")
                 self.finished_signal.emit(True, jar_path)
             else:
                 self.finished_signal.emit(False, "Download failed")
@@ -421,15 +541,67 @@ class DownloadThread(QThread):
             self.log(f"\n[ERROR] {str(e)}")
             self.finished_signal.emit(False, str(e))
             
-    def download_with_progress(self, url, filename):
-        """Download file with progress updates"""
+    def _on_task_event(self, kind, name, info):
+        """Log task graph transitions and forward them as task progress."""
+        try:
+            if kind == 'start':
+                self.task_progress_signal.emit(name, 0, "started")
+            elif kind == 'done':
+                self.log(f"[INFO] Task {name} finished in {info:.1f}s")
+                self.task_progress_signal.emit(name, 100, "done")
+            elif kind == 'failed':
+                self.log(f"[WARNING] Task {name} failed: {info}")
+                self.task_progress_signal.emit(name, 100, "failed")
+            elif kind == 'skipped':
+                self.task_progress_signal.emit(name, 100, "skipped")
+        except Exception:
+            pass
+
+    def download_with_progress(self, url, filename, coords=None, task=None, hashes=None):
+        """Download file with progress updates.
+
+        When `coords` identifies the artifact (project, version, build, file)
+        the shared artifact store is consulted first and a cached copy is
+        linked into place instead of downloading it again.
+
+        `hashes` maps algorithm to the digest published upstream (e.g.
+        {'sha1': ...}); the file is verified while downloading and never
+        reaches `filename` if it does not match.
+
+        Progress goes to progress_signal, or to task_progress_signal when
+        `task` names a task running alongside the server jar download. The
+        transfer itself runs on the shared download queue, where task
+        downloads rank below the server jar.
+        """
+        def _emit(percent, text):
+            if task:
+                self.task_progress_signal.emit(task, percent, text)
+            else:
+                self.progress_signal.emit(percent, text)
+
+        hashes = {k: v for k, v in (hashes or {}).items() if v}
+        store = None
+        if coords or hashes.get('sha256'):
+            try:
+                store = artifacts.get_store()
+                method = store.fetch(coords, filename) if coords else None
+                if not method and hashes.get('sha256') and store.has(hashes['sha256']):
+                    method = store.materialize(hashes['sha256'], filename)
+                if method:
+                    self.log(f"[INFO] Using cached {os.path.basename(filename)} ({method})")
+                    _emit(100, "Cached")
+                    return
+            except Exception as e:
+                self.log(f"[WARNING] Artifact cache unavailable: {e}")
+                store = None
+
         def _progress_cb(downloaded, total):
             try:
                 now = time.monotonic()
                 if not hasattr(_progress_cb, '_started'):
                     _progress_cb._started = now
                     _progress_cb._last_ts = now
-                    _progress_cb._last_bytes = 0
+                    _progress_cb._last_bytes = downloaded if downloaded <= resumed else 0
                     _progress_cb._speed = 0.0
 
                 size_mb = downloaded / (1024 * 1024)
@@ -468,14 +640,46 @@ class DownloadThread(QThread):
                     percent = -1
                     text = f"{size_mb:.1f} MB — {speed_str}"
 
-                self.progress_signal.emit(percent, text)
+                _emit(percent, text)
             except Exception:
                 pass
 
+        resumed = 0
         try:
-            downloader.download_file(url, filename, progress_cb=_progress_cb)
-        except Exception as e:
+            resumed = downloader.partial_bytes(filename, url)
+            if resumed:
+                self.log(f"[INFO] Resuming {os.path.basename(filename)} from {resumed / (1024 * 1024):.1f} MB")
+        except Exception:
+            resumed = 0
+
+        digests = {}
+        # optional plugins queue behind the server jar and any runtime download
+        priority = dl_queue.PRIORITY_OPTIONAL if task else dl_queue.PRIORITY_SERVER
+        try:
+            dl_queue.get_queue().submit(url, filename, priority=priority, progress_cb=_progress_cb,
+                                        expected_hashes=hashes, digests=digests).result()
+        except downloader.ChecksumMismatch as e:
+            self.log(f"[ERROR] {e}")
             raise
+        if hashes:
+            self.log(f"[INFO] Verified {os.path.basename(filename)} ({', '.join(sorted(hashes))})")
+
+        if store is not None:
+            try:
+                store.put(filename, coords, sha256=digests.get('sha256'))
+            except Exception as e:
+                self.log(f"[WARNING] Failed to cache {os.path.basename(filename)}: {e}")
+
+    def papermc_build_hashes(self, project, version, build):
+        """Return {'sha256': ...} for a PaperMC build's application jar, or {}"""
+        try:
+            build_url = f"https://api.papermc.io/v2/projects/{project}/versions/{version}/builds/{build}"
+            build_data = http.get_json(build_url, timeout=10)
+            sha256 = ((build_data.get('downloads') or {}).get('application') or {}).get('sha256')
+            return {'sha256': sha256} if sha256 else {}
+        except Exception as e:
+            self.log(f"[WARNING] Could not fetch checksum for {project} {version} build {build}: {e}")
+            return {}
                         
     def download_vanilla(self):
         """Download vanilla server"""
@@ -494,10 +698,11 @@ class DownloadThread(QThread):
             raise Exception(f"No server download available for {self.version}")
             
         server_url = version_data['downloads']['server']['url']
+        server_sha1 = version_data['downloads']['server'].get('sha1')
         filename = os.path.join(self.directory, f"server-{self.version}-vanilla.jar")
         
         self.log(f"[INFO] Downloading to: {os.path.basename(filename)}")
-        self.download_with_progress(server_url, filename)
+        self.download_with_progress(server_url, filename, coords=('vanilla', self.version, server_sha1 or server_url, 'server.jar'), hashes={'sha1': server_sha1})
         self.log(f"\n[SUCCESS] Downloaded vanilla server")
         
         return filename
@@ -520,7 +725,8 @@ class DownloadThread(QThread):
         filename = os.path.join(self.directory, f"server-{self.version}-paper.jar")
         
         self.log(f"[INFO] Downloading to: {os.path.basename(filename)}")
-        self.download_with_progress(download_url, filename)
+        hashes = self.papermc_build_hashes('paper', self.version, latest_build)
+        self.download_with_progress(download_url, filename, coords=('paper', self.version, latest_build, 'paper.jar'), hashes=hashes)
         self.log(f"\n[SUCCESS] Downloaded Paper server")
         
         return filename
@@ -543,7 +749,14 @@ class DownloadThread(QThread):
         filename = os.path.join(self.directory, f"server-{self.version}-purpur.jar")
         
         self.log(f"[INFO] Downloading to: {os.path.basename(filename)}")
-        self.download_with_progress(download_url, filename)
+        hashes = {}
+        try:
+            build_data = http.get_json(f"https://api.purpurmc.org/v2/purpur/{self.version}/{latest_build}", timeout=10)
+            if build_data.get('md5'):
+                hashes['md5'] = build_data['md5']
+        except Exception as e:
+            self.log(f"[WARNING] Could not fetch checksum for Purpur build {latest_build}: {e}")
+        self.download_with_progress(download_url, filename, coords=('purpur', self.version, latest_build, 'purpur.jar'), hashes=hashes)
         self.log(f"\n[SUCCESS] Downloaded Purpur server")
         
         return filename
@@ -572,7 +785,7 @@ class DownloadThread(QThread):
         
         self.log(f"[INFO] Downloading to: {os.path.basename(filename)}")
         
-        self.download_with_progress(download_url, filename)
+        self.download_with_progress(download_url, filename, coords=('fabric', self.version, f"{latest_loader}+{latest_installer}", 'server.jar'))
         self.log(f"\n[SUCCESS] Downloaded Fabric server")
         
         return filename
@@ -596,7 +809,8 @@ class DownloadThread(QThread):
         filename = os.path.join(self.directory, f"server-{self.version}-folia.jar")
         
         self.log(f"[INFO] Downloading to: {os.path.basename(filename)}")
-        self.download_with_progress(download_url, filename)
+        hashes = self.papermc_build_hashes('folia', self.version, latest_build)
+        self.download_with_progress(download_url, filename, coords=('folia', self.version, latest_build, 'folia.jar'), hashes=hashes)
         self.log(f"\n[SUCCESS] Downloaded Folia server")
         
         return filename
@@ -642,7 +856,8 @@ class DownloadThread(QThread):
         filename = os.path.join(self.directory, f"waterfall-{latest_version}-{latest_build}.jar")
         
         self.log(f"[INFO] Downloading to: {os.path.basename(filename)}")
-        self.download_with_progress(download_url, filename)
+        hashes = self.papermc_build_hashes('waterfall', latest_version, latest_build)
+        self.download_with_progress(download_url, filename, coords=('waterfall', latest_version, latest_build, 'waterfall.jar'), hashes=hashes)
         self.log(f"\n[SUCCESS] Downloaded Waterfall")
         
         return filename
@@ -675,7 +890,8 @@ class DownloadThread(QThread):
         filename = os.path.join(self.directory, f"velocity-{latest_version}-{latest_build}.jar")
         
         self.log(f"[INFO] Downloading to: {os.path.basename(filename)}")
-        self.download_with_progress(download_url, filename)
+        hashes = self.papermc_build_hashes('velocity', latest_version, latest_build)
+        self.download_with_progress(download_url, filename, coords=('velocity', latest_version, latest_build, 'velocity.jar'), hashes=hashes)
         self.log(f"\n[SUCCESS] Downloaded Velocity")
         
         return filename
@@ -714,7 +930,7 @@ class DownloadThread(QThread):
         filename = os.path.join(self.directory, f"neoforge-{compatible_version}-installer.jar")
         
         self.log(f"[INFO] Downloading to: {os.path.basename(filename)}")
-        self.download_with_progress(download_url, filename)
+        self.download_with_progress(download_url, filename, coords=('neoforge', compatible_version, 'installer.jar'))
         self.log(f"\n[SUCCESS] Downloaded NeoForge installer")
         self.log(f"[INFO] Run: java -jar {os.path.basename(filename)} --installServer")
         
@@ -814,7 +1030,7 @@ pause
         except Exception as e:
             self.log(f"[WARNING] Failed to create folder: {e}")
     
-    def install_axior_plugin(self, jar_path):
+    def install_axior_plugin(self, jar_path=None):
         """Install Axior plugin based on server type"""
         try:
             sw = getattr(self, 'software', None)
@@ -832,7 +1048,7 @@ pause
         except Exception as e:
             self.log(f"[WARNING] Failed to install Axior plugin: {e}")
 
-    def install_foliaperms_plugin(self, jar_path):
+    def install_foliaperms_plugin(self, jar_path=None):
         """Install FoliaPerms plugin for Folia servers (Modrinth)"""
         try:
             if getattr(self, 'software', None) != 'Folia':
@@ -842,7 +1058,7 @@ pause
         except Exception as e:
             self.log(f"[WARNING] Failed to install FoliaPerms plugin: {e}")
 
-    def install_eventron_plugin(self, jar_path):
+    def install_eventron_plugin(self, jar_path=None):
         """Install Eventron plugin for Bukkit-based servers (Modrinth)"""
         try:
             supported = {"Bukkit", "Spigot", "Paper", "Purpur", "Folia"}
@@ -853,7 +1069,7 @@ pause
         except Exception as e:
             self.log(f"[WARNING] Failed to install Eventron plugin: {e}")
 
-    def install_multimedia_plugin(self, jar_path):
+    def install_multimedia_plugin(self, jar_path=None):
         """Install Multimedia plugin from Modrinth"""
         try:
             supported = {"Bukkit", "Spigot", "Paper", "Purpur", "Folia"}
@@ -865,7 +1081,7 @@ pause
         except Exception as e:
             self.log(f"[WARNING] Failed to install Multimedia plugin: {e}")
 
-    def install_fabric_api(self, jar_path):
+    def install_fabric_api(self, jar_path=None):
         """Install Fabric API mod from Modrinth for Fabric servers.
 
         Chooses the newest Fabric API version compatible with the selected
@@ -881,13 +1097,16 @@ pause
         except Exception as e:
             self.log(f"[WARNING] Failed to install Fabric API: {e}")
 
-    def install_plugin_from_modrinth(self, slug: str, jar_path: str, platform_hint: str | None = None):
+    def install_plugin_from_modrinth(self, slug: str, jar_path: str | None = None, platform_hint: str | None = None):
         """Download the best matching plugin version from Modrinth and place it into the server's plugins/mods folder.
 
+        `jar_path` may be None when the plugin is fetched while the server jar
+        is still downloading; the target directory is used instead.
+
         Returns the destination path on success, or None on failure.
         """
         try:
-            server_dir = os.path.dirname(jar_path)
+            server_dir = os.path.dirname(jar_path) if jar_path else self.directory
             if self.software in ["Fabric", "NeoForge", "Forge"]:
                 dest_folder = os.path.join(server_dir, 'mods')
             else:
@@ -1001,7 +1220,7 @@ pause
 
             self.log(f"[INFO] Downloading {slug} -> {os.path.basename(dest_path)}")
             try:
-                self.download_with_progress(file_url, dest_path)
+                self.download_with_progress(file_url, dest_path, coords=('modrinth', slug, chosen.get('id') or file_url, filename), task=slug, hashes=jar_file.get('hashes'))
             except Exception as e:
                 self.log(f"[WARNING] Failed to download {slug} file: {e}")
                 return None
@@ -1054,10 +1273,532 @@ class TemurinInstallThread(QThread):
             self.finished_signal.emit(False, str(e))
 
 
+class JavaDiscoveryThread(QThread):
+    """Run components.runtime.java_discovery off the GUI thread.
+
+    Emits finished_signal(runtimes, default_java_path).
+    """
+    finished_signal = pyqtSignal(list, object)
+
+    def run(self):
+        runtimes = []
+        default_path = None
+        try:
+            runtimes = java_discovery.discover()
+        except Exception:
+            runtimes = []
+        try:
+            default_path = java_discovery.default_java()
+        except Exception:
+            default_path = None
+        self.finished_signal.emit(runtimes, default_path)
+
+
+class MetricsSamplerThread(QThread):
+    """Background thread that samples the server process and posts batches.
+
+    Samples are taken every `interval_ms` (>= MIN_INTERVAL_MS) and delivered
+    via samples_signal(list) at most every `batch_ms`, so sub-second sampling
+    does not mean sub-second repaints. Samples of a running server are also
+    recorded into the attached MetricsHistory.
+    """
+    samples_signal = pyqtSignal(list)
+
+    def __init__(self, interval_ms: int = DEFAULT_INTERVAL_MS, batch_ms: int = 500, parent=None):
+        super().__init__(parent)
+        self._interval_ms = max(MIN_INTERVAL_MS, int(interval_ms))
+        self._batch_ms = batch_ms
+        self._pid = None
+        self._stopping = False
+        self._history = None
+        self._history_lock = QMutex()
+        self.sampler = ProcessSampler()
+
+    def set_pid(self, pid):
+        self._pid = pid
+
+    def set_history(self, history):
+        """Record future samples into `history`; the previous one is closed."""
+        self._history_lock.lock()
+        try:
+            old, self._history = self._history, history
+        finally:
+            self._history_lock.unlock()
+        if old is not None and old is not history:
+            try:
+                old.close()
+            except Exception:
+                pass
+
+    def set_interval(self, interval_ms):
+        self._interval_ms = max(MIN_INTERVAL_MS, int(interval_ms))
+
+    def stop(self):
+        self._stopping = True
+
+    def run(self):
+        batch = []
+        last_emit = time.monotonic()
+        while not self._stopping:
+            started = time.monotonic()
+            try:
+                self.sampler.set_pid(self._pid)
+                sample = self.sampler.sample()
+                batch.append(sample)
+                if sample.get('alive'):
+                    self._history_lock.lock()
+                    try:
+                        if self._history is not None:
+                            self._history.add(sample)
+                    finally:
+                        self._history_lock.unlock()
+            except Exception:
+                pass
+            if batch and (time.monotonic() - last_emit) * 1000.0 >= min(self._batch_ms, self._interval_ms):
+                self.samples_signal.emit(batch)
+                batch = []
+                last_emit = time.monotonic()
+            remaining = self._interval_ms - (time.monotonic() - started) * 1000.0
+            while remaining > 0 and not self._stopping:
+                step = min(remaining, 50)
+                self.msleep(int(step))
+                remaining -= step
+        self.set_history(None)
+
+SERVER_JAR_HINTS = ('server', 'paper', 'purpur', 'spigot', 'bukkit', 'forge', 'fabric', 'neoforge', 'velocity', 'waterfall', 'bungeecord')
+
+
+def find_server_jar(directory):
+    """Return the most likely server jar in `directory` (or its versions/ folder), or None.
+
+    Name hints win; otherwise jar manifests are probed for a Minecraft main
+    class. Touches the disk, so call it off the GUI thread.
+    """
+    candidates = [f for f in os.listdir(directory) if f.lower().endswith('.jar')]
+
+    if not candidates:
+        versions_dir = os.path.join(directory, 'versions')
+        if os.path.isdir(versions_dir):
+            for v in os.listdir(versions_dir):
+                vpath = os.path.join(versions_dir, v)
+                if os.path.isdir(vpath):
+                    for f in os.listdir(vpath):
+                        if f.lower().endswith('.jar'):
+                            candidates.append(os.path.join(vpath, f))
+
+    candidates = [os.path.join(directory, c) if not os.path.isabs(c) and os.path.exists(os.path.join(directory, c)) else c for c in candidates]
+
+    for c in candidates:
+        base = os.path.basename(c).lower()
+        if any(h in base for h in SERVER_JAR_HINTS):
+            return c
+
+    for c in candidates:
+        try:
+            with zipfile.ZipFile(c, 'r') as z:
+                try:
+                    mf = z.read('META-INF/MANIFEST.MF').decode('utf-8', errors='ignore')
+                except KeyError:
+                    mf = ''
+                mf_l = mf.lower()
+                if 'main-class' in mf_l or 'net.minecraft' in mf_l or 'minecraft_server' in mf_l or 'org.bukkit' in mf_l:
+                    return c
+        except Exception:
+            continue
+
+    return candidates[0] if candidates else None
+
+
+class ServerDirScanThread(QThread):
+    """Locate the server jar of a directory without blocking the GUI.
+
+    Emits finished_signal(generation, directory, jar_path_or_None); the
+    generation lets the GUI drop results for a directory that is no longer
+    selected.
+    """
+    finished_signal = pyqtSignal(int, str, object)
+
+    def __init__(self, generation: int, directory: str, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.directory = directory
+
+    def run(self):
+        try:
+            chosen = find_server_jar(self.directory)
+        except Exception:
+            chosen = None
+        self.finished_signal.emit(self.generation, self.directory, chosen)
+
+
+class WorldIndexThread(QThread):
+    """Index the worlds of a server directory with components.world.indexer.
+
+    Emits names_signal(generation, names) once the worlds are found, then
+    world_signal(generation, info) as each world's size is known and
+    finished_signal(generation, infos) at the end. With a server jar, each
+    info also carries 'server_version': the (DataVersion, name) that jar
+    writes, or None if it does not say.
+    """
+    names_signal = pyqtSignal(int, list)
+    world_signal = pyqtSignal(int, dict)
+    finished_signal = pyqtSignal(int, list)
+
+    def __init__(self, generation: int, server_dir: str, force: bool = False, jar_path=None, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.server_dir = server_dir
+        self.force = force
+        self.jar_path = jar_path
+
+    def run(self):
+        infos = []
+        try:
+            names = world_indexer.find_worlds(self.server_dir)
+            self.names_signal.emit(self.generation, names)
+            server_version = leveldat.jar_world_version(self.jar_path) if self.jar_path else None
+
+            def _on_world(info):
+                info['server_version'] = server_version
+                self.world_signal.emit(self.generation, info)
+
+            indexer = world_indexer.get_indexer()
+            infos = indexer.scan(self.server_dir, force=self.force, worlds=names, on_world=_on_world)
+        except Exception:
+            pass
+        self.finished_signal.emit(self.generation, infos)
+
+class AddonIndexThread(QThread):
+    """Read plugin / mod descriptors of an addons folder with components.addons.index.
+
+    Emits finished_signal(generation, addons) with the checked addon dicts
+    (an empty list if the folder could not be read).
+    """
+    finished_signal = pyqtSignal(int, list)
+
+    def __init__(self, generation: int, folder: str, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.folder = folder
+
+    def run(self):
+        addons = []
+        try:
+            addons = addon_index.get_index().scan(self.folder)
+        except Exception:
+            pass
+        self.finished_signal.emit(self.generation, addons)
+
+class AddonUpdateThread(QThread):
+    """Check an addons folder for Modrinth updates, or download a checked list of them.
+
+    Emits progress_signal(done, total, file) while applying and
+    finished_signal(ok, mode, result_or_error_message): the
+    modrinth.check_updates report for 'check', the (update, error) pairs
+    for 'apply'.
+    """
+    progress_signal = pyqtSignal(int, int, str)
+    finished_signal = pyqtSignal(bool, str, object)
+
+    def __init__(self, mode: str, folder: str, loaders=None, game_versions=None, updates=None, parent=None):
+        super().__init__(parent)
+        self.mode = mode
+        self.folder = folder
+        self.loaders = loaders or []
+        self.game_versions = game_versions or []
+        self.updates = updates or []
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            if self.mode == 'check':
+                result = modrinth.check_updates(self.folder, self.loaders, self.game_versions)
+            else:
+                result = modrinth.apply_updates(self.folder, self.updates, cancel=self._cancel,
+                                                progress_cb=lambda d, t, n: self.progress_signal.emit(d, t, n))
+        except Exception as e:
+            self.finished_signal.emit(False, self.mode, str(e) or e.__class__.__name__)
+            return
+        self.finished_signal.emit(True, self.mode, result)
+
+class ModrinthSearchThread(QThread):
+    """Fetch one page of Modrinth search results (modrinth.search) off the GUI thread.
+
+    Emits finished_signal(generation, offset, ok, result_or_error_message).
+    A search superseded by newer typing still finishes, but its generation
+    no longer matches and the GUI drops the result (it stays cached).
+    """
+    finished_signal = pyqtSignal(int, int, bool, object)
+
+    def __init__(self, generation: int, query: str, facets, offset: int = 0, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.query = query
+        self.facets = facets
+        self.offset = offset
+
+    def run(self):
+        try:
+            result = modrinth.search(self.query, self.facets, offset=self.offset)
+        except Exception as e:
+            self.finished_signal.emit(self.generation, self.offset, False, str(e) or e.__class__.__name__)
+            return
+        self.finished_signal.emit(self.generation, self.offset, True, result)
+
+class AddonDownloadThread(QThread):
+    """Resolve a Modrinth project to a compatible file and install it through the download queue.
+
+    Emits log_signal(str) and finished_signal(ok, project_id,
+    version_info_or_error_message). Several can run at once; the queue
+    bounds how many transfers actually proceed in parallel.
+    """
+    log_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(bool, str, object)
+
+    def __init__(self, project_id: str, folder: str, loaders=None, game_versions=None, parent=None):
+        super().__init__(parent)
+        self.project_id = project_id
+        self.folder = folder
+        self.loaders = loaders or []
+        self.game_versions = game_versions or []
+        self.item = None
+
+    def cancel(self):
+        if self.item is not None:
+            self.item.cancel()
+
+    def run(self):
+        try:
+            version = modrinth.latest_version(self.project_id, self.loaders, self.game_versions)
+            self.log_signal.emit(f"[INFO] Found compatible version {version['version_number']} of {version['title']} "
+                                 f"(MC: {', '.join(version['game_versions'][:3])}, Loaders: {', '.join(version['loaders'])})")
+            self.item = dl_queue.get_queue().submit(version['url'], os.path.join(self.folder, version['filename']),
+                                                    priority=dl_queue.PRIORITY_ADDON,
+                                                    expected_hashes=version['hashes'] or None)
+            self.item.result()
+        except Exception as e:
+            self.finished_signal.emit(False, self.project_id, str(e) or e.__class__.__name__)
+            return
+        self.finished_signal.emit(True, self.project_id, version)
+
+class WorldBackupThread(QThread):
+    """Snapshot a world into its repository, holding the server in save-off
+    only while the changed files are staged (see world_backup.snapshot_world).
+
+    For an online backup the save commands are emitted through
+    command_signal(str) so the GUI thread writes them to the server
+    process; console lines must be passed back with feed_line(). Once
+    autosave is back on, the repository's retention policy is applied.
+    """
+    command_signal = pyqtSignal(str)
+    progress_signal = pyqtSignal(int, str)
+    finished_signal = pyqtSignal(bool, str, dict)
+
+    def __init__(self, world_path: str, online: bool, parent=None, tag: str = 'manual'):
+        super().__init__(parent)
+        self.world_path = world_path
+        self.tag = tag
+        self.save_lock = world_backup.SaveLock(self.command_signal.emit) if online else None
+        self._cancel = threading.Event()
+        self._last_progress = 0.0
+
+    def feed_line(self, line: str):
+        if self.save_lock is not None:
+            self.save_lock.feed(line)
+
+    def server_stopped(self):
+        if self.save_lock is not None:
+            self.save_lock.server_stopped()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _snapshot_progress(self, done_files, total_files):
+        now = time.monotonic()
+        if done_files != total_files and now - self._last_progress < 0.1:
+            return
+        self._last_progress = now
+        pct = int(done_files * 100 / total_files) if total_files else 100
+        self.progress_signal.emit(pct, f"{done_files}/{total_files} files checked")
+
+    def run(self):
+        try:
+            repo = diffbackup.DiffRepository.for_world(self.world_path)
+            stats = world_backup.snapshot_world(self.world_path, repo, save_lock=self.save_lock,
+                                                progress_cb=self._snapshot_progress, cancel=self._cancel, tag=self.tag)
+        except Exception as e:
+            unsafe = self.save_lock.unsafe_seconds if self.save_lock is not None else None
+            self.finished_signal.emit(False, str(e) or e.__class__.__name__, {'unsafe_seconds': unsafe})
+            return
+        try:
+            self.progress_signal.emit(100, "applying retention policy")
+            stats['forgotten'] = repo.forget()
+            stats['bytes_freed'] = repo.prune()['bytes_freed']
+        except Exception as e:
+            stats['prune_error'] = str(e)
+        self.finished_signal.emit(True, stats['id'], stats)
+
+
+class WorldExportThread(WorldBackupThread):
+    """Write a world to a .zip/.tar.zst archive, under save-off if the server runs.
+
+    Shares the save-command plumbing of WorldBackupThread, so the GUI keeps
+    it in `world_backup_thread` while it runs.
+    """
+
+    def __init__(self, world_path: str, archive_path: str, online: bool, parent=None):
+        super().__init__(world_path, online, parent=parent)
+        self.archive_path = archive_path
+
+    def _progress(self, done_bytes, total_bytes, done_files, total_files):
+        now = time.monotonic()
+        if done_files != total_files and now - self._last_progress < 0.1:
+            return
+        self._last_progress = now
+        pct = int(done_bytes * 100 / total_bytes) if total_bytes else 100
+        self.progress_signal.emit(pct, f"{done_files}/{total_files} files, {world_indexer.format_size(done_bytes)} of {world_indexer.format_size(total_bytes)}")
+
+    def run(self):
+        try:
+            if self.save_lock is not None:
+                with self.save_lock:
+                    stats = world_archive.export_world(self.world_path, self.archive_path, progress_cb=self._progress, cancel=self._cancel)
+            else:
+                stats = world_archive.export_world(self.world_path, self.archive_path, progress_cb=self._progress, cancel=self._cancel)
+            stats['unsafe_seconds'] = self.save_lock.unsafe_seconds if self.save_lock is not None else None
+            self.finished_signal.emit(True, self.archive_path, stats)
+        except Exception as e:
+            unsafe = self.save_lock.unsafe_seconds if self.save_lock is not None else None
+            self.finished_signal.emit(False, str(e) or e.__class__.__name__, {'unsafe_seconds': unsafe})
+
+
+class WorldImportThread(QThread):
+    """Copy a world folder (components.world.copier) or extract a world
+    archive (components.world.archive) into the server directory.
+
+    progress_signal carries the percentage and a files / size / MB/s line.
+    """
+    progress_signal = pyqtSignal(int, str)
+    finished_signal = pyqtSignal(bool, str, dict)
+
+    def __init__(self, source_path: str, dest_path: str, parent=None):
+        super().__init__(parent)
+        self.source_path = source_path
+        self.dest_path = dest_path
+        self._cancel = threading.Event()
+        self._last_progress = 0.0
+        self._started = time.monotonic()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _progress(self, done_bytes, total_bytes, done_files, total_files):
+        now = time.monotonic()
+        if done_bytes != total_bytes and now - self._last_progress < 0.1:
+            return
+        self._last_progress = now
+        pct = int(done_bytes * 100 / total_bytes) if total_bytes else 100
+        files = f"{done_files}/{total_files}" if total_files else str(done_files)
+        elapsed = now - self._started
+        rate = done_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0.0
+        self.progress_signal.emit(pct, f"{files} files, {world_indexer.format_size(done_bytes)}, {rate:.0f} MB/s")
+
+    def run(self):
+        self._started = time.monotonic()
+        try:
+            if os.path.isdir(self.source_path):
+                stats = world_copier.copy_tree(self.source_path, self.dest_path, progress_cb=self._progress, cancel=self._cancel)
+            else:
+                stats = world_archive.import_world(self.source_path, self.dest_path, progress_cb=self._progress, cancel=self._cancel)
+            self.finished_signal.emit(True, self.dest_path, stats)
+        except Exception as e:
+            self.finished_signal.emit(False, str(e) or e.__class__.__name__, {})
+
+
+class WorldRegionThread(QThread):
+    """Analyze a world's region files or prune its chunks (components.world.regions).
+
+    mode is 'analyze', 'preview' (a dry-run prune) or 'prune'; a real prune
+    first stores a 'pre-prune' snapshot of the world. Emits
+    finished_signal(ok, mode, result) where result carries 'error' on
+    failure.
+    """
+    progress_signal = pyqtSignal(int, str)
+    finished_signal = pyqtSignal(bool, str, dict)
+
+    def __init__(self, mode: str, world_path: str, min_inhabited_ticks: int = 0, radius=None, parent=None):
+        super().__init__(parent)
+        self.mode = mode
+        self.world_path = world_path
+        self.min_inhabited_ticks = min_inhabited_ticks
+        self.radius = radius
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _progress(self, done, total):
+        self.progress_signal.emit(int(done * 100 / total) if total else 100, f"{done}/{total} region files")
+
+    def run(self):
+        try:
+            if self.mode == 'analyze':
+                result = world_regions.analyze_world(self.world_path, progress_cb=self._progress, cancel=self._cancel)
+            else:
+                if self.mode == 'prune':
+                    self.progress_signal.emit(0, "saving a pre-prune snapshot")
+                    diffbackup.DiffRepository.for_world(self.world_path).create(self.world_path, tag='pre-prune', cancel=self._cancel)
+                result = world_regions.prune_world(self.world_path, min_inhabited_ticks=self.min_inhabited_ticks, radius=self.radius,
+                                                   dry_run=self.mode != 'prune', progress_cb=self._progress, cancel=self._cancel)
+            self.finished_signal.emit(True, self.mode, result)
+        except Exception as e:
+            self.finished_signal.emit(False, self.mode, {'error': str(e) or e.__class__.__name__})
+
+
+class SnapshotTaskThread(QThread):
+    """Run one snapshot repository operation (restore, prune) off the GUI thread.
+
+    Emits finished_signal(ok, label, result_or_error_message).
+    """
+    finished_signal = pyqtSignal(bool, str, object)
+
+    def __init__(self, label: str, func, parent=None):
+        super().__init__(parent)
+        self.label = label
+        self.func = func
+
+    def run(self):
+        try:
+            result = self.func()
+        except Exception as e:
+            self.finished_signal.emit(False, self.label, str(e) or e.__class__.__name__)
+            return
+        self.finished_signal.emit(True, self.label, result)
+
 class ServerLauncherGUI(QMainWindow):
+    # Tabs after the first one, in display order, built on first activation
+    # or while the event loop is idle after the first paint.
+    LAZY_TABS = (
+        ("Console", 'create_console_tab'),
+        ("Monitoring", 'create_monitoring_tab'),
+        ("Server Settings", 'create_settings_tab'),
+        ("Addons", 'create_addons_tab'),
+        ("Configuration", 'create_configuration_tab'),
+        ("World Manager", 'create_world_manager_tab'),
+        ("Yali Settings", 'create_yali_settings_tab'),
+        ("Info", 'create_info_tab'),
+    )
+    STARTUP_LOG_KEEP = 200
+    DOWNLOAD_STATUS_ROWS = 3
+    CONSOLE_TAIL_LIMIT = 64 * 1024
+
     def __init__(self):
         super().__init__()
         self.download_thread = None
+        self.addon_download_threads = {}
         self.java_version = None
         self.java_check_done = False
         self.server_process = None
@@ -1077,25 +1818,22 @@ class ServerLauncherGUI(QMainWindow):
         self.disk_plot = None
         self.net_read_plot = None
         self.net_write_plot = None
-        self._last_disk_io = None
-        self._last_net_io = None
         self.monitor_timer = QTimer(self)
         self.monitor_timer.timeout.connect(self._monitor_tick)
-        self.monitor_timer.start(1000)
+        self.metrics_thread = MetricsSamplerThread(DEFAULT_INTERVAL_MS, parent=self)
+        self.metrics_thread.samples_signal.connect(self._on_metric_samples)
         self._raw_console_lines = deque(maxlen=2000)
-        
-        try:
-            self.setup_click_sound()
-            self.setup_background_music()
-        except Exception:
-            pass
-
+        # unterminated last line of each server output stream, completed by the next read
+        self._console_tails = {}
+        self.tick_metrics = TickMetricsExtractor()
+        self._pending_tabs = {}
+        self._startup_marks = {}
+        self._settings_loaded = False
+        self._dir_scan_generation = 0
+
+        # Only the first tab is built here; everything else happens after the
+        # window has painted (see _continue_startup).
         self.init_ui()
-        try:
-            self.load_app_settings()
-        except Exception:
-            pass
-        self.check_java_version_once()
 
     def setup_click_sound(self):
         app = QApplication.instance()
@@ -1117,7 +1855,7 @@ class ServerLauncherGUI(QMainWindow):
             ext = os.path.splitext(sound_path)[1].lower()
             if ext == '.wav':
                 try:
-                    self._click_effect = QSoundEffect(self)
+                    self._click_effect = QtMultimedia.QSoundEffect(self)
                     self._click_effect.setSource(QUrl.fromLocalFile(sound_path))
                     self._click_effect.setLoopCount(1)
                     self._click_effect.setVolume(0.35)
@@ -1179,8 +1917,8 @@ class ServerLauncherGUI(QMainWindow):
             media_src = getattr(self, '_click_media_source', None)
             if media_src:
                 try:
-                    player = QMediaPlayer(self)
-                    output = QAudioOutput(self)
+                    player = QtMultimedia.QMediaPlayer(self)
+                    output = QtMultimedia.QAudioOutput(self)
                     player.setAudioOutput(output)
                     try:
                         output.setVolume((self.sfx_slider.value() if hasattr(self, 'sfx_slider') else 35) / 100.0)
@@ -1190,7 +1928,7 @@ class ServerLauncherGUI(QMainWindow):
 
                     def _on_status_changed(status):
                         try:
-                            if status == QMediaPlayer.MediaStatus.EndOfMedia or status == QMediaPlayer.MediaStatus.InvalidMedia:
+                            if status == QtMultimedia.QMediaPlayer.MediaStatus.EndOfMedia or status == QtMultimedia.QMediaPlayer.MediaStatus.InvalidMedia:
                                 try:
                                     player.stop()
                                 except Exception:
@@ -1261,8 +1999,8 @@ class ServerLauncherGUI(QMainWindow):
             if not os.path.exists(music_path):
                 return
 
-            self._bg_player = QMediaPlayer(self)
-            self._bg_output = QAudioOutput(self)
+            self._bg_player = QtMultimedia.QMediaPlayer(self)
+            self._bg_output = QtMultimedia.QAudioOutput(self)
             self._bg_player.setAudioOutput(self._bg_output)
             try:
                 self._bg_output.setVolume(0.25)
@@ -1280,9 +2018,9 @@ class ServerLauncherGUI(QMainWindow):
                     return
 
             try:
-                loops_attr = getattr(QMediaPlayer, 'Loops', None)
+                loops_attr = getattr(QtMultimedia.QMediaPlayer, 'Loops', None)
                 if loops_attr is not None and hasattr(self._bg_player, 'setLoops'):
-                    self._bg_player.setLoops(QMediaPlayer.Loops.Infinite)
+                    self._bg_player.setLoops(QtMultimedia.QMediaPlayer.Loops.Infinite)
                 elif hasattr(self._bg_player, 'setLoopCount'):
                     try:
                         self._bg_player.setLoopCount(-1)
@@ -1291,7 +2029,7 @@ class ServerLauncherGUI(QMainWindow):
                 else:
                     def _on_status_changed(status):
                         try:
-                            if status == QMediaPlayer.MediaStatus.EndOfMedia:
+                            if status == QtMultimedia.QMediaPlayer.MediaStatus.EndOfMedia:
                                 self._bg_player.setPosition(0)
                                 self._bg_player.play()
                         except Exception:
@@ -1316,13 +2054,7 @@ class ServerLauncherGUI(QMainWindow):
     def get_settings_path(self):
         """Return path to settings JSON in AppData (Windows) or user config dir fallback."""
         try:
-            local = os.getenv('LOCALAPPDATA') or os.getenv('APPDATA')
-            if local:
-                folder = os.path.join(local, 'KaiakK', 'YaliLauncher')
-            else:
-                folder = os.path.join(os.path.expanduser('~'), '.config', 'YaliLauncher')
-            os.makedirs(folder, exist_ok=True)
-            return os.path.join(folder, 'yali_settings.json')
+            return os.path.join(get_app_data_dir(), 'yali_settings.json')
         except Exception:
             return os.path.join(os.path.expanduser('~'), 'yali_settings.json')
 
@@ -1367,6 +2099,8 @@ class ServerLauncherGUI(QMainWindow):
                 self.music_enable.blockSignals(True)
                 self.music_enable.setChecked(bool(data.get('music_enabled', defaults['music_enabled'])))
                 self.music_enable.blockSignals(False)
+            if hasattr(self, 'monitor_interval_spin') and data.get('monitor_interval_ms'):
+                self.monitor_interval_spin.setValue(int(data.get('monitor_interval_ms')))
         except Exception:
             pass
 
@@ -1454,7 +2188,8 @@ class ServerLauncherGUI(QMainWindow):
                 'music_volume': int(self.music_slider.value()) if hasattr(self, 'music_slider') else 12,
                 'sfx_enabled': bool(self.sfx_enable.isChecked()) if hasattr(self, 'sfx_enable') else True,
                 'music_enabled': bool(self.music_enable.isChecked()) if hasattr(self, 'music_enable') else True,
-                'last_server_directory': last_dir_val
+                'last_server_directory': last_dir_val,
+                'monitor_interval_ms': int(self.monitor_interval_spin.value()) if hasattr(self, 'monitor_interval_spin') else DEFAULT_INTERVAL_MS
             }
             tmp = path + '.tmp'
             try:
@@ -1756,15 +2491,135 @@ class ServerLauncherGUI(QMainWindow):
         main_layout.addWidget(self.tab_widget)
         
         self.create_installation_tab()
-        self.create_console_tab()
-        self.create_monitoring_tab()
-        self.create_settings_tab()
-        self.create_addons_tab()
-        self.create_configuration_tab()
-        self.create_world_manager_tab()
-        self.create_yali_settings_tab()
-        self.create_info_tab()
-        
+        for title, builder in self.LAZY_TABS:
+            placeholder = QLabel("Loading...")
+            placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            placeholder.setProperty('lazyPlaceholder', True)
+            self.tab_widget.addTab(placeholder, title)
+            self._pending_tabs[title] = builder
+        self.tab_widget.currentChanged.connect(self._on_tab_activated)
+
+    def _add_tab(self, widget, title):
+        """Add a tab, swapping out its 'Loading...' placeholder if there is one."""
+        for i in range(self.tab_widget.count()):
+            old = self.tab_widget.widget(i)
+            if self.tab_widget.tabText(i) != title or not old.property('lazyPlaceholder'):
+                continue
+            current = self.tab_widget.currentIndex()
+            self.tab_widget.blockSignals(True)
+            try:
+                self.tab_widget.removeTab(i)
+                self.tab_widget.insertTab(i, widget, title)
+                self.tab_widget.setCurrentIndex(current)
+            finally:
+                self.tab_widget.blockSignals(False)
+            old.deleteLater()
+            return i
+        return self.tab_widget.addTab(widget, title)
+
+    def _ensure_tab(self, title):
+        """Build tab `title` now if it is still a placeholder."""
+        builder = self._pending_tabs.pop(title, None)
+        if builder is None:
+            return False
+        started = time.perf_counter()
+        getattr(self, builder)()
+        self._startup_marks.setdefault('tabs', {})[title] = round((time.perf_counter() - started) * 1000.0, 1)
+        return True
+
+    def _ensure_all_tabs(self):
+        """Build every remaining tab; call before touching widgets outside the first tab."""
+        for title, _ in self.LAZY_TABS:
+            self._ensure_tab(title)
+
+    def _on_tab_activated(self, index):
+        if self._pending_tabs:
+            self._ensure_tab(self.tab_widget.tabText(index))
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if 'first_paint' not in self._startup_marks:
+            self._mark_startup('first_paint')
+            QTimer.singleShot(0, self._continue_startup)
+
+    def _continue_startup(self):
+        """Second startup stage: audio, Java discovery, then one lazy tab per event loop pass."""
+        try:
+            self.setup_click_sound()
+            self.setup_background_music()
+        except Exception:
+            pass
+        self.check_java_version_once()
+        QTimer.singleShot(0, self._build_next_tab)
+
+    def _build_next_tab(self):
+        for title, _ in self.LAZY_TABS:
+            if self._ensure_tab(title):
+                QTimer.singleShot(0, self._build_next_tab)
+                return
+        self._finish_startup()
+
+    def _finish_startup(self):
+        """Final stage: restore settings (and the last server directory), start monitoring."""
+        if self._settings_loaded:
+            return
+        try:
+            self.load_app_settings()
+        except Exception:
+            pass
+        self._settings_loaded = True
+        self.monitor_timer.start(1000)
+        self.metrics_thread.start()
+        self._mark_startup('interactive')
+        if not self.server_dir_input.text():
+            self._mark_startup('index')
+
+    def _mark_startup(self, stage):
+        """Record when startup `stage` was reached, in ms since the process started.
+
+        Once first paint, interactive and the initial directory index are
+        all known the timings are logged and appended to startup_times.jsonl
+        in app data.
+        """
+        marks = self._startup_marks
+        if stage in marks or marks.get('recorded'):
+            return
+        try:
+            marks[stage] = round((time.time() - psutil.Process(os.getpid()).create_time()) * 1000.0, 1)
+        except Exception:
+            marks[stage] = None
+        if not all(k in marks for k in ('first_paint', 'interactive', 'index')):
+            return
+        marks['recorded'] = True
+        if PROFILE_IMPORTS:
+            try:
+                budget = float(os.environ.get('YALI_IMPORT_BUDGET_MS') or importprofile.DEFAULT_BUDGET_MS)
+            except ValueError:
+                budget = importprofile.DEFAULT_BUDGET_MS
+            report_path = os.path.join(get_app_data_dir(), 'import_profile.txt')
+            importprofile.write_report(report_path, budget_ms=budget)
+            self.log(f"[INFO] Import profile written to {report_path}")
+        record = {
+            'ts': time.time(),
+            'version': self.get_launcher_version(),
+            'first_paint_ms': marks['first_paint'],
+            'interactive_ms': marks['interactive'],
+            'index_ms': marks['index'],
+            'tab_build_ms': marks.get('tabs', {}),
+        }
+        self.log(f"[INFO] Startup: first paint {marks['first_paint']} ms, interactive {marks['interactive']} ms, server directory indexed {marks['index']} ms")
+        try:
+            path = os.path.join(get_app_data_dir(), 'startup_times.jsonl')
+            lines = []
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    lines = f.readlines()[-(self.STARTUP_LOG_KEEP - 1):]
+            lines.append(json.dumps(record) + '\n')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+        except Exception:
+            pass
+
     def create_installation_tab(self):
         """Create the installation tab"""
         install_widget = QWidget()
@@ -1885,8 +2740,7 @@ class ServerLauncherGUI(QMainWindow):
         
         log_group = QGroupBox("YaliLauncher Logs (debug)")
         log_layout = QVBoxLayout()
-        self.log_output = QTextEdit()
-        self.log_output.setReadOnly(True)
+        self.log_output = ConsoleView(max_blocks=2000)
         self.log_output.setMaximumHeight(200)
         self.log_output.setObjectName("logOutput")
         log_layout.addWidget(self.log_output)
@@ -1900,7 +2754,7 @@ class ServerLauncherGUI(QMainWindow):
         
         self.version_combo.currentTextChanged.connect(self.on_version_changed)
         
-        self.tab_widget.addTab(install_widget, "Installation")
+        self._add_tab(install_widget, "Installation")
     
     def create_console_tab(self):
         """Create the console tab"""
@@ -1943,8 +2797,7 @@ class ServerLauncherGUI(QMainWindow):
 
         console_group = QGroupBox("Server Console")
         console_output_layout = QVBoxLayout()
-        self.console_output = QTextEdit()
-        self.console_output.setReadOnly(True)
+        self.console_output = ConsoleView(max_blocks=10000)
         self.console_output.setObjectName("consoleOutput")
         console_output_layout.addWidget(self.console_output)
 
@@ -2007,20 +2860,46 @@ class ServerLauncherGUI(QMainWindow):
 
         console_layout.addLayout(main_h)
 
-        self.tab_widget.addTab(console_widget, "Console")
+        self._add_tab(console_widget, "Console")
 
     def create_monitoring_tab(self):
         """Create a Monitoring tab that shows RAM usage and TPS graphs for the running server."""
+        # first use of pyqtgraph; falls back to SimplePlot if it is missing or fails to import
+        PlotWidget = getattr(load_module(pg), 'PlotWidget', None) if HAS_PG else None
         mon_widget = QWidget()
         mon_layout = QVBoxLayout(mon_widget)
 
+        header_h = QHBoxLayout()
+        self.tps_label = QLabel("TPS: N/A (run /tps, /mspt or /tick query)")
+        self.tps_label.setObjectName('tpsLabel')
+        header_h.addWidget(self.tps_label, 1, Qt.AlignmentFlag.AlignLeft)
+        header_h.addWidget(QLabel("Sample every:"))
+        self.monitor_interval_spin = QSpinBox()
+        self.monitor_interval_spin.setRange(MIN_INTERVAL_MS, 10000)
+        self.monitor_interval_spin.setSingleStep(100)
+        self.monitor_interval_spin.setSuffix(" ms")
+        self.monitor_interval_spin.setValue(DEFAULT_INTERVAL_MS)
+        self.monitor_interval_spin.valueChanged.connect(self.on_monitor_interval_changed)
+        header_h.addWidget(self.monitor_interval_spin)
+        header_h.addWidget(QLabel("Range:"))
+        self.monitor_range_combo = QComboBox()
+        for label, seconds in (("Live", 0), ("Last hour", 3600), ("Last 24 hours", 86400), ("Last 7 days", 7 * 86400), ("Last 30 days", 30 * 86400)):
+            self.monitor_range_combo.addItem(label, seconds)
+        self.monitor_range_combo.currentIndexChanged.connect(self.on_monitor_range_changed)
+        header_h.addWidget(self.monitor_range_combo)
+        mon_layout.addLayout(header_h)
+
+        self.proc_info_label = QLabel("Server not running")
+        self.proc_info_label.setObjectName('procInfoLabel')
+        mon_layout.addWidget(self.proc_info_label, 0, Qt.AlignmentFlag.AlignLeft)
+
         plots_h = QHBoxLayout()
 
         left_col = QVBoxLayout()
         self.cpu_label = QLabel("CPU: N/A")
         self.cpu_label.setObjectName('cpuLabel')
         left_col.addWidget(self.cpu_label, 0, Qt.AlignmentFlag.AlignLeft)
-        if HAS_PG and PlotWidget is not None:
+        if PlotWidget is not None:
             self.cpu_plot = PlotWidget()
             self.cpu_plot.setBackground('#282828')
             self.cpu_curve = self.cpu_plot.plot(pen=pg.mkPen(color=(200,120,50), width=2))
@@ -2029,10 +2908,10 @@ class ServerLauncherGUI(QMainWindow):
             self.cpu_curve = None
         left_col.addWidget(self.cpu_plot)
 
-        self.disk_label = QLabel("Disk I/O: N/A")
+        self.disk_label = QLabel("Disk I/O (server): N/A")
         self.disk_label.setObjectName('diskLabel')
         left_col.addWidget(self.disk_label, 0, Qt.AlignmentFlag.AlignLeft)
-        if HAS_PG and PlotWidget is not None:
+        if PlotWidget is not None:
             self.disk_plot = PlotWidget()
             self.disk_plot.setBackground('#282828')
             self.disk_curve = self.disk_plot.plot(pen=pg.mkPen(color=(120,180,120), width=2))
@@ -2047,7 +2926,7 @@ class ServerLauncherGUI(QMainWindow):
         self.ram_label = QLabel("RAM: N/A")
         self.ram_label.setObjectName('ramLabel')
         right_col.addWidget(self.ram_label, 0, Qt.AlignmentFlag.AlignLeft)
-        if HAS_PG and PlotWidget is not None:
+        if PlotWidget is not None:
             self.ram_plot = PlotWidget()
             self.ram_plot.setBackground('#282828')
             self.ram_curve = self.ram_plot.plot(pen=pg.mkPen(color=(100,180,255), width=2))
@@ -2061,11 +2940,11 @@ class ServerLauncherGUI(QMainWindow):
         mon_layout.addLayout(plots_h)
 
         net_h = QHBoxLayout()
-        self.net_read_label = QLabel("Net Read: N/A")
+        self.net_read_label = QLabel("Net Read (host): N/A")
         self.net_read_label.setObjectName('netReadLabel')
         net_left = QVBoxLayout()
         net_left.addWidget(self.net_read_label, 0, Qt.AlignmentFlag.AlignLeft)
-        if HAS_PG and PlotWidget is not None:
+        if PlotWidget is not None:
             self.net_read_plot = PlotWidget()
             self.net_read_plot.setBackground('#282828')
             self.net_read_curve = self.net_read_plot.plot(pen=pg.mkPen(color=(120,200,255), width=2))
@@ -2075,11 +2954,11 @@ class ServerLauncherGUI(QMainWindow):
         net_left.addWidget(self.net_read_plot)
         net_h.addLayout(net_left, 1)
 
-        self.net_write_label = QLabel("Net Write: N/A")
+        self.net_write_label = QLabel("Net Write (host): N/A")
         self.net_write_label.setObjectName('netWriteLabel')
         net_right = QVBoxLayout()
         net_right.addWidget(self.net_write_label, 0, Qt.AlignmentFlag.AlignLeft)
-        if HAS_PG and PlotWidget is not None:
+        if PlotWidget is not None:
             self.net_write_plot = PlotWidget()
             self.net_write_plot.setBackground('#282828')
             self.net_write_curve = self.net_write_plot.plot(pen=pg.mkPen(color=(255,170,120), width=2))
@@ -2095,228 +2974,211 @@ class ServerLauncherGUI(QMainWindow):
         note.setProperty('class', 'infoLabel')
         mon_layout.addWidget(note)
 
-        self.tab_widget.addTab(mon_widget, "Monitoring")
+        self._add_tab(mon_widget, "Monitoring")
 
     def _monitor_tick(self):
-        """Periodic monitor tick: sample server process metrics and parse console for TPS."""
+        """Periodic monitor tick: point the sampler at the server process and refresh TPS.
+
+        Process metrics are collected on MetricsSamplerThread and arrive via
+        _on_metric_samples; nothing here touches psutil.
+        """
         pid = None
         proc = getattr(self, 'server_process', None)
         try:
-            if proc:
-                try:
-                    pid = int(proc.processId())
-                except Exception:
-                    pid = None
+            if proc and proc.state() != QProcess.ProcessState.NotRunning:
+                pid = int(proc.processId()) or None
         except Exception:
             pid = None
+        try:
+            if getattr(self, 'metrics_thread', None):
+                self.metrics_thread.set_pid(pid)
+        except Exception:
+            pass
 
-        ram_val = None
-        cpu_val = None
-        if pid and HAS_PSUTIL:
-            try:
-                if not hasattr(self, '_ps_proc') or getattr(self, '_ps_proc_pid', None) != pid:
-                    try:
-                        self._ps_proc = psutil.Process(pid)
-                        self._ps_proc_pid = pid
-                        try:
-                            self._ps_proc.cpu_percent(interval=None)
-                        except Exception:
-                            pass
-                        cpu_val = None
-                    except Exception:
-                        self._ps_proc = None
-                        self._ps_proc_pid = None
-                        cpu_val = None
-                else:
-                    try:
-                        cpu_val = self._ps_proc.cpu_percent(interval=None)
-                    except Exception:
-                        cpu_val = None
-
-                if getattr(self, '_ps_proc', None):
-                    try:
-                        ram_val = self._ps_proc.memory_info().rss / (1024.0*1024.0)
-                    except Exception:
-                        ram_val = None
-            except Exception:
-                ram_val = None
-                cpu_val = None
-
-        if ram_val is not None:
-            self.ram_label.setText(f"RAM: {ram_val:.1f} MB")
-        else:
-            self.ram_label.setText("RAM: N/A")
-
-        if cpu_val is not None:
-            self.cpu_label.setText(f"CPU: {cpu_val:.0f}%")
-        else:
-            self.cpu_label.setText("CPU: N/A")
-
-        tps_val = None
         try:
-            txt = ''
-            if getattr(self, '_raw_console_lines', None) and len(self._raw_console_lines) > 0:
-                try:
-                    lines = list(self._raw_console_lines)[-800:]
-                    joined = '\n'.join(lines)
-                except Exception:
-                    joined = ''
-            else:
-                if getattr(self, 'console_output', None):
-                    txt = self.console_output.toPlainText()
-                if txt:
-                    lines = txt.splitlines()[-800:]
-                    joined = '\n'.join(lines)
-                    try:
-                        joined = re.sub(r'\x1B\[[0-?]*[ -/]*[@-~]', '', joined)
-                    except Exception:
-                        pass
-                m = re.search(r'(?:TPS[:=\s]*([0-9]+(?:\.[0-9]+)?)|([0-9]+(?:\.[0-9]+)?)\s*(?:TPS|tps))', joined, flags=re.IGNORECASE)
-                if m:
-                    g = m.group(1) or m.group(2)
-                    try:
-                        tps_val = float(g)
-                    except Exception:
-                        tps_val = None
-                else:
-                    mm = re.search(r'mean\s*tick\s*time[:\s:=]*([0-9]+(?:\.[0-9]+)?)\s*ms', joined, flags=re.IGNORECASE)
-                    if not mm:
-                        mm = re.search(r'([0-9]+(?:\.[0-9]+)?)\s*ms\s*/?\s*tick', joined, flags=re.IGNORECASE)
-                    if mm:
-                        try:
-                            ms = float(mm.group(1))
-                            if ms > 0:
-                                tps_val = min(20.0, 1000.0 / ms)
-                        except Exception:
-                            tps_val = None
-                    else:
-                        mlist = re.search(r'TPS[:=\s]*([0-9]+(?:\.[0-9]+)?(?:\s*,\s*[0-9]+(?:\.[0-9]+)?)*)', joined, flags=re.IGNORECASE)
-                        if mlist:
-                            try:
-                                nums = [float(x.strip()) for x in mlist.group(1).split(',') if x.strip()]
-                                if nums:
-                                    tps_val = nums[0]
-                            except Exception:
-                                tps_val = None
+            snap = self.tick_metrics.snapshot()
+            tps_val = snap['tps']
+            if tps_val is not None and getattr(self, 'tps_label', None):
+                age = max(0, int(time.time() - (snap['updated_at'] or time.time())))
+                text = f"TPS: {tps_val:.1f}"
+                if snap['mspt'] is not None:
+                    text += f" — MSPT: {snap['mspt']:.1f} ms"
+                text += f" ({age}s ago)"
+                self.tps_label.setText(text)
+            elif getattr(self, 'tps_label', None):
+                self.tps_label.setText("TPS: N/A (run /tps, /mspt or /tick query)")
         except Exception:
             tps_val = None
 
-
+    def on_monitor_interval_changed(self, value):
         try:
-            total_disk = None
-            net_read = None
-            net_write = None
-            try:
-                if HAS_PSUTIL:
-                    dio = psutil.disk_io_counters()
-                    if dio is not None:
-                        total_disk = (getattr(dio, 'read_bytes', 0) or 0) + (getattr(dio, 'write_bytes', 0) or 0)
-            except Exception:
-                total_disk = None
+            if getattr(self, 'metrics_thread', None):
+                self.metrics_thread.set_interval(int(value))
+        except Exception:
+            pass
 
-            try:
-                if HAS_PSUTIL:
-                    nio = psutil.net_io_counters()
-                    if nio is not None:
-                        net_read = getattr(nio, 'bytes_recv', 0) or 0
-                        net_write = getattr(nio, 'bytes_sent', 0) or 0
-            except Exception:
-                net_read = None
-                net_write = None
+    MONITOR_PLOTS = (
+        ('rss_mb', 'ram_plot', 'ram_curve', 'ram_samples'),
+        ('cpu', 'cpu_plot', 'cpu_curve', 'cpu_samples'),
+        ('disk_kbs', 'disk_plot', 'disk_curve', 'disk_samples'),
+        ('net_recv_kbs', 'net_read_plot', 'net_read_curve', 'net_read_samples'),
+        ('net_sent_kbs', 'net_write_plot', 'net_write_curve', 'net_write_samples'),
+    )
 
-            disk_kb_s = None
-            if total_disk is not None:
-                if self._last_disk_io is None:
-                    disk_kb_s = 0.0
-                else:
-                    disk_kb_s = max(0.0, (total_disk - self._last_disk_io) / 1024.0)
-                self._last_disk_io = total_disk
-
-            net_read_kb_s = None
-            net_write_kb_s = None
-            if net_read is not None and net_write is not None:
-                if self._last_net_io is None:
-                    net_read_kb_s = 0.0
-                    net_write_kb_s = 0.0
-                else:
-                    last_r, last_w = self._last_net_io
-                    net_read_kb_s = max(0.0, (net_read - last_r) / 1024.0)
-                    net_write_kb_s = max(0.0, (net_write - last_w) / 1024.0)
-                self._last_net_io = (net_read, net_write)
+    def _attach_metrics_history(self, directory):
+        """Point the metrics history at `directory` (one store per server directory)."""
+        try:
+            if not directory or not os.path.isdir(directory):
+                return
+            norm = os.path.normcase(os.path.abspath(directory))
+            if getattr(self, '_metrics_history_dir', None) == norm:
+                return
+            history = MetricsHistory.for_directory(directory)
+            self._metrics_history_dir = norm
+            self.metrics_history = history
+            if getattr(self, 'metrics_thread', None):
+                self.metrics_thread.set_history(history)
+            if self._monitor_range_seconds():
+                self._refresh_history_plots()
+        except Exception as e:
+            self.metrics_history = None
+            self.log(f"[WARNING] Metrics history unavailable: {e}")
 
-            try:
-                self.ram_samples.append(ram_val if ram_val is not None else None)
-                self.cpu_samples.append(cpu_val if cpu_val is not None else None)
-                self.disk_samples.append(disk_kb_s if disk_kb_s is not None else None)
-                self.net_read_samples.append(net_read_kb_s if net_read_kb_s is not None else None)
-                self.net_write_samples.append(net_write_kb_s if net_write_kb_s is not None else None)
-            except Exception:
-                pass
+    def _monitor_range_seconds(self):
+        try:
+            combo = getattr(self, 'monitor_range_combo', None)
+            return int(combo.currentData() or 0) if combo else 0
+        except Exception:
+            return 0
 
+    def on_monitor_range_changed(self, index):
+        if self._monitor_range_seconds():
+            self._refresh_history_plots()
+            return
+        for metric, plot_attr, curve_attr, samples_attr in self.MONITOR_PLOTS:
             try:
-                if disk_kb_s is not None:
-                    self.disk_label.setText(f"Disk I/O: {disk_kb_s:.1f} KB/s")
-                else:
-                    self.disk_label.setText("Disk I/O: N/A")
+                samples = getattr(self, samples_attr)
+                curve = getattr(self, curve_attr, None)
+                plot = getattr(self, plot_attr, None)
+                if curve is not None:
+                    curve.setData([v if v is not None else float('nan') for v in samples])
+                elif isinstance(plot, SimplePlot):
+                    plot.samples = deque(samples, maxlen=120)
+                    plot.update()
             except Exception:
                 pass
+
+    def _refresh_history_plots(self):
+        """Show the selected history range (avg per bucket) in the Monitoring plots."""
+        self._history_plot_ts = time.monotonic()
+        history = getattr(self, 'metrics_history', None)
+        span = self._monitor_range_seconds()
+        if history is None or not span:
+            return
+        now = time.time()
+        for metric, plot_attr, curve_attr, samples_attr in self.MONITOR_PLOTS:
             try:
-                if net_read_kb_s is not None:
-                    self.net_read_label.setText(f"Net Read: {net_read_kb_s:.1f} KB/s")
-                else:
-                    self.net_read_label.setText("Net Read: N/A")
-                if net_write_kb_s is not None:
-                    self.net_write_label.setText(f"Net Write: {net_write_kb_s:.1f} KB/s")
-                else:
-                    self.net_write_label.setText("Net Write: N/A")
+                series = history.query(now - span, now, metric, max_points=300)
+                values = series['avg']
+                curve = getattr(self, curve_attr, None)
+                plot = getattr(self, plot_attr, None)
+                if curve is not None:
+                    curve.setData([(t - now) / 60.0 for t in series['ts']], values)
+                elif isinstance(plot, SimplePlot):
+                    plot.samples = deque([None if v != v else v for v in values], maxlen=max(1, len(values)))
+                    plot.update()
             except Exception:
                 pass
 
-            def to_series(dq):
-                return [v if v is not None else float('nan') for v in dq]
+    def _on_metric_samples(self, batch):
+        """Apply a batch of samples from MetricsSamplerThread to the Monitoring tab."""
+        if not batch:
+            return
+        live = self._monitor_range_seconds() == 0
+        try:
+            for sample in batch:
+                disk_kb_s = sample.get('disk_kbs')
+                self.ram_samples.append(sample.get('rss_mb'))
+                self.cpu_samples.append(sample.get('cpu'))
+                self.disk_samples.append(disk_kb_s)
+                self.net_read_samples.append(sample.get('net_recv_kbs'))
+                self.net_write_samples.append(sample.get('net_sent_kbs'))
+                for plot_attr, curve_attr, value in (
+                    ('ram_plot', 'ram_curve', sample.get('rss_mb')),
+                    ('cpu_plot', 'cpu_curve', sample.get('cpu')),
+                    ('disk_plot', 'disk_curve', disk_kb_s),
+                    ('net_read_plot', 'net_read_curve', sample.get('net_recv_kbs')),
+                    ('net_write_plot', 'net_write_curve', sample.get('net_sent_kbs')),
+                ):
+                    plot = getattr(self, plot_attr, None)
+                    if live and getattr(self, curve_attr, None) is None and isinstance(plot, SimplePlot):
+                        plot.add_sample(value)
+        except Exception:
+            pass
 
-            try:
-                if getattr(self, 'ram_curve', None) is not None:
-                    self.ram_curve.setData(to_series(self.ram_samples))
-                elif getattr(self, 'ram_plot', None):
-                    self.ram_plot.add_sample(ram_val if ram_val is not None else None)
-            except Exception:
-                pass
+        last = batch[-1]
+        try:
+            if last.get('rss_mb') is not None:
+                text = f"RAM: {last['rss_mb']:.1f} MB"
+                if last.get('uss_mb') is not None:
+                    text += f" (USS {last['uss_mb']:.1f} MB)"
+                self.ram_label.setText(text)
+            else:
+                self.ram_label.setText("RAM: N/A")
 
-            try:
-                if getattr(self, 'cpu_curve', None) is not None:
-                    self.cpu_curve.setData(to_series(self.cpu_samples))
-                elif getattr(self, 'cpu_plot', None):
-                    self.cpu_plot.add_sample(cpu_val if cpu_val is not None else None)
-            except Exception:
-                pass
+            if last.get('cpu') is not None:
+                self.cpu_label.setText(f"CPU: {last['cpu']:.0f}%")
+            else:
+                self.cpu_label.setText("CPU: N/A")
 
-            try:
-                if getattr(self, 'disk_curve', None) is not None:
-                    self.disk_curve.setData(to_series(self.disk_samples))
-                elif getattr(self, 'disk_plot', None):
-                    self.disk_plot.add_sample(disk_kb_s if disk_kb_s is not None else None)
-            except Exception:
-                pass
+            if last.get('read_kbs') is not None or last.get('write_kbs') is not None:
+                self.disk_label.setText(f"Disk I/O (server): R {last.get('read_kbs') or 0.0:.1f} / W {last.get('write_kbs') or 0.0:.1f} KB/s")
+            else:
+                self.disk_label.setText("Disk I/O (server): N/A")
+
+            if last.get('net_recv_kbs') is not None:
+                self.net_read_label.setText(f"Net Read (host): {last['net_recv_kbs']:.1f} KB/s")
+            else:
+                self.net_read_label.setText("Net Read (host): N/A")
+            if last.get('net_sent_kbs') is not None:
+                self.net_write_label.setText(f"Net Write (host): {last['net_sent_kbs']:.1f} KB/s")
+            else:
+                self.net_write_label.setText("Net Write (host): N/A")
+
+            if getattr(self, 'proc_info_label', None):
+                cost = max(s.get('cost_ms') or 0.0 for s in batch)
+                if last.get('alive'):
+                    handles = "Handles" if sys.platform == 'win32' else "Open files"
+                    self.proc_info_label.setText(
+                        f"Threads: {last.get('threads')} — {handles}: {last.get('fds')} — "
+                        f"Child processes: {last.get('children')} — Sampling cost: {cost:.1f} ms"
+                    )
+                else:
+                    self.proc_info_label.setText(f"Server not running — Sampling cost: {cost:.1f} ms")
+        except Exception:
+            pass
 
+        if not live:
+            if time.monotonic() - getattr(self, '_history_plot_ts', 0.0) >= 5.0:
+                self._refresh_history_plots()
+            return
 
-            try:
-                if getattr(self, 'net_read_curve', None) is not None:
-                    self.net_read_curve.setData(to_series(self.net_read_samples))
-                elif getattr(self, 'net_read_plot', None):
-                    self.net_read_plot.add_sample(net_read_kb_s if net_read_kb_s is not None else None)
-            except Exception:
-                pass
+        def to_series(dq):
+            return [v if v is not None else float('nan') for v in dq]
 
+        for curve_attr, samples in (
+            ('ram_curve', self.ram_samples),
+            ('cpu_curve', self.cpu_samples),
+            ('disk_curve', self.disk_samples),
+            ('net_read_curve', self.net_read_samples),
+            ('net_write_curve', self.net_write_samples),
+        ):
             try:
-                if getattr(self, 'net_write_curve', None) is not None:
-                    self.net_write_curve.setData(to_series(self.net_write_samples))
-                elif getattr(self, 'net_write_plot', None):
-                    self.net_write_plot.add_sample(net_write_kb_s if net_write_kb_s is not None else None)
+                curve = getattr(self, curve_attr, None)
+                if curve is not None:
+                    curve.setData(to_series(samples))
             except Exception:
                 pass
-        except Exception:
-            pass
     
     def create_settings_tab(self):
         """Create the settings tab for server.properties"""
@@ -2486,7 +3348,7 @@ class ServerLauncherGUI(QMainWindow):
         button_layout.addWidget(self.save_settings_button)
         settings_layout.addLayout(button_layout)
         
-        self.tab_widget.addTab(settings_widget, "Server Settings")
+        self._add_tab(settings_widget, "Server Settings")
     
     def create_addons_tab(self):
         """Create the addons tab for managing plugins/mods"""
@@ -2514,10 +3376,16 @@ class ServerLauncherGUI(QMainWindow):
         self.modrinth_search_input = QLineEdit()
         self.modrinth_search_input.setPlaceholderText("Search for plugins or mods...")
         self.modrinth_search_input.returnPressed.connect(self.search_modrinth)
+        # search as you type once typing pauses
+        self._modrinth_search_timer = QTimer(self)
+        self._modrinth_search_timer.setSingleShot(True)
+        self._modrinth_search_timer.setInterval(350)
+        self._modrinth_search_timer.timeout.connect(lambda: self.search_modrinth(interactive=False))
+        self.modrinth_search_input.textEdited.connect(lambda _text: self._modrinth_search_timer.start())
         
         self.modrinth_search_button = QPushButton("Search")
         self.modrinth_search_button.setObjectName("modrinthSearchButton")
-        self.modrinth_search_button.clicked.connect(self.search_modrinth)
+        self.modrinth_search_button.clicked.connect(lambda: self.search_modrinth())
         
         search_input_layout.addWidget(self.modrinth_search_input)
         search_input_layout.addWidget(self.modrinth_search_button)
@@ -2527,12 +3395,39 @@ class ServerLauncherGUI(QMainWindow):
         self.modrinth_results.setMaximumHeight(150)
         self.modrinth_results.setObjectName("modrinthResults")
         self.modrinth_results.itemDoubleClicked.connect(self.download_modrinth_addon)
+        self.modrinth_results.verticalScrollBar().valueChanged.connect(self._on_modrinth_results_scrolled)
         search_layout.addWidget(self.modrinth_results)
         
         download_hint = QLabel("💡 Double-click an item to download and install")
         download_hint.setObjectName("downloadHint")
         search_layout.addWidget(download_hint)
         
+        # shared download queue: server jars, JDKs and addons all show up here
+        downloads_layout = QHBoxLayout()
+        self.download_queue_label = QLabel("No active downloads")
+        self.download_queue_label.setObjectName("downloadQueueLabel")
+        self.download_queue_label.setWordWrap(True)
+        
+        self.pause_downloads_button = QPushButton("Pause Downloads")
+        self.pause_downloads_button.setObjectName("pauseDownloadsButton")
+        self.pause_downloads_button.clicked.connect(self.toggle_downloads_paused)
+        self.pause_downloads_button.setEnabled(False)
+        
+        self.cancel_downloads_button = QPushButton("Cancel All")
+        self.cancel_downloads_button.setObjectName("cancelDownloadsButton")
+        self.cancel_downloads_button.clicked.connect(self.cancel_all_downloads)
+        self.cancel_downloads_button.setEnabled(False)
+        
+        downloads_layout.addWidget(self.download_queue_label, 1)
+        downloads_layout.addWidget(self.pause_downloads_button)
+        downloads_layout.addWidget(self.cancel_downloads_button)
+        search_layout.addLayout(downloads_layout)
+        
+        self._download_status_timer = QTimer(self)
+        self._download_status_timer.setInterval(500)
+        self._download_status_timer.timeout.connect(self._refresh_download_status)
+        self._download_status_timer.start()
+        
         search_group.setLayout(search_layout)
         addons_layout.addWidget(search_group)
         
@@ -2569,14 +3464,21 @@ class ServerLauncherGUI(QMainWindow):
         self.open_folder_button.clicked.connect(self.open_addons_folder)
         self.open_folder_button.setEnabled(False)
         
+        self.check_updates_button = QPushButton("Check for Updates")
+        self.check_updates_button.setObjectName("checkUpdatesButton")
+        self.check_updates_button.setToolTip("Look up every jar on Modrinth by its hash and offer the newer versions")
+        self.check_updates_button.clicked.connect(self.check_addon_updates)
+        self.check_updates_button.setEnabled(False)
+        
         button_layout.addWidget(self.refresh_addons_button)
         button_layout.addWidget(self.add_addon_button)
         button_layout.addWidget(self.remove_addon_button)
         button_layout.addWidget(self.open_folder_button)
+        button_layout.addWidget(self.check_updates_button)
         button_layout.addStretch()
         addons_layout.addLayout(button_layout)
         
-        self.tab_widget.addTab(addons_widget, "Addons")
+        self._add_tab(addons_widget, "Addons")
 
     def create_configuration_tab(self):
         """Create Configuration tab to edit plugin/mod config files"""
@@ -2629,7 +3531,7 @@ class ServerLauncherGUI(QMainWindow):
         cfg_layout.addLayout(left_layout, 1)
         cfg_layout.addLayout(right_layout, 3)
 
-        self.tab_widget.addTab(cfg_widget, "Configuration")
+        self._add_tab(cfg_widget, "Configuration")
 
         self._current_config_folder = None
         self._current_config_file = None
@@ -2769,7 +3671,7 @@ class ServerLauncherGUI(QMainWindow):
         
         self.refresh_worlds_button = QPushButton("Refresh List")
         self.refresh_worlds_button.setObjectName("refreshButton")
-        self.refresh_worlds_button.clicked.connect(self.refresh_worlds_list)
+        self.refresh_worlds_button.clicked.connect(lambda: self.refresh_worlds_list(force=True))
         self.refresh_worlds_button.setEnabled(False)
         
         self.open_world_folder_button = QPushButton("Open Folder")
@@ -2787,15 +3689,114 @@ class ServerLauncherGUI(QMainWindow):
         self.backup_world_button.clicked.connect(self.backup_world)
         self.backup_world_button.setEnabled(False)
         
+        self.import_archive_button = QPushButton("Import Archive")
+        self.import_archive_button.setObjectName("importArchiveButton")
+        self.import_archive_button.setToolTip("Import a world from a .zip, .tar.zst or .tar.gz archive")
+        self.import_archive_button.clicked.connect(lambda: self.import_world_archive())
+        self.import_archive_button.setEnabled(False)
+        
+        self.export_world_button = QPushButton("Export Selected")
+        self.export_world_button.setObjectName("exportWorldButton")
+        self.export_world_button.setToolTip("Write the selected world to a single .zip or .tar.zst archive")
+        self.export_world_button.clicked.connect(self.export_world)
+        self.export_world_button.setEnabled(False)
+        
         button_layout.addWidget(self.import_world_button)
+        button_layout.addWidget(self.import_archive_button)
         button_layout.addWidget(self.refresh_worlds_button)
         button_layout.addWidget(self.open_world_folder_button)
         button_layout.addWidget(self.backup_world_button)
+        button_layout.addWidget(self.export_world_button)
         button_layout.addWidget(self.delete_world_button)
         button_layout.addStretch()
         world_layout.addLayout(button_layout)
-        
-        self.tab_widget.addTab(world_widget, "World Manager")
+
+        snapshot_group = QGroupBox("Snapshots")
+        snapshot_layout = QVBoxLayout()
+
+        self.snapshot_list = QListWidget()
+        self.snapshot_list.setObjectName("snapshotList")
+        self.snapshot_list.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
+        self.snapshot_list.itemSelectionChanged.connect(self._update_snapshot_buttons)
+        snapshot_layout.addWidget(self.snapshot_list)
+
+        snapshot_buttons = QHBoxLayout()
+        self.restore_snapshot_button = QPushButton("Restore Snapshot")
+        self.restore_snapshot_button.setObjectName("restoreSnapshotButton")
+        self.restore_snapshot_button.clicked.connect(self.restore_snapshot)
+        self.delete_snapshot_button = QPushButton("Delete Snapshot")
+        self.delete_snapshot_button.setObjectName("deleteSnapshotButton")
+        self.delete_snapshot_button.clicked.connect(self.delete_snapshot)
+        self.prune_snapshots_button = QPushButton("Prune Now")
+        self.prune_snapshots_button.setObjectName("pruneSnapshotsButton")
+        self.prune_snapshots_button.setToolTip("Apply the retention policy and free space no snapshot uses any more")
+        self.prune_snapshots_button.clicked.connect(self.prune_snapshots)
+        snapshot_buttons.addWidget(self.restore_snapshot_button)
+        snapshot_buttons.addWidget(self.delete_snapshot_button)
+        snapshot_buttons.addWidget(self.prune_snapshots_button)
+        snapshot_buttons.addStretch()
+        self.snapshot_repo_label = QLabel("")
+        self.snapshot_repo_label.setProperty('class', 'infoLabel')
+        snapshot_buttons.addWidget(self.snapshot_repo_label)
+        snapshot_layout.addLayout(snapshot_buttons)
+
+        retention_layout = QHBoxLayout()
+        retention_layout.addWidget(QLabel("Keep:"))
+        self.retention_spinboxes = {}
+        for key, label in (('keep_last', "last"), ('hourly', "hourly"), ('daily', "daily"), ('weekly', "weekly")):
+            spin = QSpinBox()
+            spin.setRange(0, 999)
+            spin.setValue(diffbackup.DEFAULT_POLICY[key])
+            spin.valueChanged.connect(self._on_retention_changed)
+            retention_layout.addWidget(spin)
+            retention_layout.addWidget(QLabel(label))
+            self.retention_spinboxes[key] = spin
+        retention_layout.addStretch()
+        snapshot_layout.addLayout(retention_layout)
+
+        snapshot_group.setLayout(snapshot_layout)
+        world_layout.addWidget(snapshot_group)
+        chunks_group = QGroupBox("Chunks")
+        chunks_layout = QVBoxLayout()
+        chunk_buttons = QHBoxLayout()
+        self.analyze_regions_button = QPushButton("Analyze Regions")
+        self.analyze_regions_button.setObjectName("analyzeRegionsButton")
+        self.analyze_regions_button.setToolTip("Count chunks per dimension and how long players spent in them")
+        self.analyze_regions_button.clicked.connect(self.analyze_world_regions)
+        chunk_buttons.addWidget(self.analyze_regions_button)
+        chunk_buttons.addStretch()
+        chunk_buttons.addWidget(QLabel("Prune chunks visited less than"))
+        self.prune_minutes_spinbox = QSpinBox()
+        self.prune_minutes_spinbox.setRange(0, 6000)
+        self.prune_minutes_spinbox.setSuffix(" min")
+        self.prune_minutes_spinbox.setSpecialValueText("off")
+        self.prune_minutes_spinbox.setValue(1)
+        chunk_buttons.addWidget(self.prune_minutes_spinbox)
+        chunk_buttons.addWidget(QLabel("or further than"))
+        self.prune_radius_spinbox = QSpinBox()
+        self.prune_radius_spinbox.setRange(0, 100000)
+        self.prune_radius_spinbox.setSuffix(" chunks")
+        self.prune_radius_spinbox.setSpecialValueText("off")
+        self.prune_radius_spinbox.setToolTip("Square radius around the world spawn")
+        chunk_buttons.addWidget(self.prune_radius_spinbox)
+        self.prune_chunks_button = QPushButton("Prune Chunks")
+        self.prune_chunks_button.setObjectName("pruneChunksButton")
+        self.prune_chunks_button.setToolTip("Delete matching chunks; the game regenerates them from the seed when visited.\n"
+                                            "A snapshot of the world is taken first.")
+        self.prune_chunks_button.clicked.connect(self.prune_world_chunks)
+        chunk_buttons.addWidget(self.prune_chunks_button)
+        chunks_layout.addLayout(chunk_buttons)
+        self.region_report_label = QLabel("")
+        self.region_report_label.setWordWrap(True)
+        self.region_report_label.setProperty('class', 'infoLabel')
+        chunks_layout.addWidget(self.region_report_label)
+        chunks_group.setLayout(chunks_layout)
+        world_layout.addWidget(chunks_group)
+
+        self.worlds_list.itemSelectionChanged.connect(self.refresh_snapshot_list)
+        self.refresh_snapshot_list()
+        
+        self._add_tab(world_widget, "World Manager")
         
     def create_yali_settings_tab(self):
         """Create a separate tab for Yali/App settings (SFX and Music)."""
@@ -2841,7 +3842,7 @@ class ServerLauncherGUI(QMainWindow):
         yali_layout.addWidget(hint)
 
         yali_layout.addStretch()
-        self.tab_widget.addTab(yali_widget, "Yali Settings")
+        self._add_tab(yali_widget, "Yali Settings")
         
     def create_info_tab(self):
         """Create an Info tab that displays markdown documents from
@@ -2877,7 +3878,7 @@ class ServerLauncherGUI(QMainWindow):
         self.info_view.setLineWrapMode(QTextEdit.LineWrapMode.WidgetWidth)
         info_layout.addWidget(self.info_view)
 
-        self.tab_widget.addTab(info_widget, "Info")
+        self._add_tab(info_widget, "Info")
 
         try:
             default_label = 'YALI'
@@ -2979,163 +3980,79 @@ class ServerLauncherGUI(QMainWindow):
             self.update_java_label()
 
     def detect_all_java_installations(self):
-        """Scan common locations and PATH for java executables and record their major versions.
+        """Start background Java discovery; results land in `self.java_candidates`.
 
-        Populates `self.java_candidates` with dicts: {'major': int, 'path': str, 'source': str}
+        `self.java_candidates` holds dicts: {'major': int, 'path': str, 'source': str, ...}.
+        Discovery reads each runtime's `release` file, only runs `java -version`
+        for unknown candidates (in parallel) and caches results, so this never
+        blocks the GUI thread.
         """
-        candidates = []
-
-        def run_and_parse(java_path, source_label):
-            try:
-                result = subprocess.run(
-                    [java_path, '-version'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-                )
-                out = (result.stderr or result.stdout) or ''
-                m = re.search(r'version\s+"?(\d+)(?:\.(\d+))?(?:\.(\d+))?', out)
-                if m:
-                    major = int(m.group(1))
-                    if major == 1 and m.group(2):
-                        major = int(m.group(2))
-                    candidates.append({'major': major, 'path': java_path, 'source': source_label})
-            except Exception:
-                return
-
-        try:
-            jh = os.environ.get('JAVA_HOME')
-            if jh:
-                jp = os.path.join(jh, 'bin', 'java.exe') if sys.platform == 'win32' else os.path.join(jh, 'bin', 'java')
-                if os.path.exists(jp):
-                    run_and_parse(jp, 'JAVA_HOME')
-        except Exception:
-            pass
-
         try:
-            path_env = os.environ.get('PATH', '')
-            for p in path_env.split(os.pathsep):
-                if not p:
-                    continue
-                jp = os.path.join(p, 'java.exe') if sys.platform == 'win32' else os.path.join(p, 'java')
-                if os.path.exists(jp):
-                    run_and_parse(jp, 'PATH')
+            running = getattr(self, 'java_discovery_thread', None)
+            if running is not None and running.isRunning():
+                self._java_rediscover = True
+                return
         except Exception:
             pass
+        self._java_rediscover = False
+        self.java_discovery_thread = JavaDiscoveryThread(self)
+        self.java_discovery_thread.finished_signal.connect(self._on_java_discovered)
+        self.java_discovery_thread.start()
 
-        if sys.platform == 'win32':
-            roots = []
-            try:
-                roots.append(os.environ.get('ProgramFiles', r'C:\Program Files'))
-            except Exception:
-                pass
-            try:
-                roots.append(os.environ.get('ProgramFiles(x86)', r'C:\Program Files (x86)'))
-            except Exception:
-                pass
-
-            for root in [r for r in roots if r]:
-                try:
-                    for child in os.listdir(root):
-                        child_path = os.path.join(root, child)
-                        if not os.path.isdir(child_path):
-                            continue
-                        jp = os.path.join(child_path, 'bin', 'java.exe')
-                        if os.path.exists(jp):
-                            run_and_parse(jp, 'ProgramFiles')
-                except Exception:
-                    continue
-
-            try:
-                user_home = os.path.expanduser('~')
-                user_roots = [
-                    os.path.join(user_home, '.local', 'opt'),
-                    os.path.join(user_home, '.jdks'),
-                    os.path.join(user_home, 'jdk'),
-                    os.path.join(user_home, 'java'),
-                ]
-                for root in user_roots:
-                    if not root or not os.path.isdir(root):
-                        continue
-                    try:
-                        for child in os.listdir(root):
-                            child_path = os.path.join(root, child)
-                            if not os.path.isdir(child_path):
-                                continue
-                            jp = os.path.join(child_path, 'bin', 'java.exe') if sys.platform == 'win32' else os.path.join(child_path, 'bin', 'java')
-                            if os.path.exists(jp):
-                                run_and_parse(jp, 'UserLocal')
-                    except Exception:
-                        continue
-
-                try:
-                    for child in os.listdir(user_home):
-                        child_path = os.path.join(user_home, child)
-                        if not os.path.isdir(child_path):
-                            continue
-                        if re.search(r'(?i)^(jdk|openjdk|temurin|adoptium|adoptopenjdk|java)', child):
-                            jp = os.path.join(child_path, 'bin', 'java.exe') if sys.platform == 'win32' else os.path.join(child_path, 'bin', 'java')
-                            if os.path.exists(jp):
-                                run_and_parse(jp, 'UserHome')
-                except Exception:
-                    pass
-            except Exception:
-                pass
-
+    def _on_java_discovered(self, runtimes, default_path):
         seen = set()
         uniq = []
-        for c in candidates:
+        for c in runtimes or []:
             key = (c.get('major'), os.path.normcase(os.path.abspath(c.get('path'))))
             if key in seen:
                 continue
             seen.add(key)
             uniq.append(c)
-
         self.java_candidates = uniq
+
+        self.java_version = None
         try:
-            if hasattr(self, 'refresh_java_selection'):
-                try:
-                    self.refresh_java_selection()
-                except Exception:
-                    pass
+            if default_path:
+                real = os.path.normcase(os.path.realpath(default_path))
+                match = next((c for c in uniq if os.path.normcase(os.path.realpath(c.get('path'))) == real), None)
+                if match:
+                    self.java_version = match.get('major')
         except Exception:
             pass
-    
-    def check_java_version_once(self):
-        """Check Java version once at startup"""
-        try:
-            self.java_candidates = []
-            self.detect_all_java_installations()
-        except Exception:
-            self.java_candidates = []
 
         try:
-            result = subprocess.run(
-                ['java', '-version'],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-            )
-            output = result.stderr or result.stdout or ''
-            version_match = re.search(r'version\s+"?(\d+)(?:\.(\d+))?(?:\.(\d+))?', output)
-            if version_match:
-                major = int(version_match.group(1))
-                if major == 1 and version_match.group(2):
-                    self.java_version = int(version_match.group(2))
-                else:
-                    self.java_version = major
-            else:
-                self.java_version = None
+            counts = {}
+            for c in uniq:
+                counts[c.get('how')] = counts.get(c.get('how'), 0) + 1
+            detail = ", ".join(f"{n} via {how}" for how, n in counts.items())
+            self.log(f"[INFO] Found {len(uniq)} Java runtime(s)" + (f" ({detail})" if detail else ""))
         except Exception:
-            self.java_version = None
+            pass
 
         self.java_check_done = True
+        try:
+            self.refresh_java_selection()
+        except Exception:
+            pass
         try:
             self.update_java_label()
         except Exception:
             pass
+        if getattr(self, '_java_rediscover', False):
+            QTimer.singleShot(0, self.detect_all_java_installations)
+    
+    def check_java_version_once(self):
+        """Check Java version once at startup (in the background)"""
+        self.java_candidates = []
+        try:
+            self.java_installed_label.setText("Detecting Java…")
+        except Exception:
+            pass
+        try:
+            self.detect_all_java_installations()
+        except Exception:
+            self.java_candidates = []
+            self.java_check_done = True
     
     def update_java_label(self):
         """Update Java label based on current selection"""
@@ -3279,8 +4196,10 @@ class ServerLauncherGUI(QMainWindow):
             self.server_dir_input.setText(directory)
     
     def on_server_dir_changed(self):
-        """Handle server directory change"""
+        """Handle server directory change; the jar scan runs on a ServerDirScanThread."""
+        self._ensure_all_tabs()
         directory = self.server_dir_input.text()
+        self._dir_scan_generation = getattr(self, '_dir_scan_generation', 0) + 1
         
         if not directory or not os.path.exists(directory):
             self.start_button.setEnabled(False)
@@ -3289,8 +4208,11 @@ class ServerLauncherGUI(QMainWindow):
             self.refresh_addons_button.setEnabled(False)
             self.add_addon_button.setEnabled(False)
             self.remove_addon_button.setEnabled(False)
+            self.check_updates_button.setEnabled(False)
             self.open_folder_button.setEnabled(False)
             self.import_world_button.setEnabled(False)
+            self.import_archive_button.setEnabled(False)
+            self.export_world_button.setEnabled(False)
             self.refresh_worlds_button.setEnabled(False)
             self.open_world_folder_button.setEnabled(False)
             self.delete_world_button.setEnabled(False)
@@ -3302,46 +4224,26 @@ class ServerLauncherGUI(QMainWindow):
             self.world_status_label.setText("No server directory selected")
             self._set_widget_state(self.world_status_label, 'state', 'warn')
             return
-        
-        candidates = [f for f in os.listdir(directory) if f.lower().endswith('.jar')]
-
-        if not candidates:
-            versions_dir = os.path.join(directory, 'versions')
-            if os.path.isdir(versions_dir):
-                for v in os.listdir(versions_dir):
-                    vpath = os.path.join(versions_dir, v)
-                    if os.path.isdir(vpath):
-                        for f in os.listdir(vpath):
-                            if f.lower().endswith('.jar'):
-                                candidates.append(os.path.join(vpath, f))
-
-        chosen = None
-        name_hints = ['server', 'paper', 'purpur', 'spigot', 'bukkit', 'forge', 'fabric', 'neoforge', 'velocity', 'waterfall', 'bungeecord']
-        candidates = [os.path.join(directory, c) if not os.path.isabs(c) and os.path.exists(os.path.join(directory, c)) else c for c in candidates]
-
-        for c in candidates:
-            base = os.path.basename(c).lower()
-            if any(h in base for h in name_hints):
-                chosen = c
-                break
 
-        if not chosen:
-            for c in candidates:
-                try:
-                    with zipfile.ZipFile(c, 'r') as z:
-                        try:
-                            mf = z.read('META-INF/MANIFEST.MF').decode('utf-8', errors='ignore')
-                        except KeyError:
-                            mf = ''
-                        mf_l = mf.lower()
-                        if 'main-class' in mf_l or 'net.minecraft' in mf_l or 'minecraft_server' in mf_l or 'org.bukkit' in mf_l:
-                            chosen = c
-                            break
-                except Exception:
-                    continue
+        self._attach_metrics_history(directory)
+
+        generation = self._dir_scan_generation
+        scan = ServerDirScanThread(generation, directory, parent=self)
+        scan.finished_signal.connect(self._on_server_dir_scanned)
+        scan.finished.connect(scan.deleteLater)
+        try:
+            self.settings_status_label.setText(f"Scanning {directory}...")
+            self._set_widget_state(self.settings_status_label, 'state', 'normal')
+        except Exception:
+            pass
+        scan.start()
 
-        if not chosen and candidates:
-            chosen = candidates[0]
+    def _on_server_dir_scanned(self, generation, directory, chosen):
+        """Apply a ServerDirScanThread result unless the selection has moved on."""
+        if generation != getattr(self, '_dir_scan_generation', 0):
+            return
+        if directory != self.server_dir_input.text():
+            return
 
         if chosen:
             self.server_jar_path = chosen
@@ -3357,8 +4259,11 @@ class ServerLauncherGUI(QMainWindow):
             self.refresh_addons_button.setEnabled(True)
             self.add_addon_button.setEnabled(True)
             self.remove_addon_button.setEnabled(True)
+            self.check_updates_button.setEnabled(True)
             self.open_folder_button.setEnabled(True)
             self.import_world_button.setEnabled(True)
+            self.import_archive_button.setEnabled(True)
+            self.export_world_button.setEnabled(True)
             self.refresh_worlds_button.setEnabled(True)
             self.open_world_folder_button.setEnabled(True)
             self.delete_world_button.setEnabled(True)
@@ -3375,8 +4280,6 @@ class ServerLauncherGUI(QMainWindow):
                 self.settings_status_label.setText(f"Connected to: {directory} (server.properties will be created on save)")
                 self._set_widget_state(self.settings_status_label, 'state', 'normal')
             
-            self.refresh_addons_list()
-            
             self.refresh_addons_list()
             try:
                 self.refresh_config_folders()
@@ -3398,12 +4301,15 @@ class ServerLauncherGUI(QMainWindow):
             self.refresh_addons_button.setEnabled(False)
             self.add_addon_button.setEnabled(False)
             self.remove_addon_button.setEnabled(False)
+            self.check_updates_button.setEnabled(False)
             self.open_folder_button.setEnabled(False)
             try:
                 self.refresh_config_folders()
             except Exception:
                 pass
             self.import_world_button.setEnabled(False)
+            self.import_archive_button.setEnabled(False)
+            self.export_world_button.setEnabled(False)
             self.refresh_worlds_button.setEnabled(False)
             self.open_world_folder_button.setEnabled(False)
             self.delete_world_button.setEnabled(False)
@@ -3414,6 +4320,7 @@ class ServerLauncherGUI(QMainWindow):
             self._set_widget_state(self.addons_status_label, 'state', 'error')
             self.world_status_label.setText("No server JAR found in directory")
             self._set_widget_state(self.world_status_label, 'state', 'error')
+        self._mark_startup('index')
             
     def log(self, message):
         """Add message to log output"""
@@ -3425,15 +4332,14 @@ class ServerLauncherGUI(QMainWindow):
 
     def get_severity_color(self, text):
         """Return HTML color for a given log/console line based on severity"""
-        t = text.upper()
-        if "ERROR" in t or "EXCEPTION" in t or "SEVERE" in t or "CRITICAL" in t:
-            return "#ff5555"
-        if "WARN" in t or "WARNING" in t:
-            return "#ffd700"
-        return "#d4d4d4"
+        return ConsoleView.severity_color(text)
 
     def append_colored(self, widget, message):
-        """Append text to a QTextEdit `widget`, coloring each line by severity when enabled."""
+        """Append text to a console `widget`, coloring each line by severity when enabled.
+
+        ConsoleView widgets queue the lines and render them on their next
+        frame; plain QTextEdit widgets get one HTML block per line.
+        """
         colorize = getattr(self, 'console_color_checkbox', None)
         enabled = True if not colorize else bool(colorize.isChecked())
 
@@ -3441,6 +4347,10 @@ class ServerLauncherGUI(QMainWindow):
         if not lines:
             lines = [""]
 
+        if isinstance(widget, ConsoleView):
+            widget.append_lines(lines, colorize=enabled)
+            return
+
         for i, line in enumerate(lines):
             if enabled:
                 color = self.get_severity_color(line)
@@ -3593,6 +4503,7 @@ class ServerLauncherGUI(QMainWindow):
         self.download_thread = DownloadThread(version, software, directory, ram, java_exe)
         self.download_thread.log_signal.connect(self.log)
         self.download_thread.progress_signal.connect(self.update_progress)
+        self.download_thread.task_progress_signal.connect(self.update_task_progress)
         self.download_thread.finished_signal.connect(self.download_finished)
         self.download_thread.start()
         
@@ -3612,12 +4523,45 @@ class ServerLauncherGUI(QMainWindow):
                     self.progress_bar.setValue(max(0, min(100, int(percent))))
                 except Exception:
                     pass
+            self._progress_text = text
+            self._refresh_progress_label()
+        except Exception:
+            pass
+
+    def update_task_progress(self, task, percent, text):
+        """Track progress of tasks running alongside the server download"""
+        try:
+            if task == 'server':
+                return
+            if not hasattr(self, '_task_progress'):
+                self._task_progress = {}
+            if text in ('done', 'skipped', 'Cached'):
+                self._task_progress.pop(task, None)
+            elif text == 'started':
+                self._task_progress[task] = "…"
+            elif percent is not None and percent >= 0:
+                self._task_progress[task] = f"{percent}%"
+            else:
+                self._task_progress[task] = text.split(' — ')[0]
+            self._refresh_progress_label()
+        except Exception:
+            pass
+
+    def _refresh_progress_label(self):
+        try:
+            text = getattr(self, '_progress_text', '') or ''
+            tasks = getattr(self, '_task_progress', {}) or {}
+            if tasks:
+                extra = " · ".join(f"{name} {state}" for name, state in tasks.items())
+                text = f"{text}\n{extra}" if text else extra
             self.progress_label.setText(text)
         except Exception:
             pass
         
     def download_finished(self, success, message):
         """Handle download completion"""
+        self._task_progress = {}
+        self._progress_text = ''
         self.download_button.setEnabled(True)
         self.progress_bar.setVisible(False)
         self.progress_label.setVisible(False)
@@ -3711,18 +4655,10 @@ class ServerLauncherGUI(QMainWindow):
                     self.detect_all_java_installations()
                 except Exception:
                     pass
+            else:
+                self.log(f"[ERROR] Temurin install failed: {message}")
                 try:
-                    self.refresh_java_selection()
-                except Exception:
-                    pass
-                try:
-                    self.update_java_label()
-                except Exception:
-                    pass
-            else:
-                self.log(f"[ERROR] Temurin install failed: {message}")
-                try:
-                    QMessageBox.warning(self, "Install Failed", f"Failed to install Java: {message}")
+                    QMessageBox.warning(self, "Install Failed", f"Failed to install Java: {message}")
                 except Exception:
                     pass
         except Exception:
@@ -3741,6 +4677,7 @@ class ServerLauncherGUI(QMainWindow):
         
         self.server_process = QProcess(self)
         self.server_process.setWorkingDirectory(self.server_directory)
+        self._console_tails = {}
         self.server_process.readyReadStandardOutput.connect(self.handle_stdout)
         self.server_process.readyReadStandardError.connect(self.handle_stderr)
         self.server_process.finished.connect(lambda exitCode, exitStatus: self.server_finished(exitCode, exitStatus))
@@ -3783,6 +4720,8 @@ class ServerLauncherGUI(QMainWindow):
             pass
 
         self.console_output.clear()
+        self.tick_metrics.reset()
+        self._attach_metrics_history(self.server_directory)
         self.console_output.append(f"Starting server: {java_cmd} {' '.join(args)}\n")
         self.console_output.append("="*60 + "\n")
 
@@ -3819,11 +4758,17 @@ class ServerLauncherGUI(QMainWindow):
     def handle_stdout(self):
         """Handle server stdout"""
         if self.server_process:
-            data = self.server_process.readAllStandardOutput()
-            text = bytes(data).decode('utf-8', errors='ignore')
+            data = bytes(self.server_process.readAllStandardOutput())
+            text = data.decode('utf-8', errors='ignore')
             try:
-                for ln in text.splitlines():
+                backup = getattr(self, 'world_backup_thread', None)
+                if backup is not None and not backup.isRunning():
+                    backup = None
+                for ln in self._complete_lines('stdout', data):
                     self._raw_console_lines.append(ln)
+                    self.tick_metrics.feed(ln)
+                    if backup is not None:
+                        backup.feed_line(ln)
             except Exception:
                 pass
             try:
@@ -3843,11 +4788,17 @@ class ServerLauncherGUI(QMainWindow):
     def handle_stderr(self):
         """Handle server stderr"""
         if self.server_process:
-            data = self.server_process.readAllStandardError()
-            text = bytes(data).decode('utf-8', errors='ignore')
+            data = bytes(self.server_process.readAllStandardError())
+            text = data.decode('utf-8', errors='ignore')
             try:
-                for ln in text.splitlines():
+                backup = getattr(self, 'world_backup_thread', None)
+                if backup is not None and not backup.isRunning():
+                    backup = None
+                for ln in self._complete_lines('stderr', data):
                     self._raw_console_lines.append(ln)
+                    self.tick_metrics.feed(ln)
+                    if backup is not None:
+                        backup.feed_line(ln)
             except Exception:
                 pass
             try:
@@ -3860,6 +4811,19 @@ class ServerLauncherGUI(QMainWindow):
             except Exception:
                 pass
 
+    def _complete_lines(self, stream, data: bytes):
+        """Lines finished by this read of `stream`; a trailing partial line is held for the next read.
+
+        A read can end mid-line (or mid-character), so line consumers such
+        as the save lock and the TPS extractor only ever see whole lines.
+        """
+        buf = self._console_tails.get(stream, b'') + data
+        cut = buf.rfind(b'\n') + 1
+        if not cut and len(buf) > self.CONSOLE_TAIL_LIMIT:
+            cut = len(buf)
+        self._console_tails[stream] = buf[cut:]
+        return buf[:cut].decode('utf-8', errors='ignore').splitlines()
+
     def check_for_plugin_crash(self, text: str):
         """Heuristic detection of plugin crashes or plugin-related exceptions in console output.
 
@@ -3905,6 +4869,17 @@ class ServerLauncherGUI(QMainWindow):
             
     def server_finished(self, exitCode=0, exitStatus=None):
         """Handle server process finished. Detect crashes and optionally auto-restart."""
+        try:
+            if getattr(self, 'world_backup_thread', None) and self.world_backup_thread.isRunning():
+                self.world_backup_thread.server_stopped()
+        except Exception:
+            pass
+        try:
+            # region files grew in place while the server ran; directory mtimes do not show that
+            if self.server_directory:
+                world_indexer.get_indexer().invalidate(self.server_directory)
+        except Exception:
+            pass
         self.console_output.append("\n" + "="*60)
 
         crashed = False
@@ -4146,8 +5121,14 @@ class ServerLauncherGUI(QMainWindow):
         return None, None
     
     def refresh_addons_list(self):
-        """Refresh the list of installed addons"""
+        """Refresh the list of installed addons.
+
+        File names and sizes are listed right away; names, versions and
+        dependency problems from each jar's descriptor are filled in by an
+        AddonIndexThread.
+        """
         self.addons_list.clear()
+        self._addon_index_generation = getattr(self, '_addon_index_generation', 0) + 1
         
         if not self.server_directory:
             self.addons_status_label.setText("No server directory selected")
@@ -4178,6 +5159,10 @@ class ServerLauncherGUI(QMainWindow):
                     
                     self.addons_status_label.setText(f"✓ Found {len(jar_files)} {addon_type} in: {addon_folder}")
                     self._set_widget_state(self.addons_status_label, 'state', 'ok')
+                    thread = AddonIndexThread(self._addon_index_generation, addon_folder, parent=self)
+                    thread.finished_signal.connect(self._on_addons_indexed)
+                    thread.finished.connect(thread.deleteLater)
+                    thread.start()
                 else:
                     self.addons_status_label.setText(f"No {addon_type} installed (folder exists but is empty)")
                     self._set_widget_state(self.addons_status_label, 'state', 'normal')
@@ -4189,6 +5174,130 @@ class ServerLauncherGUI(QMainWindow):
             self.addons_status_label.setText(f"Error reading {addon_type} folder: {str(e)}")
             self._set_widget_state(self.addons_status_label, 'state', 'error')
     
+    def _on_addons_indexed(self, generation, addons):
+        if generation != self._addon_index_generation or not addons:
+            return
+        flagged = 0
+        for addon in addons:
+            item = None
+            for i in range(self.addons_list.count()):
+                if self.addons_list.item(i).data(Qt.ItemDataRole.UserRole) == addon['file']:
+                    item = self.addons_list.item(i)
+                    break
+            if item is None:
+                continue
+            size = addon.get('size', 0)
+            size_str = f"{size / 1024:.1f} KB" if size < 1024*1024 else f"{size / (1024*1024):.1f} MB"
+            if addon.get('name'):
+                text = f"{addon['name']} {addon.get('version') or ''}".rstrip() + f" - {addon['file']} ({size_str})"
+            else:
+                text = f"{addon['file']} ({size_str})"
+            issues = addon_index.problems(addon)
+            if addon.get('missing') or addon.get('duplicates'):
+                flagged += 1
+            if issues:
+                text += f" - ⚠ {'; '.join(issues)}"
+            tooltip = []
+            if addon.get('kind'):
+                tooltip.append(f"Type: {addon['kind']}")
+            if addon.get('api_version'):
+                tooltip.append(f"API version: {addon['api_version']}")
+            if addon.get('load'):
+                tooltip.append(f"Load: {addon['load']}")
+            for label, field in (("Depends", 'depends'), ("Soft depends", 'soft_depends'), ("Loads before", 'load_before')):
+                if addon.get(field):
+                    tooltip.append(f"{label}: {', '.join(addon[field])}")
+            item.setText(text)
+            item.setToolTip("\n".join(tooltip + issues))
+        if flagged:
+            self.addons_status_label.setText(f"{self.addons_status_label.text()} - ⚠ {flagged} with missing dependencies or duplicates")
+            self._set_widget_state(self.addons_status_label, 'state', 'warn')
+
+    def _modrinth_filters(self):
+        """(loaders, game_versions) for Modrinth queries about the current server."""
+        mc_version, software_type = self.detect_server_info()
+        if not mc_version and self.server_jar_path:
+            try:
+                version = leveldat.jar_world_version(self.server_jar_path)
+                mc_version = version[1] if version else None
+            except Exception:
+                pass
+        return list(modrinth.LOADERS.get(software_type, [])), ([mc_version] if mc_version else [])
+
+    def check_addon_updates(self):
+        """Look up every installed jar on Modrinth and offer the available updates."""
+        addon_type, addon_folder = self.get_addon_folder_type()
+        if not addon_folder or not os.path.isdir(addon_folder):
+            QMessageBox.warning(self, "No Folder", "Could not determine addon folder.")
+            return
+        if getattr(self, 'addon_update_thread', None) and self.addon_update_thread.isRunning():
+            return
+        loaders, game_versions = self._modrinth_filters()
+        self.log(f"[INFO] Checking {addon_type} for Modrinth updates "
+                 f"(MC {', '.join(game_versions) or 'any'}, {', '.join(loaders) or 'any loader'})...")
+        self.check_updates_button.setEnabled(False)
+        self.addons_status_label.setText(f"Checking {addon_type} for updates...")
+        self._set_widget_state(self.addons_status_label, 'state', 'normal')
+        self._start_addon_update_thread(AddonUpdateThread('check', addon_folder, loaders=loaders,
+                                                          game_versions=game_versions, parent=self))
+
+    def _start_addon_update_thread(self, thread):
+        self.addon_update_thread = thread
+        thread.progress_signal.connect(
+            lambda done, total, name: self.addons_status_label.setText(f"Updated {name} ({done}/{total})..."))
+        thread.finished_signal.connect(self._on_addon_update_finished)
+        thread.finished.connect(lambda: self.check_updates_button.setEnabled(bool(self.server_directory)))
+        thread.start()
+
+    def _on_addon_update_finished(self, ok, mode, result):
+        thread = self.addon_update_thread
+        if not ok:
+            self.log(f"[ERROR] Modrinth update {'check' if mode == 'check' else 'download'} failed: {result}")
+            self.addons_status_label.setText(f"Update check failed: {result}")
+            self._set_widget_state(self.addons_status_label, 'state', 'error')
+            return
+        if mode == 'apply':
+            failed = [(u, err) for u, err in result if err]
+            for update, error in result:
+                if error:
+                    self.log(f"[ERROR] Could not update {update['file']}: {error}")
+                else:
+                    self.log(f"[SUCCESS] Updated {modrinth.describe(update)}")
+            self.refresh_addons_list()
+            if failed:
+                QMessageBox.warning(self, "Updates Incomplete",
+                                    f"{len(result) - len(failed)} of {len(result)} update(s) installed.\n\n"
+                                    + "\n".join(f"{u['file']}: {err}" for u, err in failed[:10]))
+            else:
+                QMessageBox.information(self, "Updates Installed",
+                                        f"Installed {len(result)} update(s).\n\nRestart your server to load them.")
+            return
+
+        updates = result['updates']
+        self.log(f"[INFO] Modrinth: {len(updates)} update(s), {len(result['current'])} up to date, "
+                 f"{len(result['unknown'])} not on Modrinth")
+        self.addons_status_label.setText(f"{len(updates)} update(s) available" if updates else "All addons on Modrinth are up to date")
+        self._set_widget_state(self.addons_status_label, 'state', 'ok')
+        if not updates:
+            QMessageBox.information(self, "No Updates",
+                                    f"All {len(result['current'])} addon(s) found on Modrinth are up to date."
+                                    + (f"\n\n{len(result['unknown'])} jar(s) are not on Modrinth." if result['unknown'] else ""))
+            return
+        lines = [modrinth.describe(u) for u in updates]
+        if len(lines) > 25:
+            lines = lines[:25] + [f"... and {len(updates) - 25} more"]
+        reply = QMessageBox.question(
+            self,
+            "Updates Available",
+            f"{len(updates)} update(s) available:\n\n" + "\n".join(lines) + "\n\nDownload and install them now?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        self.check_updates_button.setEnabled(False)
+        self.addons_status_label.setText(f"Downloading {len(updates)} update(s)...")
+        self._start_addon_update_thread(AddonUpdateThread('apply', thread.folder, updates=updates, parent=self))
+
     def add_addon(self):
         """Add a new addon by copying a JAR file"""
         addon_type, addon_folder = self.get_addon_folder_type()
@@ -4281,50 +5390,11 @@ class ServerLauncherGUI(QMainWindow):
     
     def is_valid_world(self, world_path):
         """Check if a directory is a valid Minecraft world"""
-        if not os.path.isdir(world_path):
-            return False
-        
-        if not os.path.exists(os.path.join(world_path, 'level.dat')):
-            return False
-        
-        has_region = (
-            os.path.isdir(os.path.join(world_path, 'region')) or
-            os.path.isdir(os.path.join(world_path, 'DIM-1', 'region')) or
-            os.path.isdir(os.path.join(world_path, 'DIM1', 'region'))
-        )
-        
-        if not has_region:
-            return False
-        
-        return True
+        return world_indexer.is_valid_world(world_path)
     
     def get_world_dimensions(self, world_path):
         """Detect which dimensions exist in a world"""
-        dimensions = []
-        
-        if os.path.isdir(os.path.join(world_path, 'region')):
-            dimensions.append('Overworld')
-        
-        nether_paths = [
-            os.path.join(world_path, 'DIM-1', 'region'),
-            os.path.join(world_path, 'dimensions', 'minecraft', 'the_nether', 'region')
-        ]
-        
-        if any(os.path.isdir(p) for p in nether_paths):
-            dimensions.append('Nether')
-        
-        end_paths = [
-            os.path.join(world_path, 'DIM1', 'region'),
-            os.path.join(world_path, 'dimensions', 'minecraft', 'the_end', 'region')
-        ]
-        
-        if any(os.path.isdir(p) for p in end_paths):
-            dimensions.append('End')
-        
-        if not dimensions:
-            dimensions.append('Overworld')
-        
-        return dimensions
+        return world_indexer.world_dimensions(world_path)
     
     def detect_worlds(self):
         """Detect all valid Minecraft worlds in the server directory"""
@@ -4345,53 +5415,84 @@ class ServerLauncherGUI(QMainWindow):
         
         return sorted(worlds)
     
-    def refresh_worlds_list(self):
-        """Refresh the list of detected worlds"""
+    def refresh_worlds_list(self, force=False):
+        """Refresh the list of detected worlds.
+
+        Detection and sizing run on a WorldIndexThread; names appear first
+        and sizes fill in as each world finishes. `force` ignores cached
+        directory totals.
+        """
         self.worlds_list.clear()
+        self._world_index_generation = getattr(self, '_world_index_generation', 0) + 1
         
         if not self.server_directory:
             self.world_status_label.setText("No server directory selected")
             self._set_widget_state(self.world_status_label, 'state', 'warn')
             return
         
-        worlds = self.detect_worlds()
-        
-        if worlds:
-            self.world_status_label.setText(f"Found {len(worlds)} world(s)")
+        self.world_status_label.setText("Scanning worlds...")
+        self._set_widget_state(self.world_status_label, 'state', 'normal')
+        thread = WorldIndexThread(self._world_index_generation, self.server_directory, force=force,
+                                  jar_path=self.server_jar_path, parent=self)
+        thread.names_signal.connect(self._on_world_names)
+        thread.world_signal.connect(self._on_world_indexed)
+        thread.finished_signal.connect(self._on_worlds_indexed)
+        thread.finished.connect(thread.deleteLater)
+        thread.start()
+
+    def _world_item(self, world):
+        for i in range(self.worlds_list.count()):
+            item = self.worlds_list.item(i)
+            if item.data(Qt.ItemDataRole.UserRole) == world:
+                return item
+        return None
+
+    def _on_world_names(self, generation, names):
+        if generation != self._world_index_generation:
+            return
+        self.worlds_list.clear()
+        for world in names:
+            item = QListWidgetItem(f"{world} (calculating size...)")
+            item.setData(Qt.ItemDataRole.UserRole, world)
+            self.worlds_list.addItem(item)
+        if names:
+            self.world_status_label.setText(f"Found {len(names)} world(s), calculating sizes...")
+            self._set_widget_state(self.world_status_label, 'state', 'ok')
+
+    def _on_world_indexed(self, generation, info):
+        if generation != self._world_index_generation:
+            return
+        item = self._world_item(info.get('name'))
+        if item is None:
+            return
+        dim_str = ', '.join(info.get('dimensions') or [])
+        text = f"{info['name']} ({world_indexer.format_size(info.get('size', 0))}) - [{dim_str}]"
+        level = info.get('level') or {}
+        summary = leveldat.describe(level)
+        if summary:
+            text += f" - {summary}"
+        tooltip = []
+        if level.get('name') and level['name'] != info['name']:
+            tooltip.append(f"Level name: {level['name']}")
+        if level.get('seed') is not None:
+            tooltip.append(f"Seed: {level['seed']}")
+        if level.get('data_version'):
+            tooltip.append(f"Data version: {level['data_version']}")
+        server_version = info.get('server_version')
+        if server_version and level.get('data_version') and level['data_version'] > server_version[0]:
+            text += f" - ⚠ newer than server ({server_version[1]})"
+            tooltip.append(f"This world was last saved by a newer Minecraft version than the selected server jar "
+                           f"({server_version[1]}, data version {server_version[0]}). Opening it with this jar "
+                           f"may fail or lose data.")
+        item.setText(text)
+        item.setToolTip("\n".join(tooltip))
+
+    def _on_worlds_indexed(self, generation, infos):
+        if generation != self._world_index_generation:
+            return
+        if self.worlds_list.count():
+            self.world_status_label.setText(f"Found {self.worlds_list.count()} world(s)")
             self._set_widget_state(self.world_status_label, 'state', 'ok')
-            
-            for world in worlds:
-                world_path = os.path.join(self.server_directory, world)
-                
-                try:
-                    total_size = 0
-                    for dirpath, dirnames, filenames in os.walk(world_path):
-                        for filename in filenames:
-                            filepath = os.path.join(dirpath, filename)
-                            if os.path.exists(filepath):
-                                total_size += os.path.getsize(filepath)
-                    
-                    size_mb = total_size / (1024 * 1024)
-                    if size_mb < 1024:
-                        size_str = f"{size_mb:.1f} MB"
-                    else:
-                        size_str = f"{size_mb / 1024:.2f} GB"
-                    
-                    dimensions = self.get_world_dimensions(world_path)
-                    dim_str = ', '.join(dimensions)
-                    
-                    item = QListWidgetItem(f"{world} ({size_str}) - [{dim_str}]")
-                    item.setData(Qt.ItemDataRole.UserRole, world)
-                    self.worlds_list.addItem(item)
-                except Exception:
-                    try:
-                        dimensions = self.get_world_dimensions(world_path)
-                        dim_str = ', '.join(dimensions)
-                        item = QListWidgetItem(f"{world} - [{dim_str}]")
-                    except Exception:
-                        item = QListWidgetItem(world)
-                    item.setData(Qt.ItemDataRole.UserRole, world)
-                    self.worlds_list.addItem(item)
         else:
             self.world_status_label.setText("No worlds detected in server directory")
             self._set_widget_state(self.world_status_label, 'state', 'idle')
@@ -4448,12 +5549,23 @@ class ServerLauncherGUI(QMainWindow):
                 QMessageBox.critical(self, "Error", f"Failed to delete world:\n{str(e)}")
     
     def backup_world(self):
-        """Create a backup of the selected world"""
+        """Snapshot the selected world into its repository.
+
+        Runs on a WorldBackupThread. If the server is running, autosave is
+        paused (save-off / save-all flush) only while the changed files are
+        staged; the diff runs from the staged copy after save-on.
+        Snapshots live in the launcher's app data folder, not the server
+        directory; see components.world.diffbackup.
+        """
         selected_items = self.worlds_list.selectedItems()
         
         if not selected_items:
             QMessageBox.warning(self, "No Selection", "Please select a world to backup.")
             return
+
+        if self._snapshot_busy():
+            QMessageBox.information(self, "Backup Running", "A world backup or snapshot task is already in progress.")
+            return
         
         world_name = selected_items[0].data(Qt.ItemDataRole.UserRole)
         world_path = os.path.join(self.server_directory, world_name)
@@ -4461,89 +5573,464 @@ class ServerLauncherGUI(QMainWindow):
         if not os.path.exists(world_path):
             QMessageBox.warning(self, "Error", f"World folder not found: {world_name}")
             return
-        
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"{world_name}_backup_{timestamp}"
-        backup_path = os.path.join(self.server_directory, backup_name)
-        
+
+        online = bool(self.server_process and self.server_process.state() == QProcess.ProcessState.Running)
+        if online:
+            self.log(f"[INFO] Creating online snapshot of {world_name} (pausing autosave while staging changed files)...")
+        else:
+            self.log(f"[INFO] Creating snapshot of {world_name}...")
+
+        self.world_backup_thread = WorldBackupThread(world_path, online, parent=self)
+        self.world_backup_thread.command_signal.connect(self._send_backup_command)
+        self.world_backup_thread.progress_signal.connect(self._on_world_backup_progress)
+        self.world_backup_thread.finished_signal.connect(lambda ok, msg, stats, name=world_name: self._on_world_backup_finished(ok, name, msg, stats))
+        self.world_backup_thread.finished.connect(self._update_snapshot_buttons)
+        self.backup_world_button.setEnabled(False)
+        self._update_snapshot_buttons()
+        self.world_status_label.setText(f"Backing up {world_name}...")
+        self._set_widget_state(self.world_status_label, 'state', 'normal')
+        self.world_backup_thread.start()
+
+    def _send_backup_command(self, command):
+        """Write a save command for WorldBackupThread to the server's stdin."""
         try:
-            self.log(f"[INFO] Creating backup of {world_name}...")
-            shutil.copytree(world_path, backup_path)
-            self.log(f"[SUCCESS] Backup created: {backup_name}")
-            QMessageBox.information(self, "Success", f"Backup created successfully:\n{backup_name}")
-            self.refresh_worlds_list()
+            if self.server_process and self.server_process.state() == QProcess.ProcessState.Running:
+                self.server_process.write((command + "\n").encode())
+                self.console_output.append(f"> {command}")
+        except Exception:
+            pass
+
+    def _on_world_backup_progress(self, pct, text):
+        self.world_status_label.setText(f"Backing up: {pct}% ({text})")
+
+    def _on_world_backup_finished(self, ok, world_name, message, stats):
+        try:
+            self.backup_world_button.setEnabled(bool(self.server_directory))
+        except Exception:
+            pass
+        unsafe = stats.get('unsafe_seconds')
+        if unsafe is not None:
+            self.log(f"[INFO] Autosave was paused for {unsafe:.1f}s during the backup")
+        if ok:
+            secs = (stats.get('elapsed_ms') or 0) / 1000.0
+            self.log(f"[SUCCESS] Snapshot {message} of {world_name}: {stats.get('chunks_written', 0)}/{stats.get('chunks', 0)} chunks and "
+                     f"{stats.get('files_written', 0)} files changed, {world_indexer.format_size(stats.get('bytes_written', 0))} stored "
+                     f"(world is {world_indexer.format_size(stats.get('bytes_total', 0))}) in {secs:.1f}s")
+            if stats.get('forgotten'):
+                self.log(f"[INFO] Retention policy removed {len(stats['forgotten'])} old snapshot(s), "
+                         f"{world_indexer.format_size(stats.get('bytes_freed', 0))} freed")
+            if stats.get('prune_error'):
+                self.log(f"[WARNING] Could not prune the snapshot repository: {stats['prune_error']}")
+            self.world_status_label.setText(f"Snapshot {message} saved")
+            self._set_widget_state(self.world_status_label, 'state', 'ok')
+            QMessageBox.information(self, "Success", f"Snapshot created successfully:\n{message}\n\n{world_indexer.format_size(stats.get('bytes_written', 0))} of new data stored.")
+        else:
+            self.log(f"[ERROR] Failed to backup world {world_name}: {message}")
+            self.world_status_label.setText(f"Backup of {world_name} failed")
+            self._set_widget_state(self.world_status_label, 'state', 'error')
+            QMessageBox.critical(self, "Error", f"Failed to create backup:\n{message}")
+        self.refresh_snapshot_list()
+
+    def _selected_world_path(self):
+        try:
+            selected_items = self.worlds_list.selectedItems()
+        except Exception:
+            return None
+        if not selected_items or not self.server_directory:
+            return None
+        return os.path.join(self.server_directory, selected_items[0].data(Qt.ItemDataRole.UserRole))
+
+    def _snapshot_busy(self):
+        for name in ('world_backup_thread', 'snapshot_task_thread', 'world_region_thread'):
+            thread = getattr(self, name, None)
+            if thread is not None and thread.isRunning():
+                return True
+        return False
+
+    def refresh_snapshot_list(self):
+        """List the snapshots of the selected world, newest first."""
+        self.snapshot_list.clear()
+        world_path = self._selected_world_path()
+        self._snapshot_repo = None
+        if world_path:
+            try:
+                self._snapshot_repo = diffbackup.DiffRepository.for_world(world_path)
+                summaries = self._snapshot_repo.summaries()
+            except Exception as e:
+                self.log(f"[WARNING] Could not read snapshots of {os.path.basename(world_path)}: {e}")
+                self._snapshot_repo = None
+        if self._snapshot_repo is None:
+            self.snapshot_repo_label.setText("Select a world to see its snapshots")
+            self._update_snapshot_buttons()
+            return
+        for entry in summaries:
+            stats = entry.get('stats') or {}
+            created = datetime.fromtimestamp(entry.get('created') or 0).strftime("%Y-%m-%d %H:%M:%S")
+            item = QListWidgetItem(f"{created}  [{entry.get('tag') or 'manual'}]  +{world_indexer.format_size(stats.get('bytes_written', 0))} "
+                                   f"(world {world_indexer.format_size(stats.get('bytes_total', 0))})")
+            item.setData(Qt.ItemDataRole.UserRole, entry['id'])
+            self.snapshot_list.addItem(item)
+        self.snapshot_repo_label.setText(f"{len(summaries)} snapshot(s), {world_indexer.format_size(self._snapshot_repo.total_size())} on disk")
+        policy = self._snapshot_repo.policy()
+        for key, spin in self.retention_spinboxes.items():
+            spin.blockSignals(True)
+            spin.setValue(policy.get(key, 0))
+            spin.blockSignals(False)
+        self._update_snapshot_buttons()
+
+    def _update_snapshot_buttons(self):
+        repo = getattr(self, '_snapshot_repo', None)
+        idle = repo is not None and not self._snapshot_busy()
+        has_selection = bool(self.snapshot_list.selectedItems())
+        self.restore_snapshot_button.setEnabled(idle and has_selection)
+        self.delete_snapshot_button.setEnabled(idle and has_selection)
+        self.prune_snapshots_button.setEnabled(idle and self.snapshot_list.count() > 0)
+        for spin in self.retention_spinboxes.values():
+            spin.setEnabled(repo is not None)
+        self.analyze_regions_button.setEnabled(idle)
+        self.prune_chunks_button.setEnabled(idle)
+
+    def _on_retention_changed(self, _value=None):
+        repo = getattr(self, '_snapshot_repo', None)
+        if repo is None:
+            return
+        try:
+            repo.set_policy({key: spin.value() for key, spin in self.retention_spinboxes.items()})
         except Exception as e:
-            self.log(f"[ERROR] Failed to backup world {world_name}: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to create backup:\n{str(e)}")
+            self.log(f"[WARNING] Could not save the retention policy: {e}")
+
+    def _start_snapshot_task(self, label, func, status_text):
+        self.snapshot_task_thread = SnapshotTaskThread(label, func, parent=self)
+        self.snapshot_task_thread.finished_signal.connect(self._on_snapshot_task_finished)
+        self.snapshot_task_thread.finished.connect(self._update_snapshot_buttons)
+        self.world_status_label.setText(status_text)
+        self._set_widget_state(self.world_status_label, 'state', 'normal')
+        self.backup_world_button.setEnabled(False)
+        self.snapshot_task_thread.start()
+        self._update_snapshot_buttons()
+
+    def restore_snapshot(self):
+        """Replace the selected world with the selected snapshot.
+
+        Refused while the server runs. The current world is snapshotted
+        first (tag 'pre-restore'), then the snapshot is rebuilt next to it
+        and swapped in, so a failed restore leaves the world untouched.
+        """
+        world_path = self._selected_world_path()
+        items = self.snapshot_list.selectedItems()
+        if not world_path or not items or self._snapshot_repo is None or self._snapshot_busy():
+            return
+        if self.server_process and self.server_process.state() == QProcess.ProcessState.Running:
+            QMessageBox.warning(self, "Server Running", "Stop the server before restoring a world snapshot.")
+            return
+        snapshot_id = items[0].data(Qt.ItemDataRole.UserRole)
+        world_name = os.path.basename(world_path)
+        reply = QMessageBox.question(
+            self,
+            "Confirm Restore",
+            f"Replace the world '{world_name}' with snapshot {snapshot_id}?\n\n"
+            "The current state is saved as a 'pre-restore' snapshot first.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        repo = self._snapshot_repo
+
+        def _restore():
+            if os.path.isdir(world_path):
+                repo.create(world_path, tag='pre-restore')
+            return repo.restore_into(snapshot_id, world_path)
+
+        self.log(f"[INFO] Restoring {world_name} from snapshot {snapshot_id}...")
+        self._start_snapshot_task(f"restore:{world_name}:{snapshot_id}", _restore, f"Restoring {world_name}...")
+
+    def delete_snapshot(self):
+        """Delete the selected snapshot; its data is freed by the next prune."""
+        world_path = self._selected_world_path()
+        items = self.snapshot_list.selectedItems()
+        if not world_path or not items or self._snapshot_repo is None or self._snapshot_busy():
+            return
+        snapshot_id = items[0].data(Qt.ItemDataRole.UserRole)
+        reply = QMessageBox.question(
+            self,
+            "Confirm Deletion",
+            f"Delete snapshot {snapshot_id} of '{os.path.basename(world_path)}'?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            self._snapshot_repo.delete(snapshot_id)
+            self.log(f"[SUCCESS] Deleted snapshot {snapshot_id}")
+        except Exception as e:
+            self.log(f"[ERROR] Failed to delete snapshot {snapshot_id}: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to delete snapshot:\n{str(e)}")
+        self.refresh_snapshot_list()
+
+    def prune_snapshots(self):
+        """Apply the retention policy and reclaim unreferenced data."""
+        world_path = self._selected_world_path()
+        if not world_path or self._snapshot_repo is None or self._snapshot_busy():
+            return
+        repo = self._snapshot_repo
+
+        def _prune():
+            forgotten = repo.forget()
+            return dict(repo.prune(), forgotten=forgotten)
+
+        self._start_snapshot_task(f"prune:{os.path.basename(world_path)}", _prune, "Pruning snapshots...")
+
+    def _start_region_task(self, mode, world_path, min_inhabited_ticks=0, radius=None):
+        self.world_region_thread = WorldRegionThread(mode, world_path, min_inhabited_ticks, radius, parent=self)
+        self.world_region_thread.progress_signal.connect(
+            lambda pct, text, name=os.path.basename(world_path): self.world_status_label.setText(f"{name}: {pct}% ({text})"))
+        self.world_region_thread.finished_signal.connect(
+            lambda ok, mode, result, path=world_path: self._on_region_task_finished(ok, mode, path, result))
+        self._set_widget_state(self.world_status_label, 'state', 'normal')
+        self.backup_world_button.setEnabled(False)
+        self.world_region_thread.finished.connect(self._update_snapshot_buttons)
+        self.world_region_thread.start()
+        self._update_snapshot_buttons()
+
+    def analyze_world_regions(self):
+        """Report chunk counts and InhabitedTime per dimension of the selected world."""
+        world_path = self._selected_world_path()
+        if not world_path or self._snapshot_busy():
+            return
+        self.log(f"[INFO] Analyzing region files of {os.path.basename(world_path)}...")
+        self._start_region_task('analyze', world_path)
+
+    def prune_world_chunks(self):
+        """Delete rarely visited or far away chunks of the selected world.
+
+        Runs a dry run first and asks for confirmation with its numbers;
+        the real prune takes a 'pre-prune' snapshot before touching files.
+        """
+        world_path = self._selected_world_path()
+        if not world_path or self._snapshot_busy():
+            return
+        if self.server_process and self.server_process.state() == QProcess.ProcessState.Running:
+            QMessageBox.warning(self, "Server Running", "Stop the server before pruning chunks.")
+            return
+        minutes = self.prune_minutes_spinbox.value()
+        radius = self.prune_radius_spinbox.value() or None
+        if not minutes and radius is None:
+            QMessageBox.warning(self, "Nothing to Prune", "Set a minimum visit time or a radius first.")
+            return
+        self._start_region_task('preview', world_path, minutes * 60 * world_regions.TICKS_PER_SECOND, radius)
+
+    def _on_region_task_finished(self, ok, mode, world_path, result):
+        try:
+            self.backup_world_button.setEnabled(bool(self.server_directory))
+        except Exception:
+            pass
+        world_name = os.path.basename(world_path)
+        if not ok:
+            self.log(f"[ERROR] Region {mode} of {world_name} failed: {result.get('error')}")
+            self.world_status_label.setText(f"Region {mode} of {world_name} failed")
+            self._set_widget_state(self.world_status_label, 'state', 'error')
+            QMessageBox.critical(self, "Error", f"Region {mode} failed:\n{result.get('error')}")
+            self._update_snapshot_buttons()
+            return
+
+        if mode == 'analyze':
+            lines = []
+            for label, d in result.get('dimensions', {}).items():
+                inhabited = ', '.join(f"{k}: {v}" for k, v in d['inhabited'].items() if v)
+                lines.append(f"{label}: {d['chunks']} chunks in {d['regions']} regions ({world_indexer.format_size(d['bytes'])}), "
+                             f"{d['never_visited']} never visited" + (f", {d['unreadable']} unreadable" if d['unreadable'] else "")
+                             + (f", {d['unreadable_regions']} unreadable region files skipped" if d.get('unreadable_regions') else "")
+                             + (f" - time spent: {inhabited}" if inhabited else ""))
+                self.log(f"[INFO] {world_name} {lines[-1]}")
+            self.region_report_label.setText("\n".join(lines) or "No region files found")
+            self.world_status_label.setText(f"Analyzed {result.get('chunks', 0)} chunks of {world_name} in {result.get('elapsed_ms', 0) / 1000.0:.1f}s")
+            self._set_widget_state(self.world_status_label, 'state', 'ok')
+        elif mode == 'preview':
+            self.world_status_label.setText(f"Found {result['chunks_removed']} chunks to prune in {world_name}")
+            self._set_widget_state(self.world_status_label, 'state', 'ok')
+            if not result['chunks_removed']:
+                QMessageBox.information(self, "Nothing to Prune", "No chunks match these settings.")
+            else:
+                reply = QMessageBox.question(
+                    self,
+                    "Confirm Prune",
+                    f"Delete {result['chunks_removed']} of {result['chunks']} chunks from '{world_name}'?\n\n"
+                    f"Region files: {world_indexer.format_size(result['bytes_before'])} -> {world_indexer.format_size(result['bytes_after'])}\n"
+                    "The game regenerates deleted chunks when they are visited again. A snapshot is taken first.",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                    QMessageBox.StandardButton.No
+                )
+                if reply == QMessageBox.StandardButton.Yes:
+                    self.log(f"[INFO] Pruning {result['chunks_removed']} chunks of {world_name}...")
+                    self._start_region_task('prune', world_path, self.world_region_thread.min_inhabited_ticks, self.world_region_thread.radius)
+                    return
+        else:
+            self.log(f"[SUCCESS] Pruned {result['chunks_removed']}/{result['chunks']} chunks of {world_name} in {result['regions_changed']} region files "
+                     f"({result['regions_deleted']} removed), {world_indexer.format_size(result['bytes_before'])} -> "
+                     f"{world_indexer.format_size(result['bytes_after'])}")
+            if result.get('regions_unreadable'):
+                self.log(f"[WARNING] Skipped {result['regions_unreadable']} unreadable region files of {world_name}")
+            self.world_status_label.setText(f"Pruned {result['chunks_removed']} chunks of {world_name}")
+            self._set_widget_state(self.world_status_label, 'state', 'ok')
+            try:
+                world_indexer.get_indexer().invalidate(world_path)
+            except Exception:
+                pass
+            self.refresh_snapshot_list()
+            self.refresh_worlds_list()
+        self._update_snapshot_buttons()
+
+    def _on_snapshot_task_finished(self, ok, label, result):
+        try:
+            self.backup_world_button.setEnabled(bool(self.server_directory))
+        except Exception:
+            pass
+        action, _, target = label.partition(':')
+        if not ok:
+            self.log(f"[ERROR] Snapshot {action} failed for {target}: {result}")
+            self.world_status_label.setText(f"Snapshot {action} failed")
+            self._set_widget_state(self.world_status_label, 'state', 'error')
+            QMessageBox.critical(self, "Error", f"Snapshot {action} failed:\n{result}")
+        elif action == 'restore':
+            world_name, _, snapshot_id = target.partition(':')
+            self.log(f"[SUCCESS] Restored {world_name} from snapshot {snapshot_id} ({result.get('files', 0)} files in {result.get('elapsed_ms', 0) / 1000.0:.1f}s)")
+            self.world_status_label.setText(f"Restored {world_name}")
+            self._set_widget_state(self.world_status_label, 'state', 'ok')
+            try:
+                world_indexer.get_indexer().invalidate(os.path.join(self.server_directory, world_name))
+            except Exception:
+                pass
+            QMessageBox.information(self, "Success", f"World '{world_name}' restored from snapshot {snapshot_id}.")
+        else:
+            self.log(f"[SUCCESS] Pruned snapshots of {target}: {len(result.get('forgotten', []))} removed by the retention policy, "
+                     f"{world_indexer.format_size(result.get('bytes_freed', 0))} freed")
+            self.world_status_label.setText(f"Pruned snapshots of {target}")
+            self._set_widget_state(self.world_status_label, 'state', 'ok')
+        self.refresh_snapshot_list()
     
-    def search_modrinth(self):
-        """Search Modrinth for plugins/mods"""
+    def search_modrinth(self, interactive=True):
+        """Search Modrinth for plugins/mods.
+
+        Pages of 20 results are fetched on ModrinthSearchThreads and cached
+        by modrinth.search; a newer search supersedes any still running.
+        Scrolling through the results prefetches the next page and
+        appends it once the end of the list is reached.
+        """
+        self._modrinth_search_timer.stop()
         query = self.modrinth_search_input.text().strip()
+        self._modrinth_search_generation = getattr(self, '_modrinth_search_generation', 0) + 1
         if not query:
-            QMessageBox.warning(self, "Empty Search", "Please enter a search term.")
+            self.modrinth_results.clear()
+            if interactive:
+                QMessageBox.warning(self, "Empty Search", "Please enter a search term.")
             return
         
+        addon_type, addon_folder = self.get_addon_folder_type()
+        mc_version, software_type = self.detect_server_info()
+        facets = modrinth.search_facets(addon_type, software_type, mc_version)
+        self._modrinth_search = {
+            'query': query, 'facets': facets, 'loaded': 0, 'total': None,
+            'loading': False, 'platform': f"{software_type or 'this platform'} {mc_version or ''}".strip(),
+        }
         self.modrinth_results.clear()
-        self.modrinth_results.addItem("Searching Modrinth...")
-        
-        try:
-            addon_type, addon_folder = self.get_addon_folder_type()
-            mc_version, software_type = self.detect_server_info()
-            
-            facets = []
-            if addon_type == "plugins":
-                facets.append('["project_type:plugin"]')
-            elif addon_type == "mods":
-                facets.append('["project_type:mod"]')
-            
-            if mc_version:
-                facets.append(f'["versions:{mc_version}"]')
-            
-            if software_type:
-                if software_type == 'fabric':
-                    facets.append('["categories:fabric"]')
-                elif software_type == 'forge':
-                    facets.append('["categories:forge","categories:neoforge"]')
-                elif software_type == 'bukkit':
-                    facets.append('["categories:bukkit","categories:spigot","categories:paper","categories:purpur"]')
-            
-            facet_str = f"&facets=[{','.join(facets)}]" if facets else ""
-            url = f"https://api.modrinth.com/v2/search?query={query}{facet_str}&limit=20"
-            
+        if interactive:
             self.log(f"[INFO] Searching for '{query}' (MC {mc_version or 'any'}, {software_type or 'any platform'})")
-            
-            data = http.get_json(url, timeout=10)
-            hits = data.get('hits', [])
-            
+        if not self._load_modrinth_page(0):
+            self.modrinth_results.addItem("Searching Modrinth...")
+
+    def _load_modrinth_page(self, offset, prefetch=False):
+        """Show the page at `offset`, from the cache if possible; True if it was shown right away.
+
+        With `prefetch` the page is only fetched into the cache.
+        """
+        search = getattr(self, '_modrinth_search', None)
+        if not search:
+            return False
+        generation = self._modrinth_search_generation
+        cached = modrinth.cached_search(search['query'], search['facets'], offset=offset)
+        if cached is not None:
+            if not prefetch:
+                self._on_modrinth_page(generation, offset, True, cached)
+            return True
+        if not prefetch:
+            search['loading'] = True
+        elif offset in search.setdefault('prefetching', set()):
+            return False
+        else:
+            search['prefetching'].add(offset)
+        thread = ModrinthSearchThread(generation, search['query'], search['facets'], offset=offset, parent=self)
+        if not prefetch:
+            thread.finished_signal.connect(self._on_modrinth_page)
+        thread.finished.connect(thread.deleteLater)
+        thread.start()
+        return False
+
+    def _on_modrinth_page(self, generation, offset, ok, result):
+        if generation != getattr(self, '_modrinth_search_generation', 0):
+            return
+        search = self._modrinth_search
+        search['loading'] = False
+        if offset == 0:
             self.modrinth_results.clear()
+        else:
+            # drop the trailing "Load more" / status row
+            last = self.modrinth_results.item(self.modrinth_results.count() - 1)
+            if last is not None and last.data(Qt.ItemDataRole.UserRole) is None:
+                self.modrinth_results.takeItem(self.modrinth_results.count() - 1)
+        if not ok:
+            self.modrinth_results.addItem(f"Error: {result}")
+            self.log(f"[ERROR] Modrinth search failed: {result}")
+            return
+        hits = result.get('hits', [])
+        search['total'] = result.get('total_hits', 0)
+        if offset == 0 and not hits:
+            self.modrinth_results.addItem(f"No results found for {search['platform']}")
+            return
+        for hit in hits:
+            project_id = hit.get('project_id', '')
+            title = hit.get('title', 'Unknown')
+            description = (hit.get('description') or '')[:60]
+            downloads = hit.get('downloads', 0)
             
-            if not hits:
-                self.modrinth_results.addItem(f"No results found for {software_type or 'this platform'} {mc_version or ''}")
-                return
-            
-            for hit in hits:
-                project_id = hit.get('project_id', '')
-                title = hit.get('title', 'Unknown')
-                description = hit.get('description', '')[:60]
-                downloads = hit.get('downloads', 0)
-                
-                item_text = f"{title} - {downloads:,} downloads\n  {description}..."
-                item = QListWidgetItem(item_text)
-                item.setData(Qt.ItemDataRole.UserRole, project_id)
-                self.modrinth_results.addItem(item)
-            
-            self.log(f"[INFO] Found {len(hits)} compatible results for '{query}'")
-            
-        except Exception as e:
-            self.modrinth_results.clear()
-            self.modrinth_results.addItem(f"Error: {str(e)}")
-            self.log(f"[ERROR] Modrinth search failed: {e}")
+            item_text = f"{title} - {downloads:,} downloads\n  {description}..."
+            item = QListWidgetItem(item_text)
+            item.setData(Qt.ItemDataRole.UserRole, project_id)
+            self.modrinth_results.addItem(item)
+        search['loaded'] = offset + len(hits)
+        if hits and search['loaded'] < search['total']:
+            more = QListWidgetItem(f"Load more ({search['loaded']} of {search['total']:,} shown)...")
+            more.setData(Qt.ItemDataRole.UserRole, None)
+            self.modrinth_results.addItem(more)
+        if offset == 0:
+            self.log(f"[INFO] Found {search['total']:,} compatible results for '{search['query']}'")
+
+    def _load_more_modrinth_results(self):
+        search = getattr(self, '_modrinth_search', None)
+        if not search or search['loading'] or search['total'] is None or search['loaded'] >= search['total']:
+            return
+        last = self.modrinth_results.item(self.modrinth_results.count() - 1)
+        if last is not None and last.data(Qt.ItemDataRole.UserRole) is None:
+            last.setText("Loading more...")
+        self._load_modrinth_page(search['loaded'])
+
+    def _on_modrinth_results_scrolled(self, value):
+        search = getattr(self, '_modrinth_search', None)
+        if not search or search['total'] is None or search['loaded'] >= search['total']:
+            return
+        bar = self.modrinth_results.verticalScrollBar()
+        if value >= bar.maximum():
+            self._load_more_modrinth_results()
+        elif value >= bar.maximum() // 2:
+            self._load_modrinth_page(search['loaded'], prefetch=True)
     
     def download_modrinth_addon(self, item):
-        """Download and install addon from Modrinth"""
+        """Download and install addon from Modrinth without blocking the window"""
         project_id = item.data(Qt.ItemDataRole.UserRole)
         if not project_id:
+            if item.text().startswith("Load more"):
+                self._load_more_modrinth_results()
             return
         
         addon_type, addon_folder = self.get_addon_folder_type()
@@ -4551,82 +6038,139 @@ class ServerLauncherGUI(QMainWindow):
             QMessageBox.warning(self, "No Folder", "Could not determine addon folder.")
             return
         
-        mc_version, software_type = self.detect_server_info()
+        if project_id in self.addon_download_threads:
+            title = item.text().splitlines()[0].rsplit(' - ', 1)[0]
+            self.log(f"[INFO] {title} is already being downloaded")
+            return
         
+        loaders, game_versions = self._modrinth_filters()
+        self.log(f"[INFO] Fetching project details from Modrinth...")
+        thread = AddonDownloadThread(project_id, addon_folder, loaders=loaders, game_versions=game_versions, parent=self)
+        thread.log_signal.connect(self.log)
+        thread.finished_signal.connect(lambda ok, pid, result, _type=addon_type: self._on_addon_downloaded(ok, pid, result, _type))
+        thread.finished.connect(thread.deleteLater)
+        self.addon_download_threads[project_id] = thread
+        thread.start()
+        self._refresh_download_status()
+    
+    def _on_addon_downloaded(self, ok, project_id, result, addon_type):
+        self.addon_download_threads.pop(project_id, None)
+        if ok:
+            self.log(f"[SUCCESS] Downloaded {result['filename']} from Modrinth! Restart your server to load the {addon_type[:-1]}.")
+            self.refresh_addons_list()
+        elif result.endswith('was cancelled'):
+            self.log(f"[WARNING] Modrinth download cancelled: {result}")
+        else:
+            self.log(f"[ERROR] Failed to download from Modrinth: {result}")
+            QMessageBox.critical(self, "Download Failed", f"Failed to download addon:\n{result}")
+    
+    def _refresh_download_status(self):
+        """Show per-item progress, queue depth and throughput of the shared download queue."""
         try:
-            self.log(f"[INFO] Fetching project details from Modrinth...")
-            
-            project_url = f"https://api.modrinth.com/v2/project/{project_id}"
-            project_data = http.get_json(project_url, timeout=10)
-            
-            project_name = project_data.get('title', 'Unknown')
-            
-            params = {}
-            if mc_version:
-                params['game_versions'] = f'["{mc_version}"]'
-            
-            if software_type:
-                if software_type == 'fabric':
-                    params['loaders'] = '["fabric"]'
-                elif software_type == 'forge':
-                    params['loaders'] = '["forge","neoforge"]'
-                elif software_type == 'bukkit':
-                    params['loaders'] = '["bukkit","spigot","paper","purpur"]'
-            
-            versions_url = f"https://api.modrinth.com/v2/project/{project_id}/version"
-            versions_data = http.get_json(versions_url, timeout=10, params=params)
-            
-            if not versions_data:
-                msg = f"No compatible versions found for {project_name}"
-                if mc_version:
-                    msg += f" (MC {mc_version}"
-                if software_type:
-                    msg += f", {software_type}"
-                if mc_version:
-                    msg += ")"
-                QMessageBox.warning(self, "No Compatible Versions", msg)
-                self.log(f"[WARNING] {msg}")
+            queue = dl_queue.current_queue() if 'components.net.queue' in sys.modules else None
+            if queue is None:
                 return
-            
-            latest_version = versions_data[0]
-            version_number = latest_version.get('version_number', 'unknown')
-            game_versions = latest_version.get('game_versions', [])
-            loaders = latest_version.get('loaders', [])
-            
-            self.log(f"[INFO] Found compatible version {version_number} (MC: {', '.join(game_versions[:3])}, Loaders: {', '.join(loaders)})")
-            
-            files = latest_version.get('files', [])
-            
-            if not files:
-                QMessageBox.warning(self, "No Files", f"No files available for {project_name}")
-                return
-            
-            primary_file = next((f for f in files if f.get('primary', False)), files[0])
-            download_url = primary_file.get('url')
-            filename = primary_file.get('filename')
-            
-            if not download_url or not filename:
-                QMessageBox.warning(self, "Invalid File", "Could not find download URL")
-                return
-            
-            self.log(f"[INFO] Downloading {filename}...")
-            dest_path = os.path.join(addon_folder, filename)
-            downloader.download_file(download_url, dest_path)
-            self.log(f"[SUCCESS] Downloaded {filename} from Modrinth!")
-            QMessageBox.information(self, "Success", f"Downloaded and installed:\n{filename}\n\nRestart your server to load the {addon_type[:-1]}.")
-            self.refresh_addons_list()
-            
-        except Exception as e:
-            self.log(f"[ERROR] Failed to download from Modrinth: {e}")
-            QMessageBox.critical(self, "Download Failed", f"Failed to download addon:\n{str(e)}")
+            stats = queue.stats()
+            active = [i for i in queue.items() if i.state in ('queued', 'running', 'retrying')]
+            lines = []
+            for entry in active[:self.DOWNLOAD_STATUS_ROWS]:
+                if entry.state == 'running':
+                    progress = f"{entry.percent}%" if entry.percent >= 0 else f"{entry.downloaded / (1024 * 1024):.1f} MB"
+                elif entry.state == 'retrying':
+                    progress = f"retrying ({entry.attempts}/{entry.retries + 1})"
+                else:
+                    progress = "queued"
+                lines.append(f"{entry.label} — {progress}")
+            if len(active) > self.DOWNLOAD_STATUS_ROWS:
+                lines.append(f"... and {len(active) - self.DOWNLOAD_STATUS_ROWS} more")
+            if active:
+                summary = f"{stats['running']} running, {stats['queued']} queued — {dl_queue.format_rate(stats['rate_bps'])}"
+                if stats['paused']:
+                    summary += " (paused)"
+            else:
+                summary = f"No active downloads ({stats['done']} done, {stats['failed']} failed)"
+            lines.append(summary)
+            self.download_queue_label.setText("\n".join(lines))
+            self.pause_downloads_button.setText("Resume Downloads" if stats['paused'] else "Pause Downloads")
+            self.pause_downloads_button.setEnabled(bool(active) or stats['paused'])
+            self.cancel_downloads_button.setEnabled(bool(active))
+        except Exception:
+            pass
+    
+    def toggle_downloads_paused(self):
+        queue = dl_queue.get_queue()
+        if queue.paused:
+            queue.resume()
+            self.log("[INFO] Downloads resumed")
+        else:
+            queue.pause()
+            self.log("[INFO] Downloads paused")
+        self._refresh_download_status()
+    
+    def cancel_all_downloads(self):
+        reply = QMessageBox.question(self, "Cancel Downloads", "Cancel every queued and running download?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        queue = dl_queue.get_queue()
+        queue.cancel_all()
+        self.log("[WARNING] All downloads cancelled")
+        self._refresh_download_status()
     
     def closeEvent(self, event):
         """Handle window close event"""
         try:
-            try:
+            # closing before startup finished must not overwrite saved settings with defaults
+            if self._settings_loaded:
                 self.save_app_settings()
-            except Exception:
-                pass
+        except Exception:
+            pass
+        try:
+            if getattr(self, 'world_backup_thread', None) and self.world_backup_thread.isRunning():
+                self.world_backup_thread.cancel()
+                self.world_backup_thread.server_stopped()
+                self.world_backup_thread.wait(5000)
+        except Exception:
+            pass
+        try:
+            if getattr(self, 'world_import_thread', None) and self.world_import_thread.isRunning():
+                self.world_import_thread.cancel()
+                self.world_import_thread.wait(5000)
+        except Exception:
+            pass
+        try:
+            if getattr(self, 'addon_update_thread', None) and self.addon_update_thread.isRunning():
+                # downloads land as .part files; an interrupted one never replaces a jar
+                self.addon_update_thread.cancel()
+                self.addon_update_thread.wait(5000)
+        except Exception:
+            pass
+        try:
+            queue = dl_queue.current_queue() if 'components.net.queue' in sys.modules else None
+            if queue is not None:
+                # interrupted transfers keep their .part files and resume next time
+                queue.cancel_all()
+                for thread in list(self.addon_download_threads.values()):
+                    thread.wait(2000)
+        except Exception:
+            pass
+        try:
+            if getattr(self, 'world_region_thread', None) and self.world_region_thread.isRunning():
+                # a region file is only ever swapped in whole, so stopping between files is safe
+                self.world_region_thread.cancel()
+                self.world_region_thread.wait()
+        except Exception:
+            pass
+        try:
+            if getattr(self, 'snapshot_task_thread', None) and self.snapshot_task_thread.isRunning():
+                # restores and prunes only swap files in at the end; let them finish
+                self.snapshot_task_thread.wait()
+        except Exception:
+            pass
+        try:
+            if getattr(self, 'metrics_thread', None):
+                self.metrics_thread.stop()
+                self.metrics_thread.wait(1000)
         except Exception:
             pass
         try:
@@ -4691,7 +6235,7 @@ class ServerLauncherGUI(QMainWindow):
 
     
     def import_world(self):
-        """Import a world folder from file system"""
+        """Import a world folder from the file system (copied on a WorldImportThread)"""
         if not self.server_directory:
             QMessageBox.warning(self, "No Server", "Please select a server directory first.")
             return
@@ -4735,15 +6279,173 @@ class ServerLauncherGUI(QMainWindow):
                 QMessageBox.critical(self, "Error", f"Failed to remove existing world:\n{str(e)}")
                 return
         
-        try:
-            self.log(f"[INFO] Importing world: {world_name}...")
-            shutil.copytree(world_dir, dest_path)
-            self.log(f"[SUCCESS] Imported world: {world_name}")
-            QMessageBox.information(self, "Success", f"World '{world_name}' imported successfully!")
+        self.queue_world_import(world_dir, dest_path)
+
+    def import_world_archive(self, archive_path=None, interactive=True):
+        """Import a world from a .zip / .tar.zst / .tar.gz archive.
+
+        Extraction runs on a WorldImportThread; archives dropped while one
+        is being extracted are queued. The world is named after the archive
+        file. With `interactive` False (drag & drop) an existing world of
+        that name is skipped instead of offering to overwrite it.
+        """
+        if not self.server_directory:
+            QMessageBox.warning(self, "No Server", "Please select a server directory first.")
+            return
+
+        if archive_path is None:
+            patterns = "*.zip *.tar.zst *.tar.gz *.tgz *.tar"
+            archive_path, _ = QFileDialog.getOpenFileName(
+                self,
+                "Select World Archive to Import",
+                "",
+                f"World Archives ({patterns})"
+            )
+            if not archive_path:
+                return
+
+        world_name = world_archive.archive_stem(archive_path)
+        dest_path = os.path.join(self.server_directory, world_name)
+        if os.path.exists(dest_path):
+            if not interactive:
+                self.log(f"[WARNING] World '{world_name}' already exists in server directory")
+                return
+            reply = QMessageBox.question(
+                self,
+                "World Exists",
+                f"A world named '{world_name}' already exists.\n\nOverwrite it?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                return
+            try:
+                shutil.rmtree(dest_path)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to remove existing world:\n{str(e)}")
+                return
+
+        self.queue_world_import(archive_path, dest_path, interactive)
+
+    def queue_world_import(self, source_path, dest_path, interactive=True):
+        """Copy a world folder or extract a world archive to `dest_path` on a WorldImportThread.
+
+        Imports run one at a time; later ones wait in a queue. `interactive`
+        shows a message box with the result instead of only logging it.
+        """
+        if not hasattr(self, '_world_imports'):
+            self._world_imports = deque()
+        self._world_imports.append((source_path, dest_path, interactive))
+        if not (getattr(self, 'world_import_thread', None) and self.world_import_thread.isRunning()):
+            self._start_next_world_import()
+
+    def _start_next_world_import(self):
+        if not self._world_imports:
+            return
+        source_path, dest_path, interactive = self._world_imports.popleft()
+        self.log(f"[INFO] Importing world from {os.path.basename(source_path)}...")
+        self.world_import_thread = WorldImportThread(source_path, dest_path, parent=self)
+        self.world_import_thread.progress_signal.connect(
+            lambda pct, text, name=os.path.basename(dest_path): self.world_status_label.setText(f"Importing {name}: {pct}% ({text})"))
+        self.world_import_thread.finished_signal.connect(
+            lambda ok, msg, stats, src=source_path, ask=interactive: self._on_world_import_finished(ok, src, msg, stats, ask))
+        self._set_widget_state(self.world_status_label, 'state', 'normal')
+        self.world_import_thread.start()
+
+    def _on_world_import_finished(self, ok, source_path, message, stats, interactive):
+        if ok:
+            world_name = os.path.basename(message)
+            secs = (stats.get('elapsed_ms') or 0) / 1000.0
+            detail = f"{stats.get('files', 0)} files in {secs:.1f}s"
+            if stats.get('methods'):
+                detail += ", " + ", ".join(f"{k}: {v}" for k, v in sorted(stats['methods'].items()))
+            self.log(f"[SUCCESS] Imported world: {world_name} ({detail})")
+            if interactive:
+                QMessageBox.information(self, "Success", f"World '{world_name}' imported successfully!")
+        else:
+            self.log(f"[ERROR] Failed to import {os.path.basename(source_path)}: {message}")
+            if interactive:
+                QMessageBox.critical(self, "Import Failed", f"Failed to import world:\n{message}")
+        if self._world_imports:
+            self._start_next_world_import()
+        else:
             self.refresh_worlds_list()
-        except Exception as e:
-            self.log(f"[ERROR] Failed to import world: {e}")
-            QMessageBox.critical(self, "Import Failed", f"Failed to import world:\n{str(e)}")
+
+    def export_world(self):
+        """Export the selected world to a single archive.
+
+        Runs on a WorldExportThread; like a backup, autosave is paused while
+        the files are read if the server is running.
+        """
+        selected_items = self.worlds_list.selectedItems()
+        if not selected_items:
+            QMessageBox.warning(self, "No Selection", "Please select a world to export.")
+            return
+
+        if self._snapshot_busy():
+            QMessageBox.information(self, "Backup Running", "A world backup or snapshot task is already in progress.")
+            return
+
+        world_name = selected_items[0].data(Qt.ItemDataRole.UserRole)
+        world_path = os.path.join(self.server_directory, world_name)
+        if not os.path.exists(world_path):
+            QMessageBox.warning(self, "Error", f"World folder not found: {world_name}")
+            return
+
+        filters = ["Zip Archive (*.zip)"]
+        if world_archive.zstd_available():
+            filters.append("Zstandard Tar Archive (*.tar.zst)")
+        archive_path, chosen = QFileDialog.getSaveFileName(
+            self,
+            "Export World",
+            os.path.join(os.path.expanduser('~'), f"{world_name}.zip"),
+            ";;".join(filters)
+        )
+        if not archive_path:
+            return
+        if world_archive.archive_kind(archive_path) not in ('zip', 'tar.zst'):
+            archive_path += '.tar.zst' if 'tar.zst' in (chosen or '') else '.zip'
+
+        online = bool(self.server_process and self.server_process.state() == QProcess.ProcessState.Running)
+        if online:
+            self.log(f"[INFO] Exporting {world_name} to {archive_path} (pausing autosave while reading)...")
+        else:
+            self.log(f"[INFO] Exporting {world_name} to {archive_path}...")
+
+        self.world_backup_thread = WorldExportThread(world_path, archive_path, online, parent=self)
+        self.world_backup_thread.command_signal.connect(self._send_backup_command)
+        self.world_backup_thread.progress_signal.connect(
+            lambda pct, text, name=world_name: self.world_status_label.setText(f"Exporting {name}: {pct}% ({text})"))
+        self.world_backup_thread.finished_signal.connect(lambda ok, msg, stats, name=world_name: self._on_world_export_finished(ok, name, msg, stats))
+        self.world_backup_thread.finished.connect(self._update_snapshot_buttons)
+        self.backup_world_button.setEnabled(False)
+        self.export_world_button.setEnabled(False)
+        self._update_snapshot_buttons()
+        self._set_widget_state(self.world_status_label, 'state', 'normal')
+        self.world_backup_thread.start()
+
+    def _on_world_export_finished(self, ok, world_name, message, stats):
+        try:
+            self.backup_world_button.setEnabled(bool(self.server_directory))
+            self.export_world_button.setEnabled(bool(self.server_directory))
+        except Exception:
+            pass
+        unsafe = stats.get('unsafe_seconds')
+        if unsafe is not None:
+            self.log(f"[INFO] Autosave was paused for {unsafe:.1f}s during the export")
+        if ok:
+            secs = (stats.get('elapsed_ms') or 0) / 1000.0
+            self.log(f"[SUCCESS] Exported {world_name} to {message}: {stats.get('files', 0)} files, "
+                     f"{world_indexer.format_size(stats.get('bytes', 0))} -> {world_indexer.format_size(stats.get('archive_bytes', 0))} in {secs:.1f}s")
+            self.world_status_label.setText(f"Exported {world_name}")
+            self._set_widget_state(self.world_status_label, 'state', 'ok')
+            QMessageBox.information(self, "Success", f"World exported to:\n{message}")
+        else:
+            self.log(f"[ERROR] Failed to export world {world_name}: {message}")
+            self.world_status_label.setText(f"Export of {world_name} failed")
+            self._set_widget_state(self.world_status_label, 'state', 'error')
+            QMessageBox.critical(self, "Error", f"Failed to export world:\n{message}")
+        self._update_snapshot_buttons()
 
 
 class HistoryLineEdit(QLineEdit):
@@ -0,0 +1,59 @@
+"""Artifact store size limit and materialize locking."""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from components.net import artifacts
+
+
+class ArtifactStoreTest(unittest.TestCase):
+
+	def setUp(self):
+		self.tmp = tempfile.mkdtemp(prefix='yali-artifacts-')
+		self.addCleanup(shutil.rmtree, self.tmp, True)
+		self.jar = os.path.join(self.tmp, 'server.jar')
+		with open(self.jar, 'wb') as f:
+			f.write(b'jar' * 1000)
+
+	def store(self, max_bytes=artifacts.DEFAULT_MAX_BYTES):
+		return artifacts.ArtifactStore(os.path.join(self.tmp, 'store'), max_bytes=max_bytes)
+
+	def test_zero_limit_keeps_nothing(self):
+		coords = ('paper', '1.21.1', '130', 'server.jar')
+		self.store().put(self.jar, coords)
+		store = self.store(max_bytes=0)
+		store.put(self.jar, ('paper', '1.21.1', '131', 'server.jar'))
+		self.assertEqual((store.entries(), store.total_size(), store.lookup(coords)), ([], 0, None))
+		self.assertIsNone(store.fetch(coords, os.path.join(self.tmp, 'out.jar')))
+
+	def test_materialize_copies_outside_the_store_lock(self):
+		store = self.store()
+		sha = store.put(self.jar, ('paper', '1.21.1', '130', 'server.jar'))
+		locked = []
+		real = artifacts.link_or_copy
+
+		def _probe():
+			acquired = store._lock.acquire(timeout=1)
+			locked.append(not acquired)
+			if acquired:
+				store._lock.release()
+
+		def copy(src, dst, **kwargs):
+			probe = threading.Thread(target=_probe)
+			probe.start()
+			probe.join()
+			return real(src, dst, **kwargs)
+
+		dest = os.path.join(self.tmp, 'server', 'server.jar')
+		with mock.patch.object(artifacts, 'link_or_copy', copy):
+			store.materialize(sha, dest)
+		self.assertEqual(locked, [False])
+		with open(dest, 'rb') as f:
+			self.assertEqual(f.read(), b'jar' * 1000)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,76 @@
+"""Online snapshots: what autosave-off covers and what ends up stored.
+
+The fake server confirms `save-all flush` at once and, as soon as it gets
+`save-on`, rewrites a file of the world the way a real server resumes
+saving. The snapshot must hold the world as it was while autosave was off.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from components.world import anvil, backup, diffbackup
+
+
+class OnlineSnapshotTest(unittest.TestCase):
+
+	def setUp(self):
+		self.tmp = tempfile.mkdtemp(prefix='yali-backup-')
+		self.addCleanup(shutil.rmtree, self.tmp, True)
+		self.world = os.path.join(self.tmp, 'world')
+		os.makedirs(os.path.join(self.world, 'region'))
+		anvil.write_region(os.path.join(self.world, 'region', 'r.0.0.mca'), {0: (1, b'\x00\x00\x00\x02\x02x')})
+		self.write('level.dat', b'level-1')
+		self.write('stats.json', b'stats-1')
+		self.repo = diffbackup.DiffRepository(os.path.join(self.tmp, 'repo'))
+		self.sent = []
+		self.lock = backup.SaveLock(self.send, timeout=5)
+
+	def write(self, rel, data):
+		with open(os.path.join(self.world, rel), 'wb') as f:
+			f.write(data)
+
+	def read(self, root, rel):
+		with open(os.path.join(root, rel), 'rb') as f:
+			return f.read()
+
+	def send(self, command):
+		self.sent.append(command)
+		if command == 'save-all flush':
+			self.lock.feed('[Server thread/INFO]: Saved the game')
+		elif command == 'save-on':
+			self.staged = sorted(n for n in os.listdir(self.tmp) if n.startswith('.world.snapshot-'))
+			self.write('level.dat', b'level-after-save-on')
+
+	def restored(self, snapshot_id):
+		dest = os.path.join(self.tmp, f'restore-{snapshot_id}')
+		self.repo.restore(snapshot_id, dest)
+		return dest
+
+	def test_snapshot_stores_world_as_of_save_off(self):
+		first = backup.snapshot_world(self.world, self.repo, save_lock=self.lock)
+		self.assertEqual(self.sent, ['save-off', 'save-all flush', 'save-on'])
+		self.assertEqual(len(self.staged), 1)
+		self.assertEqual(self.read(self.restored(first['id']), 'level.dat'), b'level-1')
+		self.assertNotIn(self.staged[0], os.listdir(self.tmp))
+
+		# only changed files are staged the second time, unchanged ones reuse the parent
+		self.write('stats.json', b'stats-2')
+		self.sent = []
+		second = backup.snapshot_world(self.world, self.repo, save_lock=self.lock)
+		self.assertEqual(second['parent'], first['id'])
+		self.assertEqual(second['files_reused'], 1)
+		dest = self.restored(second['id'])
+		self.assertEqual((self.read(dest, 'level.dat'), self.read(dest, 'stats.json')), (b'level-after-save-on', b'stats-2'))
+
+	def test_stale_save_line_is_not_a_confirmation(self):
+		lock = backup.SaveLock(self.sent.append, timeout=0.2)
+		lock.feed('Saved the game')
+		with self.assertRaises(backup.SaveTimeout):
+			with lock:
+				pass
+		self.assertEqual(self.sent, ['save-off', 'save-all flush', 'save-on'])
+
+
+if __name__ == '__main__':
+	unittest.main()
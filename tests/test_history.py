@@ -0,0 +1,38 @@
+"""Tier choice of MetricsHistory.query for ranges older than any retained data."""
+import shutil
+import tempfile
+import unittest
+
+from components.monitor import history
+
+
+class QueryTierTest(unittest.TestCase):
+
+	def setUp(self):
+		self.folder = tempfile.mkdtemp(prefix='yali-history-')
+		self.addCleanup(shutil.rmtree, self.folder, True)
+		self.history = history.MetricsHistory(self.folder)
+		self.addCleanup(self.history.close)
+		self.now = 1_700_000_000.0
+		# ten minutes of samples: the 1s tier has them, the 1m tier a few, the 1h tier none yet
+		for i in range(600):
+			self.history.add({'ts': self.now - 600 + i, 'cpu': float(i % 100)})
+
+	def test_short_history_uses_finest_tier(self):
+		out = self.history.query(self.now - 3600, self.now)
+		self.assertEqual(out['tier'], '1s')
+		self.assertGreater(len(out['ts']), 500)
+
+	def test_covered_range_keeps_finest_covering_tier(self):
+		out = self.history.query(self.now - 300, self.now)
+		self.assertEqual(out['tier'], '1s')
+		self.assertGreaterEqual(len(out['ts']), 299)
+
+	def test_range_past_the_finest_retention_uses_spanning_tier(self):
+		out = self.history.query(self.now - 86400, self.now)
+		self.assertEqual(out['tier'], '1m')
+		self.assertGreater(len(out['ts']), 5)
+
+
+if __name__ == '__main__':
+	unittest.main()
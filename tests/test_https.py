@@ -0,0 +1,57 @@
+"""get_json response cache: callers get their own copy of a cached body."""
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from components.net import https
+
+
+class _Handler(BaseHTTPRequestHandler):
+	def log_message(self, *args):
+		pass
+
+	def do_GET(self):
+		data = json.dumps({'versions': ['1.21.1'], 'meta': {'count': 1}}).encode('utf-8')
+		self.send_response(200)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(data)))
+		self.end_headers()
+		self.wfile.write(data)
+
+
+class CachedBodyTest(unittest.TestCase):
+
+	def setUp(self):
+		self.tmp = tempfile.mkdtemp(prefix='yali-https-')
+		self.addCleanup(shutil.rmtree, self.tmp, True)
+		env = mock.patch.dict(os.environ, {'LOCALAPPDATA': os.path.join(self.tmp, 'appdata')})
+		env.start()
+		self.addCleanup(env.stop)
+		patcher = mock.patch.object(https, '_cache_dir', None)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+		https.clear_cache()
+		self.addCleanup(https.clear_cache)
+		server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+		threading.Thread(target=server.serve_forever, daemon=True).start()
+		self.addCleanup(server.server_close)
+		self.addCleanup(server.shutdown)
+		self.url = f'http://127.0.0.1:{server.server_port}/versions'
+
+	def test_mutating_a_result_does_not_change_the_cache(self):
+		first = https.get_json(self.url, ttl=60)
+		first['versions'].append('changed')
+		first['meta']['count'] = 99
+		second = https.get_json(self.url, ttl=60)
+		self.assertEqual(second, {'versions': ['1.21.1'], 'meta': {'count': 1}})
+		second['versions'].clear()
+		self.assertEqual(https.get_json(self.url, ttl=60)['versions'], ['1.21.1'])
+
+
+if __name__ == '__main__':
+	unittest.main()
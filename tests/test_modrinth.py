@@ -0,0 +1,154 @@
+"""Modrinth update check and apply against a local stub of the API.
+
+The stub answers `/version_files`, `/version_files/update`, `/projects` and
+serves the new jars from `/files/`, so `check_updates` and `apply_updates`
+run end to end without the network (the same thing `YALI_MODRINTH_API`
+does for manual testing).
+"""
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from components.net import modrinth, https
+
+
+def _hashes(content: bytes):
+	return {'sha1': hashlib.sha1(content).hexdigest(), 'sha512': hashlib.sha512(content).hexdigest()}
+
+
+class _Stub:
+	"""Installed jar contents -> (installed version, newest version), and the files to serve."""
+
+	def __init__(self):
+		self.files = {}
+		self.versions = {}
+		self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+		self.base = f'http://127.0.0.1:{self.server.server_port}'
+		threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+	def version(self, version_id, project_id, number, filename, content, served=None):
+		self.files[filename] = content if served is None else served
+		return {'id': version_id, 'project_id': project_id, 'version_number': number,
+				'files': [{'url': f'{self.base}/files/{filename}', 'filename': filename, 'primary': True,
+						   'size': len(content), 'hashes': _hashes(content)}]}
+
+	def add(self, installed_content, installed, newest):
+		self.versions[hashlib.sha512(installed_content).hexdigest()] = (installed, newest)
+
+	def _handler(self):
+		stub = self
+
+		class Handler(BaseHTTPRequestHandler):
+			def log_message(self, *args):
+				pass
+
+			def _send(self, body, content_type='application/json'):
+				data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+				self.send_response(200)
+				self.send_header('Content-Type', content_type)
+				self.send_header('Content-Length', str(len(data)))
+				self.end_headers()
+				self.wfile.write(data)
+
+			def do_POST(self):
+				body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+				pick = 0 if self.path.endswith('/version_files') else 1
+				self._send({h: stub.versions[h][pick] for h in body['hashes'] if h in stub.versions})
+
+			def do_GET(self):
+				if self.path.startswith('/projects'):
+					ids = {v[0]['project_id'] for v in stub.versions.values()}
+					self._send([{'id': pid, 'title': pid.title()} for pid in sorted(ids)])
+				elif self.path.startswith('/files/') and self.path[7:] in stub.files:
+					self._send(stub.files[self.path[7:]], 'application/java-archive')
+				else:
+					self.send_error(404)
+
+		return Handler
+
+	def close(self):
+		self.server.shutdown()
+		self.server.server_close()
+
+
+class ModrinthUpdateTest(unittest.TestCase):
+
+	def setUp(self):
+		self.tmp = tempfile.mkdtemp(prefix='yali-modrinth-')
+		self.folder = os.path.join(self.tmp, 'plugins')
+		os.makedirs(self.folder)
+		env = mock.patch.dict(os.environ, {'LOCALAPPDATA': os.path.join(self.tmp, 'appdata')})
+		env.start()
+		self.addCleanup(env.stop)
+		# module-level caches would otherwise point at the real app data folder
+		for target, attr, value in ((modrinth, '_hash_cache', None), (https, '_cache_dir', None)):
+			patcher = mock.patch.object(target, attr, value)
+			patcher.start()
+			self.addCleanup(patcher.stop)
+		https.clear_cache()
+
+		self.stub = _Stub()
+		self.addCleanup(self.stub.close)
+		stub = self.stub
+		stub.add(b'vault-old', stub.version('v1', 'vault', '1.7.3', 'Vault.jar', b'vault-old'),
+				 stub.version('v2', 'vault', '1.7.4', 'Vault-1.7.4.jar', b'vault-new'))
+		stub.add(b'ess-current', stub.version('e1', 'essentials', '2.20', 'Essentials.jar', b'ess-current'),
+				 stub.version('e1', 'essentials', '2.20', 'Essentials.jar', b'ess-current'))
+		stub.add(b'same-old', stub.version('s1', 'same', '1', 'Same.jar', b'same-old'),
+				 stub.version('s2', 'same', '2', 'Same.jar', b'same-new'))
+		stub.add(b'bad-old', stub.version('b1', 'bad', '1', 'Bad.jar', b'bad-old'),
+				 stub.version('b2', 'bad', '2', 'Bad-2.jar', b'bad-new', served=b'tampered'))
+		self.install({'Vault.jar': b'vault-old', 'Vault-copy.jar': b'vault-old', 'Essentials.jar': b'ess-current',
+					  'Same.jar': b'same-old', 'Bad.jar': b'bad-old', 'unknown.jar': b'who-knows'})
+
+	def tearDown(self):
+		shutil.rmtree(self.tmp, ignore_errors=True)
+
+	def install(self, jars):
+		for name, content in jars.items():
+			with open(os.path.join(self.folder, name), 'wb') as f:
+				f.write(content)
+
+	def contents(self):
+		out = {}
+		for name in sorted(os.listdir(self.folder)):
+			with open(os.path.join(self.folder, name), 'rb') as f:
+				out[name] = f.read()
+		return out
+
+	def check(self):
+		return modrinth.check_updates(self.folder, ['paper'], ['1.21.1'], api_base=self.stub.base)
+
+	def test_check_reports_every_jar(self):
+		report = self.check()
+		self.assertEqual(report['checked'], 6)
+		self.assertEqual(sorted(u['file'] for u in report['updates']),
+						 ['Bad.jar', 'Same.jar', 'Vault-copy.jar', 'Vault.jar'])
+		self.assertEqual(report['current'], ['Essentials.jar'])
+		self.assertEqual(report['unknown'], ['unknown.jar'])
+		vault = next(u for u in report['updates'] if u['file'] == 'Vault.jar')
+		self.assertEqual((vault['title'], vault['current_version'], vault['new_version'], vault['filename']),
+						 ('Vault', '1.7.3', '1.7.4', 'Vault-1.7.4.jar'))
+
+	def test_apply_renames_swaps_and_keeps_failed(self):
+		results = modrinth.apply_updates(self.folder, self.check()['updates'])
+		errors = {update['file']: error for update, error in results}
+		self.assertEqual({name for name, error in errors.items() if error}, {'Bad.jar'})
+		self.assertIn('mismatch', errors['Bad.jar'])
+		self.assertEqual(self.contents(), {
+			'Bad.jar': b'bad-old',
+			'Essentials.jar': b'ess-current',
+			'Same.jar': b'same-new',
+			'Vault-1.7.4.jar': b'vault-new',
+			'unknown.jar': b'who-knows',
+		})
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,59 @@
+"""Region analyzer and pruner on a world holding a corrupt chunk.
+
+One chunk carries valid zlib-compressed NBT, the other is tagged zlib but
+its body is garbage; the corrupt one must be counted as unreadable and
+kept, not abort the whole job.
+"""
+import os
+import zlib
+import shutil
+import struct
+import tempfile
+import unittest
+
+from components.world import anvil, nbt, regions
+
+
+def _chunk_nbt(inhabited: int) -> bytes:
+	name = b'InhabitedTime'
+	return (bytes([nbt.TAG_COMPOUND]) + struct.pack('>H', 0)
+			+ bytes([nbt.TAG_LONG]) + struct.pack('>H', len(name)) + name + struct.pack('>q', inhabited)
+			+ bytes([nbt.TAG_END]))
+
+
+def _payload(kind: int, body: bytes) -> bytes:
+	return struct.pack('>I', len(body) + 1) + bytes([kind]) + body
+
+
+class CorruptChunkTest(unittest.TestCase):
+
+	def setUp(self):
+		self.world = tempfile.mkdtemp(prefix='yali-regions-')
+		self.addCleanup(shutil.rmtree, self.world, True)
+		folder = os.path.join(self.world, 'region')
+		os.makedirs(folder)
+		self.region = os.path.join(folder, 'r.0.0.mca')
+		anvil.write_region(self.region, {
+			0: (1, _payload(nbt.COMPRESSION_ZLIB, zlib.compress(_chunk_nbt(0)))),
+			1: (1, _payload(nbt.COMPRESSION_ZLIB, b'definitely not zlib data')),
+		})
+
+	def test_decompress_raises_nbt_error(self):
+		with self.assertRaises(nbt.NBTError):
+			nbt.decompress_chunk(_payload(nbt.COMPRESSION_ZLIB, b'garbage'))
+		with self.assertRaises(nbt.NBTError):
+			nbt.decompress_chunk(_payload(nbt.COMPRESSION_GZIP, b'garbage'))
+
+	def test_analyze_counts_corrupt_chunk(self):
+		d = regions.analyze_world(self.world)['dimensions']['Overworld']
+		self.assertEqual((d['regions'], d['chunks'], d['unreadable'], d['never_visited']), (1, 2, 1, 1))
+
+	def test_prune_keeps_corrupt_chunk(self):
+		stats = regions.prune_world(self.world, min_inhabited_ticks=100)
+		self.assertEqual((stats['chunks'], stats['chunks_removed'], stats['regions_unreadable']), (2, 1, 0))
+		with open(self.region, 'rb') as f:
+			self.assertEqual([entry[0] for entry in anvil.read_header(f)], [1])
+
+
+if __name__ == '__main__':
+	unittest.main()